@@ -0,0 +1,8 @@
+-- Migration: Composite index for keyset pagination of members
+-- Version: 002
+-- Date: 2026-10-17
+
+CREATE INDEX IF NOT EXISTS ix_members_church_name_keyset
+    ON members (church_id, last_name, first_name, id);
+
+COMMENT ON INDEX ix_members_church_name_keyset IS 'Paginación por cursor de GET /members (last_name, first_name, id)';
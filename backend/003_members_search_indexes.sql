@@ -0,0 +1,30 @@
+-- Migration: Accent-insensitive, ranked member search
+-- Version: 003
+-- Date: 2026-10-17
+
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- unaccent() es STABLE; los índices de expresión requieren una función IMMUTABLE
+CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT public.unaccent('public.unaccent', $1) $$;
+
+-- Las expresiones deben coincidir exactamente con las de
+-- app/infrastructure/database/models/member.py (member_search_document, etc.)
+CREATE INDEX IF NOT EXISTS ix_members_search_trgm
+    ON members USING gin (
+        f_unaccent(lower(coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || coalesce(email, ''))) gin_trgm_ops
+    );
+
+CREATE INDEX IF NOT EXISTS ix_members_search_tsv
+    ON members USING gin (
+        to_tsvector('simple'::regconfig, f_unaccent(lower(coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || coalesce(email, ''))))
+    );
+
+CREATE INDEX IF NOT EXISTS ix_members_phone_digits_trgm
+    ON members USING gin (
+        regexp_replace(coalesce(phone, ''), '[^0-9]', '', 'g') gin_trgm_ops
+    );
+
+COMMENT ON FUNCTION f_unaccent(text) IS 'unaccent inmutable para índices de búsqueda de miembros';
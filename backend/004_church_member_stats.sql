@@ -0,0 +1,35 @@
+-- Migration: Incrementally maintained per-church member stats snapshot
+-- Version: 004
+-- Date: 2026-10-17
+
+CREATE TABLE IF NOT EXISTS church_member_stats (
+    church_id UUID PRIMARY KEY,
+
+    total_members INTEGER NOT NULL DEFAULT 0,
+    active_members INTEGER NOT NULL DEFAULT 0,
+    visitors INTEGER NOT NULL DEFAULT 0,
+    members_at_risk INTEGER NOT NULL DEFAULT 0,
+    members_needing_followup INTEGER NOT NULL DEFAULT 0,
+
+    sum_attendance_rate DOUBLE PRECISION NOT NULL DEFAULT 0,
+    sum_commitment_score DOUBLE PRECISION NOT NULL DEFAULT 0,
+
+    new_by_month JSON NOT NULL DEFAULT '{}',
+
+    age_distribution JSON NOT NULL DEFAULT '{}',
+    gender_distribution JSON NOT NULL DEFAULT '{}',
+    marital_status_distribution JSON NOT NULL DEFAULT '{}',
+    member_type_distribution JSON NOT NULL DEFAULT '{}',
+
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    reconciled_at TIMESTAMP NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT fk_church_member_stats_church
+        FOREIGN KEY (church_id)
+        REFERENCES churches(id)
+        ON DELETE CASCADE
+);
+
+COMMENT ON TABLE church_member_stats IS 'Snapshot incremental de GET /members/stats, reconciliado periódicamente';
+COMMENT ON COLUMN church_member_stats.updated_at IS 'Último cambio incremental aplicado';
+COMMENT ON COLUMN church_member_stats.reconciled_at IS 'Último recálculo completo';
@@ -0,0 +1,8 @@
+-- Migration: Index for paged attendance history per member
+-- Version: 005
+-- Date: 2026-10-17
+
+CREATE INDEX IF NOT EXISTS ix_attendance_member_date
+    ON attendance_records (member_id, event_date, id);
+
+COMMENT ON INDEX ix_attendance_member_date IS 'Historial de asistencia por miembro (event_date DESC, id DESC) con cursor';
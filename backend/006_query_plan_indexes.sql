@@ -0,0 +1,29 @@
+-- Migration: Indexes required by the query-plan regression suite
+-- Version: 006
+-- Date: 2026-10-17
+
+-- Miembros en riesgo por iglesia
+CREATE INDEX IF NOT EXISTS ix_members_church_risk
+    ON members (church_id, risk_level);
+
+-- Notas pastorales por miembro y seguimientos pendientes
+CREATE INDEX IF NOT EXISTS ix_pastoral_notes_member_created
+    ON pastoral_notes (member_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_pastoral_notes_pending_followup
+    ON pastoral_notes (member_id, follow_up_date)
+    WHERE follow_up_date IS NOT NULL AND follow_up_completed IS NOT TRUE;
+
+-- Usuarios
+CREATE INDEX IF NOT EXISTS ix_users_church_id ON users (church_id);
+CREATE INDEX IF NOT EXISTS ix_users_email_verification_token ON users (email_verification_token);
+
+-- Iglesias y sus datos relacionados (selectinload por church_id)
+CREATE INDEX IF NOT EXISTS ix_churches_owner_user_id ON churches (owner_user_id);
+CREATE INDEX IF NOT EXISTS ix_churches_created_at ON churches (created_at);
+CREATE INDEX IF NOT EXISTS ix_addresses_church_id ON addresses (church_id);
+CREATE INDEX IF NOT EXISTS ix_contact_info_church_id ON contact_info (church_id);
+CREATE INDEX IF NOT EXISTS ix_legal_documents_church_id ON legal_documents (church_id);
+
+-- Auditoría: historial por miembro y acciones por usuario (ORDER BY changed_at DESC LIMIT n)
+CREATE INDEX IF NOT EXISTS ix_member_audit_member_changed ON member_audit_log (member_id, changed_at);
+CREATE INDEX IF NOT EXISTS ix_member_audit_user_changed ON member_audit_log (user_id, changed_at);
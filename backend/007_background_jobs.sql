@@ -0,0 +1,54 @@
+-- Migration: Background jobs table (whole-church score recalculation)
+-- Version: 007
+-- Date: 2026-10-17
+
+CREATE TABLE IF NOT EXISTS background_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    church_id UUID NOT NULL,
+    created_by UUID,
+
+    job_type VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+
+    chunk_size INTEGER NOT NULL DEFAULT 500,
+    cursor UUID,
+
+    total INTEGER,
+    processed INTEGER NOT NULL DEFAULT 0,
+    updated INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    errors JSON NOT NULL DEFAULT '[]',
+    attempts INTEGER NOT NULL DEFAULT 0,
+
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    finished_at TIMESTAMP,
+
+    CONSTRAINT fk_background_jobs_church
+        FOREIGN KEY (church_id)
+        REFERENCES churches(id)
+        ON DELETE CASCADE,
+
+    CONSTRAINT fk_background_jobs_user
+        FOREIGN KEY (created_by)
+        REFERENCES users(id)
+        ON DELETE SET NULL
+);
+
+-- Un solo trabajo activo por iglesia y tipo
+CREATE UNIQUE INDEX IF NOT EXISTS ux_background_jobs_church_type_active
+    ON background_jobs (church_id, job_type)
+    WHERE status IN ('pending', 'running');
+
+-- Barrido de trabajos sin latido
+CREATE INDEX IF NOT EXISTS ix_background_jobs_status_heartbeat
+    ON background_jobs (status, heartbeat_at);
+
+-- Lotes de miembros de una iglesia: WHERE church_id = ? AND id > ? ORDER BY id
+CREATE INDEX IF NOT EXISTS ix_members_church_id_keyset
+    ON members (church_id, id);
+
+COMMENT ON TABLE background_jobs IS 'Trabajos en segundo plano por iglesia (POST /members/recalculate-all)';
+COMMENT ON COLUMN background_jobs.cursor IS 'Último member_id confirmado; el trabajo se retoma desde aquí';
+COMMENT ON COLUMN background_jobs.heartbeat_at IS 'Latido del proceso que lo ejecuta; vencido = se puede retomar';
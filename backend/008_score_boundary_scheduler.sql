@@ -0,0 +1,21 @@
+-- Migration: Threshold-boundary score refresh (indexes + scheduler state)
+-- Version: 008
+-- Date: 2026-10-17
+
+-- Miembros cuyo umbral de días sin asistir vence en el rango procesado
+CREATE INDEX IF NOT EXISTS ix_members_last_attendance
+    ON members (last_attendance);
+
+-- Visitantes que superan los 90 días de membresía
+CREATE INDEX IF NOT EXISTS ix_members_visitor_membership
+    ON members (membership_date)
+    WHERE member_type = 'visitante';
+
+CREATE TABLE IF NOT EXISTS scheduler_state (
+    name VARCHAR(100) PRIMARY KEY,
+    last_run_date DATE NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE scheduler_state IS 'Última fecha procesada por cada tarea programada';
+COMMENT ON COLUMN scheduler_state.last_run_date IS 'La próxima corrida procesa (last_run_date, hoy]';
@@ -0,0 +1,9 @@
+-- Migration: Attendance trend index (GET /members/trends)
+-- Version: 009
+-- Date: 2026-10-17
+
+-- Tendencias de una iglesia: WHERE church_id = ? AND event_date > ? AND event_date <= ?
+-- Se lee sólo el período pedido (no todo el historial); INCLUDE permite index-only scan
+CREATE INDEX IF NOT EXISTS ix_attendance_church_date
+    ON attendance_records (church_id, event_date)
+    INCLUDE (member_id, id, attended);
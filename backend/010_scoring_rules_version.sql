@@ -0,0 +1,12 @@
+-- Migration: Versioned scoring rules per church
+-- Version: 010
+-- Date: 2026-10-17
+
+-- Versión de reglas de scoring fijada por la iglesia (SCORING_RULES en
+-- app/domain/services/scoring_rules.py). NULL = la versión actual por defecto.
+ALTER TABLE churches ADD COLUMN IF NOT EXISTS scoring_rules_version INTEGER;
+
+-- rescore_due: un UPDATE por versión en uso; sólo se consultan las iglesias fijadas
+CREATE INDEX IF NOT EXISTS ix_churches_scoring_rules_version
+    ON churches (scoring_rules_version)
+    WHERE scoring_rules_version IS NOT NULL;
@@ -0,0 +1,13 @@
+-- Migration: Member celebration indexes (GET /members/upcoming-celebrations)
+-- Version: 011
+-- Date: 2026-10-17
+
+-- Cumpleaños y aniversarios próximos de una iglesia:
+-- WHERE church_id = ? AND (mes-día BETWEEN ? AND ? [OR BETWEEN ? AND ?])
+-- Mes-día como entero (315 = 15 de marzo); la expresión debe coincidir
+-- textualmente con month_day() de app/infrastructure/database/models/member.py
+CREATE INDEX IF NOT EXISTS ix_members_church_birth_month_day
+    ON members (church_id, CAST(date_part('month', birth_date) * 100 + date_part('day', birth_date) AS INTEGER));
+
+CREATE INDEX IF NOT EXISTS ix_members_church_membership_month_day
+    ON members (church_id, CAST(date_part('month', membership_date) * 100 + date_part('day', membership_date) AS INTEGER));
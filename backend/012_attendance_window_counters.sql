@@ -0,0 +1,41 @@
+-- Migration: Rolling attendance window counters (O(1) attendance_rate per check-in)
+-- Version: 012
+-- Date: 2026-10-17
+
+-- Registros y asistencias de los últimos 90 días por miembro. Cada registro
+-- suma al insertarse; jobs/attendance_window resta una vez por día los que
+-- salen de la ventana (inicio = scheduler_state.last_run_date - 90)
+ALTER TABLE members
+    ADD COLUMN IF NOT EXISTS attendance_window_total INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS attendance_window_attended INTEGER NOT NULL DEFAULT 0;
+
+-- La ventana arranca hoy
+INSERT INTO scheduler_state (name, last_run_date)
+VALUES ('attendance_window', CURRENT_DATE)
+ON CONFLICT (name) DO UPDATE SET last_run_date = EXCLUDED.last_run_date, updated_at = NOW();
+
+-- Contadores desde un recuento completo; la tasa sale de ellos (misma
+-- fórmula que attendance_rate() de member_repository)
+WITH recount AS (
+    SELECT member_id,
+           COUNT(*) AS total,
+           COUNT(*) FILTER (WHERE attended) AS attended
+    FROM attendance_records
+    WHERE event_date >= CURRENT_DATE - 90
+    GROUP BY member_id
+)
+UPDATE members m
+SET attendance_window_total = COALESCE(r.total, 0),
+    attendance_window_attended = COALESCE(r.attended, 0),
+    attendance_rate = CASE WHEN COALESCE(r.total, 0) > 0
+                           THEN r.attended::float8 / r.total * 100
+                           ELSE 0.0 END
+FROM members m2
+LEFT JOIN recount r ON r.member_id = m2.id
+WHERE m.id = m2.id;
+
+-- attendance_rate cambió fuera del ORM: el snapshot de estadísticas se
+-- corrige en la próxima reconciliación (STATS_RECONCILE_INTERVAL_SECONDS)
+
+COMMENT ON COLUMN members.attendance_window_total IS 'Registros de asistencia en la ventana de 90 días (jobs/attendance_window)';
+COMMENT ON COLUMN members.attendance_window_attended IS 'Asistencias en la ventana de 90 días';
@@ -0,0 +1,34 @@
+-- Migration: Weekly attendance rollups per church and event type
+-- Version: 013
+-- Date: 2026-10-17
+
+-- Registros y asistencias por (iglesia, tipo de evento, semana). week_start
+-- es el lunes de la semana (date_trunc('week')). Los registros de asistencia
+-- suman a su fila en la misma transacción; GET /attendance/weekly lee sólo de
+-- aquí. Reconstrucción: python -m app.infrastructure.jobs.attendance_rollups
+CREATE TABLE IF NOT EXISTS attendance_weekly_rollups (
+    church_id UUID NOT NULL REFERENCES churches(id) ON DELETE CASCADE,
+    event_type VARCHAR(50) NOT NULL,
+    week_start DATE NOT NULL,
+    records INTEGER NOT NULL DEFAULT 0,
+    attended INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (church_id, event_type, week_start)
+);
+
+-- Carga inicial desde el historial
+INSERT INTO attendance_weekly_rollups (church_id, event_type, week_start, records, attended, updated_at)
+SELECT church_id,
+       event_type,
+       CAST(date_trunc('week', event_date) AS DATE),
+       COUNT(*),
+       COUNT(*) FILTER (WHERE attended),
+       NOW()
+FROM attendance_records
+GROUP BY church_id, event_type, CAST(date_trunc('week', event_date) AS DATE)
+ON CONFLICT (church_id, event_type, week_start) DO UPDATE
+SET records = EXCLUDED.records,
+    attended = EXCLUDED.attended,
+    updated_at = EXCLUDED.updated_at;
+
+COMMENT ON TABLE attendance_weekly_rollups IS 'Asistencia agregada por iglesia, tipo de evento y semana (lunes)';
@@ -0,0 +1,82 @@
+-- Migration: Monthly partitions of attendance_records + Parquet archive registry
+-- Version: 014
+-- Date: 2026-10-17
+
+-- Reescribe attendance_records como tabla particionada por mes sobre
+-- event_date (attendance_records_YYYY_MM) con una partición DEFAULT para
+-- fechas sin partición. Copia todas las filas: correr en una ventana de
+-- mantenimiento. Después, jobs/attendance_partitions crea los meses futuros.
+BEGIN;
+
+ALTER TABLE attendance_records RENAME TO attendance_records_unpartitioned;
+ALTER TABLE attendance_records_unpartitioned RENAME CONSTRAINT attendance_records_pkey TO attendance_records_unpartitioned_pkey;
+ALTER INDEX IF EXISTS ix_attendance_member_date RENAME TO ix_attendance_member_date_unpartitioned;
+ALTER INDEX IF EXISTS ix_attendance_church_date RENAME TO ix_attendance_church_date_unpartitioned;
+
+-- La clave primaria debe incluir la clave de partición
+CREATE TABLE attendance_records (
+    id UUID NOT NULL,
+    member_id UUID NOT NULL REFERENCES members(id),
+    church_id UUID NOT NULL REFERENCES churches(id),
+    event_type VARCHAR(50) NOT NULL,
+    event_name VARCHAR(200),
+    event_date DATE NOT NULL,
+    attended BOOLEAN,
+    arrival_time TIMESTAMP,
+    notes TEXT,
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (id, event_date)
+) PARTITION BY RANGE (event_date);
+
+CREATE INDEX ix_attendance_member_date
+    ON attendance_records (member_id, event_date, id);
+
+CREATE INDEX ix_attendance_church_date
+    ON attendance_records (church_id, event_date)
+    INCLUDE (member_id, id, attended);
+
+CREATE TABLE attendance_records_default PARTITION OF attendance_records DEFAULT;
+
+-- Un mes por partición, del primer mes con registros hasta tres meses después del actual
+DO $$
+DECLARE
+    month DATE;
+    last_month DATE;
+BEGIN
+    SELECT CAST(date_trunc('month', COALESCE(MIN(event_date), CURRENT_DATE)) AS DATE),
+           CAST(date_trunc('month', GREATEST(COALESCE(MAX(event_date), CURRENT_DATE), CURRENT_DATE)) + INTERVAL '3 months' AS DATE)
+    INTO month, last_month
+    FROM attendance_records_unpartitioned;
+
+    WHILE month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF attendance_records FOR VALUES FROM (%L) TO (%L)',
+            'attendance_records_' || to_char(month, 'YYYY_MM'),
+            month,
+            CAST(month + INTERVAL '1 month' AS DATE)
+        );
+        month := CAST(month + INTERVAL '1 month' AS DATE);
+    END LOOP;
+END $$;
+
+INSERT INTO attendance_records (
+    id, member_id, church_id, event_type, event_name, event_date, attended, arrival_time, notes, created_at
+)
+SELECT id, member_id, church_id, event_type, event_name, event_date, attended, arrival_time, notes, created_at
+FROM attendance_records_unpartitioned;
+
+DROP TABLE attendance_records_unpartitioned;
+
+-- Meses exportados a Parquet y separados de la tabla
+CREATE TABLE IF NOT EXISTS attendance_archives (
+    month DATE PRIMARY KEY,
+    path VARCHAR(500) NOT NULL,
+    records INTEGER NOT NULL,
+    archived_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+COMMIT;
+
+ANALYZE attendance_records;
+
+COMMENT ON TABLE attendance_archives IS 'Meses de attendance_records archivados en Parquet (jobs/attendance_partitions)';
@@ -0,0 +1,73 @@
+-- Migration: events table, attendance_records.event_id and folding of existing records
+-- Version: 015
+-- Date: 2026-10-17
+
+-- Cada registro de asistencia pasa a apuntar a un evento (una ocurrencia:
+-- iglesia, tipo, nombre, inicio). Los registros existentes se agrupan en un
+-- evento por iglesia, tipo, nombre (sin nombre: el tipo) y día, que empieza
+-- a las 00:00 y trae sus totales ya contados. Los meses ya archivados en
+-- Parquet no se agrupan (sus agregados semanales se conservan). El UPDATE
+-- reescribe todas las filas de attendance_records: correr en una ventana
+-- de mantenimiento.
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS events (
+    id UUID PRIMARY KEY,
+    church_id UUID NOT NULL REFERENCES churches(id) ON DELETE CASCADE,
+    event_type VARCHAR(50) NOT NULL,
+    name VARCHAR(200) NOT NULL,
+    starts_at TIMESTAMP NOT NULL,
+    recurrence VARCHAR(20),
+    records INTEGER NOT NULL DEFAULT 0,
+    headcount INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_events_church_type_name_start UNIQUE (church_id, event_type, name, starts_at)
+);
+
+CREATE INDEX IF NOT EXISTS ix_events_church_starts ON events (church_id, starts_at);
+
+ALTER TABLE attendance_records ADD COLUMN IF NOT EXISTS event_id UUID REFERENCES events(id);
+
+INSERT INTO events (id, church_id, event_type, name, starts_at, records, headcount, created_at, updated_at)
+SELECT gen_random_uuid(), church_id, event_type, COALESCE(event_name, event_type), CAST(event_date AS TIMESTAMP),
+       COUNT(*), COUNT(*) FILTER (WHERE attended), MIN(created_at), NOW()
+FROM attendance_records
+WHERE event_id IS NULL
+GROUP BY church_id, event_type, COALESCE(event_name, event_type), event_date
+ON CONFLICT (church_id, event_type, name, starts_at) DO NOTHING;
+
+UPDATE attendance_records r
+SET event_id = e.id
+FROM events e
+WHERE r.event_id IS NULL
+  AND e.church_id = r.church_id
+  AND e.event_type = r.event_type
+  AND e.name = COALESCE(r.event_name, r.event_type)
+  AND e.starts_at = CAST(r.event_date AS TIMESTAMP);
+
+-- Series semanales: mismo día de la semana y presentes en más de la mitad de las semanas que abarcan
+UPDATE events e
+SET recurrence = 'weekly'
+FROM (
+    SELECT church_id, event_type, name
+    FROM events
+    GROUP BY church_id, event_type, name
+    HAVING COUNT(*) > 1
+       AND COUNT(DISTINCT EXTRACT(ISODOW FROM starts_at)) = 1
+       AND COUNT(*) * 14 > CAST(MAX(starts_at) AS DATE) - CAST(MIN(starts_at) AS DATE)
+) series
+WHERE e.recurrence IS NULL
+  AND e.church_id = series.church_id
+  AND e.event_type = series.event_type
+  AND e.name = series.name;
+
+CREATE INDEX IF NOT EXISTS ix_attendance_event
+    ON attendance_records (event_id, member_id);
+
+COMMIT;
+
+ANALYZE events;
+ANALYZE attendance_records;
+
+COMMENT ON TABLE events IS 'Eventos de la iglesia; records/headcount se mantienen con cada registro de asistencia';
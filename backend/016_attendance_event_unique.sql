@@ -0,0 +1,46 @@
+-- Migration: One attendance record per member and event (unique index backing ON CONFLICT)
+-- Version: 016
+-- Date: 2026-10-17
+
+-- Los registros de asistencia (individual y masivo) insertan con
+-- ON CONFLICT DO NOTHING sobre (event_id, member_id, event_date): dos
+-- registros simultáneos del mismo miembro en el mismo evento dejan una sola
+-- fila y sólo la insertada suma a contadores, agregados y totales del
+-- evento. event_date va en el índice porque PostgreSQL lo exige en una tabla
+-- particionada (y con él, una sola partición). Reemplaza a
+-- ix_attendance_event, que era su prefijo.
+BEGIN;
+
+-- Duplicados anteriores: queda el primer registro de cada miembro y evento,
+-- y los totales de sus eventos se descuentan
+WITH removed AS (
+    DELETE FROM attendance_records a
+    USING attendance_records b
+    WHERE a.event_id = b.event_id
+      AND a.member_id = b.member_id
+      AND a.event_date = b.event_date
+      AND (a.created_at, a.id) > (b.created_at, b.id)
+    RETURNING a.event_id, a.attended
+), per_event AS (
+    SELECT event_id, COUNT(*) AS records, COUNT(*) FILTER (WHERE attended) AS attended
+    FROM removed
+    GROUP BY event_id
+)
+UPDATE events e
+SET records = e.records - p.records,
+    headcount = e.headcount - p.attended,
+    updated_at = NOW()
+FROM per_event p
+WHERE e.id = p.event_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_attendance_event_member
+    ON attendance_records (event_id, member_id, event_date);
+
+DROP INDEX IF EXISTS ix_attendance_event;
+
+COMMIT;
+
+-- Si se borraron duplicados, los contadores de los miembros y los agregados
+-- semanales quedan corridos: corregirlos con
+--     python -m app.infrastructure.jobs.attendance_window check --repair
+--     python -m app.infrastructure.jobs.attendance_rollups
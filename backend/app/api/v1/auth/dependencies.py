@@ -4,10 +4,12 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Optional
+from uuid import UUID
 
 from app.infrastructure.database.connection import get_db
 from app.infrastructure.database.models.user import UserModel, UserStatus
 from app.core.security import verify_token
+from app.infrastructure.repositories.member_repository import MemberRepository
 
 security = HTTPBearer()
 
@@ -83,6 +85,32 @@ async def get_current_admin(
         )
     return current_user
 
+async def get_accessible_member_id(
+    member_id: UUID,
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> UUID:
+    """
+    Verificar que el miembro existe y pertenece a la iglesia del usuario
+    
+    Sólo consulta (id, church_id); cada endpoint carga después lo que necesite.
+    """
+    church_id = await MemberRepository(db).get_church_id(member_id)
+    
+    if church_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Miembro no encontrado"
+        )
+    
+    if str(church_id) != str(current_user.church_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permiso para acceder a este miembro"
+        )
+    
+    return member_id
+
 async def get_optional_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: AsyncSession = Depends(get_db)
@@ -0,0 +1,209 @@
+# app/api/v1/endpoints/attendance.py
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from datetime import date, timedelta
+
+from app.infrastructure.database.connection import get_db
+from app.infrastructure.repositories.member_repository import MemberRepository, attendance_rate
+from app.infrastructure.repositories.attendance_rollup_repository import AttendanceRollupRepository, week_start
+from app.infrastructure.repositories.event_repository import EventRepository
+from app.domain.schemas.member import (
+    AttendanceBulkCreate, AttendanceBulkResult, AttendanceCounterCheck, AttendanceCounterDrift,
+    AttendanceWeek, AttendanceWeeklySeries
+)
+from app.api.v1.auth.dependencies import get_current_user, get_current_admin
+from app.infrastructure.database.models.user import UserModel
+
+router = APIRouter(prefix="/attendance", tags=["attendance"])
+
+
+@router.post("/bulk", response_model=AttendanceBulkResult, status_code=status.HTTP_201_CREATED)
+async def record_attendance_bulk(
+    bulk_data: AttendanceBulkCreate,
+    current_user: UserModel = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Registrar la asistencia de un evento para muchos miembros a la vez
+
+    - event_id: evento existente; o event_type/event_date (y event_name)
+      para usar o crear el evento de ese día
+    - member_ids: miembros presentes
+    - entries: {member_id, attended} para registrar también ausencias
+
+    Un INSERT de todas las filas, last_attendance/attendance_rate, scores y
+    totales del evento actualizados con UPDATEs set-based y la diferencia de
+    esos miembros sumada al snapshot de estadísticas, todo en una
+    transacción. Los miembros que ya tienen registro del evento no se
+    duplican.
+    """
+    if not current_user.church_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El usuario no pertenece a ninguna iglesia"
+        )
+
+    statuses = dict.fromkeys(bulk_data.member_ids, True)
+    statuses.update((entry.member_id, entry.attended) for entry in bulk_data.entries)
+    if not statuses:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No hay miembros para registrar"
+        )
+
+    events = EventRepository(session)
+    if bulk_data.event_id:
+        event = await events.get_by_id(bulk_data.event_id, current_user.church_id)
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Evento no encontrado"
+            )
+        bulk_data.event_type, bulk_data.event_name = event.event_type, event.name
+        bulk_data.event_date = event.starts_at.date()
+    else:
+        bulk_data.event_id = await events.get_or_create_id(
+            current_user.church_id, bulk_data.event_type, bulk_data.event_date, bulk_data.event_name
+        )
+
+    repo = MemberRepository(session)
+    member_ids = list(statuses)
+    # Los UPDATE no pasan por el ORM: se bloquean los miembros y se aplica
+    # sólo su diferencia. La ventana se bloquea antes, en el mismo orden que
+    # su avance diario
+    await repo.get_attendance_window_start(current_user.church_id, lock=True)
+    stats_before = await repo.get_stats_values(current_user.church_id, member_ids, lock=True)
+    recorded, rescored = await repo.record_attendance_bulk(
+        current_user.church_id,
+        bulk_data.event_type,
+        bulk_data.event_date,
+        statuses,
+        event_name=bulk_data.event_name,
+        event_id=bulk_data.event_id
+    )
+
+    recorded_ids = {row.member_id for row in recorded}
+    skipped = [member_id for member_id in statuses if member_id not in recorded_ids]
+    existing = await repo.existing_member_ids(current_user.church_id, skipped)
+
+    if recorded:
+        await repo.apply_stats_changes(
+            stats_before, await repo.get_stats_values(current_user.church_id, member_ids)
+        )
+    await session.commit()
+
+    return AttendanceBulkResult(
+        event_id=bulk_data.event_id,
+        event_type=bulk_data.event_type,
+        event_date=bulk_data.event_date,
+        recorded=len(recorded),
+        attended=sum(row.attended for row in recorded),
+        rescored=rescored,
+        already_recorded=[member_id for member_id in skipped if member_id in existing],
+        not_found=[member_id for member_id in skipped if member_id not in existing]
+    )
+
+
+def _counter_check(window_start: date, drift: list, repaired: int = 0) -> AttendanceCounterCheck:
+    return AttendanceCounterCheck(
+        window_start=window_start,
+        drift=[
+            AttendanceCounterDrift(
+                member_id=row.id,
+                window_total=row.attendance_window_total,
+                window_attended=row.attendance_window_attended,
+                expected_total=row.expected_total,
+                expected_attended=row.expected_attended,
+                attendance_rate=row.attendance_rate
+            )
+            for row in drift
+        ],
+        repaired=repaired
+    )
+
+
+@router.get("/counters/check", response_model=AttendanceCounterCheck)
+async def check_attendance_counters(
+    current_user: UserModel = Depends(get_current_admin),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Comparar los contadores de asistencia de la iglesia con un recuento completo
+
+    Lista los miembros cuyos attendance_window_* o attendance_rate no
+    coinciden con los registros de la ventana vigente. No modifica nada:
+    para corregirlos, POST /attendance/counters/repair.
+    """
+    repo = MemberRepository(session)
+    window_start = await repo.get_attendance_window_start(current_user.church_id)
+    drift = await repo.check_attendance_counters(current_user.church_id, window_start)
+    return _counter_check(window_start, drift)
+
+
+@router.post("/counters/repair", response_model=AttendanceCounterCheck)
+async def repair_attendance_counters(
+    current_user: UserModel = Depends(get_current_admin),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Corregir los contadores de asistencia que no coinciden con un recuento completo
+
+    Con la ventana de la iglesia bloqueada (el avance diario no corre en el
+    medio), recuenta los miembros con diferencias, recalcula su score y
+    reconcilia el snapshot de estadísticas en la misma transacción. drift
+    lista lo que se encontró antes de corregir.
+    """
+    repo = MemberRepository(session)
+    window_start = await repo.get_attendance_window_start(current_user.church_id, lock=True)
+    drift = await repo.check_attendance_counters(current_user.church_id, window_start)
+
+    repaired = 0
+    if drift:
+        repaired = await repo.repair_attendance_counters(current_user.church_id, drift, window_start)
+        await repo.reconcile_stats_snapshot(current_user.church_id)
+    else:
+        await session.rollback()
+
+    return _counter_check(window_start, drift, repaired)
+
+
+@router.get("/weekly", response_model=AttendanceWeeklySeries)
+async def get_weekly_attendance(
+    event_type: Optional[str] = Query(None, description="Tipo de evento (culto, reunion_jovenes...); vacío = todos"),
+    weeks: int = Query(52, ge=1, le=260, description="Semanas hasta la actual inclusive"),
+    current_user: UserModel = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Serie semanal de asistencia de la iglesia (lunes a domingo)
+
+    Se lee sólo de los agregados semanales (attendance_weekly_rollups), sin
+    recorrer attendance_records; las semanas sin registros van en 0.
+    """
+    if not current_user.church_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El usuario no pertenece a ninguna iglesia"
+        )
+
+    current_week = week_start(date.today())
+    first_week = current_week - timedelta(weeks=weeks - 1)
+    rows = await AttendanceRollupRepository(session).get_weekly(
+        current_user.church_id, first_week, current_week, event_type
+    )
+    by_week = {row.week_start: row for row in rows}
+
+    series = []
+    for i in range(weeks):
+        week = first_week + timedelta(weeks=i)
+        row = by_week.get(week)
+        records, attended = (row.records, row.attended) if row else (0, 0)
+        series.append(AttendanceWeek(
+            week_start=week,
+            records=records,
+            attended=attended,
+            attendance_rate=round(attendance_rate(records, attended), 2)
+        ))
+
+    return AttendanceWeeklySeries(event_type=event_type, weeks=series)
@@ -0,0 +1,126 @@
+# app/api/v1/endpoints/events.py
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import UUID
+from datetime import date
+
+from app.infrastructure.database.connection import get_db
+from app.infrastructure.database.models.event import EventModel
+from app.infrastructure.repositories.event_repository import EventRepository
+from app.domain.schemas.event import EventCreate, EventResponse, EventAttendee
+from app.api.v1.auth.dependencies import get_current_user
+from app.infrastructure.database.models.user import UserModel
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+def _church_id(current_user: UserModel) -> UUID:
+    if not current_user.church_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El usuario no pertenece a ninguna iglesia"
+        )
+    return current_user.church_id
+
+
+async def _get_event(event_id: UUID, church_id: UUID, session: AsyncSession) -> EventModel:
+    event = await EventRepository(session).get_by_id(event_id, church_id)
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Evento no encontrado"
+        )
+    return event
+
+
+@router.post("", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
+async def create_event(
+    event_data: EventCreate,
+    current_user: UserModel = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db)
+):
+    """Crear un evento de la iglesia (la asistencia se registra con su event_id)"""
+    church_id = _church_id(current_user)
+    try:
+        event = await EventRepository(session).create(
+            church_id,
+            event_data.event_type,
+            event_data.name,
+            event_data.starts_at,
+            recurrence=event_data.recurrence.value if event_data.recurrence else None
+        )
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Ya existe un evento con ese tipo, nombre y hora de inicio"
+        )
+
+    return event
+
+
+@router.get("", response_model=List[EventResponse])
+async def list_events(
+    date_from: Optional[date] = Query(None, alias="from", description="Desde (inclusive)"),
+    date_to: Optional[date] = Query(None, alias="to", description="Hasta (inclusive)"),
+    event_type: Optional[str] = Query(None, description="Filtrar por tipo de evento"),
+    q: Optional[str] = Query(None, min_length=2, description="Parte del nombre"),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: UserModel = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Eventos de la iglesia con sus totales, del más reciente al más antiguo
+
+    records y headcount se mantienen en cada registro de asistencia: no se
+    cuentan filas de attendance_records.
+    """
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' no puede ser posterior a 'to'"
+        )
+
+    return await EventRepository(session).get_events(
+        _church_id(current_user), date_from, date_to, event_type, q, limit
+    )
+
+
+@router.get("/{event_id}", response_model=EventResponse)
+async def get_event(
+    event_id: UUID,
+    current_user: UserModel = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db)
+):
+    """Obtener un evento con sus totales de asistencia"""
+    return await _get_event(event_id, _church_id(current_user), session)
+
+
+@router.get("/{event_id}/attendance", response_model=List[EventAttendee])
+async def get_event_attendance(
+    event_id: UUID,
+    attended_only: bool = Query(True, description="Sólo presentes (false incluye ausencias registradas)"),
+    current_user: UserModel = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Quiénes asistieron al evento, por apellido y nombre
+
+    Los eventos de meses archivados conservan records/headcount pero no la
+    lista de asistentes.
+    """
+    event = await _get_event(event_id, _church_id(current_user), session)
+    rows = await EventRepository(session).get_attendees(event, attended_only=attended_only)
+    return [
+        EventAttendee(
+            member_id=row.member_id,
+            first_name=row.first_name,
+            last_name=row.last_name,
+            attended=bool(row.attended),
+            arrival_time=row.arrival_time
+        )
+        for row in rows
+    ]
@@ -0,0 +1,34 @@
+# app/api/v1/endpoints/jobs.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+
+from app.infrastructure.database.connection import get_db
+from app.infrastructure.repositories.background_job_repository import BackgroundJobRepository
+from app.domain.schemas.background_job import BackgroundJobResponse
+from app.api.v1.auth.dependencies import get_current_user
+from app.infrastructure.database.models.user import UserModel
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}", response_model=BackgroundJobResponse)
+async def get_job(
+    job_id: UUID,
+    current_user: UserModel = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Progreso de un trabajo en segundo plano
+
+    processed/total, miembros por segundo, tiempo restante estimado y los
+    últimos errores. Sólo se ven los trabajos de la iglesia del usuario.
+    """
+    job = await BackgroundJobRepository(session).get_by_id(job_id)
+    if job is None or job.church_id != current_user.church_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Trabajo no encontrado"
+        )
+
+    return BackgroundJobResponse.from_job(job)
@@ -5,16 +5,14 @@ from uuid import UUID
 from typing import List, Dict, Any
 
 from app.infrastructure.database.connection import get_db
-from app.api.v1.auth.dependencies import get_current_user
-from app.infrastructure.database.models.user import UserModel
+from app.api.v1.auth.dependencies import get_accessible_member_id
 
 # SIN PREFIX - se agregará desde __init__.py
 router = APIRouter(tags=["members"])
 
 @router.get("/members/{member_id}/history", response_model=List[Dict[str, Any]])
 async def get_member_history(
-    member_id: UUID,
-    current_user: UserModel = Depends(get_current_user),
+    member_id: UUID = Depends(get_accessible_member_id),
     session: AsyncSession = Depends(get_db)
 ):
     """
@@ -1,27 +1,45 @@
 # app/api/v1/endpoints/members.py
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from uuid import UUID
+from datetime import date, timedelta
 
 from app.infrastructure.database.connection import get_db
 from app.infrastructure.repositories.member_repository import MemberRepository
+from app.infrastructure.repositories.event_repository import EventRepository
+from app.core.pagination import InvalidCursorError
 from app.domain.schemas.member import (
     MemberCreate,
     MemberUpdate,
     MemberResponse,
     MemberListItem,
+    MemberBatchGetRequest,
+    MemberBulkUpdate,
+    MemberBatchResult,
     MemberStats,
     ChurchMemberStats,
     MemberAIRecommendation,
+    MemberAttendanceTrend,
+    UpcomingCelebration,
     PastoralNoteCreate,
     PastoralNoteResponse,
     AttendanceRecordCreate,
     AttendanceRecordResponse
 )
+from app.domain.schemas.background_job import BackgroundJobResponse
 from app.domain.services.member_ai_service import MemberAIService
-from app.api.v1.auth.dependencies import get_current_user
+from app.domain.services.member_scoring import MemberScoringColumns
+from app.domain.services.member_insights import cached_insights, compute_insights
+from app.domain.services.celebrations import next_occurrence
+from app.api.v1.auth.dependencies import get_current_user, get_accessible_member_id
 from app.infrastructure.database.models.user import UserModel
+from app.infrastructure.cache import ResponseCache, get_response_cache
+from app.infrastructure.repositories.background_job_repository import BackgroundJobRepository
+from app.infrastructure.jobs.member_recalculation import JOB_TYPE as RECALCULATION_JOB, start_recalculation
+from app.infrastructure.external.openai_service import get_openai_service
+from app.config.settings import settings
 
 router = APIRouter(prefix="/members", tags=["members"])
 
@@ -62,9 +80,10 @@ async def create_member(
     # Crear miembro
     member = await repo.create(member_data, created_by=current_user.id)
     
-    # Calcular scores iniciales
-    member.commitment_score = MemberAIService.calculate_commitment_score(member)
-    risk_analysis = MemberAIService.detect_abandonment_risk(member)
+    # Calcular scores iniciales (reglas de la versión fijada por la iglesia)
+    rules = await repo.get_scoring_rules(member.church_id)
+    member.commitment_score = MemberAIService.calculate_commitment_score(member, rules=rules)
+    risk_analysis = MemberAIService.detect_abandonment_risk(member, rules)
     member.risk_level = risk_analysis["level"]
     
     await session.commit()
@@ -75,10 +94,12 @@ async def create_member(
 
 @router.get("/", response_model=List[MemberListItem])
 async def get_members(
+    response: Response,
     member_type: Optional[str] = Query(None, description="Filtrar por tipo: activo, visitante, inactivo"),
     member_status: str = Query("active", description="Estado: active, inactive"),
     risk_level: Optional[str] = Query(None, description="Nivel de riesgo: bajo, medio, alto, critico"),
     search: Optional[str] = Query(None, description="Buscar por nombre, email o teléfono"),
+    after: Optional[str] = Query(None, description="Cursor opaco devuelto en X-Next-Cursor"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     current_user: UserModel = Depends(get_current_user),
@@ -92,6 +113,11 @@ async def get_members(
     - member_status: active, inactive
     - risk_level: bajo, medio, alto, critico
     - search: busca en nombre, email, teléfono
+    
+    Paginación:
+    - after: cursor de la página siguiente (header X-Next-Cursor de la respuesta
+      anterior). Sin skip, la primera página también devuelve X-Next-Cursor.
+    - skip: paginación por offset (obsoleta, costosa en páginas profundas)
     """
     if not current_user.church_id:
         raise HTTPException(
@@ -99,12 +125,36 @@ async def get_members(
             detail="El usuario no pertenece a ninguna iglesia"
         )
     
+    if after and skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No se puede combinar 'after' con 'skip'"
+        )
+    
     repo = MemberRepository(session)
     
     if search:
-        members = await repo.search_members(current_user.church_id, search, limit=limit)
+        members = await repo.search_list_items(current_user.church_id, search, limit=limit)
+    elif not skip:
+        try:
+            members, next_cursor = await repo.get_page_by_church(
+                church_id=current_user.church_id,
+                member_type=member_type,
+                member_status=member_status,
+                risk_level=risk_level,
+                after=after,
+                limit=limit
+            )
+        except InvalidCursorError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor de paginación inválido"
+            )
+        
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
     else:
-        members = await repo.get_all_by_church(
+        members = await repo.list_by_church(
             church_id=current_user.church_id,
             member_type=member_type,
             member_status=member_status,
@@ -119,17 +169,25 @@ async def get_members(
 @router.get("/stats", response_model=ChurchMemberStats)
 async def get_church_member_stats(
     current_user: UserModel = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db)
+    cache: ResponseCache = Depends(get_response_cache)
 ):
-    """Obtener estadísticas generales de miembros de la iglesia"""
+    """
+    Obtener estadísticas generales de miembros de la iglesia
+    
+    Se leen del snapshot incremental (cacheado por iglesia);
+    snapshot_updated_at y snapshot_reconciled_at indican su frescura.
+    """
     if not current_user.church_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="El usuario no pertenece a ninguna iglesia"
         )
     
-    repo = MemberRepository(session)
-    stats = await repo.get_church_stats(current_user.church_id)
+    stats = await cache.get_or_load(
+        current_user.church_id,
+        "stats",
+        lambda session: MemberRepository(session).get_stats_snapshot(current_user.church_id)
+    )
     
     return stats
 
@@ -137,76 +195,318 @@ async def get_church_member_stats(
 @router.get("/at-risk", response_model=List[MemberListItem])
 async def get_members_at_risk(
     current_user: UserModel = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db)
+    cache: ResponseCache = Depends(get_response_cache)
 ):
-    """Obtener miembros con alto riesgo de abandono"""
+    """Obtener miembros con alto riesgo de abandono (cacheado por iglesia)"""
     if not current_user.church_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="El usuario no pertenece a ninguna iglesia"
         )
     
-    repo = MemberRepository(session)
-    members = await repo.get_members_at_risk(current_user.church_id)
+    members = await cache.get_or_load(
+        current_user.church_id,
+        "at-risk",
+        lambda session: MemberRepository(session).list_at_risk(current_user.church_id)
+    )
     
     return members
 
 
-@router.get("/{member_id}", response_model=MemberResponse)
-async def get_member(
-    member_id: UUID,
+@router.get("/trends", response_model=List[MemberAttendanceTrend])
+async def get_attendance_trends(
+    weeks: int = Query(26, ge=12, le=104, description="Semanas de historial analizadas"),
+    limit: int = Query(50, ge=1, le=500),
     current_user: UserModel = Depends(get_current_user),
     session: AsyncSession = Depends(get_db)
 ):
-    """Obtener información completa de un miembro"""
-    repo = MemberRepository(session)
-    member = await repo.get_by_id(member_id)
+    """
+    Tendencia de asistencia de toda la iglesia, mayor caída primero
     
-    if not member:
+    Primera vs segunda mitad del período (como analyze_member_trend), tasas
+    de las últimas 4/8/12 semanas y rachas, calculadas con funciones de
+    ventana en una sola consulta. Sólo miembros activos con 4+ registros.
+    """
+    if not current_user.church_id:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Miembro no encontrado"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El usuario no pertenece a ninguna iglesia"
         )
     
-    # Verificar que pertenece a la iglesia del usuario
-    if str(member.church_id) != str(current_user.church_id):
+    today = date.today()
+    rows = await MemberRepository(session).get_attendance_trends(
+        current_user.church_id, today - timedelta(weeks=weeks), today, limit=limit
+    )
+    return [_attendance_trend(row) for row in rows]
+
+
+@router.get("/upcoming-celebrations", response_model=List[UpcomingCelebration])
+async def get_upcoming_celebrations(
+    days: int = Query(7, ge=0, le=90, description="Días hacia adelante (hoy incluido)"),
+    current_user: UserModel = Depends(get_current_user),
+    cache: ResponseCache = Depends(get_response_cache)
+):
+    """
+    Cumpleaños y aniversarios de membresía de hoy a dentro de `days` días
+    
+    Rangos de mes-día indexados (también cuando la ventana cruza el fin de
+    año), sin recorrer los miembros de la iglesia. Los aniversarios cuentan
+    desde el primer año. Cacheado por iglesia y día.
+    """
+    if not current_user.church_id:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para ver este miembro"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El usuario no pertenece a ninguna iglesia"
         )
     
-    return member
+    today = date.today()
+    
+    async def load(session: AsyncSession):
+        rows = await MemberRepository(session).get_upcoming_celebrations(current_user.church_id, today, days)
+        return _celebrations(rows, today, days)
+    
+    return await cache.get_or_load(current_user.church_id, "celebrations", load, item=f"{today}:{days}")
+
+
+def _celebrations(rows, today: date, days: int) -> List[UpcomingCelebration]:
+    """Filas de get_upcoming_celebrations con su fecha y años, la más próxima primero"""
+    celebrations = []
+    for row in rows:
+        occurrence = next_occurrence(row.original_date, today)
+        years = occurrence.year - row.original_date.year
+        if (occurrence - today).days > days or (row.kind == "membership_anniversary" and years < 1):
+            continue
+        celebrations.append(UpcomingCelebration(
+            member_id=row.id,
+            first_name=row.first_name,
+            last_name=row.last_name,
+            kind=row.kind,
+            celebration_date=occurrence,
+            days_until=(occurrence - today).days,
+            years=years,
+            preferred_contact_method=row.preferred_contact_method
+        ))
+    celebrations.sort(key=lambda c: (c.days_until, c.kind, c.last_name, c.first_name))
+    return celebrations
+
+
+def _attendance_trend(row) -> MemberAttendanceTrend:
+    """Fila de attendance_trend_query + clasificación de MemberAIService.classify_trend"""
+    data = dict(row._mapping)
+    if data["records"] < 4:
+        data.update(
+            trend="insufficient_data",
+            attendance_trend="unknown",
+            prediction="Datos insuficientes para análisis de tendencia"
+        )
+    else:
+        data["trend"], data["attendance_trend"], data["prediction"] = MemberAIService.classify_trend(data["change"])
+        for key in ("first_half_rate", "second_half_rate", "change"):
+            data[key] = round(data[key], 1)
+    data["current_streak"] = data["current_streak"] or 0
+    data["longest_attended_streak"] = data["longest_attended_streak"] or 0
+    return MemberAttendanceTrend(**data)
 
 
-@router.put("/{member_id}", response_model=MemberResponse)
-async def update_member(
-    member_id: UUID,
-    member_data: MemberUpdate,
+@router.post("/batch-get", response_model=List[MemberBatchResult])
+async def batch_get_members(
+    batch_data: MemberBatchGetRequest,
     current_user: UserModel = Depends(get_current_user),
     session: AsyncSession = Depends(get_db)
 ):
-    """Actualizar información de un miembro"""
+    """
+    Obtener varios miembros en una sola consulta
+    
+    Retorna un resultado por ID, en el orden pedido: found con el miembro,
+    o not_found si no existe o no pertenece a la iglesia del usuario.
+    """
+    if not current_user.church_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El usuario no pertenece a ninguna iglesia"
+        )
+    
     repo = MemberRepository(session)
-    member = await repo.get_by_id(member_id)
+    found = {
+        member.id: member
+        for member in await repo.list_by_ids(current_user.church_id, batch_data.ids)
+    }
     
-    if not member:
+    return [
+        MemberBatchResult(id=member_id, status="found", member=found[member_id])
+        if member_id in found
+        else MemberBatchResult(id=member_id, status="not_found")
+        for member_id in batch_data.ids
+    ]
+
+
+@router.patch("/bulk", response_model=List[MemberBatchResult])
+async def bulk_update_members(
+    bulk_data: MemberBulkUpdate,
+    current_user: UserModel = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Aplicar los mismos cambios a varios miembros en una transacción
+    
+    - member_type: nuevo tipo
+    - ministries / tags: reemplazan la lista completa
+    - add_* / remove_*: agregan o quitan valores sin tocar el resto
+    
+    Los scores se recalculan sólo para los miembros actualizados y sólo si
+    cambió el tipo o los ministerios. Retorna un resultado por ID: updated
+    con el miembro, o not_found si no existe o no pertenece a la iglesia.
+    """
+    if not current_user.church_id:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Miembro no encontrado"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El usuario no pertenece a ninguna iglesia"
         )
     
-    if str(member.church_id) != str(current_user.church_id):
+    if bulk_data.ministries is not None and (bulk_data.add_ministries or bulk_data.remove_ministries):
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para editar este miembro"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No se puede combinar 'ministries' con 'add_ministries' o 'remove_ministries'"
+        )
+    
+    if bulk_data.tags is not None and (bulk_data.add_tags or bulk_data.remove_tags):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No se puede combinar 'tags' con 'add_tags' o 'remove_tags'"
+        )
+    
+    rescore = (
+        bulk_data.member_type is not None
+        or bulk_data.ministries is not None
+        or bool(bulk_data.add_ministries or bulk_data.remove_ministries)
+    )
+    retag = bulk_data.tags is not None or bool(bulk_data.add_tags or bulk_data.remove_tags)
+    
+    if not rescore and not retag:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No hay cambios para aplicar"
         )
     
+    repo = MemberRepository(session)
+    if rescore:
+        # Tipo y scores aportan al snapshot de estadísticas: se bloquean los
+        # miembros y se aplica sólo su diferencia
+        stats_before = await repo.get_stats_values(current_user.church_id, bulk_data.member_ids, lock=True)
+    updated_ids = await repo.bulk_update(current_user.church_id, bulk_data)
+    
+    # Recalcular scores si cambió algo relevante
+    if rescore and updated_ids:
+        rows = await repo.get_score_inputs(updated_ids)
+        rules = await repo.get_scoring_rules(current_user.church_id)
+        result = MemberAIService.score_batch(MemberScoringColumns.from_members(rows), rules=rules)
+        scores = []
+        for row, commitment_score, risk_level in zip(rows, result.commitment_score.tolist(), result.level_names()):
+            if commitment_score != row.commitment_score or risk_level != row.risk_level:
+                scores.append({
+                    "id": row.id,
+                    "commitment_score": commitment_score,
+                    "risk_level": risk_level
+                })
+        
+        await repo.update_scores(scores)
+        
+        # Los UPDATE masivos no pasan por el ORM
+        await repo.apply_stats_changes(
+            stats_before, await repo.get_stats_values(current_user.church_id, updated_ids)
+        )
+    
+    await session.commit()
+    
+    updated = {}
+    if updated_ids:
+        updated = {
+            member.id: member
+            for member in await repo.list_by_ids(current_user.church_id, updated_ids)
+        }
+    
+    return [
+        MemberBatchResult(id=member_id, status="updated", member=updated[member_id])
+        if member_id in updated
+        else MemberBatchResult(id=member_id, status="not_found")
+        for member_id in bulk_data.member_ids
+    ]
+
+
+@router.post("/recalculate-all", response_model=BackgroundJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def recalculate_all_members(
+    current_user: UserModel = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Recalcular los scores de todos los miembros de la iglesia en segundo plano
+    
+    Encola un trabajo por lotes (commitment_score, risk_level y ai_notes;
+    attendance_rate lo mantienen los registros de asistencia) y retorna de
+    inmediato; el progreso se consulta en GET /jobs/{id}. Si la iglesia ya
+    tiene uno pendiente o en curso se retorna ese mismo trabajo, retomándolo
+    si su proceso se cayó.
+    """
+    if not current_user.church_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El usuario no pertenece a ninguna iglesia"
+        )
+    
+    jobs = BackgroundJobRepository(session)
+    job = await jobs.get_active(current_user.church_id, RECALCULATION_JOB)
+    if job is None:
+        try:
+            job = await jobs.create(
+                current_user.church_id,
+                RECALCULATION_JOB,
+                created_by=current_user.id,
+                chunk_size=settings.RECALCULATION_CHUNK_SIZE
+            )
+            await session.commit()
+        except IntegrityError:
+            # Otro pedido creó el trabajo activo al mismo tiempo
+            await session.rollback()
+            job = await jobs.get_active(current_user.church_id, RECALCULATION_JOB)
+            if job is None:
+                # ...y ya terminó: no queda un trabajo activo que retornar
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Otro recálculo de la iglesia acaba de terminar; vuelve a intentarlo"
+                )
+    
+    start_recalculation(job.id)
+    return BackgroundJobResponse.from_job(job)
+
+
+@router.get("/{member_id}", response_model=MemberResponse)
+async def get_member(
+    member_id: UUID = Depends(get_accessible_member_id),
+    session: AsyncSession = Depends(get_db)
+):
+    """Obtener información completa de un miembro"""
+    repo = MemberRepository(session)
+    member = await repo.get_by_id(member_id)
+    
+    return member
+
+
+@router.put("/{member_id}", response_model=MemberResponse)
+async def update_member(
+    member_data: MemberUpdate,
+    member_id: UUID = Depends(get_accessible_member_id),
+    session: AsyncSession = Depends(get_db)
+):
+    """Actualizar información de un miembro"""
+    repo = MemberRepository(session)
+    
     updated_member = await repo.update(member_id, member_data)
     
     # Recalcular scores si cambió algo relevante
     if any([member_data.ministries, member_data.member_type]):
-        updated_member.commitment_score = MemberAIService.calculate_commitment_score(updated_member)
-        risk_analysis = MemberAIService.detect_abandonment_risk(updated_member)
+        rules = await repo.get_scoring_rules(updated_member.church_id)
+        updated_member.commitment_score = MemberAIService.calculate_commitment_score(updated_member, rules=rules)
+        risk_analysis = MemberAIService.detect_abandonment_risk(updated_member, rules)
         updated_member.risk_level = risk_analysis["level"]
         await session.commit()
         await session.refresh(updated_member)
@@ -216,25 +516,11 @@ async def update_member(
 
 @router.delete("/{member_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_member(
-    member_id: UUID,
-    current_user: UserModel = Depends(get_current_user),
+    member_id: UUID = Depends(get_accessible_member_id),
     session: AsyncSession = Depends(get_db)
 ):
     """Eliminar (desactivar) un miembro"""
     repo = MemberRepository(session)
-    member = await repo.get_by_id(member_id)
-    
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Miembro no encontrado"
-        )
-    
-    if str(member.church_id) != str(current_user.church_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para eliminar este miembro"
-        )
     
     await repo.delete(member_id)
     return None
@@ -244,65 +530,61 @@ async def delete_member(
 
 @router.get("/{member_id}/ai-insights", response_model=dict)
 async def get_member_ai_insights(
-    member_id: UUID,
+    member_id: UUID = Depends(get_accessible_member_id),
     current_user: UserModel = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db)
+    cache: ResponseCache = Depends(get_response_cache)
 ):
-    """Obtener insights de IA sobre un miembro"""
-    repo = MemberRepository(session)
-    member = await repo.get_by_id(member_id)
-    
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Miembro no encontrado"
-        )
-    
-    if str(member.church_id) != str(current_user.church_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para ver este miembro"
-        )
-    
-    # Generar insights
-    risk_analysis = MemberAIService.detect_abandonment_risk(member)
-    insights_text = MemberAIService.generate_ai_insights(member)
-    ministry_suggestions = MemberAIService.suggest_ministry_assignments(member)
+    """
+    Obtener insights de IA sobre un miembro (cacheado por iglesia)
     
-    return {
-        "member_id": member_id,
-        "commitment_score": member.commitment_score,
-        "attendance_rate": member.attendance_rate,
-        "risk_analysis": risk_analysis,
-        "insights": insights_text,
-        "ministry_suggestions": ministry_suggestions
-    }
+    El paquete se guarda en ai_notes con una huella de sus entradas y sólo
+    se recalcula cuando la huella cambia (member_insights.cached_insights).
+    """
+    async def generate_insights(session: AsyncSession):
+        repo = MemberRepository(session)
+        member = await repo.get_by_id(member_id)
+        bundle = await _member_insights(repo, member)
+        
+        return {
+            "member_id": member_id,
+            "commitment_score": member.commitment_score,
+            "attendance_rate": member.attendance_rate,
+            "risk_analysis": bundle["risk_analysis"],
+            "insights": bundle["insights"],
+            "ministry_suggestions": bundle["ministry_suggestions"]
+        }
+    
+    return await cache.get_or_load(current_user.church_id, "ai-insights", generate_insights, item=member_id)
+
+
+async def _member_insights(repo: MemberRepository, member) -> dict:
+    """Paquete de ai_notes del miembro; si se recalculó, se guarda"""
+    bundle, computed = cached_insights(member, rules=await repo.get_scoring_rules(member.church_id))
+    if computed:
+        await _with_llm_insights(member, bundle)
+        await repo.save_ai_notes(member.id, bundle)
+        await repo.session.commit()
+    return bundle
+
+
+async def _with_llm_insights(member, bundle: dict) -> None:
+    """Reemplaza el texto de plantilla del paquete por el del LLM, si respondió"""
+    text = (await get_openai_service().llm_member_insights([member]))[0]
+    if text is not None:
+        bundle["insights"] = text
 
 
 @router.get("/{member_id}/recommendations", response_model=dict)
 async def get_member_recommendations(
-    member_id: UUID,
-    current_user: UserModel = Depends(get_current_user),
+    member_id: UUID = Depends(get_accessible_member_id),
     session: AsyncSession = Depends(get_db)
 ):
-    """Obtener recomendaciones de seguimiento para un miembro"""
+    """Obtener recomendaciones de seguimiento para un miembro (paquete de ai_notes)"""
     repo = MemberRepository(session)
     member = await repo.get_by_id(member_id)
     
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Miembro no encontrado"
-        )
-    
-    if str(member.church_id) != str(current_user.church_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para ver este miembro"
-        )
-    
-    recommendations = MemberAIService.generate_followup_recommendations(member)
-    risk_analysis = MemberAIService.detect_abandonment_risk(member)
+    bundle = await _member_insights(repo, member)
+    risk_analysis = bundle["risk_analysis"]
     
     return {
         "member_id": member_id,
@@ -310,32 +592,40 @@ async def get_member_recommendations(
         "risk_level": risk_analysis["level"],
         "risk_score": risk_analysis["score"],
         "risk_factors": risk_analysis["factors"],
-        "recommended_actions": recommendations,
+        "recommended_actions": bundle["recommendations"],
         "ai_recommendation": risk_analysis["recommendation"]
     }
 
 
-@router.post("/{member_id}/recalculate", response_model=MemberResponse)
-async def recalculate_member_scores(
-    member_id: UUID,
+@router.get("/{member_id}/trend", response_model=MemberAttendanceTrend)
+async def get_member_attendance_trend(
+    member_id: UUID = Depends(get_accessible_member_id),
+    weeks: int = Query(26, ge=12, le=104, description="Semanas de historial analizadas"),
     current_user: UserModel = Depends(get_current_user),
     session: AsyncSession = Depends(get_db)
 ):
-    """Recalcular todos los scores y análisis de IA de un miembro"""
-    repo = MemberRepository(session)
-    member = await repo.get_by_id(member_id)
-    
-    if not member:
+    """Tendencia de asistencia de un miembro (misma consulta que /members/trends)"""
+    today = date.today()
+    row = await MemberRepository(session).get_member_attendance_trend(
+        current_user.church_id, member_id, today - timedelta(weeks=weeks), today
+    )
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Miembro no encontrado"
         )
     
-    if str(member.church_id) != str(current_user.church_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para modificar este miembro"
-        )
+    return _attendance_trend(row)
+
+
+@router.post("/{member_id}/recalculate", response_model=MemberResponse)
+async def recalculate_member_scores(
+    member_id: UUID = Depends(get_accessible_member_id),
+    session: AsyncSession = Depends(get_db)
+):
+    """Recalcular todos los scores y análisis de IA de un miembro"""
+    repo = MemberRepository(session)
+    member = await repo.get_by_id(member_id)
     
     # Recalcular attendance rate
     await repo.recalculate_attendance_rate(member_id)
@@ -343,19 +633,18 @@ async def recalculate_member_scores(
     # Refrescar member
     await session.refresh(member)
     
-    # Recalcular commitment score
-    member.commitment_score = MemberAIService.calculate_commitment_score(member)
+    # Recalcular commitment score (reglas de la versión fijada por la iglesia)
+    rules = await repo.get_scoring_rules(member.church_id)
+    member.commitment_score = MemberAIService.calculate_commitment_score(member, rules=rules)
     
     # Recalcular risk level
-    risk_analysis = MemberAIService.detect_abandonment_risk(member)
+    risk_analysis = MemberAIService.detect_abandonment_risk(member, rules)
     member.risk_level = risk_analysis["level"]
     
-    # Generar AI notes
-    member.ai_notes = {
-        "last_analysis": str(date.today()),
-        "risk_analysis": risk_analysis,
-        "insights": MemberAIService.generate_ai_insights(member)
-    }
+    # Generar AI notes (con huella: las lecturas siguientes no recalculan)
+    bundle = compute_insights(member, rules=rules)
+    await _with_llm_insights(member, bundle)
+    member.ai_notes = bundle
     
     await session.commit()
     await session.refresh(member)
@@ -367,26 +656,13 @@ async def recalculate_member_scores(
 
 @router.post("/{member_id}/notes", response_model=PastoralNoteResponse, status_code=status.HTTP_201_CREATED)
 async def create_pastoral_note(
-    member_id: UUID,
     note_data: PastoralNoteCreate,
+    member_id: UUID = Depends(get_accessible_member_id),
     current_user: UserModel = Depends(get_current_user),
     session: AsyncSession = Depends(get_db)
 ):
     """Crear nota pastoral sobre un miembro"""
     repo = MemberRepository(session)
-    member = await repo.get_by_id(member_id)
-    
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Miembro no encontrado"
-        )
-    
-    if str(member.church_id) != str(current_user.church_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para agregar notas a este miembro"
-        )
     
     # Asegurar que member_id coincida
     note_data.member_id = member_id
@@ -398,26 +674,12 @@ async def create_pastoral_note(
 
 @router.get("/{member_id}/notes", response_model=List[PastoralNoteResponse])
 async def get_member_notes(
-    member_id: UUID,
+    member_id: UUID = Depends(get_accessible_member_id),
     include_private: bool = Query(True),
-    current_user: UserModel = Depends(get_current_user),
     session: AsyncSession = Depends(get_db)
 ):
     """Obtener notas pastorales de un miembro"""
     repo = MemberRepository(session)
-    member = await repo.get_by_id(member_id)
-    
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Miembro no encontrado"
-        )
-    
-    if str(member.church_id) != str(current_user.church_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para ver las notas de este miembro"
-        )
     
     notes = await repo.get_member_notes(member_id, include_private=include_private)
     
@@ -428,61 +690,90 @@ async def get_member_notes(
 
 @router.post("/{member_id}/attendance", response_model=AttendanceRecordResponse, status_code=status.HTTP_201_CREATED)
 async def record_attendance(
-    member_id: UUID,
     attendance_data: AttendanceRecordCreate,
+    member_id: UUID = Depends(get_accessible_member_id),
     current_user: UserModel = Depends(get_current_user),
     session: AsyncSession = Depends(get_db)
 ):
-    """Registrar asistencia de un miembro"""
-    repo = MemberRepository(session)
-    member = await repo.get_by_id(member_id)
-    
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Miembro no encontrado"
-        )
+    """
+    Registrar asistencia de un miembro
     
-    if str(member.church_id) != str(current_user.church_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para registrar asistencia para este miembro"
-        )
+    Con event_id se registra en ese evento; con event_type/event_date (y
+    event_name) en el evento de ese día, que se crea si no existe. Un
+    segundo registro del mismo miembro en el mismo evento responde 409.
+    """
+    repo = MemberRepository(session)
     
     # Asegurar IDs correctos
     attendance_data.member_id = member_id
     attendance_data.church_id = current_user.church_id
     
+    if attendance_data.event_id:
+        event = await EventRepository(session).get_by_id(attendance_data.event_id, current_user.church_id)
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Evento no encontrado"
+            )
+        attendance_data.event_type, attendance_data.event_name = event.event_type, event.name
+        attendance_data.event_date = event.starts_at.date()
+    
     record = await repo.record_attendance(attendance_data)
+    if record is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="El miembro ya tiene registro de este evento"
+        )
     
     return record
 
 
 @router.get("/{member_id}/attendance", response_model=List[AttendanceRecordResponse])
 async def get_member_attendance(
-    member_id: UUID,
+    response: Response,
+    member_id: UUID = Depends(get_accessible_member_id),
+    date_from: Optional[date] = Query(None, alias="from", description="Desde (inclusive)"),
+    date_to: Optional[date] = Query(None, alias="to", description="Hasta (inclusive)"),
+    event_type: Optional[str] = Query(None, description="Filtrar por tipo de evento"),
+    after: Optional[str] = Query(None, description="Cursor opaco devuelto en X-Next-Cursor"),
     limit: int = Query(50, ge=1, le=500),
-    current_user: UserModel = Depends(get_current_user),
+    include_archived: bool = Query(False, description="Incluir los meses archivados (Parquet)"),
     session: AsyncSession = Depends(get_db)
 ):
-    """Obtener historial de asistencia de un miembro"""
-    repo = MemberRepository(session)
-    member = await repo.get_by_id(member_id)
+    """
+    Obtener historial de asistencia de un miembro
     
-    if not member:
+    Ordenado del evento más reciente al más antiguo. Si hay más registros,
+    la respuesta incluye el header X-Next-Cursor para pedir la página siguiente.
+    Los meses antiguos se archivan fuera de la base; include_archived=true
+    los incluye (más lento: lee los archivos).
+    """
+    if date_from and date_to and date_from > date_to:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Miembro no encontrado"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' no puede ser posterior a 'to'"
         )
     
-    if str(member.church_id) != str(current_user.church_id):
+    repo = MemberRepository(session)
+    
+    try:
+        attendance_records, next_cursor = await repo.get_attendance_page(
+            member_id,
+            date_from=date_from,
+            date_to=date_to,
+            event_type=event_type,
+            after=after,
+            limit=limit,
+            include_archived=include_archived
+        )
+    except InvalidCursorError:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para ver la asistencia de este miembro"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginación inválido"
         )
     
-    # Obtener registros de asistencia
-    attendance_records = member.attendance_records[-limit:] if member.attendance_records else []
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
     return attendance_records
 
@@ -493,8 +784,7 @@ from datetime import date
 
 @router.get("/{member_id}/history")
 async def get_member_history(
-    member_id: UUID,
-    current_user: UserModel = Depends(get_current_user),
+    member_id: UUID = Depends(get_accessible_member_id),
     session: AsyncSession = Depends(get_db)
 ):
     """
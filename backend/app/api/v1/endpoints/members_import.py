@@ -87,6 +87,7 @@ async def import_members(
         errors = []
         
         repo = MemberRepository(session)
+        rules = await repo.get_scoring_rules(current_user.church_id)
         
         # Procesar cada fila
         for index, row in df.iterrows():
@@ -144,8 +145,8 @@ async def import_members(
                 member = await repo.create(member_data, created_by=current_user.id)
                 
                 # Calcular scores iniciales
-                member.commitment_score = MemberAIService.calculate_commitment_score(member)
-                risk_analysis = MemberAIService.detect_abandonment_risk(member)
+                member.commitment_score = MemberAIService.calculate_commitment_score(member, rules=rules)
+                risk_analysis = MemberAIService.detect_abandonment_risk(member, rules)
                 member.risk_level = risk_analysis["level"]
                 
                 imported += 1
@@ -0,0 +1,40 @@
+# app/api/v1/endpoints/ministries.py
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.connection import get_db
+from app.infrastructure.repositories.member_repository import MemberRepository
+from app.domain.schemas.member import MinistryCandidate
+from app.domain.services.ministry_matching import MINISTRY_MATCHER
+from app.api.v1.auth.dependencies import get_current_user
+from app.infrastructure.database.models.user import UserModel
+
+router = APIRouter(prefix="/ministries", tags=["ministries"])
+
+
+@router.get("/{name}/candidates", response_model=List[MinistryCandidate])
+async def get_ministry_candidates(
+    name: str,
+    limit: int = Query(50, ge=1, le=500),
+    current_user: UserModel = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Candidatos de la iglesia para un ministerio
+
+    Mismas reglas que las sugerencias de ai-insights (dones 85, habilidades
+    75), evaluadas para este ministerio sobre todos los miembros activos en
+    una pasada. Excluye a quienes ya participan; ordena por fit_score,
+    commitment_score y attendance_rate.
+    """
+    ministry = name.lower()
+    if ministry not in MINISTRY_MATCHER.ministries:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ministerio sin reglas de asignación"
+        )
+
+    members = await MemberRepository(session).get_ministry_candidate_inputs(current_user.church_id)
+    return MINISTRY_MATCHER.rank_candidates(ministry, members, limit)
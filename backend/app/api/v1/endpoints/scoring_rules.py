@@ -0,0 +1,123 @@
+# app/api/v1/endpoints/scoring_rules.py
+from datetime import date
+from typing import List
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.connection import get_db
+from app.infrastructure.repositories.member_repository import MemberRepository
+from app.domain.schemas.member import (
+    ScoringRulesVersion, ScoringRulesPin, ScoringRulesPinResult, ScoringShadowReport
+)
+from app.domain.services.member_scoring import MemberScoringColumns, shadow_evaluate
+from app.domain.services.scoring_rules import RISK_LEVELS, SCORING_RULES, UnknownRulesVersion, get_rules
+from app.api.v1.auth.dependencies import get_current_user, get_current_admin
+from app.infrastructure.database.models.user import UserModel
+
+router = APIRouter(prefix="/scoring-rules", tags=["scoring-rules"])
+
+
+def _rules_or_404(version: int):
+    try:
+        return get_rules(version)
+    except UnknownRulesVersion:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Versión de reglas no encontrada"
+        )
+
+
+@router.get("", response_model=List[ScoringRulesVersion])
+async def list_scoring_rules(
+    current_user: UserModel = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db)
+):
+    """Versiones de reglas de scoring publicadas; `pinned` marca la de la iglesia"""
+    pinned = await MemberRepository(session).get_scoring_rules_version(current_user.church_id)
+    return [
+        ScoringRulesVersion(version=rules.version, description=rules.description, pinned=rules.version == pinned)
+        for rules in sorted(SCORING_RULES.values(), key=lambda rules: rules.version)
+    ]
+
+
+@router.get("/{version}/shadow", response_model=ScoringShadowReport)
+async def shadow_scoring_rules(
+    version: int,
+    limit: int = Query(100, ge=0, le=1000),
+    current_user: UserModel = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Evaluación en sombra de una versión candidata sobre toda la iglesia
+
+    Puntúa a todos los miembros con la versión fijada y con la candidata
+    (una sola lectura de la iglesia, sin guardar nada) y reporta la matriz
+    de transiciones de nivel de riesgo y los `limit` miembros cuyo nivel
+    cambia, los de mayor salto primero.
+    """
+    candidate = _rules_or_404(version)
+    repo = MemberRepository(session)
+    current = await repo.get_scoring_rules(current_user.church_id)
+    rows = await repo.get_church_score_inputs(current_user.church_id)
+
+    evaluation = shadow_evaluate(MemberScoringColumns.from_members(rows), current, candidate, date.today())
+    before, after = evaluation.current, evaluation.candidate
+
+    # Mayor salto de nivel primero, luego mayor diferencia de puntaje y puntaje candidato
+    changed = evaluation.level_changed
+    order = np.lexsort((
+        -after.risk_score[changed],
+        -np.abs(after.risk_score[changed] - before.risk_score[changed]),
+        -np.abs(after.risk_level[changed].astype(np.int64) - before.risk_level[changed]),
+    ))
+    top = changed[order[:limit]]
+
+    return ScoringShadowReport(
+        current_version=current.version,
+        candidate_version=candidate.version,
+        members=len(rows),
+        level_changes=len(changed),
+        commitment_changes=evaluation.score_changed,
+        transitions=evaluation.transitions(),
+        changes=[
+            {
+                "member_id": rows[i].id,
+                "first_name": rows[i].first_name,
+                "last_name": rows[i].last_name,
+                "current_level": RISK_LEVELS[before.risk_level[i]],
+                "candidate_level": RISK_LEVELS[after.risk_level[i]],
+                "current_risk_score": int(before.risk_score[i]),
+                "candidate_risk_score": int(after.risk_score[i]),
+                "current_commitment_score": float(before.commitment_score[i]),
+                "candidate_commitment_score": float(after.commitment_score[i]),
+            }
+            for i in top.tolist()
+        ]
+    )
+
+
+@router.put("/pin", response_model=ScoringRulesPinResult)
+async def pin_scoring_rules(
+    pin: ScoringRulesPin,
+    current_user: UserModel = Depends(get_current_admin),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Fija la versión de reglas de la iglesia y recalcula sus scores
+
+    El recálculo es el UPDATE set-based de rescore_church con las reglas
+    nuevas; la reconciliación del snapshot de estadísticas confirma todo en
+    la misma transacción.
+    """
+    _rules_or_404(pin.version)
+    repo = MemberRepository(session)
+    await repo.set_scoring_rules_version(current_user.church_id, pin.version)
+    changed = await repo.rescore_church(current_user.church_id)
+    if changed:
+        await repo.reconcile_stats_snapshot(current_user.church_id)
+    else:
+        await session.commit()
+
+    return ScoringRulesPinResult(version=pin.version, changed=changed)
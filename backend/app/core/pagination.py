@@ -0,0 +1,34 @@
+# app/core/pagination.py
+import base64
+import json
+from typing import Any, List, Optional
+
+
+class InvalidCursorError(ValueError):
+    """El cursor recibido no es válido o fue manipulado"""
+    pass
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Codifica los valores de la clave de orden en un cursor opaco (base64 url-safe)
+
+    Ej: encode_cursor(member.last_name, member.first_name, member.id)
+    """
+    payload = json.dumps([str(v) if v is not None else None for v in values], ensure_ascii=False)
+    token = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+    return token.rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> List[Optional[str]]:
+    """Decodifica un cursor opaco y valida la cantidad de valores"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursorError(f"Cursor inválido: {token}") from e
+
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorError(f"Cursor inválido: {token}")
+
+    return values
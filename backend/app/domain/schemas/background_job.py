@@ -0,0 +1,63 @@
+from pydantic import BaseModel
+from datetime import datetime
+from uuid import UUID
+from typing import Optional, List
+
+
+class BackgroundJobResponse(BaseModel):
+    """Estado y progreso de un trabajo en segundo plano"""
+    id: UUID
+    church_id: UUID
+    job_type: str
+    status: str  # pending, running, completed, failed
+
+    total: Optional[int] = None
+    processed: int
+    updated: int
+    failed: int
+    errors: List[dict]
+
+    progress_percent: Optional[float] = None
+    throughput_per_second: Optional[float] = None
+    eta_seconds: Optional[float] = None
+
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @classmethod
+    def from_job(cls, job, now: Optional[datetime] = None) -> "BackgroundJobResponse":
+        """Agrega progreso, miembros por segundo y tiempo restante estimado"""
+        progress = throughput = eta = None
+        if job.total:
+            progress = round(min(100.0, job.processed * 100 / job.total), 1)
+        elif job.total == 0 and job.status == "completed":
+            progress = 100.0
+
+        if job.started_at:
+            end = job.finished_at or now or datetime.utcnow()
+            elapsed = (end - job.started_at).total_seconds()
+            if elapsed > 0:
+                throughput = round(job.processed / elapsed, 1)
+            if throughput and job.total and job.status == "running":
+                eta = round(max(0, job.total - job.processed) / throughput, 1)
+
+        return cls(
+            id=job.id,
+            church_id=job.church_id,
+            job_type=job.job_type,
+            status=job.status,
+            total=job.total,
+            processed=job.processed,
+            updated=job.updated,
+            failed=job.failed,
+            errors=job.errors or [],
+            progress_percent=progress,
+            throughput_per_second=throughput,
+            eta_seconds=eta,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            heartbeat_at=job.heartbeat_at,
+            finished_at=job.finished_at
+        )
@@ -0,0 +1,51 @@
+from pydantic import BaseModel, Field, field_validator
+from datetime import datetime, timezone
+from uuid import UUID
+from typing import Optional
+from enum import Enum
+
+
+class EventRecurrence(str, Enum):
+    WEEKLY = "weekly"
+    BIWEEKLY = "biweekly"
+    MONTHLY = "monthly"
+    YEARLY = "yearly"
+
+
+class EventCreate(BaseModel):
+    event_type: str = Field(..., max_length=50)
+    name: str = Field(..., max_length=200)
+    starts_at: datetime
+    recurrence: Optional[EventRecurrence] = None
+
+    @field_validator("starts_at")
+    @classmethod
+    def naive_utc(cls, value: datetime) -> datetime:
+        """starts_at se guarda sin zona (UTC): una fecha con offset se convierte"""
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
+class EventResponse(BaseModel):
+    """Evento con sus totales de asistencia (mantenidos en cada registro)"""
+    id: UUID
+    church_id: UUID
+    event_type: str
+    name: str
+    starts_at: datetime
+    recurrence: Optional[str] = None
+    records: int
+    headcount: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class EventAttendee(BaseModel):
+    member_id: UUID
+    first_name: str
+    last_name: str
+    attended: bool
+    arrival_time: Optional[datetime] = None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, model_validator
 from typing import Optional, List
 from datetime import date, datetime
 from uuid import UUID
@@ -90,6 +90,30 @@ class MemberListItem(BaseModel):
         from_attributes = True
 
 
+class MemberBatchGetRequest(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=500)
+
+
+class MemberBulkUpdate(BaseModel):
+    """Mismos cambios aplicados a varios miembros"""
+    member_ids: List[UUID] = Field(..., min_length=1, max_length=500)
+    member_type: Optional[str] = None
+    # Reemplaza la lista completa; no se combina con add_/remove_
+    ministries: Optional[List[str]] = None
+    add_ministries: List[str] = []
+    remove_ministries: List[str] = []
+    tags: Optional[List[str]] = None
+    add_tags: List[str] = []
+    remove_tags: List[str] = []
+
+
+class MemberBatchResult(BaseModel):
+    """Resultado por miembro de batch-get y bulk"""
+    id: UUID
+    status: str  # found, updated, not_found
+    member: Optional[MemberListItem] = None
+
+
 class PastoralNoteBase(BaseModel):
     note_type: str
     title: Optional[str] = None
@@ -112,17 +136,30 @@ class PastoralNoteResponse(PastoralNoteBase):
         from_attributes = True
 
 
-class AttendanceRecordCreate(BaseModel):
+class EventReference(BaseModel):
+    """Un evento existente (event_id) o su tipo y fecha (se busca o crea el evento del día)"""
+    event_id: Optional[UUID] = None
+    event_type: Optional[str] = None
+    event_name: Optional[str] = None
+    event_date: Optional[date] = None
+
+    @model_validator(mode="after")
+    def check_event(self):
+        if self.event_id is None and (self.event_type is None or self.event_date is None):
+            raise ValueError("Indicar event_id o event_type y event_date")
+        return self
+
+
+class AttendanceRecordCreate(EventReference):
     member_id: UUID
     church_id: UUID
-    event_type: str
-    event_date: date
     attended: bool = True
 
 
 class AttendanceRecordResponse(BaseModel):
     id: UUID
     member_id: UUID
+    event_id: Optional[UUID] = None
     event_type: str
     event_date: date
     attended: bool
@@ -132,6 +169,58 @@ class AttendanceRecordResponse(BaseModel):
         from_attributes = True
 
 
+class AttendanceBulkEntry(BaseModel):
+    member_id: UUID
+    attended: bool = True
+
+
+class AttendanceBulkCreate(EventReference):
+    """Asistencia de varios miembros a un mismo evento"""
+    # Presentes; entries agrega estados explícitos (ausentes) y gana si un ID está en ambos
+    member_ids: List[UUID] = Field([], max_length=2000)
+    entries: List[AttendanceBulkEntry] = Field([], max_length=2000)
+
+
+class AttendanceBulkResult(BaseModel):
+    event_id: UUID
+    event_type: str
+    event_date: date
+    recorded: int
+    attended: int
+    rescored: int
+    # Ya tenían registro de este evento: no se duplican
+    already_recorded: List[UUID] = []
+    not_found: List[UUID] = []
+
+
+class AttendanceCounterDrift(BaseModel):
+    member_id: UUID
+    window_total: int
+    window_attended: int
+    expected_total: int
+    expected_attended: int
+    attendance_rate: Optional[float] = None
+
+
+class AttendanceCounterCheck(BaseModel):
+    window_start: date
+    drift: List[AttendanceCounterDrift]
+    repaired: int = 0
+
+
+class AttendanceWeek(BaseModel):
+    week_start: date
+    records: int
+    attended: int
+    attendance_rate: float
+
+
+class AttendanceWeeklySeries(BaseModel):
+    # None = todos los tipos de evento sumados
+    event_type: Optional[str] = None
+    weeks: List[AttendanceWeek]
+
+
 class MemberStats(BaseModel):
     total_attendance: int
     attendance_rate: float
@@ -153,6 +242,93 @@ class ChurchMemberStats(BaseModel):
     gender_distribution: dict
     marital_status_distribution: dict
     member_type_distribution: dict
+    # Frescura del snapshot (None si se calculó en el momento)
+    snapshot_updated_at: Optional[datetime] = None
+    snapshot_reconciled_at: Optional[datetime] = None
+
+
+class MemberAttendanceTrend(BaseModel):
+    """Tendencia de asistencia (mismas categorías que analyze_member_trend)"""
+    member_id: UUID
+    first_name: str
+    last_name: str
+    records: int
+    trend: str
+    attendance_trend: str
+    prediction: str
+    first_half_rate: Optional[float] = None
+    second_half_rate: Optional[float] = None
+    change: Optional[float] = None
+    rate_4_weeks: Optional[float] = None
+    rate_8_weeks: Optional[float] = None
+    rate_12_weeks: Optional[float] = None
+    current_streak: int = 0
+    current_streak_attended: Optional[bool] = None
+    longest_attended_streak: int = 0
+
+
+class UpcomingCelebration(BaseModel):
+    """Cumpleaños o aniversario de membresía próximo"""
+    member_id: UUID
+    first_name: str
+    last_name: str
+    kind: str                   # birthday | membership_anniversary
+    celebration_date: date      # fecha de la celebración (29/2 -> 28/2 en años no bisiestos)
+    days_until: int
+    years: int                  # edad que cumple o años de membresía
+    preferred_contact_method: Optional[str] = None
+
+
+class MinistryCandidate(BaseModel):
+    member_id: UUID
+    first_name: str
+    last_name: str
+    fit_score: int
+    reason: str
+    commitment_score: float
+    attendance_rate: float
+    risk_level: Optional[str] = None
+
+
+
+class ScoringRulesVersion(BaseModel):
+    version: int
+    description: str
+    pinned: bool = False
+
+
+class ScoringRulesPin(BaseModel):
+    version: int
+
+
+class ScoringRulesPinResult(BaseModel):
+    version: int
+    changed: int
+
+
+class ShadowMemberChange(BaseModel):
+    """Miembro cuyo nivel de riesgo cambia con la versión candidata"""
+    member_id: UUID
+    first_name: str
+    last_name: str
+    current_level: str
+    candidate_level: str
+    current_risk_score: int
+    candidate_risk_score: int
+    current_commitment_score: float
+    candidate_commitment_score: float
+
+
+class ScoringShadowReport(BaseModel):
+    """Diferencias de la versión candidata contra la fijada, sobre toda la iglesia"""
+    current_version: int
+    candidate_version: int
+    members: int
+    level_changes: int
+    commitment_changes: int
+    # nivel actual -> {nivel candidato: miembros}
+    transitions: dict
+    changes: List[ShadowMemberChange]
 
 
 class MemberAIRecommendation(BaseModel):
@@ -0,0 +1,51 @@
+# app/domain/services/celebrations.py
+"""
+Cumpleaños y aniversarios de membresía próximos
+
+Las fechas se comparan por mes-día (MMDD como entero: 15 de marzo = 315),
+que no depende del año: el índice de members sobre esa expresión sirve
+cualquier ventana con rangos BETWEEN. Una ventana que cruza el fin de año se
+parte en dos rangos (hasta 1231 y desde 101).
+
+Un 29 de febrero se celebra el 28 en los años no bisiestos: la ventana que
+termina en 228 de un año no bisiesto se extiende a 229.
+"""
+import calendar
+from datetime import date, timedelta
+from typing import List, Tuple
+
+
+def month_day(value: date) -> int:
+    return value.month * 100 + value.day
+
+
+def occurrence_in(value: date, year: int) -> date:
+    """Fecha del aniversario de `value` en `year` (29/2 -> 28/2 si el año no es bisiesto)"""
+    if value.month == 2 and value.day == 29 and not calendar.isleap(year):
+        return date(year, 2, 28)
+    return value.replace(year=year)
+
+
+def next_occurrence(value: date, today: date) -> date:
+    """Próximo aniversario de `value` a partir de hoy (hoy incluido)"""
+    occurrence = occurrence_in(value, today.year)
+    if occurrence < today:
+        occurrence = occurrence_in(value, today.year + 1)
+    return occurrence
+
+
+def celebration_ranges(today: date, days: int) -> List[Tuple[int, int]]:
+    """Rangos de MMDD (inclusive) de hoy a hoy + `days`"""
+    end = today + timedelta(days=days)
+    if end.year == today.year:
+        segments = [(today, end)]
+    else:
+        segments = [(today, date(today.year, 12, 31)), (date(end.year, 1, 1), end)]
+
+    ranges = []
+    for start, stop in segments:
+        last = month_day(stop)
+        if last == 228 and not calendar.isleap(stop.year):
+            last = 229
+        ranges.append((month_day(start), last))
+    return ranges
@@ -1,7 +1,13 @@
 # app/domain/services/member_ai_service.py
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import date, timedelta
 from app.infrastructure.database.models.member import MemberModel, AttendanceRecordModel
+from app.domain.services.member_scoring import MemberScoringColumns, MemberScoringResult, factor_names, score_members
+from app.domain.services.scoring_rules import (
+    ABSENCE_FACTORS, DEFAULT_RULES, GROUP_LEADER_ROLES, LOW_ATTENDANCE_FACTORS, LOW_COMMITMENT_FACTORS, ScoringRules
+)
+from app.domain.services.ministry_matching import MINISTRY_MATCHER
+from app.domain.services.celebrations import next_occurrence
 
 
 class MemberAIService:
@@ -10,12 +16,13 @@ class MemberAIService:
     @staticmethod
     def calculate_commitment_score(
         member: MemberModel,
-        attendance_records: List[AttendanceRecordModel] = None
+        attendance_records: List[AttendanceRecordModel] = None,
+        rules: ScoringRules = DEFAULT_RULES
     ) -> float:
         """
         Calcula el score de compromiso del miembro (0-100)
         
-        Factores:
+        Factores (puntos de las reglas por defecto; ver scoring_rules.py):
         - Asistencia (40%)
         - Participación en ministerios (30%)
         - Actividad reciente (20%)
@@ -25,51 +32,43 @@ class MemberAIService:
         
         # 1. Asistencia (40 puntos)
         attendance_rate = member.attendance_rate or 0
-        if attendance_rate >= 80:
-            score += 40
-        elif attendance_rate >= 60:
-            score += 30
-        elif attendance_rate >= 40:
-            score += 20
-        elif attendance_rate >= 20:
-            score += 10
+        for threshold, points in rules.attendance_points:
+            if attendance_rate >= threshold:
+                score += points
+                break
         
         # 2. Participación ministerial (30 puntos)
         ministries_count = len(member.ministries or [])
         if ministries_count >= 2:
-            score += 30
+            score += rules.many_ministries_points
         elif ministries_count == 1:
-            score += 20
+            score += rules.one_ministry_points
         elif member.small_group_id:
-            score += 10
+            score += rules.small_group_points
         
         # 3. Actividad reciente (20 puntos)
         if member.last_attendance:
             days_since_last = (date.today() - member.last_attendance).days
-            if days_since_last < 7:
-                score += 20
-            elif days_since_last < 14:
-                score += 15
-            elif days_since_last < 21:
-                score += 10
-            elif days_since_last < 30:
-                score += 5
+            for threshold, points in rules.recent_attendance_points:
+                if days_since_last < threshold:
+                    score += points
+                    break
         
         # 4. Engagement adicional (10 puntos)
         # Tiene dones espirituales identificados
         if member.spiritual_gifts and len(member.spiritual_gifts) > 0:
-            score += 5
+            score += rules.spiritual_gifts_points
         
         # Es líder en grupo pequeño
-        if member.small_group_role in ['lider', 'anfitrion']:
-            score += 5
+        if member.small_group_role in GROUP_LEADER_ROLES:
+            score += rules.group_leader_points
         
         return min(100.0, score)
     
     @staticmethod
-    def detect_abandonment_risk(member: MemberModel) -> Dict:
+    def detect_abandonment_risk(member: MemberModel, rules: ScoringRules = DEFAULT_RULES) -> Dict:
         """
-        Detecta el riesgo de abandono del miembro
+        Detecta el riesgo de abandono del miembro con una versión de reglas
         
         Returns:
             {
@@ -86,66 +85,55 @@ class MemberAIService:
         if member.last_attendance:
             days_since_last = (date.today() - member.last_attendance).days
             
-            if days_since_last > 60:
-                risk_factors.append("ausencia_critica_60_dias")
-                risk_score += 35
-            elif days_since_last > 30:
-                risk_factors.append("ausencia_prolongada_30_dias")
-                risk_score += 25
-            elif days_since_last > 21:
-                risk_factors.append("ausencia_21_dias")
-                risk_score += 15
-            elif days_since_last > 14:
-                risk_factors.append("ausencia_14_dias")
-                risk_score += 10
+            for factor, (threshold, points) in zip(ABSENCE_FACTORS, rules.absence_risk):
+                if days_since_last > threshold:
+                    risk_factors.append(factor)
+                    risk_score += points
+                    break
         else:
             risk_factors.append("sin_registro_asistencia")
-            risk_score += 20
+            risk_score += rules.no_attendance_risk
         
         # Factor 2: Baja asistencia
         attendance_rate = member.attendance_rate or 0
-        if attendance_rate < 20:
-            risk_factors.append("asistencia_muy_baja")
-            risk_score += 25
-        elif attendance_rate < 40:
-            risk_factors.append("asistencia_baja")
-            risk_score += 15
-        elif attendance_rate < 60:
-            risk_factors.append("asistencia_irregular")
-            risk_score += 10
+        for factor, (threshold, points) in zip(LOW_ATTENDANCE_FACTORS, rules.low_attendance_risk):
+            if attendance_rate < threshold:
+                risk_factors.append(factor)
+                risk_score += points
+                break
         
         # Factor 3: Sin participación ministerial
         if not member.ministries or len(member.ministries) == 0:
             risk_factors.append("sin_participacion_ministerial")
-            risk_score += 15
+            risk_score += rules.no_ministry_risk
         
         # Factor 4: Sin grupo pequeño
         if not member.small_group_id:
             risk_factors.append("sin_grupo_pequeno")
-            risk_score += 10
+            risk_score += rules.no_small_group_risk
         
         # Factor 5: Caída en compromiso
-        if member.commitment_score < 30:
-            risk_factors.append("compromiso_muy_bajo")
-            risk_score += 15
-        elif member.commitment_score < 50:
-            risk_factors.append("compromiso_bajo")
-            risk_score += 10
+        for factor, (threshold, points) in zip(LOW_COMMITMENT_FACTORS, rules.low_commitment_risk):
+            if member.commitment_score < threshold:
+                risk_factors.append(factor)
+                risk_score += points
+                break
         
         # Factor 6: Visitante de largo plazo sin activarse
         if member.member_type == "visitante":
             if member.membership_date:
                 days_as_visitor = (date.today() - member.membership_date).days
-                if days_as_visitor > 90:
+                if days_as_visitor > rules.stalled_visitor_days:
                     risk_factors.append("visitante_estancado")
-                    risk_score += 15
+                    risk_score += rules.stalled_visitor_risk
         
         # Determinar nivel de riesgo
-        if risk_score >= 70:
+        critical, high, medium = rules.risk_level_thresholds
+        if risk_score >= critical:
             level = "critico"
-        elif risk_score >= 50:
+        elif risk_score >= high:
             level = "alto"
-        elif risk_score >= 30:
+        elif risk_score >= medium:
             level = "medio"
         else:
             level = "bajo"
@@ -172,6 +160,34 @@ class MemberAIService:
         
         return recommendations.get(level, "Mantener seguimiento regular")
     
+    @staticmethod
+    def score_batch(
+        columns: MemberScoringColumns,
+        today: Optional[date] = None,
+        rules: ScoringRules = DEFAULT_RULES
+    ) -> MemberScoringResult:
+        """
+        calculate_commitment_score + detect_abandonment_risk para muchos miembros
+        
+        Versión vectorizada (NumPy) con resultados idénticos al camino escalar;
+        ver app/domain/services/member_scoring.py.
+        """
+        return score_members(columns, today, rules)
+    
+    @staticmethod
+    def risk_analyses(result: MemberScoringResult) -> List[Dict]:
+        """Resultado de score_batch como los dicts de detect_abandonment_risk"""
+        analyses = []
+        for level, score, mask in zip(result.level_names(), result.risk_score.tolist(), result.risk_factors.tolist()):
+            factors = factor_names(mask)
+            analyses.append({
+                "level": level,
+                "score": score,
+                "factors": factors,
+                "recommendation": MemberAIService._generate_risk_recommendation(level, factors)
+            })
+        return analyses
+    
     @staticmethod
     def generate_followup_recommendations(member: MemberModel) -> List[Dict]:
         """
@@ -241,9 +257,10 @@ class MemberAIService:
         
         # 5. Aniversario de membresía
         if member.membership_date and member.member_type == "activo":
-            days_since_membership = (date.today() - member.membership_date).days
-            years = days_since_membership // 365
-            days_to_anniversary = 365 - (days_since_membership % 365)
+            today = date.today()
+            anniversary = next_occurrence(member.membership_date, today)
+            years = anniversary.year - member.membership_date.year
+            days_to_anniversary = (anniversary - today).days
             
             if years > 0 and days_to_anniversary <= 7:
                 recommendations.append({
@@ -276,86 +293,36 @@ class MemberAIService:
     
     @staticmethod
     def _days_until_next_birthday(birth_date: date) -> int:
-        """Calcula días hasta el próximo cumpleaños"""
+        """Calcula días hasta el próximo cumpleaños (29/2 se celebra el 28 en años no bisiestos)"""
         today = date.today()
-        next_birthday = date(today.year, birth_date.month, birth_date.day)
-        
-        if next_birthday < today:
-            next_birthday = date(today.year + 1, birth_date.month, birth_date.day)
-        
-        return (next_birthday - today).days
+        return (next_occurrence(birth_date, today) - today).days
     
     @staticmethod
     def suggest_ministry_assignments(member: MemberModel) -> List[Dict]:
         """
         Sugiere ministerios basados en dones, habilidades e intereses
+
+        Las tablas de dones/habilidades están precompiladas en MINISTRY_MATCHER
+        (ministry_matching.py).
         """
-        suggestions = []
-        
-        if not member.spiritual_gifts:
-            return suggestions
-        
-        # Mapeo de dones a ministerios
-        gift_to_ministry = {
-            "enseñanza": ["escuela_dominical", "jovenes", "discipulado"],
-            "musica": ["alabanza", "coro", "banda"],
-            "evangelismo": ["evangelismo", "visitacion", "redes_sociales"],
-            "servicio": ["ujieres", "limpieza", "cocina", "mantenimiento"],
-            "administracion": ["secretaria", "administracion", "finanzas"],
-            "misericordia": ["visitacion_enfermos", "benevolencia", "consejeria"],
-            "liderazgo": ["grupos_pequenos", "coordinacion", "jovenes"],
-            "hospitalidad": ["recepcion", "nuevos_miembros", "eventos"],
-            "intercesion": ["intercesion", "oracion", "vigilia"],
-            "profecia": ["predicacion", "ensenanza", "consejeria"],
-            "fe": ["misionero", "plantacion_iglesias", "oracion"],
-            "sanidad": ["visitacion_enfermos", "oracion", "consejeria"]
-        }
+        return MINISTRY_MATCHER.suggest(member.spiritual_gifts, member.skills, member.ministries)
+    
+    @staticmethod
+    def classify_trend(change: float) -> Tuple[str, str, str]:
+        """
+        (trend, attendance_trend, prediction) según el cambio de tasa de asistencia
         
-        for gift in member.spiritual_gifts:
-            gift_lower = gift.lower()
-            if gift_lower in gift_to_ministry:
-                for ministry in gift_to_ministry[gift_lower]:
-                    # Evitar sugerir ministerios donde ya participa
-                    if not member.ministries or ministry not in [m.lower() for m in member.ministries]:
-                        suggestions.append({
-                            "ministry": ministry,
-                            "reason": f"Don de {gift}",
-                            "fit_score": 85
-                        })
-        
-        # También considerar habilidades profesionales
-        if member.skills:
-            skill_to_ministry = {
-                "diseño": ["redes_sociales", "creatividad", "comunicaciones"],
-                "contabilidad": ["finanzas", "administracion"],
-                "tecnologia": ["audiovisual", "redes_sociales", "streaming"],
-                "cocina": ["cocina", "eventos"],
-                "construccion": ["mantenimiento", "proyectos"],
-                "educacion": ["escuela_dominical", "jovenes"]
-            }
-            
-            for skill in member.skills:
-                skill_lower = skill.lower()
-                for key, ministries in skill_to_ministry.items():
-                    if key in skill_lower:
-                        for ministry in ministries:
-                            if not member.ministries or ministry not in [m.lower() for m in member.ministries]:
-                                suggestions.append({
-                                    "ministry": ministry,
-                                    "reason": f"Habilidad en {skill}",
-                                    "fit_score": 75
-                                })
-        
-        # Remover duplicados y ordenar por fit_score
-        unique_suggestions = {}
-        for sug in suggestions:
-            if sug["ministry"] not in unique_suggestions:
-                unique_suggestions[sug["ministry"]] = sug
-        
-        result = list(unique_suggestions.values())
-        result.sort(key=lambda x: x["fit_score"], reverse=True)
-        
-        return result[:5]  # Top 5 sugerencias
+        change: tasa de la segunda mitad menos la de la primera, en puntos.
+        """
+        if change > 15:
+            return "improving", "up", "Miembro mostrando mejora significativa en compromiso"
+        if change > 5:
+            return "stable_positive", "stable", "Miembro mantiene buen nivel de participación"
+        if change > -5:
+            return "stable", "stable", "Miembro mantiene nivel de participación consistente"
+        if change > -15:
+            return "declining", "down", "ALERTA: Miembro mostrando disminución en participación"
+        return "critical", "down", "CRÍTICO: Fuerte caída en participación - acción inmediata requerida"
     
     @staticmethod
     def analyze_member_trend(
@@ -391,28 +358,7 @@ class MemberAIService:
         second_half_rate = sum(1 for r in second_half if r.attended) / len(second_half) * 100
         
         change = second_half_rate - first_half_rate
-        
-        # Determinar tendencia
-        if change > 15:
-            trend = "improving"
-            attendance_trend = "up"
-            prediction = "Miembro mostrando mejora significativa en compromiso"
-        elif change > 5:
-            trend = "stable_positive"
-            attendance_trend = "stable"
-            prediction = "Miembro mantiene buen nivel de participación"
-        elif change > -5:
-            trend = "stable"
-            attendance_trend = "stable"
-            prediction = "Miembro mantiene nivel de participación consistente"
-        elif change > -15:
-            trend = "declining"
-            attendance_trend = "down"
-            prediction = "ALERTA: Miembro mostrando disminución en participación"
-        else:
-            trend = "critical"
-            attendance_trend = "down"
-            prediction = "CRÍTICO: Fuerte caída en participación - acción inmediata requerida"
+        trend, attendance_trend, prediction = MemberAIService.classify_trend(change)
         
         return {
             "trend": trend,
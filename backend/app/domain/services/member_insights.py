@@ -0,0 +1,92 @@
+# app/domain/services/member_insights.py
+"""
+Insights de IA de un miembro guardados en ai_notes con una huella de entradas
+
+generate_ai_insights, detect_abandonment_risk, suggest_ministry_assignments y
+generate_followup_recommendations sólo dependen de las columnas de
+INSIGHT_INPUT_FIELDS, de la versión de las reglas (la del paquete y la de
+scoring de la iglesia) y de la fecha (días sin asistir, tiempo de membresía,
+cumpleaños). La huella combina todo eso: si la guardada en ai_notes coincide,
+el paquete guardado es exactamente lo que se recalcularía y se sirve tal cual.
+"""
+import hashlib
+import json
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+from app.domain.services.member_ai_service import MemberAIService
+from app.domain.services.scoring_rules import DEFAULT_RULES, ScoringRules
+
+# Subir al cambiar cualquier regla que alimenta el paquete: invalida todas las huellas
+INSIGHTS_RULES_VERSION = 1
+
+# Columnas que leen las cuatro funciones del paquete
+INSIGHT_INPUT_FIELDS = (
+    "first_name",
+    "member_type",
+    "membership_date",
+    "birth_date",
+    "preferred_contact_method",
+    "attendance_rate",
+    "last_attendance",
+    "commitment_score",
+    "risk_level",
+    "ministries",
+    "spiritual_gifts",
+    "skills",
+    "small_group_id",
+    "small_group_role",
+)
+
+_metrics = {"hits": 0, "misses": 0}
+
+
+def insights_fingerprint(member, today: Optional[date] = None, rules: ScoringRules = DEFAULT_RULES) -> str:
+    """Huella de las entradas del paquete: columnas + versiones de reglas + día"""
+    payload = [INSIGHTS_RULES_VERSION, rules.version, (today or date.today()).isoformat()]
+    payload.extend(getattr(member, field) for field in INSIGHT_INPUT_FIELDS)
+    encoded = json.dumps(payload, default=str, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def compute_insights(member, today: Optional[date] = None, rules: ScoringRules = DEFAULT_RULES) -> Dict:
+    """Paquete completo para ai_notes (análisis de riesgo, insights, sugerencias, recomendaciones)"""
+    today = today or date.today()
+    return {
+        "fingerprint": insights_fingerprint(member, today, rules),
+        "rules_version": INSIGHTS_RULES_VERSION,
+        "scoring_rules_version": rules.version,
+        "last_analysis": str(today),
+        "risk_analysis": MemberAIService.detect_abandonment_risk(member, rules),
+        "insights": MemberAIService.generate_ai_insights(member),
+        "ministry_suggestions": MemberAIService.suggest_ministry_assignments(member),
+        "recommendations": MemberAIService.generate_followup_recommendations(member),
+    }
+
+
+def cached_insights(
+    member, today: Optional[date] = None, rules: ScoringRules = DEFAULT_RULES
+) -> Tuple[Dict, bool]:
+    """
+    (paquete, recalculado) para el miembro
+
+    Sirve member.ai_notes si su huella coincide; si no, recalcula y el
+    llamador debe guardar el paquete nuevo (recalculado = True).
+    """
+    today = today or date.today()
+    stored = member.ai_notes
+    if isinstance(stored, dict) and stored.get("fingerprint") == insights_fingerprint(member, today, rules):
+        _metrics["hits"] += 1
+        return stored, False
+
+    _metrics["misses"] += 1
+    return compute_insights(member, today, rules), True
+
+
+def insights_cache_metrics() -> Dict:
+    """Hits/misses de la huella de ai_notes desde el arranque del proceso"""
+    lookups = _metrics["hits"] + _metrics["misses"]
+    return {
+        **_metrics,
+        "hit_ratio": round(_metrics["hits"] / lookups, 4) if lookups else 0.0
+    }
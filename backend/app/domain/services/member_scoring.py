@@ -0,0 +1,388 @@
+# app/domain/services/member_scoring.py
+"""
+Scoring vectorizado de miembros (iglesia completa)
+
+Misma lógica que MemberAIService.calculate_commitment_score y
+detect_abandonment_risk, expresada sobre columnas NumPy y parametrizada por
+un ScoringRules (scoring_rules.py). Como los umbrales de cada escalón if/elif
+son monótonos, el tramo ganador sale de contar cuántos umbrales cumple cada
+valor, y los puntos y factores son un lookup por tramo; el resultado es
+idéntico al del camino escalar (tests/test_member_scoring.py).
+
+Lo que no depende de las reglas (días sin asistir, tramo ministerial,
+días como visitante, ...) se calcula una vez en ScoringFeatures: evaluar una
+segunda versión de reglas sobre la misma iglesia (shadow_evaluate) sólo
+repite los lookups.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.domain.services.scoring_rules import (
+    ABSENCE_FACTORS, DEFAULT_RULES, GROUP_LEADER_ROLES, LOW_ATTENDANCE_FACTORS, LOW_COMMITMENT_FACTORS,
+    RISK_FACTORS, RISK_LEVELS, ScoringRules
+)
+
+FACTOR_BITS = {name: 1 << i for i, name in enumerate(RISK_FACTORS)}
+
+# Con el resto de las entradas fijas, el scoring sólo cambia con el paso del
+# tiempo en estos días (con las reglas por defecto): el commitment baja al
+# llegar a 7/14/21/30 días sin asistir y el riesgo sube al superar
+# 14/21/30/60; el visitante pasa a "estancado" al superar 90 días de membresía.
+ATTENDANCE_BOUNDARY_DAYS = DEFAULT_RULES.attendance_boundary_days
+VISITOR_BOUNDARY_DAYS = DEFAULT_RULES.visitor_boundary_days
+
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_NAT = np.iinfo(np.int64).min
+
+
+def _to_days(values: Sequence[Optional[date]]) -> np.ndarray:
+    """
+    Fechas (o None) como datetime64[D]; None queda como NaT
+
+    Pasa por ordinales enteros: np.array(fechas, dtype="datetime64[D]") es
+    más de diez veces más lento con objetos date.
+    """
+    days = [value.toordinal() - _EPOCH_ORDINAL if value is not None else _NAT for value in values]
+    return np.array(days, dtype=np.int64).view("datetime64[D]")
+
+
+@dataclass
+class MemberScoringColumns:
+    """Entradas del scoring, una posición por miembro"""
+    attendance_rate: np.ndarray       # float64, None -> 0
+    last_attendance: np.ndarray       # datetime64[D], NaT si no hay registro
+    ministries_count: np.ndarray      # int64
+    has_small_group: np.ndarray       # bool
+    has_spiritual_gifts: np.ndarray   # bool
+    is_group_leader: np.ndarray       # bool (small_group_role lider/anfitrion)
+    commitment_score: np.ndarray      # float64, score guardado
+    is_visitor: np.ndarray            # bool (member_type == "visitante")
+    membership_date: np.ndarray       # datetime64[D], NaT si falta
+
+    def __len__(self) -> int:
+        return len(self.attendance_rate)
+
+    @classmethod
+    def from_members(cls, members: Iterable) -> "MemberScoringColumns":
+        """
+        Arma las columnas desde objetos o filas con los atributos del modelo
+
+        Sirve para MemberModel y para filas proyectadas (SCORE_INPUT_COLUMNS).
+        """
+        members = list(members)
+        return cls(
+            attendance_rate=np.array([m.attendance_rate or 0 for m in members], dtype=np.float64),
+            last_attendance=_to_days([m.last_attendance for m in members]),
+            ministries_count=np.array([len(m.ministries or []) for m in members], dtype=np.int64),
+            has_small_group=np.array([bool(m.small_group_id) for m in members], dtype=bool),
+            has_spiritual_gifts=np.array([bool(m.spiritual_gifts) for m in members], dtype=bool),
+            is_group_leader=np.array([m.small_group_role in GROUP_LEADER_ROLES for m in members], dtype=bool),
+            commitment_score=np.array([m.commitment_score or 0 for m in members], dtype=np.float64),
+            is_visitor=np.array([m.member_type == "visitante" for m in members], dtype=bool),
+            membership_date=_to_days([m.membership_date for m in members]),
+        )
+
+
+@dataclass
+class MemberScoringResult:
+    commitment_score: np.ndarray  # float64, 0-100
+    risk_score: np.ndarray        # int64, 0-100
+    risk_level: np.ndarray        # int8, índice en RISK_LEVELS
+    risk_factors: np.ndarray      # int64, bits de FACTOR_BITS
+
+    def level_names(self) -> List[str]:
+        return [RISK_LEVELS[i] for i in self.risk_level]
+
+
+def factor_names(mask: int) -> List[str]:
+    """Bitmask de factores -> lista en el orden de detect_abandonment_risk"""
+    return [name for name in RISK_FACTORS if mask & FACTOR_BITS[name]]
+
+
+def next_score_change(
+    last_attendance: Optional[date],
+    membership_date: Optional[date],
+    member_type: Optional[str],
+    today: date,
+    rules: ScoringRules = DEFAULT_RULES
+) -> Optional[date]:
+    """Próxima fecha (posterior a today) en que el scoring cambia por sí solo; None si ya no cambia"""
+    candidates = []
+    if last_attendance is not None:
+        candidates += [last_attendance + timedelta(days=d) for d in rules.attendance_boundary_days]
+    if member_type == "visitante" and membership_date is not None:
+        candidates.append(membership_date + timedelta(days=rules.visitor_boundary_days))
+    return min((d for d in candidates if d > today), default=None)
+
+
+def _days_since(dates: np.ndarray, today: date) -> np.ndarray:
+    """Días desde cada fecha; NaT da un valor cualquiera (filtrar con np.isnat)"""
+    days = (np.datetime64(today, "D") - dates).astype(np.int64)
+    return np.where(np.isnat(dates), 0, days)
+
+
+# Tramo ministerial de calculate_commitment_score: 2+ ministerios, 1, sólo grupo pequeño, nada
+_MANY_MINISTRIES, _ONE_MINISTRY, _SMALL_GROUP_ONLY, _NO_MINISTRY = range(4)
+
+
+@dataclass
+class ScoringFeatures:
+    """Entradas derivadas que no dependen de las reglas, para una fecha de referencia"""
+    attendance_rate: np.ndarray     # float64
+    has_attendance: np.ndarray      # bool
+    days_since_last: np.ndarray     # int64, 0 si no hay registro
+    ministry_tier: np.ndarray       # int8, _MANY_MINISTRIES.._NO_MINISTRY
+    engagement: np.ndarray          # int8, bit 0 dones, bit 1 líder de grupo
+    commitment_score: np.ndarray    # float64, score guardado
+    visitor_days: np.ndarray        # int64, días de membresía de los visitantes (mínimo int64 si no aplica)
+    fixed_factors: np.ndarray       # int64, bits de sin_participacion_ministerial / sin_grupo_pequeno
+
+    def __len__(self) -> int:
+        return len(self.attendance_rate)
+
+    @classmethod
+    def from_columns(cls, columns: MemberScoringColumns, today: date) -> "ScoringFeatures":
+        count = columns.ministries_count
+        ministry_tier = np.select(
+            [count >= 2, count == 1, columns.has_small_group],
+            [_MANY_MINISTRIES, _ONE_MINISTRY, _SMALL_GROUP_ONLY],
+            default=_NO_MINISTRY
+        ).astype(np.int8)
+
+        visitor = columns.is_visitor & ~np.isnat(columns.membership_date)
+        visitor_days = np.where(visitor, _days_since(columns.membership_date, today), np.iinfo(np.int64).min)
+
+        fixed_factors = (
+            np.where(count == 0, FACTOR_BITS["sin_participacion_ministerial"], 0)
+            | np.where(columns.has_small_group, 0, FACTOR_BITS["sin_grupo_pequeno"])
+        )
+
+        return cls(
+            attendance_rate=columns.attendance_rate,
+            has_attendance=~np.isnat(columns.last_attendance),
+            days_since_last=_days_since(columns.last_attendance, today),
+            ministry_tier=ministry_tier,
+            engagement=(columns.has_spiritual_gifts | (columns.is_group_leader << 1)).astype(np.int8),
+            commitment_score=columns.commitment_score,
+            visitor_days=visitor_days.astype(np.int64),
+            fixed_factors=fixed_factors.astype(np.int64),
+        )
+
+
+class _Ladder:
+    """
+    Escalón if/elif compilado: umbrales ascendentes + valores por tramo
+
+    op es la comparación del escalón (">=" y ">" con umbrales descendentes,
+    "<" con ascendentes). La cantidad de umbrales que cumple cada valor
+    identifica el primer tramo que ganaría en el if/elif; con 2-4 umbrales,
+    sumar comparaciones es bastante más rápido que np.searchsorted.
+    `points` y `factors` son los puntos y bits de FACTOR_BITS por tramo.
+    """
+
+    def __init__(self, tiers, op: str, factors: Sequence[str] = ()):
+        n = len(tiers)
+        thresholds = [float(threshold) for threshold, _ in tiers]
+        if op == "<":
+            # tramos cumplidos = umbrales <= valor; el primero que el valor no alcanza gana
+            self.thresholds, order = thresholds, list(range(n)) + [-1]
+        else:
+            # tramos cumplidos = umbrales <= valor (>=) o < valor (>); el más alto cumplido gana
+            self.thresholds, order = thresholds[::-1], [-1] + list(range(n - 1, -1, -1))
+        self.strict = op == ">"
+
+        def table(values):
+            return np.array([values[i] if i >= 0 else 0 for i in order], dtype=np.int64)
+
+        self.points = table([points for _, points in tiers])
+        self.factors = table([FACTOR_BITS[name] for name in factors]) if factors else None
+
+    def bucket(self, values: np.ndarray) -> np.ndarray:
+        """Cuántos umbrales cumple cada valor (índice en points/factors)"""
+        bucket = np.zeros(len(values), dtype=np.int8)
+        for threshold in self.thresholds:
+            bucket += (values > threshold) if self.strict else (values >= threshold)
+        return bucket
+
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        return np.take(self.points, self.bucket(values))
+
+
+@dataclass(frozen=True)
+class _CompiledRules:
+    attendance: _Ladder
+    ministry: np.ndarray            # puntos por ministry_tier
+    recent: _Ladder
+    engagement: np.ndarray          # puntos por bits de engagement
+    absence: _Ladder
+    low_attendance: _Ladder
+    low_commitment: _Ladder
+    risk_level: _Ladder
+
+
+@lru_cache(maxsize=32)
+def _compile(rules: ScoringRules) -> _CompiledRules:
+    """Escalones de una versión de reglas como tablas NumPy (una vez por versión)"""
+    gifts, leader = rules.spiritual_gifts_points, rules.group_leader_points
+    return _CompiledRules(
+        attendance=_Ladder(rules.attendance_points, ">="),
+        ministry=np.array(
+            [rules.many_ministries_points, rules.one_ministry_points, rules.small_group_points, 0], dtype=np.int64
+        ),
+        recent=_Ladder(rules.recent_attendance_points, "<"),
+        engagement=np.array([0, gifts, leader, gifts + leader], dtype=np.int64),
+        absence=_Ladder(rules.absence_risk, ">", ABSENCE_FACTORS),
+        low_attendance=_Ladder(rules.low_attendance_risk, "<", LOW_ATTENDANCE_FACTORS),
+        low_commitment=_Ladder(rules.low_commitment_risk, "<", LOW_COMMITMENT_FACTORS),
+        # "puntos" = índice en RISK_LEVELS
+        risk_level=_Ladder(
+            [(threshold, level) for level, threshold in zip((3, 2, 1), rules.risk_level_thresholds)], ">="
+        ),
+    )
+
+
+def _commitment_from_features(features: ScoringFeatures, rules: ScoringRules) -> np.ndarray:
+    compiled = _compile(rules)
+    recent = np.where(features.has_attendance, compiled.recent(features.days_since_last), 0)
+    score = (
+        compiled.attendance(features.attendance_rate)
+        + np.take(compiled.ministry, features.ministry_tier)
+        + recent
+        + np.take(compiled.engagement, features.engagement)
+    ).astype(np.float64)
+    return np.minimum(100.0, score)
+
+
+def _risk_from_features(features: ScoringFeatures, rules: ScoringRules, commitment: np.ndarray):
+    compiled = _compile(rules)
+    has_attendance = features.has_attendance
+
+    absence = compiled.absence.bucket(features.days_since_last)
+    low_attendance = compiled.low_attendance.bucket(features.attendance_rate)
+    low_commitment = compiled.low_commitment.bucket(commitment)
+
+    no_ministry = features.fixed_factors & FACTOR_BITS["sin_participacion_ministerial"]
+    no_group = features.fixed_factors & FACTOR_BITS["sin_grupo_pequeno"]
+    stalled_visitor = features.visitor_days > rules.stalled_visitor_days
+
+    risk_score = (
+        np.where(has_attendance, np.take(compiled.absence.points, absence), rules.no_attendance_risk)
+        + np.take(compiled.low_attendance.points, low_attendance)
+        + np.where(no_ministry, rules.no_ministry_risk, 0)
+        + np.where(no_group, rules.no_small_group_risk, 0)
+        + np.take(compiled.low_commitment.points, low_commitment)
+        + np.where(stalled_visitor, rules.stalled_visitor_risk, 0)
+    )
+
+    risk_factors = (
+        np.where(has_attendance, np.take(compiled.absence.factors, absence), FACTOR_BITS["sin_registro_asistencia"])
+        | np.take(compiled.low_attendance.factors, low_attendance)
+        | features.fixed_factors
+        | np.take(compiled.low_commitment.factors, low_commitment)
+        | np.where(stalled_visitor, FACTOR_BITS["visitante_estancado"], 0)
+    )
+
+    risk_level = compiled.risk_level(risk_score).astype(np.int8)
+
+    return np.minimum(100, risk_score), risk_level, risk_factors
+
+
+def commitment_scores(
+    columns: MemberScoringColumns, today: date, rules: ScoringRules = DEFAULT_RULES
+) -> np.ndarray:
+    """Vectorización de MemberAIService.calculate_commitment_score"""
+    return _commitment_from_features(ScoringFeatures.from_columns(columns, today), rules)
+
+
+def abandonment_risk(
+    columns: MemberScoringColumns,
+    today: date,
+    commitment_score: Optional[np.ndarray] = None,
+    rules: ScoringRules = DEFAULT_RULES
+):
+    """
+    Vectorización de MemberAIService.detect_abandonment_risk
+
+    commitment_score reemplaza al score guardado (p. ej. el recién calculado).
+    Retorna (risk_score, risk_level, risk_factors).
+    """
+    features = ScoringFeatures.from_columns(columns, today)
+    commitment = features.commitment_score if commitment_score is None else commitment_score
+    return _risk_from_features(features, rules, commitment)
+
+
+def score_features(features: ScoringFeatures, rules: ScoringRules = DEFAULT_RULES) -> MemberScoringResult:
+    """score_members sobre entradas ya derivadas (para evaluar varias versiones de reglas)"""
+    commitment = _commitment_from_features(features, rules)
+    risk_score, risk_level, risk_factors = _risk_from_features(features, rules, commitment)
+    return MemberScoringResult(
+        commitment_score=commitment,
+        risk_score=risk_score,
+        risk_level=risk_level,
+        risk_factors=risk_factors
+    )
+
+
+def score_members(
+    columns: MemberScoringColumns,
+    today: Optional[date] = None,
+    rules: ScoringRules = DEFAULT_RULES
+) -> MemberScoringResult:
+    """
+    Recalcula commitment_score y el riesgo de todos los miembros
+
+    Igual que los endpoints: el riesgo se evalúa con el score recién calculado.
+    """
+    return score_features(ScoringFeatures.from_columns(columns, today or date.today()), rules)
+
+
+@dataclass
+class ShadowEvaluation:
+    """Una iglesia puntuada con su versión de reglas y con una candidata"""
+    current: MemberScoringResult
+    candidate: MemberScoringResult
+
+    @property
+    def level_changed(self) -> np.ndarray:
+        """Posiciones de los miembros cuyo nivel de riesgo cambia con la candidata"""
+        return np.flatnonzero(self.current.risk_level != self.candidate.risk_level)
+
+    @property
+    def score_changed(self) -> int:
+        return int(np.count_nonzero(self.current.commitment_score != self.candidate.commitment_score))
+
+    def transitions(self) -> Dict[str, Dict[str, int]]:
+        """Matriz nivel actual -> nivel candidato (sólo celdas no vacías)"""
+        n = len(RISK_LEVELS)
+        cells = np.bincount(
+            self.current.risk_level.astype(np.int64) * n + self.candidate.risk_level, minlength=n * n
+        ).reshape(n, n)
+        return {
+            RISK_LEVELS[i]: {RISK_LEVELS[j]: int(cells[i, j]) for j in range(n) if cells[i, j]}
+            for i in range(n) if cells[i].any()
+        }
+
+
+def shadow_evaluate(
+    columns: MemberScoringColumns,
+    current: ScoringRules,
+    candidate: ScoringRules,
+    today: Optional[date] = None
+) -> ShadowEvaluation:
+    """
+    Puntúa la iglesia con ambas versiones de reglas sin guardar nada
+
+    Las entradas derivadas se calculan una sola vez; la candidata sólo suma
+    sus lookups, así la evaluación en sombra cuesta poco más que el scoring
+    normal (benchmarks/bench_scoring_rules.py).
+    """
+    features = ScoringFeatures.from_columns(columns, today or date.today())
+    return ShadowEvaluation(
+        current=score_features(features, current),
+        candidate=score_features(features, candidate)
+    )
@@ -0,0 +1,188 @@
+# app/domain/services/ministry_matching.py
+"""
+Asignación de ministerios por dones y habilidades, precompilada
+
+Las tablas de dones y habilidades se compilan una sola vez por proceso
+(MINISTRY_MATCHER): los dones son un lookup exacto en minúsculas y las
+habilidades se buscan como subcadenas con una sola regex que reconoce todas
+las claves a la vez (lookahead, así también encuentra claves solapadas).
+
+MinistryMatcher.suggest reproduce las reglas de
+MemberAIService.suggest_ministry_assignments y rank_candidates evalúa esas
+mismas reglas para un solo ministerio sobre toda una iglesia en una pasada.
+"""
+import heapq
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+GIFT_FIT_SCORE = 85
+SKILL_FIT_SCORE = 75
+MAX_SUGGESTIONS = 5
+
+GIFT_TO_MINISTRY = {
+    "enseñanza": ["escuela_dominical", "jovenes", "discipulado"],
+    "musica": ["alabanza", "coro", "banda"],
+    "evangelismo": ["evangelismo", "visitacion", "redes_sociales"],
+    "servicio": ["ujieres", "limpieza", "cocina", "mantenimiento"],
+    "administracion": ["secretaria", "administracion", "finanzas"],
+    "misericordia": ["visitacion_enfermos", "benevolencia", "consejeria"],
+    "liderazgo": ["grupos_pequenos", "coordinacion", "jovenes"],
+    "hospitalidad": ["recepcion", "nuevos_miembros", "eventos"],
+    "intercesion": ["intercesion", "oracion", "vigilia"],
+    "profecia": ["predicacion", "ensenanza", "consejeria"],
+    "fe": ["misionero", "plantacion_iglesias", "oracion"],
+    "sanidad": ["visitacion_enfermos", "oracion", "consejeria"]
+}
+
+# Se busca la clave como subcadena de la habilidad ("diseño gráfico" -> diseño)
+SKILL_TO_MINISTRY = {
+    "diseño": ["redes_sociales", "creatividad", "comunicaciones"],
+    "contabilidad": ["finanzas", "administracion"],
+    "tecnologia": ["audiovisual", "redes_sociales", "streaming"],
+    "cocina": ["cocina", "eventos"],
+    "construccion": ["mantenimiento", "proyectos"],
+    "educacion": ["escuela_dominical", "jovenes"]
+}
+
+
+class MinistryMatcher:
+    """Tablas de dones/habilidades compiladas a lookups e índices invertidos"""
+
+    def __init__(
+        self,
+        gift_to_ministry: Dict[str, List[str]] = GIFT_TO_MINISTRY,
+        skill_to_ministry: Dict[str, List[str]] = SKILL_TO_MINISTRY
+    ):
+        self.gift_to_ministry = {gift: tuple(ministries) for gift, ministries in gift_to_ministry.items()}
+        self.skill_to_ministry = {key: tuple(ministries) for key, ministries in skill_to_ministry.items()}
+        # Orden de las claves en la tabla: decide qué razón gana al deduplicar
+        self._skill_order = {key: position for position, key in enumerate(self.skill_to_ministry)}
+        self._skill_pattern = re.compile(
+            "(?=(" + "|".join(re.escape(key) for key in self.skill_to_ministry) + "))"
+        )
+        # Las habilidades se repiten mucho dentro de una iglesia
+        self.skill_keys = lru_cache(maxsize=4096)(self._match_skill)
+
+        # Índices invertidos: ministerio -> dones / claves de habilidad que lo sugieren
+        self.ministry_gifts: Dict[str, frozenset] = {}
+        self.ministry_skill_keys: Dict[str, frozenset] = {}
+        for gift, ministries in self.gift_to_ministry.items():
+            for ministry in ministries:
+                self.ministry_gifts[ministry] = self.ministry_gifts.get(ministry, frozenset()) | {gift}
+        for key, ministries in self.skill_to_ministry.items():
+            for ministry in ministries:
+                self.ministry_skill_keys[ministry] = self.ministry_skill_keys.get(ministry, frozenset()) | {key}
+
+    @property
+    def ministries(self) -> frozenset:
+        """Ministerios que alguna regla puede sugerir"""
+        return frozenset(self.ministry_gifts) | frozenset(self.ministry_skill_keys)
+
+    def _match_skill(self, skill: str) -> Tuple[str, ...]:
+        """Claves de SKILL_TO_MINISTRY contenidas en la habilidad, en orden de la tabla"""
+        found = {match.group(1) for match in self._skill_pattern.finditer(skill.lower())}
+        if len(found) > 1:
+            return tuple(sorted(found, key=self._skill_order.__getitem__))
+        return tuple(found)
+
+    def suggest(
+        self,
+        spiritual_gifts: Optional[List[str]],
+        skills: Optional[List[str]],
+        ministries: Optional[List[str]],
+        limit: int = MAX_SUGGESTIONS
+    ) -> List[Dict]:
+        """Ministerios sugeridos (sin repetir, por fit_score desc), excluyendo los actuales"""
+        if not spiritual_gifts:
+            return []
+
+        current = {m.lower() for m in ministries} if ministries else frozenset()
+        # dict conserva el orden de inserción: la primera razón de cada ministerio gana
+        unique: Dict[str, Dict] = {}
+
+        for gift in spiritual_gifts:
+            for ministry in self.gift_to_ministry.get(gift.lower(), ()):
+                if ministry not in current and ministry not in unique:
+                    unique[ministry] = {"ministry": ministry, "reason": f"Don de {gift}", "fit_score": GIFT_FIT_SCORE}
+
+        for skill in skills or ():
+            for key in self.skill_keys(skill):
+                for ministry in self.skill_to_ministry[key]:
+                    if ministry not in current and ministry not in unique:
+                        unique[ministry] = {
+                            "ministry": ministry, "reason": f"Habilidad en {skill}", "fit_score": SKILL_FIT_SCORE
+                        }
+
+        # Los de don se insertan antes y tienen mayor fit_score: ya están ordenados
+        return list(unique.values())[:limit]
+
+    def fit(
+        self,
+        ministry: str,
+        spiritual_gifts: Optional[List[str]],
+        skills: Optional[List[str]],
+        ministries: Optional[List[str]]
+    ) -> Optional[Tuple[int, str]]:
+        """
+        (fit_score, razón) del ministerio para un miembro, o None si no aplica
+
+        Misma razón que tendría el ministerio en suggest (sin el tope de
+        MAX_SUGGESTIONS).
+        """
+        if not spiritual_gifts:
+            return None
+        if ministries and any(m.lower() == ministry for m in ministries):
+            return None
+
+        gifts = self.ministry_gifts.get(ministry)
+        if gifts:
+            for gift in spiritual_gifts:
+                if gift.lower() in gifts:
+                    return GIFT_FIT_SCORE, f"Don de {gift}"
+
+        keys = self.ministry_skill_keys.get(ministry)
+        if keys and skills:
+            for skill in skills:
+                if not keys.isdisjoint(self.skill_keys(skill)):
+                    return SKILL_FIT_SCORE, f"Habilidad en {skill}"
+
+        return None
+
+    def rank_candidates(self, ministry: str, members: Iterable, limit: int) -> List[Dict]:
+        """
+        Los mejores candidatos de la iglesia para un ministerio, en una pasada
+
+        members: filas con id, first_name, last_name, spiritual_gifts, skills,
+        ministries, commitment_score, attendance_rate y risk_level. Orden:
+        fit_score, luego commitment_score y attendance_rate; se guarda sólo
+        el top `limit` (heap), no toda la iglesia.
+        """
+        ministry = ministry.lower()
+        ranked = heapq.nlargest(
+            limit,
+            (
+                (fit[0], member.commitment_score or 0, member.attendance_rate or 0, fit[1], member)
+                for member in members
+                for fit in (self.fit(ministry, member.spiritual_gifts, member.skills, member.ministries),)
+                if fit is not None
+            ),
+            key=lambda entry: entry[:3]
+        )
+        return [
+            {
+                "member_id": member.id,
+                "first_name": member.first_name,
+                "last_name": member.last_name,
+                "fit_score": fit_score,
+                "reason": reason,
+                "commitment_score": commitment_score,
+                "attendance_rate": attendance_rate,
+                "risk_level": member.risk_level,
+            }
+            for fit_score, commitment_score, attendance_rate, reason, member in ranked
+        ]
+
+
+# Compilado una vez por proceso
+MINISTRY_MATCHER = MinistryMatcher()
@@ -0,0 +1,156 @@
+# app/domain/services/scoring_rules.py
+"""
+Reglas de scoring versionadas (commitment_score y riesgo de abandono)
+
+Los umbrales y puntos de calculate_commitment_score y detect_abandonment_risk
+viven en un ScoringRules inmutable con número de versión. SCORING_RULES es el
+registro de versiones publicadas: cada iglesia fija la suya en
+churches.scoring_rules_version (NULL = CURRENT_RULES_VERSION) y una versión
+candidata se puede evaluar en sombra sobre toda la iglesia antes de fijarla
+(shadow_evaluate en member_scoring.py).
+
+Cada escalón es una tupla de (umbral, puntos) que se recorre como el if/elif
+original: el primero que cumple gana. Los umbrales deben ser monótonos en el
+sentido del escalón (se valida al construir), así el escalón equivale a
+ubicar el valor entre umbrales y los caminos escalar, NumPy y SQL coinciden.
+
+Los escalones de riesgo llevan un factor por tramo (RISK_FACTORS), por eso
+la cantidad de tramos de ausencia, asistencia baja y compromiso bajo es fija.
+"""
+from dataclasses import dataclass, replace
+from typing import Dict, Optional, Tuple
+
+RISK_LEVELS = ("bajo", "medio", "alto", "critico")
+
+# Un bit por factor, en el mismo orden en que detect_abandonment_risk los agrega
+RISK_FACTORS = (
+    "ausencia_critica_60_dias",
+    "ausencia_prolongada_30_dias",
+    "ausencia_21_dias",
+    "ausencia_14_dias",
+    "sin_registro_asistencia",
+    "asistencia_muy_baja",
+    "asistencia_baja",
+    "asistencia_irregular",
+    "sin_participacion_ministerial",
+    "sin_grupo_pequeno",
+    "compromiso_muy_bajo",
+    "compromiso_bajo",
+    "visitante_estancado",
+)
+
+# Factores de cada tramo de los escalones de riesgo
+ABSENCE_FACTORS = RISK_FACTORS[0:4]
+LOW_ATTENDANCE_FACTORS = RISK_FACTORS[5:8]
+LOW_COMMITMENT_FACTORS = RISK_FACTORS[10:12]
+
+GROUP_LEADER_ROLES = ("lider", "anfitrion")
+
+Tiers = Tuple[Tuple[float, int], ...]
+
+
+class UnknownRulesVersion(KeyError):
+    """Versión de reglas que no está en SCORING_RULES"""
+
+
+@dataclass(frozen=True)
+class ScoringRules:
+    version: int
+    description: str = ""
+
+    # --- calculate_commitment_score ---
+    # attendance_rate >= umbral
+    attendance_points: Tiers = ((80, 40), (60, 30), (40, 20), (20, 10))
+    many_ministries_points: int = 30    # 2 o más ministerios
+    one_ministry_points: int = 20
+    small_group_points: int = 10        # sin ministerios pero en un grupo pequeño
+    # días sin asistir < umbral
+    recent_attendance_points: Tiers = ((7, 20), (14, 15), (21, 10), (30, 5))
+    spiritual_gifts_points: int = 5
+    group_leader_points: int = 5
+
+    # --- detect_abandonment_risk ---
+    # días sin asistir > umbral (ABSENCE_FACTORS)
+    absence_risk: Tiers = ((60, 35), (30, 25), (21, 15), (14, 10))
+    no_attendance_risk: int = 20
+    # attendance_rate < umbral (LOW_ATTENDANCE_FACTORS)
+    low_attendance_risk: Tiers = ((20, 25), (40, 15), (60, 10))
+    no_ministry_risk: int = 15
+    no_small_group_risk: int = 10
+    # commitment_score < umbral (LOW_COMMITMENT_FACTORS)
+    low_commitment_risk: Tiers = ((30, 15), (50, 10))
+    stalled_visitor_days: int = 90
+    stalled_visitor_risk: int = 15
+    # risk_score >= umbral: critico, alto, medio
+    risk_level_thresholds: Tuple[int, int, int] = (70, 50, 30)
+
+    def __post_init__(self):
+        _check_tiers("attendance_points", self.attendance_points, descending=True)
+        _check_tiers("recent_attendance_points", self.recent_attendance_points, descending=False)
+        _check_tiers("absence_risk", self.absence_risk, descending=True, size=len(ABSENCE_FACTORS))
+        _check_tiers("low_attendance_risk", self.low_attendance_risk, descending=False, size=len(LOW_ATTENDANCE_FACTORS))
+        _check_tiers("low_commitment_risk", self.low_commitment_risk, descending=False, size=len(LOW_COMMITMENT_FACTORS))
+        _check_tiers(
+            "risk_level_thresholds", tuple((t, 0) for t in self.risk_level_thresholds),
+            descending=True, size=len(RISK_LEVELS) - 1
+        )
+
+    @property
+    def attendance_boundary_days(self) -> Tuple[int, ...]:
+        """
+        Días sin asistir en que el scoring cambia solo con el paso del tiempo
+
+        El commitment baja al llegar a cada umbral de recent_attendance_points
+        (days < umbral deja de cumplirse) y el riesgo sube al superar cada
+        umbral de absence_risk (days > umbral, o sea umbral + 1).
+        """
+        days = {int(t) for t, _ in self.recent_attendance_points}
+        days |= {int(t) + 1 for t, _ in self.absence_risk}
+        return tuple(sorted(days))
+
+    @property
+    def visitor_boundary_days(self) -> int:
+        """Días de membresía en que un visitante pasa a estancado"""
+        return self.stalled_visitor_days + 1
+
+    def derive(self, version: int, description: str = "", **changes) -> "ScoringRules":
+        """Versión nueva a partir de ésta con algunos umbrales/puntos cambiados"""
+        return replace(self, version=version, description=description, **changes)
+
+
+def _check_tiers(name: str, tiers: Tiers, descending: bool, size: Optional[int] = None):
+    thresholds = [threshold for threshold, _ in tiers]
+    if size is not None and len(thresholds) != size:
+        raise ValueError(f"{name}: se esperaban {size} tramos, hay {len(thresholds)}")
+    ordered = sorted(set(thresholds), reverse=descending)
+    if thresholds != ordered:
+        order = "descendentes" if descending else "ascendentes"
+        raise ValueError(f"{name}: los umbrales deben ser estrictamente {order}")
+
+
+# Versión por defecto de las iglesias sin una fijada
+CURRENT_RULES_VERSION = 1
+
+SCORING_RULES: Dict[int, ScoringRules] = {
+    1: ScoringRules(version=1, description="Reglas originales de MemberAIService"),
+}
+
+DEFAULT_RULES = SCORING_RULES[CURRENT_RULES_VERSION]
+
+
+def get_rules(version: Optional[int] = None) -> ScoringRules:
+    """Reglas de una versión (None = CURRENT_RULES_VERSION)"""
+    if version is None:
+        return DEFAULT_RULES
+    try:
+        return SCORING_RULES[version]
+    except KeyError:
+        raise UnknownRulesVersion(version) from None
+
+
+def register_rules(rules: ScoringRules) -> ScoringRules:
+    """Agrega una versión al registro; las versiones publicadas no se reemplazan"""
+    if rules.version in SCORING_RULES and SCORING_RULES[rules.version] != rules:
+        raise ValueError(f"La versión {rules.version} ya existe con otras reglas")
+    SCORING_RULES[rules.version] = rules
+    return rules
@@ -0,0 +1,6 @@
+from app.infrastructure.archive.attendance_parquet import (
+    ARCHIVE_COLUMNS,
+    archive_path,
+    read_member_attendance,
+    write_attendance_archive
+)
@@ -0,0 +1,137 @@
+# app/infrastructure/archive/attendance_parquet.py
+"""
+Archivos Parquet de attendance_records (un archivo por mes)
+
+Las filas se escriben ordenadas por (member_id, event_date, id) en grupos de
+ARCHIVE_ROW_GROUP filas comprimidos con zstd: las estadísticas de cada grupo
+permiten que el historial de un miembro lea sólo los grupos que lo
+contienen. Los UUID se guardan como texto; los archivos anteriores a
+event_id no tienen esa columna.
+
+pyarrow se importa al usarse: sólo lo necesitan el archivado y los
+historiales con include_archived.
+"""
+import asyncio
+import os
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+ARCHIVE_COLUMNS = (
+    "id", "member_id", "church_id", "event_id", "event_type", "event_name",
+    "event_date", "attended", "arrival_time", "notes", "created_at"
+)
+ARCHIVE_ROW_GROUP = 50_000
+_UUID_COLUMNS = ("id", "member_id", "church_id", "event_id")
+
+
+def archive_path(archive_dir: str, month: date) -> Path:
+    return Path(archive_dir) / f"{month.year:04d}" / f"attendance_records_{month:%Y_%m}.parquet"
+
+
+def _schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("id", pa.string()),
+        ("member_id", pa.string()),
+        ("church_id", pa.string()),
+        ("event_id", pa.string()),
+        ("event_type", pa.string()),
+        ("event_name", pa.string()),
+        ("event_date", pa.date32()),
+        ("attended", pa.bool_()),
+        ("arrival_time", pa.timestamp("us")),
+        ("notes", pa.string()),
+        ("created_at", pa.timestamp("us")),
+    ])
+
+
+def _table(rows: Sequence):
+    import pyarrow as pa
+
+    columns = {name: [getattr(row, name) for row in rows] for name in ARCHIVE_COLUMNS}
+    for name in _UUID_COLUMNS:
+        columns[name] = [str(value) if value is not None else None for value in columns[name]]
+    return pa.Table.from_pydict(columns, schema=_schema())
+
+
+async def write_attendance_archive(path: Path, batches: AsyncIterator[Sequence]) -> int:
+    """
+    Escribe los lotes de filas (atributos = ARCHIVE_COLUMNS) en `path`
+
+    Se escribe a un archivo temporal que se renombra al terminar: un archivo
+    con el nombre final siempre está completo. Retorna las filas escritas.
+    """
+    import pyarrow.parquet as pq
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(".parquet.tmp")
+    writer = pq.ParquetWriter(partial, _schema(), compression="zstd")
+    written = 0
+    try:
+        async for rows in batches:
+            if rows:
+                await asyncio.to_thread(writer.write_table, _table(rows), ARCHIVE_ROW_GROUP)
+                written += len(rows)
+    except BaseException:
+        writer.close()
+        partial.unlink(missing_ok=True)
+        raise
+    writer.close()
+    os.replace(partial, path)
+    return written
+
+
+def _read_member(
+    path: str,
+    member_id: UUID,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    event_type: Optional[str]
+) -> List[SimpleNamespace]:
+    import pyarrow.parquet as pq
+
+    filters = [("member_id", "=", str(member_id))]
+    if date_from:
+        filters.append(("event_date", ">=", date_from))
+    if date_to:
+        filters.append(("event_date", "<=", date_to))
+    if event_type:
+        filters.append(("event_type", "=", event_type))
+
+    rows = pq.read_table(path, filters=filters).to_pylist()
+    for row in rows:
+        for name in _UUID_COLUMNS:
+            if row.get(name) is not None:
+                row[name] = UUID(row[name])
+    return [SimpleNamespace(**row) for row in rows]
+
+
+async def read_member_attendance(
+    paths: Sequence[str],
+    member_id: UUID,
+    limit: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    event_type: Optional[str] = None,
+    before: Optional[Tuple[date, UUID]] = None
+) -> List[SimpleNamespace]:
+    """
+    Registros archivados de un miembro, del más reciente al más antiguo
+
+    `paths` va del mes más reciente al más antiguo y se leen hasta juntar
+    `limit` filas; `before` es la posición (event_date, id) del cursor.
+    """
+    records = []
+    for path in paths:
+        rows = await asyncio.to_thread(_read_member, path, member_id, date_from, date_to, event_type)
+        if before is not None:
+            rows = [row for row in rows if (row.event_date, row.id) < before]
+        rows.sort(key=lambda row: (row.event_date, row.id), reverse=True)
+        records.extend(rows)
+        if len(records) >= limit:
+            break
+    return records[:limit]
@@ -0,0 +1,3 @@
+from app.infrastructure.cache.backends import CacheBackend, InMemoryCacheBackend, RedisCacheBackend
+from app.infrastructure.cache.response_cache import ResponseCache, get_response_cache, set_response_cache
+from app.infrastructure.cache.invalidation import mark_churches_dirty
@@ -0,0 +1,96 @@
+# app/infrastructure/cache/backends.py
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+
+class CacheBackend(ABC):
+    """Operaciones mínimas que necesita ResponseCache"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        ...
+
+    @abstractmethod
+    async def add(self, key: str, value: str, ttl: int) -> bool:
+        """Guarda sólo si la clave no existe (lock); True si la guardó"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Backend local de un solo proceso, para tests y desarrollo sin Redis"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[str, Optional[float]]] = {}
+
+    def _alive(self, key: str) -> Optional[str]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._alive(key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self._data[key] = (value, time.monotonic() + ttl)
+
+    async def add(self, key: str, value: str, ttl: int) -> bool:
+        if self._alive(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        value = int(self._alive(key) or 0) + 1
+        expires_at = self._data[key][1] if key in self._data else None
+        self._data[key] = (str(value), expires_at)
+        return value
+
+
+class RedisCacheBackend(CacheBackend):
+    """Backend compartido entre workers sobre Settings.REDIS_URL"""
+
+    def __init__(self, url: str):
+        from redis import asyncio as redis_asyncio
+
+        self._client = redis_asyncio.from_url(url, decode_responses=True)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self._client.set(key, value, ex=ttl)
+
+    async def add(self, key: str, value: str, ttl: int) -> bool:
+        return bool(await self._client.set(key, value, ex=ttl, nx=True))
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(key)
+
+    async def close(self) -> None:
+        await self._client.close()
@@ -0,0 +1,51 @@
+# app/infrastructure/cache/invalidation.py
+"""
+Invalidación del cache de respuestas al confirmar escrituras
+
+Cada flush anota las iglesias de los miembros, asistencias y snapshots de
+estadísticas modificados; al hacer commit se invalidan esas iglesias. Los
+UPDATE set-based no pasan por el flush: deben llamar a mark_churches_dirty.
+"""
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.infrastructure.cache.response_cache import get_response_cache
+from app.infrastructure.database.models.member import MemberModel, AttendanceRecordModel
+from app.infrastructure.database.models.member_stats import ChurchMemberStatsModel
+
+DIRTY_CHURCHES_KEY = "cache_dirty_churches"
+
+TRACKED_MODELS = (MemberModel, AttendanceRecordModel, ChurchMemberStatsModel)
+
+
+def mark_churches_dirty(session, church_ids: Iterable[UUID]) -> None:
+    """Anota iglesias a invalidar en el próximo commit (Session o AsyncSession)"""
+    session.info.setdefault(DIRTY_CHURCHES_KEY, set()).update(
+        church_id for church_id in church_ids if church_id is not None
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def collect_dirty_churches(session: Session, flush_context) -> None:
+    church_ids = [
+        obj.church_id
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, TRACKED_MODELS)
+    ]
+    if church_ids:
+        mark_churches_dirty(session, church_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_dirty_churches(session: Session) -> None:
+    church_ids = session.info.pop(DIRTY_CHURCHES_KEY, None)
+    if church_ids:
+        get_response_cache().invalidate_later(church_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_dirty_churches(session: Session) -> None:
+    session.info.pop(DIRTY_CHURCHES_KEY, None)
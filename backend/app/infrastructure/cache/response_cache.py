@@ -0,0 +1,199 @@
+# app/infrastructure/cache/response_cache.py
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.infrastructure.cache.backends import CacheBackend, InMemoryCacheBackend, RedisCacheBackend
+from app.infrastructure.database.connection import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Cache de respuestas por iglesia
+
+    Las claves incluyen una generación por iglesia: invalidar es un INCR de
+    la generación y las claves viejas expiran solas por TTL. Un miss se
+    recalcula una sola vez: en el proceso con una tarea compartida por clave
+    y entre workers con un lock (SET NX) mientras los demás esperan el valor.
+    Si el backend falla, se responde sin cache.
+
+    El loader recibe una sesión propia (session_factory), no la del request
+    que provocó el miss: el cálculo compartido sigue aunque ese request se
+    cancele, y su sesión no se usa desde dos tareas a la vez.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        default_ttl: int = 300,
+        lock_ttl: int = 10,
+        wait_interval: float = 0.05,
+        prefix: str = "churchai:members",
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal
+    ):
+        self.backend = backend
+        self.session_factory = session_factory
+        self.default_ttl = default_ttl
+        self.lock_ttl = lock_ttl
+        self.wait_interval = wait_interval
+        self.prefix = prefix
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pending: Set[asyncio.Task] = set()
+        self._metrics = defaultdict(lambda: {"hits": 0, "misses": 0, "errors": 0})
+
+    def _generation_key(self, church_id: UUID) -> str:
+        return f"{self.prefix}:{church_id}:generation"
+
+    async def get_or_load(
+        self,
+        church_id: UUID,
+        kind: str,
+        loader: Callable[[AsyncSession], Awaitable[Any]],
+        item: Optional[Any] = None,
+        ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Valor cacheado de `kind` (y opcionalmente `item`) para la iglesia
+
+        loader(session) calcula el valor en un miss, con una sesión abierta
+        para él; se guarda y se retorna ya serializado a JSON (dicts/listas),
+        igual que en un hit.
+        """
+        await self._flush_pending()
+
+        try:
+            generation = await self.backend.get(self._generation_key(church_id)) or "0"
+            key = f"{self.prefix}:{church_id}:{generation}:{kind}"
+            if item is not None:
+                key = f"{key}:{item}"
+            cached = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"⚠️ Cache unavailable, loading {kind} without cache: {e}")
+            self._metrics[kind]["errors"] += 1
+            return await self._run_loader(loader)
+
+        if cached is not None:
+            self._metrics[kind]["hits"] += 1
+            return json.loads(cached)
+
+        self._metrics[kind]["misses"] += 1
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._load(key, kind, loader, ttl or self.default_ttl))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        return await asyncio.shield(inflight)
+
+    async def _run_loader(self, loader: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        async with self.session_factory() as session:
+            return jsonable_encoder(await loader(session))
+
+    async def _load(self, key: str, kind: str, loader: Callable[[AsyncSession], Awaitable[Any]], ttl: int) -> Any:
+        lock_key = f"{key}:lock"
+        locked = False
+
+        try:
+            locked = await self.backend.add(lock_key, "1", self.lock_ttl)
+            if not locked:
+                # Otro worker está recalculando: esperar su resultado
+                deadline = time.monotonic() + self.lock_ttl
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(self.wait_interval)
+                    cached = await self.backend.get(key)
+                    if cached is not None:
+                        return json.loads(cached)
+                    if await self.backend.get(lock_key) is None:
+                        break
+        except Exception as e:
+            logger.warning(f"⚠️ Cache lock failed for {kind}: {e}")
+            self._metrics[kind]["errors"] += 1
+
+        try:
+            value = await self._run_loader(loader)
+            try:
+                await self.backend.set(key, json.dumps(value), ttl)
+            except Exception as e:
+                logger.warning(f"⚠️ Cache write failed for {kind}: {e}")
+                self._metrics[kind]["errors"] += 1
+            return value
+        finally:
+            if locked:
+                try:
+                    await self.backend.delete(lock_key)
+                except Exception:
+                    pass
+
+    async def invalidate(self, church_id: UUID) -> None:
+        """Descarta todo lo cacheado de la iglesia"""
+        try:
+            await self.backend.incr(self._generation_key(church_id))
+        except Exception as e:
+            logger.error(f"❌ Cache invalidation failed for church {church_id}: {e}")
+
+    def invalidate_later(self, church_ids: Iterable[UUID]) -> None:
+        """
+        Programa la invalidación desde código síncrono (eventos de sesión)
+
+        La próxima lectura de este proceso espera a que termine.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        for church_id in church_ids:
+            task = loop.create_task(self.invalidate(church_id))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _flush_pending(self) -> None:
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Contadores de hits/misses/errores por tipo, desde el arranque del proceso"""
+        result = {}
+        for kind, counters in self._metrics.items():
+            lookups = counters["hits"] + counters["misses"]
+            result[kind] = {
+                **counters,
+                "hit_ratio": round(counters["hits"] / lookups, 4) if lookups else 0.0
+            }
+        return result
+
+    async def close(self) -> None:
+        await self._flush_pending()
+        await self.backend.close()
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Cache compartido de la app (también usable como dependencia de FastAPI)"""
+    global _response_cache
+    if _response_cache is None:
+        if settings.CACHE_BACKEND == "redis":
+            backend = RedisCacheBackend(settings.REDIS_URL)
+        else:
+            backend = InMemoryCacheBackend()
+        _response_cache = ResponseCache(backend, default_ttl=settings.CACHE_TTL_SECONDS)
+    return _response_cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]) -> None:
+    """Reemplaza el cache compartido (tests); None vuelve a crearlo desde settings"""
+    global _response_cache
+    _response_cache = cache
@@ -0,0 +1,23 @@
+# app/infrastructure/database/models/attendance_archive.py
+from sqlalchemy import Column, String, Integer, Date, DateTime
+from datetime import datetime
+
+from app.infrastructure.database.connection import Base
+
+
+class AttendanceArchiveModel(Base):
+    """
+    Meses de attendance_records archivados en Parquet
+
+    jobs/attendance_partitions exporta la partición del mes a `path`
+    (un archivo por mes) y la separa de la tabla en la misma transacción en
+    que registra la fila. Los historiales que piden include_archived leen
+    estos archivos.
+    """
+    __tablename__ = "attendance_archives"
+
+    # Primer día del mes archivado
+    month = Column(Date, primary_key=True)
+    path = Column(String(500), nullable=False)
+    records = Column(Integer, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
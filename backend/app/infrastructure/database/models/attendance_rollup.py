@@ -0,0 +1,29 @@
+# app/infrastructure/database/models/attendance_rollup.py
+from sqlalchemy import Column, String, Integer, Date, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+
+from app.infrastructure.database.connection import Base
+
+
+class AttendanceWeeklyRollupModel(Base):
+    """
+    Asistencia agregada por iglesia, tipo de evento y semana
+
+    week_start es el lunes de la semana (date_trunc('week')). Cada registro de
+    asistencia suma a su fila en la misma transacción
+    (AttendanceRollupRepository.add_records); jobs/attendance_rollups la
+    reconstruye desde attendance_records. Las series de
+    GET /attendance/weekly se leen sólo de aquí.
+    """
+    __tablename__ = "attendance_weekly_rollups"
+
+    church_id = Column(UUID(as_uuid=True), ForeignKey('churches.id', ondelete="CASCADE"), primary_key=True)
+    event_type = Column(String(50), primary_key=True)
+    week_start = Column(Date, primary_key=True)
+
+    # Registros de la semana (presentes y ausentes) y asistencias
+    records = Column(Integer, nullable=False, default=0)
+    attended = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -0,0 +1,55 @@
+# app/infrastructure/database/models/background_job.py
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+import uuid
+
+from app.infrastructure.database.connection import Base
+
+
+class BackgroundJobModel(Base):
+    """
+    Trabajo en segundo plano sobre una iglesia (p. ej. recalcular scores)
+
+    El progreso se guarda por lotes junto con los cambios del lote: `cursor`
+    es el último member_id confirmado, así un trabajo interrumpido continúa
+    desde ahí. `heartbeat_at` funciona como lease: un trabajo "running" sin
+    latido reciente puede ser retomado por otro proceso.
+    """
+    __tablename__ = "background_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    church_id = Column(UUID(as_uuid=True), ForeignKey('churches.id', ondelete="CASCADE"), nullable=False)
+    created_by = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete="SET NULL"), nullable=True)
+
+    job_type = Column(String(50), nullable=False)  # recalculate_members
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, completed, failed
+
+    chunk_size = Column(Integer, nullable=False, default=500)
+    cursor = Column(UUID(as_uuid=True), nullable=True)
+
+    total = Column(Integer, nullable=True)
+    processed = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=False, default=list)  # últimos errores [{member_id, error, at}]
+    attempts = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Un solo trabajo activo por iglesia y tipo (dos POST simultáneos)
+        Index(
+            "ux_background_jobs_church_type_active", "church_id", "job_type",
+            unique=True,
+            postgresql_where=text("status IN ('pending', 'running')")
+        ),
+        # Barrido de trabajos sin latido
+        Index("ix_background_jobs_status_heartbeat", "status", "heartbeat_at"),
+    )
+
+    def __repr__(self):
+        return f"<BackgroundJob {self.job_type} {self.status}>"
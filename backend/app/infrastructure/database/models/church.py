@@ -1,5 +1,5 @@
 # app/infrastructure/database/models/church.py
-from sqlalchemy import Column, String, DateTime, Float, ForeignKey, Text, JSON
+from sqlalchemy import Column, String, DateTime, Float, ForeignKey, Text, JSON, Integer, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -18,7 +18,7 @@ class ChurchModel(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Owner - Pastor que registró la iglesia
-    owner_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    owner_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     
     # Información básica
     name = Column(String(500), nullable=False, index=True)
@@ -38,6 +38,9 @@ class ChurchModel(Base):
     ai_recommendation = Column(String(100), nullable=True)
     validation_notes = Column(JSON, nullable=True)
     
+    # Versión de reglas de scoring fijada (scoring_rules.py); NULL = CURRENT_RULES_VERSION
+    scoring_rules_version = Column(Integer, nullable=True)
+    
     # Legal information
     legal_registration_number = Column(String(500), nullable=False)
     legal_representative_name = Column(String(500), nullable=False)
@@ -47,7 +50,7 @@ class ChurchModel(Base):
     registration_date = Column(String(50), nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relaciones
@@ -58,11 +61,19 @@ class ChurchModel(Base):
     legal_documents = relationship("LegalDocumentModel", back_populates="church")
     members = relationship("MemberModel", back_populates="church", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Iglesias con versión de reglas fijada (rescore_due: un UPDATE por versión)
+        Index(
+            "ix_churches_scoring_rules_version", "scoring_rules_version",
+            postgresql_where=text("scoring_rules_version IS NOT NULL")
+        ),
+    )
+
 class AddressModel(Base):
     __tablename__ = "addresses"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    church_id = Column(UUID(as_uuid=True), ForeignKey("churches.id"), nullable=False)
+    church_id = Column(UUID(as_uuid=True), ForeignKey("churches.id"), nullable=False, index=True)
     
     street = Column(String(500), nullable=False)
     number = Column(String(50), nullable=False)
@@ -83,7 +94,7 @@ class ContactInfoModel(Base):
     __tablename__ = "contact_info"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    church_id = Column(UUID(as_uuid=True), ForeignKey("churches.id"), nullable=False)
+    church_id = Column(UUID(as_uuid=True), ForeignKey("churches.id"), nullable=False, index=True)
     
     primary_email = Column(String(255), nullable=False, index=True)
     secondary_email = Column(String(255), nullable=True)
@@ -104,7 +115,7 @@ class LegalDocumentModel(Base):
     __tablename__ = "legal_documents"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    church_id = Column(UUID(as_uuid=True), ForeignKey("churches.id"), nullable=False)
+    church_id = Column(UUID(as_uuid=True), ForeignKey("churches.id"), nullable=False, index=True)
     
     document_type = Column(String(100), nullable=False)
     document_number = Column(String(500), nullable=False)
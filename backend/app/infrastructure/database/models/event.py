@@ -0,0 +1,41 @@
+# app/infrastructure/database/models/event.py
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+import uuid
+
+from app.infrastructure.database.connection import Base
+
+
+class EventModel(Base):
+    """
+    Evento de la iglesia (una ocurrencia: el culto de un domingo, la vigilia de Pascua)
+
+    Los registros de asistencia apuntan al evento con event_id. records y
+    headcount se mantienen con cada registro, en la misma transacción
+    (EventRepository.add_headcount): los totales de un evento no recorren
+    attendance_records y sobreviven al archivado de su mes. recurrence
+    describe la serie a la que pertenece la ocurrencia (None = única).
+    """
+    __tablename__ = "events"
+    __table_args__ = (
+        # Una ocurrencia por iglesia, tipo, nombre y hora de inicio
+        UniqueConstraint("church_id", "event_type", "name", "starts_at", name="uq_events_church_type_name_start"),
+        Index("ix_events_church_starts", "church_id", "starts_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    church_id = Column(UUID(as_uuid=True), ForeignKey('churches.id', ondelete="CASCADE"), nullable=False)
+
+    event_type = Column(String(50), nullable=False)
+    name = Column(String(200), nullable=False)
+    starts_at = Column(DateTime, nullable=False)
+    # weekly, biweekly, monthly, yearly (EventRecurrence)
+    recurrence = Column(String(20), nullable=True)
+
+    # Registros del evento (presentes y ausentes) y presentes
+    records = Column(Integer, nullable=False, default=0)
+    headcount = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -1,11 +1,12 @@
 # app/infrastructure/database/models/member.py
-from sqlalchemy import Column, String, Integer, Float, Boolean, Date, DateTime, ForeignKey, JSON, Text, ARRAY
+from sqlalchemy import Column, String, Integer, Float, Boolean, Date, DateTime, ForeignKey, JSON, Text, ARRAY, Index, DDL, cast, event, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
 
 from app.infrastructure.database.connection import Base
+from app.infrastructure.database.models.event import EventModel
 
 class MemberModel(Base):
     """Modelo de miembros de la iglesia"""
@@ -62,6 +63,9 @@ class MemberModel(Base):
     # IA y Seguimiento
     commitment_score = Column(Float, default=0.0)
     attendance_rate = Column(Float, default=0.0)
+    # Registros y asistencias de la ventana de attendance_rate (jobs/attendance_window)
+    attendance_window_total = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    attendance_window_attended = Column(Integer, nullable=False, default=0, server_default=text("0"))
     participation_rate = Column(Float, default=0.0)
     last_attendance = Column(Date)
     last_contact = Column(Date)
@@ -89,10 +93,127 @@ class MemberModel(Base):
     attendance_records = relationship("AttendanceRecordModel", back_populates="member", cascade="all, delete-orphan")
     spouse = relationship("MemberModel", remote_side=[id], foreign_keys=[spouse_member_id])
 
+    __table_args__ = (
+        # Paginación por cursor: ORDER BY last_name, first_name, id dentro de la iglesia
+        Index("ix_members_church_name_keyset", "church_id", "last_name", "first_name", "id"),
+        # Miembros en riesgo de la iglesia (list_at_risk)
+        Index("ix_members_church_risk", "church_id", "risk_level"),
+        # Recorrido por lotes de toda la iglesia (recálculo en segundo plano)
+        Index("ix_members_church_id_keyset", "church_id", "id"),
+        # Umbrales de scoring que vencen en el día (rescore_due)
+        Index("ix_members_last_attendance", "last_attendance"),
+        Index(
+            "ix_members_visitor_membership", "membership_date",
+            postgresql_where=text("member_type = 'visitante'")
+        ),
+    )
+
+
+# ==================== BÚSQUEDA ====================
+# Las constantes van como text() para que la expresión de la consulta coincida
+# textualmente con la del índice (con parámetros el planner no lo usa).
+
+def unaccent_lower(expr):
+    """lower() + unaccent inmutable (f_unaccent), apto para índices"""
+    return func.f_unaccent(func.lower(expr))
+
+
+_SPACE = text("' '")
+_EMPTY = text("''")
+
+# "nombre apellido email" normalizado: "Pérez" y "Perez" indexan igual
+member_search_document = unaccent_lower(
+    func.coalesce(MemberModel.first_name, _EMPTY)
+    .concat(_SPACE)
+    .concat(func.coalesce(MemberModel.last_name, _EMPTY))
+    .concat(_SPACE)
+    .concat(func.coalesce(MemberModel.email, _EMPTY))
+)
+member_search_vector = func.to_tsvector(text("'simple'::regconfig"), member_search_document)
+
+# Sólo dígitos: "+54 9 11 1234-5678" -> "5491112345678"
+member_phone_digits = func.regexp_replace(
+    func.coalesce(MemberModel.phone, _EMPTY), text("'[^0-9]'"), _EMPTY, text("'g'")
+)
+
+
+def _search_extensions_available(ddl, target, bind, **kw) -> bool:
+    """
+    unaccent y pg_trgm instalables en el servidor (vienen con contrib)
+
+    Sin ellas create_all deja afuera la función y los índices de búsqueda en
+    lugar de fallar; en producción los crea la migración 003.
+    """
+    if bind is None:
+        return False
+    result = bind.execute(
+        text("SELECT count(*) FROM pg_available_extensions WHERE name IN ('unaccent', 'pg_trgm')")
+    )
+    return result.scalar() == 2
+
+
+Index(
+    "ix_members_search_trgm",
+    member_search_document.label("search_document"),
+    postgresql_using="gin",
+    postgresql_ops={"search_document": "gin_trgm_ops"}
+).ddl_if(callable_=_search_extensions_available)
+Index("ix_members_search_tsv", member_search_vector, postgresql_using="gin").ddl_if(
+    callable_=_search_extensions_available
+)
+Index(
+    "ix_members_phone_digits_trgm",
+    member_phone_digits.label("phone_digits"),
+    postgresql_using="gin",
+    postgresql_ops={"phone_digits": "gin_trgm_ops"}
+).ddl_if(callable_=_search_extensions_available)
+
+
+# ==================== CELEBRACIONES ====================
+# Mes-día como entero (15 de marzo = 315), independiente del año: los
+# cumpleaños y aniversarios de una ventana de días son rangos BETWEEN sobre
+# el índice (app/domain/services/celebrations.py).
+
+def month_day(expr):
+    """MMDD de una fecha como entero, inmutable (apto para índices)"""
+    return cast(
+        func.date_part(text("'month'"), expr) * text("100") + func.date_part(text("'day'"), expr),
+        Integer
+    )
+
+
+member_birth_month_day = month_day(MemberModel.birth_date)
+member_membership_month_day = month_day(MemberModel.membership_date)
+
+Index("ix_members_church_birth_month_day", MemberModel.church_id, member_birth_month_day)
+Index("ix_members_church_membership_month_day", MemberModel.church_id, member_membership_month_day)
+
+# Extensiones y unaccent inmutable requeridos por los índices de búsqueda,
+# sólo si el servidor las tiene
+for _statement in (
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text "
+    "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT "
+    "AS $$ SELECT public.unaccent('public.unaccent', $1) $$",
+):
+    event.listen(
+        MemberModel.__table__, "before_create", DDL(_statement).execute_if(callable_=_search_extensions_available)
+    )
+
 
 class PastoralNoteModel(Base):
     """Notas pastorales sobre miembros"""
     __tablename__ = "pastoral_notes"
+    __table_args__ = (
+        # Notas de un miembro, de la más reciente a la más antigua
+        Index('ix_pastoral_notes_member_created', 'member_id', 'created_at'),
+        # Seguimientos pendientes (members_needing_followup en las estadísticas)
+        Index(
+            'ix_pastoral_notes_pending_followup', 'member_id', 'follow_up_date',
+            postgresql_where=text("follow_up_date IS NOT NULL AND follow_up_completed IS NOT TRUE")
+        ),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     member_id = Column(UUID(as_uuid=True), ForeignKey('members.id'), nullable=False)
@@ -118,16 +239,40 @@ class PastoralNoteModel(Base):
 
 
 class AttendanceRecordModel(Base):
-    """Registro de asistencia de miembros"""
+    """
+    Registro de asistencia de miembros
+
+    Particionada por mes sobre event_date (attendance_records_YYYY_MM, ver
+    AttendancePartitionRepository); la clave primaria incluye event_date
+    porque PostgreSQL lo exige en tablas particionadas. La partición DEFAULT
+    recibe fechas sin partición mensual hasta que se cree la suya.
+    """
     __tablename__ = "attendance_records"
+    __table_args__ = (
+        # Historial por miembro: ORDER BY event_date DESC, id DESC con cursor
+        Index('ix_attendance_member_date', 'member_id', 'event_date', 'id'),
+        # Tendencias por iglesia: rango de fechas de una iglesia sin leer el resto del historial
+        Index(
+            'ix_attendance_church_date', 'church_id', 'event_date',
+            postgresql_include=['member_id', 'id', 'attended']
+        ),
+        # Un registro por miembro y evento (ON CONFLICT de los registros de
+        # asistencia); también lista los asistentes de un evento, y con
+        # event_date se lee una sola partición
+        Index('uq_attendance_event_member', 'event_id', 'member_id', 'event_date', unique=True),
+        {"postgresql_partition_by": "RANGE (event_date)"},
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     member_id = Column(UUID(as_uuid=True), ForeignKey('members.id'), nullable=False)
     church_id = Column(UUID(as_uuid=True), ForeignKey('churches.id'), nullable=False)
     
+    # event_type/event_name/event_date copian los del evento: los agregados,
+    # tendencias y archivos los leen sin unir con events
+    event_id = Column(UUID(as_uuid=True), ForeignKey(EventModel.id), nullable=True)
     event_type = Column(String(50), nullable=False)
     event_name = Column(String(200))
-    event_date = Column(Date, nullable=False)
+    event_date = Column(Date, primary_key=True, nullable=False)
     
     attended = Column(Boolean, default=True)
     arrival_time = Column(DateTime)
@@ -141,6 +286,14 @@ class AttendanceRecordModel(Base):
     church = relationship("ChurchModel")
 
 
+# Sin la DEFAULT una tabla recién creada no acepta filas hasta crear particiones mensuales
+event.listen(
+    AttendanceRecordModel.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS attendance_records_default PARTITION OF attendance_records DEFAULT")
+)
+
+
 class MemberInteractionModel(Base):
     """Registro de interacciones con miembros"""
     __tablename__ = "member_interactions"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -24,5 +24,11 @@ class MemberAuditLog(Base):
     
     changed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        # Historial por miembro y acciones por usuario: ORDER BY changed_at DESC LIMIT n
+        Index("ix_member_audit_member_changed", "member_id", "changed_at"),
+        Index("ix_member_audit_user_changed", "user_id", "changed_at"),
+    )
+
     def __repr__(self):
         return f"<MemberAuditLog {self.action} on {self.member_id}>"
\ No newline at end of file
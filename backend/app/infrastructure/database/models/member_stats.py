@@ -0,0 +1,41 @@
+# app/infrastructure/database/models/member_stats.py
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, JSON
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+
+from app.infrastructure.database.connection import Base
+
+
+class ChurchMemberStatsModel(Base):
+    """
+    Snapshot de estadísticas de miembros por iglesia
+
+    Se mantiene de forma incremental en cada flush de MemberModel (ver el
+    listener de member_stats_tracking) y se reconcilia periódicamente
+    contra un recálculo completo para corregir desvíos.
+    """
+    __tablename__ = "church_member_stats"
+
+    church_id = Column(UUID(as_uuid=True), ForeignKey('churches.id', ondelete="CASCADE"), primary_key=True)
+
+    total_members = Column(Integer, nullable=False, default=0)
+    active_members = Column(Integer, nullable=False, default=0)
+    visitors = Column(Integer, nullable=False, default=0)
+    members_at_risk = Column(Integer, nullable=False, default=0)
+    members_needing_followup = Column(Integer, nullable=False, default=0)
+
+    # Numeradores de los promedios (promedio = suma / total_members)
+    sum_attendance_rate = Column(Float, nullable=False, default=0.0)
+    sum_commitment_score = Column(Float, nullable=False, default=0.0)
+
+    # {"2026-10": 12, ...} - altas por mes de membership_date
+    new_by_month = Column(JSON, nullable=False, default=dict)
+
+    age_distribution = Column(JSON, nullable=False, default=dict)
+    gender_distribution = Column(JSON, nullable=False, default=dict)
+    marital_status_distribution = Column(JSON, nullable=False, default=dict)
+    member_type_distribution = Column(JSON, nullable=False, default=dict)
+
+    # Frescura: último cambio incremental y última reconciliación completa
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    reconciled_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,20 @@
+# app/infrastructure/database/models/scheduler_state.py
+from sqlalchemy import Column, String, Date, DateTime
+from datetime import datetime
+
+from app.infrastructure.database.connection import Base
+
+
+class SchedulerStateModel(Base):
+    """
+    Última fecha procesada por cada tarea programada
+
+    El refresco por umbrales (jobs/score_refresh) procesa el rango
+    (last_run_date, hoy]; si el proceso estuvo caído varios días, los cubre
+    todos en la siguiente corrida.
+    """
+    __tablename__ = "scheduler_state"
+
+    name = Column(String(100), primary_key=True)
+    last_run_date = Column(Date, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -59,12 +59,12 @@ class UserModel(Base):
     registration_type = Column(String(50), nullable=True)
     
     # Relación con iglesia
-    church_id = Column(UUID(as_uuid=True), ForeignKey("churches.id"), nullable=True)
+    church_id = Column(UUID(as_uuid=True), ForeignKey("churches.id"), nullable=True, index=True)
     pending_church_id = Column(UUID(as_uuid=True), nullable=True)
     
     # Verificación
     is_email_verified = Column(Boolean, default=False)
-    email_verification_token = Column(String(255), nullable=True)
+    email_verification_token = Column(String(255), nullable=True, index=True)
     email_verification_sent_at = Column(DateTime, nullable=True)
     
     # Información profesional (para pastores)
@@ -0,0 +1,238 @@
+# app/infrastructure/external/llm_client.py
+"""
+Cliente asíncrono de LLM: concurrencia acotada, lotes, coalescing y cache
+
+Cada ítem (el fragmento de prompt de un miembro, o un prompt completo) se
+identifica por el hash de (modelo, espacio, ítem):
+
+- Cache persistente: la respuesta de cada ítem se guarda en un CacheBackend
+  (Redis entre workers, memoria en desarrollo) con TTL. Un hit no llega al LLM.
+- Coalescing: un ítem que ya está pidiéndose en este proceso (otro request,
+  o el mismo ítem repetido en la lista) espera esa misma respuesta.
+- Lotes: los ítems restantes se agrupan de a batch_size en un solo prompt
+  (build arma los mensajes, parse separa la respuesta por ítem).
+- Concurrencia: a lo sumo max_concurrency requests al LLM a la vez; el resto
+  espera turno. El timeout cuenta desde que el request sale, no la espera.
+
+Un timeout, un error del LLM o una respuesta que no se puede separar dan None
+para los ítems afectados (y no se cachean): el llamador cae a su respaldo.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from app.infrastructure.cache.backends import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+Messages = List[Dict[str, str]]
+# Recibe los mensajes del chat y retorna el texto de la respuesta
+Transport = Callable[[Messages], Awaitable[str]]
+
+# Latencias de request guardadas para los percentiles de metrics()
+LATENCY_SAMPLES = 1000
+
+
+class OpenAIChatTransport:
+    """Transporte sobre el SDK de OpenAI (o un servidor compatible en base_url)"""
+
+    def __init__(self, api_key: str, model: str, base_url: Optional[str] = None, timeout: float = 30.0):
+        from openai import AsyncOpenAI
+
+        # Los reintentos y el timeout total los maneja LLMClient
+        self._client = AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0)
+        self.model = model
+
+    async def __call__(self, messages: Messages) -> str:
+        response = await self._client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.2,
+            response_format={"type": "json_object"}
+        )
+        return response.choices[0].message.content or ""
+
+    async def close(self) -> None:
+        await self._client.close()
+
+
+class LLMClient:
+    def __init__(
+        self,
+        transport: Transport,
+        cache: CacheBackend,
+        model: str,
+        max_concurrency: int = 8,
+        batch_size: int = 10,
+        timeout: float = 15.0,
+        cache_ttl: int = 7 * 24 * 3600,
+        prefix: str = "churchai:llm"
+    ):
+        self.transport = transport
+        self.cache = cache
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.prefix = prefix
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._latencies: deque = deque(maxlen=LATENCY_SAMPLES)
+        self._metrics = {
+            "items": 0,
+            "cache_hits": 0,
+            "coalesced": 0,
+            "requests": 0,
+            "timeouts": 0,
+            "errors": 0,
+            "unanswered": 0,
+        }
+
+    def _key(self, namespace: str, item: str) -> str:
+        digest = hashlib.sha256(json.dumps([self.model, namespace, item]).encode()).hexdigest()
+        return f"{self.prefix}:{namespace}:{digest}"
+
+    async def complete(self, messages: Messages, namespace: str = "prompt") -> Optional[str]:
+        """Respuesta a un prompt completo (cacheada y coalescida por hash del prompt)"""
+        results = await self.complete_many(
+            [json.dumps(messages, ensure_ascii=False, sort_keys=True)],
+            build=lambda items: json.loads(items[0]),
+            parse=lambda text, count: [text],
+            namespace=namespace
+        )
+        return results[0]
+
+    async def complete_many(
+        self,
+        items: Sequence[str],
+        build: Callable[[List[str]], Messages],
+        parse: Callable[[str, int], List[Optional[str]]],
+        namespace: str
+    ) -> List[Optional[str]]:
+        """
+        Respuesta de cada ítem, en el orden de `items` (None = sin respuesta)
+
+        build(ítems_del_lote) arma los mensajes de un lote y
+        parse(texto, cantidad) retorna la respuesta de cada ítem del lote.
+        """
+        keys = [self._key(namespace, item) for item in items]
+        cached = await asyncio.gather(*(self._cache_get(key) for key in keys))
+        self._metrics["items"] += len(keys)
+
+        waiting: Dict[str, asyncio.Future] = {}
+        new: List[Tuple[str, str]] = []
+        loop = asyncio.get_running_loop()
+        for key, item, value in zip(keys, items, cached):
+            if value is not None:
+                self._metrics["cache_hits"] += 1
+            elif key in waiting or key in self._inflight:
+                self._metrics["coalesced"] += 1
+                waiting[key] = self._inflight[key]
+            else:
+                waiting[key] = self._inflight[key] = loop.create_future()
+                new.append((key, item))
+
+        for start in range(0, len(new), self.batch_size):
+            # Tareas del cliente: si el llamador se cancela, el lote sigue para los demás que esperan
+            task = asyncio.ensure_future(self._run_batch(new[start:start + self.batch_size], build, parse))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        if waiting:
+            answers = dict(zip(waiting, await asyncio.shield(asyncio.gather(*waiting.values()))))
+        else:
+            answers = {}
+
+        return [value if value is not None else answers.get(key) for key, value in zip(keys, cached)]
+
+    async def _run_batch(
+        self,
+        batch: List[Tuple[str, str]],
+        build: Callable[[List[str]], Messages],
+        parse: Callable[[str, int], List[Optional[str]]]
+    ) -> None:
+        futures = [self._inflight[key] for key, _ in batch]
+        values: List[Optional[str]] = [None] * len(batch)
+        try:
+            text = await self._request(build([item for _, item in batch]))
+            if text is not None:
+                try:
+                    parsed = parse(text, len(batch))
+                    values = [parsed[i] if i < len(parsed) else None for i in range(len(batch))]
+                except Exception as e:
+                    logger.warning(f"⚠️ Unparseable LLM response for a batch of {len(batch)}: {e}")
+                    self._metrics["errors"] += 1
+            self._metrics["unanswered"] += sum(value is None for value in values)
+
+            for future, value in zip(futures, values):
+                if not future.done():
+                    future.set_result(value)
+            # Escribir antes de soltar el coalescing: quien llegue entre medio no repite el request
+            await asyncio.gather(*(
+                self._cache_set(key, value) for (key, _), value in zip(batch, values) if value is not None
+            ))
+        finally:
+            for (key, _), future in zip(batch, futures):
+                if not future.done():
+                    future.set_result(None)
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+    async def _request(self, messages: Messages) -> Optional[str]:
+        async with self._semaphore:
+            self._metrics["requests"] += 1
+            start = time.perf_counter()
+            try:
+                return await asyncio.wait_for(self.transport(messages), self.timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️ LLM request timed out after {self.timeout}s")
+                self._metrics["timeouts"] += 1
+            except Exception as e:
+                logger.warning(f"⚠️ LLM request failed: {e}")
+                self._metrics["errors"] += 1
+            finally:
+                self._latencies.append((time.perf_counter() - start) * 1000)
+            return None
+
+    async def _cache_get(self, key: str) -> Optional[str]:
+        try:
+            return await self.cache.get(key)
+        except Exception as e:
+            logger.warning(f"⚠️ LLM cache unavailable: {e}")
+            self._metrics["errors"] += 1
+            return None
+
+    async def _cache_set(self, key: str, value: str) -> None:
+        try:
+            await self.cache.set(key, value, self.cache_ttl)
+        except Exception as e:
+            logger.warning(f"⚠️ LLM cache write failed: {e}")
+            self._metrics["errors"] += 1
+
+    def metrics(self) -> Dict:
+        """Contadores y percentiles de latencia de los requests al LLM, desde el arranque"""
+        samples = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            return round(samples[min(len(samples) - 1, int(len(samples) * p))], 2) if samples else 0.0
+
+        return {
+            **self._metrics,
+            "hit_ratio": round(self._metrics["cache_hits"] / self._metrics["items"], 4) if self._metrics["items"] else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+        }
+
+    async def close(self) -> None:
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+        close = getattr(self.transport, "close", None)
+        if close is not None:
+            await close()
+        await self.cache.close()
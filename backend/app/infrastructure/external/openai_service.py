@@ -1,13 +1,75 @@
-cat > backend/app/infrastructure/external/openai_service.py << 'EOF'
-from typing import Dict, Any
+# app/infrastructure/external/openai_service.py
+"""
+Servicio de OpenAI: evaluación de registro de iglesias e insights de miembros
+
+Los insights con LLM se activan con LLM_INSIGHTS_ENABLED. Cada miembro se
+reduce a sus datos de pastoral (sin contacto ni apellido) y esos datos son el
+ítem de LLMClient: mismo miembro en el mismo estado = misma respuesta
+cacheada. Sin LLM, o si el LLM no responde a tiempo, se usa el texto de
+MemberAIService.generate_ai_insights.
+"""
+import json
 import logging
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import settings
+from app.domain.services.member_ai_service import MemberAIService
+from app.infrastructure.cache.backends import InMemoryCacheBackend, RedisCacheBackend
+from app.infrastructure.external.llm_client import LLMClient, Messages, OpenAIChatTransport
 
 logger = logging.getLogger(__name__)
 
+# Subir al cambiar el prompt o los datos enviados: invalida las respuestas cacheadas
+INSIGHTS_PROMPT_VERSION = 1
+
+INSIGHTS_SYSTEM_PROMPT = (
+    "Eres un asistente pastoral de una iglesia. Para cada miembro recibido escribe un "
+    "análisis breve (2 a 4 oraciones, en español) de su compromiso, asistencia, "
+    "participación y riesgo de abandono, con una sugerencia concreta de seguimiento. "
+    'Responde sólo con JSON: {"insights": [{"id": <id del miembro>, "text": "<análisis>"}]}'
+)
+
+
+def member_facts(member, today: Optional[date] = None) -> Dict[str, Any]:
+    """Datos del miembro que se envían al LLM (semanas/meses para que la respuesta dure más)"""
+    today = today or date.today()
+    last_attendance = getattr(member, "last_attendance", None)
+    membership_date = getattr(member, "membership_date", None)
+    return {
+        "nombre": member.first_name,
+        "tipo": member.member_type,
+        "meses_de_membresia": (today - membership_date).days // 30 if membership_date else None,
+        "asistencia_90_dias": round(member.attendance_rate or 0),
+        "semanas_sin_asistir": (today - last_attendance).days // 7 if last_attendance else None,
+        "compromiso": round(member.commitment_score or 0),
+        "riesgo": member.risk_level,
+        "ministerios": sorted(member.ministries or []),
+        "dones": sorted(member.spiritual_gifts or []),
+        "grupo_pequeno": (member.small_group_role or "miembro") if member.small_group_id else None,
+    }
+
+
+def _build_insights_prompt(items: List[str]) -> Messages:
+    members = [{"id": i, **json.loads(item)} for i, item in enumerate(items)]
+    return [
+        {"role": "system", "content": INSIGHTS_SYSTEM_PROMPT},
+        {"role": "user", "content": json.dumps({"members": members}, ensure_ascii=False)},
+    ]
+
+
+def _parse_insights(text: str, count: int) -> List[Optional[str]]:
+    texts = {}
+    for entry in json.loads(text)["insights"]:
+        if isinstance(entry.get("text"), str) and entry["text"].strip():
+            texts[entry.get("id")] = entry["text"].strip()
+    return [texts.get(i) for i in range(count)]
+
+
 class OpenAIService:
-    def __init__(self):
-        pass
-    
+    def __init__(self, llm: Optional[LLMClient] = None):
+        self.llm = llm
+
     async def assess_church_registration_risk(self, assessment_data: Dict[str, Any]) -> Dict[str, Any]:
         # Mock AI assessment for now
         return {
@@ -17,4 +79,71 @@ class OpenAIService:
             "recommendation": "approve",
             "reasoning": "Low risk church registration"
         }
-EOF
+
+    async def llm_member_insights(self, members: List[Any], today: Optional[date] = None) -> List[Optional[str]]:
+        """Insights del LLM por miembro, en lotes; None donde no hubo respuesta (o LLM deshabilitado)"""
+        if self.llm is None or not members:
+            return [None] * len(members)
+
+        items = [
+            json.dumps(member_facts(member, today), ensure_ascii=False, sort_keys=True, default=str)
+            for member in members
+        ]
+        return await self.llm.complete_many(
+            items,
+            build=_build_insights_prompt,
+            parse=_parse_insights,
+            namespace=f"member-insights:v{INSIGHTS_PROMPT_VERSION}"
+        )
+
+    async def generate_member_insights(self, members: List[Any], today: Optional[date] = None) -> List[str]:
+        """Insights por miembro: los del LLM y, donde falten, los de plantilla"""
+        texts = await self.llm_member_insights(members, today)
+        return [
+            text if text is not None else MemberAIService.generate_ai_insights(member)
+            for member, text in zip(members, texts)
+        ]
+
+    def metrics(self) -> Dict[str, Any]:
+        if self.llm is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.llm.metrics()}
+
+    async def close(self) -> None:
+        if self.llm is not None:
+            await self.llm.close()
+
+
+_openai_service: Optional[OpenAIService] = None
+
+
+def get_openai_service() -> OpenAIService:
+    """Servicio compartido de la app; sin LLM si LLM_INSIGHTS_ENABLED está apagado"""
+    global _openai_service
+    if _openai_service is None:
+        llm = None
+        if settings.LLM_INSIGHTS_ENABLED:
+            if settings.CACHE_BACKEND == "redis":
+                cache = RedisCacheBackend(settings.REDIS_URL)
+            else:
+                cache = InMemoryCacheBackend()
+            llm = LLMClient(
+                OpenAIChatTransport(
+                    settings.OPENAI_API_KEY, settings.LLM_MODEL,
+                    base_url=settings.LLM_BASE_URL, timeout=settings.LLM_TIMEOUT_SECONDS
+                ),
+                cache,
+                model=settings.LLM_MODEL,
+                max_concurrency=settings.LLM_MAX_CONCURRENCY,
+                batch_size=settings.LLM_BATCH_SIZE,
+                timeout=settings.LLM_TIMEOUT_SECONDS,
+                cache_ttl=settings.LLM_CACHE_TTL_SECONDS
+            )
+        _openai_service = OpenAIService(llm)
+    return _openai_service
+
+
+def set_openai_service(service: Optional[OpenAIService]) -> None:
+    """Reemplaza el servicio compartido (tests, benchmarks); None vuelve a crearlo desde settings"""
+    global _openai_service
+    _openai_service = service
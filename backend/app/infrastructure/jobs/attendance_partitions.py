@@ -0,0 +1,164 @@
+# app/infrastructure/jobs/attendance_partitions.py
+"""
+Particiones mensuales de attendance_records y archivo en Parquet
+
+ensure_attendance_partitions crea las particiones del mes actual y de los
+ATTENDANCE_PARTITION_MONTHS_AHEAD siguientes, más las de meses que hayan
+caído en la partición DEFAULT (moviendo sus filas). Corre al arrancar la
+app y luego cada ATTENDANCE_PARTITION_INTERVAL_SECONDS.
+
+archive_attendance_partitions exporta los meses anteriores a N años a
+ATTENDANCE_ARCHIVE_DIR (un Parquet por mes), los registra en
+attendance_archives y separa su partición. Los agregados semanales y los
+contadores de la ventana no cambian: sólo se van las filas.
+
+    python -m app.infrastructure.jobs.attendance_partitions ensure [--months-ahead 3]
+    python -m app.infrastructure.jobs.attendance_partitions archive --years 5 [--dir DIR] [--keep-detached]
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date
+from typing import List, Optional, Tuple
+
+from app.config.settings import settings
+from app.infrastructure.archive import archive_path, write_attendance_archive
+from app.infrastructure.database.connection import AsyncSessionLocal
+from app.infrastructure.repositories.attendance_partition_repository import (
+    AttendancePartitionRepository, add_months, month_start
+)
+from app.infrastructure.repositories.member_repository import MemberRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def ensure_attendance_partitions(today: Optional[date] = None, months_ahead: Optional[int] = None) -> List[date]:
+    """
+    Crea las particiones que faltan; una transacción por partición
+
+    Los meses ya archivados no se recrean: un registro tardío de esos meses
+    queda en la DEFAULT. Retorna los meses creados.
+    """
+    current = month_start(today or date.today())
+    months_ahead = settings.ATTENDANCE_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+
+    async with AsyncSessionLocal() as session:
+        repo = AttendancePartitionRepository(session)
+        existing = set(await repo.get_partition_months())
+        archived_until = await repo.get_archived_until()
+        default_months = await repo.get_default_months()
+        await session.rollback()
+
+    wanted = {add_months(current, i) for i in range(months_ahead + 1)}
+    wanted.update(month for month in default_months if archived_until is None or month >= archived_until)
+
+    created = []
+    for month in sorted(wanted - existing):
+        async with AsyncSessionLocal() as session:
+            try:
+                await AttendancePartitionRepository(session).create_month(month)
+                await session.commit()
+                created.append(month)
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"❌ Error creating attendance partition {month:%Y-%m}: {e}")
+
+    return created
+
+
+async def archive_attendance_partitions(
+    older_than_years: int,
+    archive_dir: Optional[str] = None,
+    drop: bool = True,
+    today: Optional[date] = None
+) -> List[Tuple[date, int]]:
+    """
+    Archiva los meses que terminaron hace más de `older_than_years` años
+
+    Por mes: exporta la partición a Parquet y, en una transacción que
+    bloquea escrituras en ella, comprueba que no cambió desde la exportación,
+    la separa (y elimina si drop) y la registra en attendance_archives. Si
+    cambió, el mes queda para la próxima corrida. Retorna [(mes, filas)].
+
+    Nunca archiva meses que toquen la ventana de los contadores de alguna
+    iglesia (get_oldest_attendance_window_start): su recuento y su
+    reparación leen esas filas.
+    """
+    if older_than_years < 1:
+        raise ValueError("older_than_years debe ser al menos 1")
+
+    cutoff = add_months(month_start(today or date.today()), -12 * older_than_years)
+    archive_dir = archive_dir or settings.ATTENDANCE_ARCHIVE_DIR
+
+    async with AsyncSessionLocal() as session:
+        window_start = await MemberRepository(session).get_oldest_attendance_window_start(today)
+        cutoff = min(cutoff, month_start(window_start))
+        months = [
+            month for month in await AttendancePartitionRepository(session).get_partition_months()
+            if add_months(month, 1) <= cutoff
+        ]
+        await session.rollback()
+
+    archived = []
+    for month in months:
+        path = archive_path(archive_dir, month)
+        try:
+            async with AsyncSessionLocal() as session:
+                written = await write_attendance_archive(path, AttendancePartitionRepository(session).stream_rows(month))
+
+            async with AsyncSessionLocal() as session:
+                repo = AttendancePartitionRepository(session)
+                rows = await repo.count_rows(month, lock=True)
+                if rows != written:
+                    await session.rollback()
+                    logger.warning(f"⚠️ Attendance partition {month:%Y-%m} changed during export ({written} -> {rows}); retrying next run")
+                    continue
+                await repo.detach_month(month, drop=drop)
+                await repo.add_archive(month, str(path), written)
+                await session.commit()
+            archived.append((month, written))
+        except Exception as e:
+            logger.error(f"❌ Error archiving attendance partition {month:%Y-%m}: {e}")
+
+    return archived
+
+
+async def run_periodic_attendance_partitions(interval_seconds: int = None) -> None:
+    """
+    Loop de creación de particiones; se lanza como tarea en el lifespan de la app
+
+    A diferencia de los otros loops corre primero y después espera: las
+    particiones del mes tienen que existir desde el arranque.
+    """
+    interval = interval_seconds or settings.ATTENDANCE_PARTITION_INTERVAL_SECONDS
+    while True:
+        try:
+            created = await ensure_attendance_partitions()
+            if created:
+                logger.info(f"✅ Attendance partitions created: {', '.join(f'{month:%Y-%m}' for month in created)}")
+        except Exception as e:
+            logger.error(f"❌ Error ensuring attendance partitions: {e}")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    ensure = subcommands.add_parser("ensure")
+    ensure.add_argument("--months-ahead", type=int)
+    archive = subcommands.add_parser("archive")
+    archive.add_argument("--years", type=int, required=True, help="Archivar meses anteriores a N años")
+    archive.add_argument("--dir", help="Directorio de los Parquet (ATTENDANCE_ARCHIVE_DIR)")
+    archive.add_argument("--keep-detached", action="store_true", help="Separar las particiones sin eliminarlas")
+    args = parser.parse_args()
+    if args.command == "archive" and args.years < 1:
+        parser.error("--years debe ser al menos 1")
+
+    if args.command == "ensure":
+        created = asyncio.run(ensure_attendance_partitions(months_ahead=args.months_ahead))
+        print(f"Particiones creadas: {', '.join(f'{month:%Y-%m}' for month in created) or 'ninguna'}")
+    else:
+        archived = asyncio.run(archive_attendance_partitions(args.years, args.dir, drop=not args.keep_detached))
+        for month, rows in archived:
+            print(f"{month:%Y-%m}: {rows} registros")
+        print(f"Meses archivados: {len(archived)}")
@@ -0,0 +1,61 @@
+# app/infrastructure/jobs/attendance_rollups.py
+"""
+Reconstrucción de los agregados semanales de asistencia
+
+Los registros de asistencia mantienen attendance_weekly_rollups al día;
+esto los rehace desde attendance_records (carga inicial, datos insertados
+por fuera de los repositorios o una corrección), una transacción por
+iglesia:
+
+    python -m app.infrastructure.jobs.attendance_rollups [--church UUID] [--since 2026-01-01]
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.infrastructure.database.connection import AsyncSessionLocal
+from app.infrastructure.database.models.church import ChurchModel
+from app.infrastructure.repositories.attendance_rollup_repository import AttendanceRollupRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_attendance_rollups(church_id: Optional[UUID] = None, since: Optional[date] = None) -> int:
+    """
+    Reconstruye los agregados de una iglesia o de todas
+
+    Con `since` sólo rehace las semanas desde la que contiene esa fecha.
+    Retorna la cantidad de filas escritas.
+    """
+    if church_id is None:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(ChurchModel.id))
+            church_ids = result.scalars().all()
+    else:
+        church_ids = [church_id]
+
+    written = 0
+    for church_id in church_ids:
+        async with AsyncSessionLocal() as session:
+            try:
+                written += await AttendanceRollupRepository(session).rebuild(church_id, since)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"❌ Error rebuilding attendance rollups for church {church_id}: {e}")
+
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--church", type=UUID, help="Sólo esta iglesia")
+    parser.add_argument("--since", type=date.fromisoformat, help="Sólo las semanas desde esta fecha (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    print(f"Filas escritas: {asyncio.run(rebuild_attendance_rollups(args.church, args.since))}")
@@ -0,0 +1,196 @@
+# app/infrastructure/jobs/attendance_window.py
+"""
+Ventana móvil de asistencia (90 días) de los contadores de members
+
+Cada registro de asistencia suma a attendance_window_total/_attended en el
+momento (O(1) por registro); este job hace la otra mitad: una vez por día
+resta los registros que salieron de la ventana desde la última corrida de
+cada iglesia (su fila en scheduler_state), recalcula attendance_rate y el
+score de esos miembros. Cada iglesia avanza en su propia transacción: sólo
+sus registros de asistencia esperan. La primera vez (sin la fila global)
+reconstruye los contadores con un recuento completo.
+
+check_all_attendance_counters compara los contadores con un recuento
+completo de la ventana vigente y, con repair=True, corrige las diferencias:
+
+    python -m app.infrastructure.jobs.attendance_window expire
+    python -m app.infrastructure.jobs.attendance_window check [--repair]
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config.settings import settings
+from app.infrastructure.database.connection import AsyncSessionLocal
+from app.infrastructure.database.models.church import ChurchModel
+from app.infrastructure.database.models.scheduler_state import SchedulerStateModel
+from app.infrastructure.repositories.member_repository import (
+    MemberRepository, ATTENDANCE_WINDOW_DAYS, ATTENDANCE_WINDOW_SCHEDULER, attendance_window_scheduler
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _church_ids():
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(ChurchModel.id))
+        return result.scalars().all()
+
+
+async def check_all_attendance_counters(repair: bool = False, today: Optional[date] = None) -> Dict:
+    """
+    Compara los contadores de cada iglesia con un recuento completo
+
+    Una transacción por iglesia, con la fila de la ventana bloqueada en modo
+    compartido (el avance diario no corre en el medio). Retorna
+    {church_id: miembros con diferencias}; con repair=True las corrige,
+    re-score incluido, y reconcilia el snapshot de estadísticas.
+    """
+    drift_by_church = {}
+    for church_id in await _church_ids():
+        async with AsyncSessionLocal() as session:
+            try:
+                repo = MemberRepository(session)
+                window_start = await repo.get_attendance_window_start(church_id, today, lock=True)
+                drift = await repo.check_attendance_counters(church_id, window_start)
+                if drift:
+                    drift_by_church[church_id] = len(drift)
+                if drift and repair:
+                    await repo.repair_attendance_counters(church_id, drift, window_start, today)
+                    await repo.reconcile_stats_snapshot(church_id)
+                else:
+                    await session.rollback()
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"❌ Error checking attendance counters for church {church_id}: {e}")
+
+    return drift_by_church
+
+
+async def _save_last_run(session, name: str, today: date) -> None:
+    await session.execute(
+        insert(SchedulerStateModel)
+        .values(name=name, last_run_date=today)
+        .on_conflict_do_update(index_elements=[SchedulerStateModel.name], set_={"last_run_date": today})
+    )
+
+
+async def _expire_church(church_id: UUID, today: date) -> List[UUID]:
+    """
+    Avanza la ventana de una iglesia hasta hoy
+
+    El UPDATE (expire_attendance_window), el re-score de los miembros tocados
+    y la nueva fecha de corrida de la iglesia se confirman juntos; su fila de
+    scheduler_state queda bloqueada mientras tanto, así sus registros de
+    asistencia esperan y no se cuentan con la ventana vieja. Retorna los
+    miembros actualizados.
+    """
+    async with AsyncSessionLocal() as session:
+        repo = MemberRepository(session)
+        last_run = await repo.lock_attendance_window(church_id, today)
+        if last_run >= today:
+            await session.rollback()
+            return []
+
+        old_start = last_run - timedelta(days=ATTENDANCE_WINDOW_DAYS)
+        new_start = today - timedelta(days=ATTENDANCE_WINDOW_DAYS)
+        member_ids = await repo.expire_attendance_window(church_id, old_start, new_start)
+        if member_ids:
+            await repo.rescore_members(church_id, member_ids, today)
+        await _save_last_run(session, attendance_window_scheduler(church_id), today)
+        await session.commit()
+
+    return member_ids
+
+
+async def expire_attendance_windows(today: Optional[date] = None) -> int:
+    """
+    Avanza la ventana de cada iglesia hasta hoy, una transacción por iglesia
+
+    La fila global de scheduler_state guarda la última corrida completa: si
+    ya es de hoy no hay nada que hacer, y sólo avanza cuando todas las
+    iglesias avanzaron (una que falló se reintenta en la próxima corrida).
+    Retorna la cantidad de miembros actualizados.
+    """
+    today = today or date.today()
+
+    async with AsyncSessionLocal() as session:
+        last_run = (await session.execute(
+            select(SchedulerStateModel.last_run_date).where(SchedulerStateModel.name == ATTENDANCE_WINDOW_SCHEDULER)
+        )).scalar_one_or_none()
+
+        if last_run is None:
+            drift = await check_all_attendance_counters(repair=True, today=today)
+            await _save_last_run(session, ATTENDANCE_WINDOW_SCHEDULER, today)
+            await session.commit()
+            return sum(drift.values())
+
+        if last_run >= today:
+            return 0
+
+    changed = 0
+    failed = False
+    for church_id in await _church_ids():
+        try:
+            member_ids = await _expire_church(church_id, today)
+        except Exception as e:
+            failed = True
+            logger.error(f"❌ Error advancing attendance window for church {church_id}: {e}")
+            continue
+        if not member_ids:
+            continue
+
+        changed += len(member_ids)
+        # update() no pasa por el ORM: reconciliar el snapshot de la iglesia
+        async with AsyncSessionLocal() as session:
+            try:
+                await MemberRepository(session).reconcile_stats_snapshot(church_id)
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"❌ Error reconciling stats for church {church_id}: {e}")
+
+    if not failed:
+        async with AsyncSessionLocal() as session:
+            await _save_last_run(session, ATTENDANCE_WINDOW_SCHEDULER, today)
+            await session.commit()
+
+    return changed
+
+
+async def run_periodic_attendance_window(interval_seconds: int = None) -> None:
+    """
+    Loop del avance de la ventana; se lanza como tarea en el lifespan de la app
+
+    Corre cada ATTENDANCE_WINDOW_INTERVAL_SECONDS pero sólo trabaja cuando
+    cambia la fecha.
+    """
+    interval = interval_seconds or settings.ATTENDANCE_WINDOW_INTERVAL_SECONDS
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            changed = await expire_attendance_windows()
+            if changed:
+                logger.info(f"✅ Attendance window advanced ({changed} members updated)")
+        except Exception as e:
+            logger.error(f"❌ Error advancing attendance window: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=["expire", "check"])
+    parser.add_argument("--repair", action="store_true", help="check: corregir las diferencias")
+    args = parser.parse_args()
+
+    if args.command == "expire":
+        print(f"Miembros actualizados: {asyncio.run(expire_attendance_windows())}")
+    else:
+        drift = asyncio.run(check_all_attendance_counters(repair=args.repair))
+        for church_id, count in drift.items():
+            print(f"{church_id}: {count} miembros con diferencias")
+        print(f"Iglesias con diferencias: {len(drift)}{' (corregidas)' if args.repair else ''}")
@@ -0,0 +1,259 @@
+# app/infrastructure/jobs/member_recalculation.py
+"""
+Recalcular scores de toda una iglesia en segundo plano
+
+Recorre los miembros por lotes (keyset sobre members.id): commitment_score y
+risk_level se recalculan con MemberAIService.score_batch y ai_notes con
+member_insights.compute_insights (el paquete con huella que sirven los
+endpoints; los insights con el LLM en lotes si está habilitado, fuera de toda
+transacción), se escriben en un executemany y en la misma transacción se
+avanza el cursor del trabajo. Los contadores de la ventana y attendance_rate
+no se tocan: los mantienen los registros de asistencia y jobs/attendance_window
+(reescribirlos desde aquí pisaría un registro simultáneo).
+
+Si el proceso cae, el trabajo queda "running" con el último cursor confirmado
+y, cuando su latido vence, run_job_resumer lo retoma desde ahí. Reprocesar un
+lote es inofensivo: el resultado sólo depende de los datos del miembro.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from app.config.settings import settings
+from app.domain.services.member_ai_service import MemberAIService
+from app.domain.services.member_insights import compute_insights
+from app.domain.services.member_scoring import MemberScoringColumns
+from app.infrastructure.cache.invalidation import mark_churches_dirty
+from app.infrastructure.database.connection import AsyncSessionLocal
+from app.infrastructure.external.openai_service import get_openai_service
+from app.infrastructure.repositories.background_job_repository import BackgroundJobRepository
+from app.infrastructure.repositories.member_repository import MemberRepository
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPE = "recalculate_members"
+MAX_ERRORS = 50
+MAX_CHUNK_RETRIES = 3
+
+# Tareas de este proceso; la referencia evita que el GC las cancele
+_tasks: Dict[UUID, asyncio.Task] = {}
+
+
+@dataclass
+class _JobState:
+    church_id: UUID
+    chunk_size: int
+    cursor: Optional[UUID]
+    errors: List[dict] = field(default_factory=list)
+
+
+def _stale_before() -> datetime:
+    return datetime.utcnow() - timedelta(seconds=settings.JOB_LEASE_SECONDS)
+
+
+def start_recalculation(job_id: UUID) -> None:
+    """Lanza el trabajo en este proceso si no está corriendo ya aquí"""
+    task = _tasks.get(job_id)
+    if task is not None and not task.done():
+        return
+
+    task = asyncio.create_task(run_recalculation_job(job_id))
+    _tasks[job_id] = task
+    task.add_done_callback(lambda _: _tasks.pop(job_id, None))
+
+
+async def cancel_running_jobs() -> None:
+    """Cancela las tareas de este proceso; quedan "running" y se retoman luego"""
+    tasks = list(_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _claim(job_id: UUID) -> Optional[_JobState]:
+    async with AsyncSessionLocal() as session:
+        jobs = BackgroundJobRepository(session)
+        if not await jobs.claim(job_id, _stale_before()):
+            await session.rollback()
+            return None
+
+        job = await jobs.get_by_id(job_id)
+        if job.total is None:
+            job.total = await MemberRepository(session).count_by_church(job.church_id)
+        state = _JobState(
+            church_id=job.church_id,
+            chunk_size=job.chunk_size,
+            cursor=job.cursor,
+            errors=list(job.errors or [])
+        )
+        await session.commit()
+        return state
+
+
+def _score(members: list, today: date, rules) -> None:
+    """commitment_score y risk_level de los miembros, en el lugar"""
+    result = MemberAIService.score_batch(MemberScoringColumns.from_members(members), today, rules)
+    for member, commitment_score, risk_analysis in zip(
+        members, result.commitment_score.tolist(), MemberAIService.risk_analyses(result)
+    ):
+        member.commitment_score = commitment_score
+        member.risk_level = risk_analysis["level"]
+
+
+async def _process_chunk(job_id: UUID, state: _JobState) -> Optional[int]:
+    """
+    Recalcula y guarda un lote; retorna cuántos miembros leyó
+
+    Tres pasos, para no tener una transacción (ni bloqueos) abierta mientras
+    se espera al LLM:
+
+    1. Transacción corta: lee el lote y lo puntúa (el LLM recibe los scores).
+    2. Insights del LLM, sin transacción.
+    3. Transacción corta: bloquea los miembros del lote, vuelve a puntuarlos
+       con sus datos actuales, guarda y avanza el cursor sólo si sigue
+       siendo el que se leyó (expected_cursor).
+
+    None si otro proceso tomó el trabajo (el lote se descarta).
+    """
+    today = date.today()
+    async with AsyncSessionLocal() as session:
+        members_repo = MemberRepository(session)
+        rows = await members_repo.get_score_inputs_page(state.church_id, after=state.cursor, limit=state.chunk_size)
+        if not rows:
+            return 0
+        rules = await members_repo.get_scoring_rules(state.church_id)
+
+    members = [SimpleNamespace(**row._mapping) for row in rows]
+    _score(members, today, rules)
+    # Un request al LLM por cada LLM_BATCH_SIZE miembros; None = texto de plantilla
+    llm_insights = dict(zip(
+        (member.id for member in members),
+        await get_openai_service().llm_member_insights(members, today)
+    ))
+
+    async with AsyncSessionLocal() as session:
+        members_repo = MemberRepository(session)
+        current = await members_repo.lock_score_inputs(state.church_id, [row.id for row in rows])
+        members = [SimpleNamespace(**row._mapping) for row in current]
+        _score(members, today, rules)
+
+        updates = []
+        chunk_errors = []
+        for member in members:
+            try:
+                # El paquete con huella que sirven los endpoints; el texto del LLM reemplaza al de plantilla
+                ai_notes = compute_insights(member, today, rules)
+            except Exception as e:
+                chunk_errors.append({"member_id": str(member.id), "error": str(e), "at": datetime.utcnow().isoformat()})
+                continue
+            if llm_insights.get(member.id):
+                ai_notes["insights"] = llm_insights[member.id]
+
+            updates.append({
+                "id": member.id,
+                "commitment_score": member.commitment_score,
+                "risk_level": member.risk_level,
+                "ai_notes": ai_notes
+            })
+
+        await members_repo.update_scores(updates)
+        mark_churches_dirty(session, [state.church_id])
+
+        errors = (state.errors + chunk_errors)[-MAX_ERRORS:]
+        advanced = await BackgroundJobRepository(session).advance(
+            job_id,
+            expected_cursor=state.cursor,
+            cursor=rows[-1].id,
+            processed=len(rows),
+            updated=len(updates),
+            failed=len(chunk_errors),
+            errors=errors
+        )
+        if not advanced:
+            await session.rollback()
+            return None
+
+        await session.commit()
+
+    state.cursor = rows[-1].id
+    state.errors = errors
+    return len(rows)
+
+
+async def _finish(job_id: UUID, state: _JobState, status: str) -> bool:
+    """Termina el trabajo; False si otro proceso lo retomó (no se toca nada)"""
+    async with AsyncSessionLocal() as session:
+        finished = await BackgroundJobRepository(session).finish(
+            job_id, status, expected_cursor=state.cursor, errors=state.errors
+        )
+        if not finished:
+            await session.rollback()
+            return False
+        if status == "completed":
+            # update_scores no pasa por el ORM: el snapshot se recalcula al final
+            await MemberRepository(session).reconcile_stats_snapshot(state.church_id)
+        await session.commit()
+    return True
+
+
+async def run_recalculation_job(job_id: UUID) -> None:
+    """Ejecuta (o retoma) un trabajo hasta terminar, perder el lease o fallar"""
+    state = await _claim(job_id)
+    if state is None:
+        return
+
+    retries = 0
+    while True:
+        try:
+            read = await _process_chunk(job_id, state)
+        except Exception as e:
+            retries += 1
+            logger.error(f"❌ Recalculation job {job_id} chunk after {state.cursor} failed ({retries}): {e}")
+            if retries >= MAX_CHUNK_RETRIES:
+                state.errors = (state.errors + [{
+                    "member_id": None, "error": str(e), "at": datetime.utcnow().isoformat()
+                }])[-MAX_ERRORS:]
+                if not await _finish(job_id, state, "failed"):
+                    logger.info(f"Recalculation job {job_id} was taken over by another worker")
+                return
+            await asyncio.sleep(2 ** retries)
+            continue
+
+        if read is None:
+            logger.info(f"Recalculation job {job_id} was taken over by another worker")
+            return
+        if read == 0:
+            break
+        retries = 0
+
+    if not await _finish(job_id, state, "completed"):
+        logger.info(f"Recalculation job {job_id} was taken over by another worker")
+        return
+    logger.info(f"✅ Recalculation job {job_id} completed")
+
+
+async def resume_stale_jobs() -> int:
+    """Relanza los trabajos sin latido reciente (proceso caído o reiniciado)"""
+    async with AsyncSessionLocal() as session:
+        job_ids = await BackgroundJobRepository(session).list_resumable(JOB_TYPE, _stale_before())
+
+    for job_id in job_ids:
+        start_recalculation(job_id)
+    return len(job_ids)
+
+
+async def run_job_resumer(interval_seconds: int = None) -> None:
+    """Loop de reanudación; se lanza como tarea en el lifespan de la app"""
+    interval = interval_seconds or settings.JOB_LEASE_SECONDS
+    while True:
+        try:
+            resumed = await resume_stale_jobs()
+            if resumed:
+                logger.info(f"Resumed {resumed} recalculation jobs")
+        except Exception as e:
+            logger.error(f"❌ Error resuming recalculation jobs: {e}")
+        await asyncio.sleep(interval)
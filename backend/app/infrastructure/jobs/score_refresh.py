@@ -0,0 +1,130 @@
+# app/infrastructure/jobs/score_refresh.py
+"""
+Refresco de scores por el paso del tiempo, dentro de PostgreSQL
+
+Con las demás entradas fijas, commitment_score y risk_level sólo cambian
+cuando los días desde last_attendance cruzan un umbral (7/14/21/30/60) o un
+visitante supera los 90 días de membresía. refresh_due_scores recalcula sólo
+a los miembros cuyo umbral venció desde la última corrida guardada en
+scheduler_state; la primera vez hace un recálculo completo para partir de
+scores exactos.
+"""
+import asyncio
+import logging
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config.settings import settings
+from app.infrastructure.database.connection import AsyncSessionLocal
+from app.infrastructure.database.models.church import ChurchModel
+from app.infrastructure.database.models.scheduler_state import SchedulerStateModel
+from app.infrastructure.repositories.member_repository import MemberRepository
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_NAME = "score_boundaries"
+
+
+async def refresh_all_church_scores(today: Optional[date] = None) -> int:
+    """
+    Recalcula commitment_score y risk_level de cada iglesia dentro de PostgreSQL
+
+    Una transacción por iglesia: el UPDATE set-based (rescore_church) y la
+    reconciliación del snapshot de estadísticas se confirman juntos.
+    Retorna la cantidad de miembros cuyo score cambió.
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(ChurchModel.id))
+        church_ids = result.scalars().all()
+
+    changed = 0
+    for church_id in church_ids:
+        async with AsyncSessionLocal() as session:
+            try:
+                repo = MemberRepository(session)
+                church_changed = await repo.rescore_church(church_id, today)
+                if church_changed:
+                    await repo.reconcile_stats_snapshot(church_id)
+                else:
+                    await session.commit()
+                changed += church_changed
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"❌ Error refreshing scores for church {church_id}: {e}")
+
+    return changed
+
+
+async def _save_last_run(session, today: date) -> None:
+    await session.execute(
+        insert(SchedulerStateModel)
+        .values(name=SCHEDULER_NAME, last_run_date=today)
+        .on_conflict_do_update(index_elements=[SchedulerStateModel.name], set_={"last_run_date": today})
+    )
+
+
+async def refresh_due_scores(today: Optional[date] = None) -> int:
+    """
+    Recalcula sólo a los miembros con un umbral vencido desde la última corrida
+
+    El UPDATE (rescore_due) y la nueva fecha de corrida se confirman juntos;
+    la fila de scheduler_state queda bloqueada mientras tanto, así dos
+    procesos no procesan el mismo rango. Retorna la cantidad de miembros
+    cuyo score cambió.
+    """
+    today = today or date.today()
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(SchedulerStateModel)
+            .where(SchedulerStateModel.name == SCHEDULER_NAME)
+            .with_for_update()
+        )
+        state = result.scalar_one_or_none()
+
+        if state is None:
+            await session.rollback()
+            changed = await refresh_all_church_scores(today)
+            await _save_last_run(session, today)
+            await session.commit()
+            return changed
+
+        if state.last_run_date >= today:
+            await session.rollback()
+            return 0
+
+        changed_by_church = await MemberRepository(session).rescore_due(state.last_run_date, today)
+        await _save_last_run(session, today)
+        await session.commit()
+
+    # update() no pasa por el ORM: reconciliar el snapshot de las iglesias tocadas
+    for church_id in changed_by_church:
+        async with AsyncSessionLocal() as session:
+            try:
+                await MemberRepository(session).reconcile_stats_snapshot(church_id)
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"❌ Error reconciling stats for church {church_id}: {e}")
+
+    return sum(changed_by_church.values())
+
+
+async def run_periodic_score_refresh(interval_seconds: int = None) -> None:
+    """
+    Loop del refresco por umbrales; se lanza como tarea en el lifespan de la app
+
+    Corre cada SCORE_REFRESH_INTERVAL_SECONDS pero sólo trabaja cuando cambia
+    la fecha, así el cambio de día se aplica poco después de medianoche.
+    """
+    interval = interval_seconds or settings.SCORE_REFRESH_INTERVAL_SECONDS
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            changed = await refresh_due_scores()
+            if changed:
+                logger.info(f"✅ Member scores refreshed ({changed} changed)")
+        except Exception as e:
+            logger.error(f"❌ Error in score refresh: {e}")
@@ -0,0 +1,43 @@
+# app/infrastructure/jobs/stats_reconciliation.py
+import asyncio
+import logging
+
+from sqlalchemy import select
+
+from app.config.settings import settings
+from app.infrastructure.database.connection import AsyncSessionLocal
+from app.infrastructure.database.models.church import ChurchModel
+from app.infrastructure.repositories.member_repository import MemberRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile_all_churches() -> int:
+    """Recalcula el snapshot de estadísticas de cada iglesia, una transacción por iglesia"""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(ChurchModel.id))
+        church_ids = result.scalars().all()
+
+    reconciled = 0
+    for church_id in church_ids:
+        async with AsyncSessionLocal() as session:
+            try:
+                await MemberRepository(session).reconcile_stats_snapshot(church_id)
+                reconciled += 1
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"❌ Error reconciling stats for church {church_id}: {e}")
+
+    return reconciled
+
+
+async def run_periodic_reconciliation(interval_seconds: int = None) -> None:
+    """Loop de reconciliación; se lanza como tarea en el lifespan de la app"""
+    interval = interval_seconds or settings.STATS_RECONCILE_INTERVAL_SECONDS
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            reconciled = await reconcile_all_churches()
+            logger.info(f"✅ Member stats reconciled for {reconciled} churches")
+        except Exception as e:
+            logger.error(f"❌ Error in stats reconciliation: {e}")
@@ -0,0 +1,157 @@
+# app/infrastructure/repositories/attendance_partition_repository.py
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
+from typing import AsyncIterator, List, Optional
+from datetime import date, datetime
+
+from app.infrastructure.database.models.attendance_archive import AttendanceArchiveModel
+from app.infrastructure.database.models.member import AttendanceRecordModel
+from app.infrastructure.archive import ARCHIVE_COLUMNS
+
+PARENT_TABLE = AttendanceRecordModel.__tablename__
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """attendance_records_YYYY_MM; el nombre sólo se arma desde una fecha"""
+    return f"{PARENT_TABLE}_{month:%Y_%m}"
+
+
+class AttendancePartitionRepository:
+    """
+    Particiones mensuales de attendance_records y su archivo
+
+    Sólo hace DDL sobre nombres armados con partition_name. Ningún método
+    hace commit: crear o separar una partición debe confirmarse junto con
+    el movimiento de filas o el registro del archivo.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_partition_months(self) -> List[date]:
+        """Meses con partición propia, del más antiguo al más reciente"""
+        result = await self.session.execute(
+            text("""
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = CAST(:parent AS regclass)
+            """),
+            {"parent": PARENT_TABLE}
+        )
+        months = []
+        for (name,) in result:
+            if name != DEFAULT_PARTITION and name.startswith(f"{PARENT_TABLE}_"):
+                year, month = name[len(PARENT_TABLE) + 1:].split("_")
+                months.append(date(int(year), int(month), 1))
+        return sorted(months)
+
+    async def get_default_months(self) -> List[date]:
+        """Meses con filas en la partición DEFAULT (les falta su partición)"""
+        result = await self.session.execute(
+            text(f"SELECT DISTINCT CAST(date_trunc('month', event_date) AS DATE) FROM {DEFAULT_PARTITION}")
+        )
+        return sorted(result.scalars())
+
+    async def create_month(self, month: date) -> None:
+        """
+        Crea y adjunta la partición del mes
+
+        Las filas del mes que hayan caído en la DEFAULT se mueven a la nueva
+        partición antes de adjuntarla (si no, ATTACH falla). ATTACH copia
+        índices y claves foráneas de la tabla padre. La DEFAULT queda
+        bloqueada hasta el commit (ATTACH la bloquea igual para validarla):
+        ningún registro del mes entra en ella entre el movimiento y ATTACH.
+        """
+        name = partition_name(month)
+        bounds = {"start": month, "end": add_months(month, 1)}
+        await self.session.execute(text(f"LOCK TABLE {DEFAULT_PARTITION} IN ACCESS EXCLUSIVE MODE"))
+        await self.session.execute(
+            text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        )
+        await self.session.execute(
+            text(f"""
+                WITH moved AS (
+                    DELETE FROM {DEFAULT_PARTITION}
+                    WHERE event_date >= :start AND event_date < :end
+                    RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved
+            """),
+            bounds
+        )
+        await self.session.execute(
+            text(
+                f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+            )
+        )
+
+    async def count_rows(self, month: date, lock: bool = False) -> int:
+        """Filas de la partición; lock=True bloquea escrituras en ella hasta el commit"""
+        name = partition_name(month)
+        if lock:
+            await self.session.execute(text(f"LOCK TABLE {name} IN SHARE MODE"))
+        result = await self.session.execute(text(f"SELECT count(*) FROM {name}"))
+        return result.scalar()
+
+    async def stream_rows(self, month: date, batch_size: int = 10_000) -> AsyncIterator[list]:
+        """Filas de la partición ordenadas por (member_id, event_date, id), en lotes"""
+        result = await self.session.stream(
+            text(f"SELECT {', '.join(ARCHIVE_COLUMNS)} FROM {partition_name(month)} ORDER BY member_id, event_date, id")
+        )
+        async for rows in result.partitions(batch_size):
+            yield rows
+
+    async def detach_month(self, month: date, drop: bool = True) -> None:
+        """Separa la partición del mes (y la elimina si drop)"""
+        name = partition_name(month)
+        await self.session.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        if drop:
+            await self.session.execute(text(f"DROP TABLE {name}"))
+
+    async def add_archive(self, month: date, path: str, records: int) -> None:
+        statement = insert(AttendanceArchiveModel).values(
+            month=month, path=path, records=records, archived_at=datetime.utcnow()
+        )
+        await self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[AttendanceArchiveModel.month],
+                set_={"path": statement.excluded.path, "records": statement.excluded.records,
+                      "archived_at": statement.excluded.archived_at}
+            )
+        )
+
+    async def get_archives(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> List[AttendanceArchiveModel]:
+        """Meses archivados que tocan el rango, del más reciente al más antiguo"""
+        query = select(AttendanceArchiveModel).order_by(AttendanceArchiveModel.month.desc())
+        if date_from:
+            query = query.where(AttendanceArchiveModel.month >= month_start(date_from))
+        if date_to:
+            query = query.where(AttendanceArchiveModel.month <= date_to)
+
+        result = await self.session.execute(query)
+        return list(result.scalars())
+
+    async def get_archived_until(self) -> Optional[date]:
+        """Primer día posterior al último mes archivado (None si no hay archivo)"""
+        result = await self.session.execute(
+            select(AttendanceArchiveModel.month).order_by(AttendanceArchiveModel.month.desc()).limit(1)
+        )
+        month = result.scalar_one_or_none()
+        return add_months(month, 1) if month else None
@@ -0,0 +1,140 @@
+# app/infrastructure/repositories/attendance_rollup_repository.py
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func, and_, cast, literal, Date, DateTime, Integer
+from sqlalchemy.dialects.postgresql import insert
+from typing import List, Optional
+from uuid import UUID
+from datetime import date, datetime, timedelta
+
+from app.infrastructure.database.models.attendance_rollup import AttendanceWeeklyRollupModel
+from app.infrastructure.database.models.church import ChurchModel
+from app.infrastructure.database.models.member import AttendanceRecordModel
+from app.infrastructure.repositories.attendance_partition_repository import AttendancePartitionRepository
+
+
+def week_start(value: date) -> date:
+    """Lunes de la semana de `value` (igual que date_trunc('week'))"""
+    return value - timedelta(days=value.weekday())
+
+
+def week_start_expr(column):
+    return cast(func.date_trunc("week", column), Date)
+
+
+class AttendanceRollupRepository:
+    """Repositorio de los agregados semanales de asistencia. Ningún método hace commit."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add_records(self, church_id: UUID, event_type: str, event_date: date, records: int, attended: int) -> None:
+        """
+        Suma registros nuevos a la semana del evento (upsert con incremento)
+
+        Se llama en la transacción que inserta los registros y después del
+        INSERT en attendance_records: así la reconstrucción de la iglesia
+        (que bloquea su fila en churches) espera a que se confirme.
+        """
+        if not records:
+            return
+
+        statement = insert(AttendanceWeeklyRollupModel).values(
+            church_id=church_id,
+            event_type=event_type,
+            week_start=week_start(event_date),
+            records=records,
+            attended=attended,
+            updated_at=datetime.utcnow()
+        )
+        await self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[
+                    AttendanceWeeklyRollupModel.church_id,
+                    AttendanceWeeklyRollupModel.event_type,
+                    AttendanceWeeklyRollupModel.week_start
+                ],
+                set_={
+                    "records": AttendanceWeeklyRollupModel.records + statement.excluded.records,
+                    "attended": AttendanceWeeklyRollupModel.attended + statement.excluded.attended,
+                    "updated_at": statement.excluded.updated_at
+                }
+            )
+        )
+
+    async def get_weekly(
+        self,
+        church_id: UUID,
+        since: date,
+        until: date,
+        event_type: Optional[str] = None
+    ) -> List:
+        """
+        Filas (week_start, records, attended) de las semanas con datos
+
+        Sin event_type suma todos los tipos de evento de cada semana.
+        """
+        conditions = [
+            AttendanceWeeklyRollupModel.church_id == church_id,
+            AttendanceWeeklyRollupModel.week_start >= week_start(since),
+            AttendanceWeeklyRollupModel.week_start <= until
+        ]
+        if event_type is not None:
+            conditions.append(AttendanceWeeklyRollupModel.event_type == event_type)
+
+        result = await self.session.execute(
+            select(
+                AttendanceWeeklyRollupModel.week_start,
+                cast(func.sum(AttendanceWeeklyRollupModel.records), Integer).label("records"),
+                cast(func.sum(AttendanceWeeklyRollupModel.attended), Integer).label("attended")
+            )
+            .where(and_(*conditions))
+            .group_by(AttendanceWeeklyRollupModel.week_start)
+            .order_by(AttendanceWeeklyRollupModel.week_start)
+        )
+        return result.all()
+
+    async def rebuild(self, church_id: UUID, since: Optional[date] = None) -> int:
+        """
+        Reconstruye los agregados de la iglesia desde attendance_records
+
+        Bloquea la fila de la iglesia: los registros nuevos (cuya FK a
+        churches la toma en modo compartido) esperan a que termine, y ella a
+        los que están en curso. Con `since` sólo rehace las semanas desde la
+        que contiene esa fecha. Las semanas de meses archivados se conservan:
+        sus registros ya no están en attendance_records. Retorna las filas
+        escritas.
+        """
+        await self.session.execute(
+            select(ChurchModel.id).where(ChurchModel.id == church_id).with_for_update()
+        )
+
+        archived_until = await AttendancePartitionRepository(self.session).get_archived_until()
+        if archived_until is not None:
+            # Primer lunes sin archivar (la semana del corte mezcla archivo y tabla)
+            live_start = week_start(archived_until + timedelta(days=6))
+            since = max(since or live_start, live_start)
+
+        delete_conditions = [AttendanceWeeklyRollupModel.church_id == church_id]
+        record_conditions = [AttendanceRecordModel.church_id == church_id]
+        if since is not None:
+            delete_conditions.append(AttendanceWeeklyRollupModel.week_start >= week_start(since))
+            record_conditions.append(AttendanceRecordModel.event_date >= week_start(since))
+        await self.session.execute(delete(AttendanceWeeklyRollupModel).where(and_(*delete_conditions)))
+
+        week = week_start_expr(AttendanceRecordModel.event_date)
+        result = await self.session.execute(
+            insert(AttendanceWeeklyRollupModel).from_select(
+                ["church_id", "event_type", "week_start", "records", "attended", "updated_at"],
+                select(
+                    AttendanceRecordModel.church_id,
+                    AttendanceRecordModel.event_type,
+                    week,
+                    func.count(AttendanceRecordModel.id),
+                    func.count(AttendanceRecordModel.id).filter(AttendanceRecordModel.attended.is_(True)),
+                    literal(datetime.utcnow(), DateTime)
+                )
+                .where(and_(*record_conditions))
+                .group_by(AttendanceRecordModel.church_id, AttendanceRecordModel.event_type, week)
+            )
+        )
+        return result.rowcount
@@ -0,0 +1,151 @@
+# app/infrastructure/repositories/attendance_trend_sql.py
+"""
+Tendencia de asistencia (analyze_member_trend) calculada en PostgreSQL
+
+Sobre los registros de cada miembro en la ventana (since, today], ordenados
+por (event_date, id):
+
+- Primera vs segunda mitad: row_number() y count(*) OVER por miembro; la
+  primera mitad son las primeras count // 2 filas, igual que el mid_point
+  de analyze_member_trend.
+- Tasas de 4/8/12 semanas hasta `today` con conteos FILTER.
+- Rachas (gaps-and-islands): con la suma acumulada de asistencias, "faltas
+  previas" es constante dentro de una racha de asistencia y "asistencias
+  previas" dentro de una de faltas; agrupando por esa clave queda una fila
+  por racha. La actual es la que contiene la última fila.
+
+Todas las ventanas comparten PARTITION BY member_id ORDER BY event_date, id:
+un solo ordenamiento de las filas del período, que se leen del rango
+(church_id, event_date) de ix_attendance_church_date sin tocar el resto del
+historial.
+"""
+from datetime import date, timedelta
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import Float, Integer, and_, case, cast, func, select
+
+from app.infrastructure.database.models.member import AttendanceRecordModel, MemberModel
+
+ROLLING_WEEKS = (4, 8, 12)
+
+
+def _member_window():
+    return {
+        "partition_by": AttendanceRecordModel.member_id,
+        "order_by": (AttendanceRecordModel.event_date, AttendanceRecordModel.id),
+    }
+
+
+def attendance_trend_query(
+    church_id: UUID,
+    since: date,
+    today: date,
+    member_id: Optional[UUID] = None,
+    min_records: int = 4
+):
+    """
+    Una fila por miembro: mitades, tasas móviles, rachas y change
+
+    Con member_id se devuelve la fila del miembro aunque no tenga registros
+    (columnas de asistencia en NULL); sin él, sólo los miembros activos con al
+    menos min_records registros, ordenados por mayor caída primero.
+    """
+    attended = func.coalesce(AttendanceRecordModel.attended, False)
+
+    conditions = [
+        AttendanceRecordModel.church_id == church_id,
+        AttendanceRecordModel.event_date > since,
+        AttendanceRecordModel.event_date <= today,
+    ]
+    if member_id is not None:
+        conditions.append(AttendanceRecordModel.member_id == member_id)
+
+    window = _member_window()
+    attended_int = cast(attended, Integer)
+    rn = func.row_number().over(**window)
+    attended_so_far = func.sum(attended_int).over(**window)
+    ordered = (
+        select(
+            AttendanceRecordModel.member_id,
+            AttendanceRecordModel.event_date,
+            attended.label("attended"),
+            rn.label("rn"),
+            func.count().over(partition_by=AttendanceRecordModel.member_id).label("total"),
+            # Constante dentro de cada racha: faltas previas si asistió, asistencias previas si no
+            case((attended, rn - attended_so_far), else_=attended_so_far).label("streak"),
+        )
+        .where(and_(*conditions))
+        .subquery("ordered")
+    )
+
+    # Una fila por racha, con sus conteos por mitad y por ventana móvil
+    first_half = ordered.c.rn * 2 <= ordered.c.total
+    islands = (
+        select(
+            ordered.c.member_id,
+            ordered.c.attended,
+            func.count().label("length"),
+            func.count().filter(first_half).label("first_half"),
+            *(
+                func.count().filter(ordered.c.event_date > today - timedelta(weeks=weeks)).label(f"last_{weeks}_weeks")
+                for weeks in ROLLING_WEEKS
+            ),
+            func.bool_or(ordered.c.rn == ordered.c.total).label("is_current"),
+        )
+        .group_by(ordered.c.member_id, ordered.c.attended, ordered.c.streak)
+        .subquery("islands")
+    )
+
+    def _rate(column):
+        """% de asistencia entre los registros contados en `column`"""
+        return cast(
+            100.0 * func.sum(column).filter(islands.c.attended) / func.nullif(func.sum(column), 0), Float
+        )
+
+    records = func.sum(islands.c.length)
+    second_half = islands.c.length - islands.c.first_half
+    rates = (
+        select(
+            islands.c.member_id,
+            cast(records, Integer).label("records"),
+            _rate(islands.c.first_half).label("first_half_rate"),
+            _rate(second_half).label("second_half_rate"),
+            *(_rate(islands.c[f"last_{weeks}_weeks"]).label(f"rate_{weeks}_weeks") for weeks in ROLLING_WEEKS),
+            func.max(islands.c.length).filter(islands.c.is_current).label("current_streak"),
+            func.bool_or(islands.c.attended).filter(islands.c.is_current).label("current_streak_attended"),
+            func.coalesce(func.max(islands.c.length).filter(islands.c.attended), 0).label("longest_attended_streak"),
+        )
+        .group_by(islands.c.member_id)
+        .having(records >= min_records)
+        .subquery("rates")
+    )
+
+    change = (rates.c.second_half_rate - rates.c.first_half_rate).label("change")
+    query = select(
+        MemberModel.id.label("member_id"),
+        MemberModel.first_name,
+        MemberModel.last_name,
+        func.coalesce(rates.c.records, 0).label("records"),
+        rates.c.first_half_rate,
+        rates.c.second_half_rate,
+        change,
+        *(rates.c[f"rate_{weeks}_weeks"] for weeks in ROLLING_WEEKS),
+        rates.c.current_streak,
+        rates.c.current_streak_attended,
+        rates.c.longest_attended_streak,
+    )
+
+    if member_id is not None:
+        return (
+            query.select_from(MemberModel)
+            .outerjoin(rates, rates.c.member_id == MemberModel.id)
+            .where(MemberModel.id == member_id)
+        )
+
+    return (
+        query.select_from(rates)
+        .join(MemberModel, MemberModel.id == rates.c.member_id)
+        .where(MemberModel.member_status == "active")
+        .order_by(change.asc(), MemberModel.id)
+    )
@@ -0,0 +1,181 @@
+# app/infrastructure/repositories/background_job_repository.py
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, and_, or_, func
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+
+from app.infrastructure.database.models.background_job import BackgroundJobModel
+
+ACTIVE_STATUSES = ("pending", "running")
+
+
+class BackgroundJobRepository:
+    """Repositorio de trabajos en segundo plano. Ningún método hace commit."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(
+        self,
+        church_id: UUID,
+        job_type: str,
+        created_by: Optional[UUID] = None,
+        chunk_size: int = 500
+    ) -> BackgroundJobModel:
+        job = BackgroundJobModel(
+            church_id=church_id,
+            job_type=job_type,
+            created_by=created_by,
+            chunk_size=chunk_size,
+            status="pending",
+            errors=[]
+        )
+        self.session.add(job)
+        await self.session.flush()
+        return job
+
+    async def get_by_id(self, job_id: UUID) -> Optional[BackgroundJobModel]:
+        result = await self.session.execute(
+            select(BackgroundJobModel).where(BackgroundJobModel.id == job_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_active(self, church_id: UUID, job_type: str) -> Optional[BackgroundJobModel]:
+        """Trabajo pendiente o en curso de la iglesia, si hay uno"""
+        result = await self.session.execute(
+            select(BackgroundJobModel)
+            .where(
+                and_(
+                    BackgroundJobModel.church_id == church_id,
+                    BackgroundJobModel.job_type == job_type,
+                    BackgroundJobModel.status.in_(ACTIVE_STATUSES)
+                )
+            )
+            .order_by(BackgroundJobModel.created_at.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def list_resumable(self, job_type: str, stale_before: datetime) -> List[UUID]:
+        """Trabajos pendientes o en curso cuyo latido es anterior a `stale_before`"""
+        result = await self.session.execute(
+            select(BackgroundJobModel.id).where(
+                and_(
+                    BackgroundJobModel.job_type == job_type,
+                    BackgroundJobModel.status.in_(ACTIVE_STATUSES),
+                    or_(
+                        BackgroundJobModel.heartbeat_at.is_(None),
+                        BackgroundJobModel.heartbeat_at < stale_before
+                    )
+                )
+            )
+        )
+        return list(result.scalars().all())
+
+    async def claim(self, job_id: UUID, stale_before: datetime) -> bool:
+        """
+        Toma el trabajo para este proceso (UPDATE condicional, atómico)
+
+        Sólo si está pendiente o si está en curso sin latido reciente; así
+        dos procesos no ejecutan el mismo trabajo a la vez.
+        """
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            update(BackgroundJobModel)
+            .where(
+                and_(
+                    BackgroundJobModel.id == job_id,
+                    or_(
+                        BackgroundJobModel.status == "pending",
+                        and_(
+                            BackgroundJobModel.status == "running",
+                            or_(
+                                BackgroundJobModel.heartbeat_at.is_(None),
+                                BackgroundJobModel.heartbeat_at < stale_before
+                            )
+                        )
+                    )
+                )
+            )
+            .values(
+                status="running",
+                heartbeat_at=now,
+                started_at=func.coalesce(BackgroundJobModel.started_at, now),
+                attempts=BackgroundJobModel.attempts + 1
+            )
+            .returning(BackgroundJobModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def advance(
+        self,
+        job_id: UUID,
+        expected_cursor: Optional[UUID],
+        cursor: UUID,
+        processed: int,
+        updated: int,
+        failed: int,
+        errors: list
+    ) -> bool:
+        """
+        Registra un lote confirmado y renueva el latido
+
+        Falla (False) si el cursor ya no es `expected_cursor`: otro proceso
+        retomó el trabajo y el lote debe descartarse con rollback.
+        """
+        result = await self.session.execute(
+            update(BackgroundJobModel)
+            .where(
+                and_(
+                    BackgroundJobModel.id == job_id,
+                    BackgroundJobModel.status == "running",
+                    BackgroundJobModel.cursor.is_not_distinct_from(expected_cursor)
+                )
+            )
+            .values(
+                cursor=cursor,
+                processed=BackgroundJobModel.processed + processed,
+                updated=BackgroundJobModel.updated + updated,
+                failed=BackgroundJobModel.failed + failed,
+                errors=errors,
+                heartbeat_at=datetime.utcnow()
+            )
+            .returning(BackgroundJobModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def finish(
+        self,
+        job_id: UUID,
+        status: str,
+        expected_cursor: Optional[UUID],
+        errors: Optional[list] = None
+    ) -> bool:
+        """
+        Marca el trabajo como completed o failed
+
+        Con la misma condición que advance: falla (False) si el trabajo ya no
+        está en curso con `expected_cursor`, es decir, si otro proceso lo
+        retomó; ese proceso es el que lo termina.
+        """
+        values = {"status": status, "finished_at": datetime.utcnow(), "heartbeat_at": datetime.utcnow()}
+        if errors is not None:
+            values["errors"] = errors
+
+        result = await self.session.execute(
+            update(BackgroundJobModel)
+            .where(
+                and_(
+                    BackgroundJobModel.id == job_id,
+                    BackgroundJobModel.status == "running",
+                    BackgroundJobModel.cursor.is_not_distinct_from(expected_cursor)
+                )
+            )
+            .values(**values)
+            .returning(BackgroundJobModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none() is not None
@@ -0,0 +1,160 @@
+# app/infrastructure/repositories/event_repository.py
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, and_
+from sqlalchemy.dialects.postgresql import insert
+from typing import List, Optional
+from uuid import UUID, uuid4
+from datetime import date, datetime, time, timedelta
+
+from app.infrastructure.database.models.event import EventModel
+from app.infrastructure.database.models.member import AttendanceRecordModel, MemberModel
+
+
+def day_bounds(value: date):
+    """[inicio, fin) del día como timestamps, para comparar con starts_at"""
+    start = datetime.combine(value, time.min)
+    return start, start + timedelta(days=1)
+
+
+class EventRepository:
+    """Repositorio de eventos y sus totales de asistencia. Ningún método hace commit."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, church_id: UUID, event_type: str, name: str, starts_at: datetime,
+                     recurrence: Optional[str] = None) -> EventModel:
+        event = EventModel(
+            church_id=church_id, event_type=event_type, name=name, starts_at=starts_at,
+            recurrence=recurrence, records=0, headcount=0
+        )
+        self.session.add(event)
+        await self.session.flush()
+        return event
+
+    async def get_by_id(self, event_id: UUID, church_id: UUID) -> Optional[EventModel]:
+        result = await self.session.execute(
+            select(EventModel).where(and_(EventModel.id == event_id, EventModel.church_id == church_id))
+        )
+        return result.scalar_one_or_none()
+
+    async def get_events(
+        self,
+        church_id: UUID,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        event_type: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: int = 100
+    ) -> List[EventModel]:
+        """Eventos de la iglesia, del más reciente al más antiguo (ix_events_church_starts)"""
+        conditions = [EventModel.church_id == church_id]
+        if date_from:
+            conditions.append(EventModel.starts_at >= day_bounds(date_from)[0])
+        if date_to:
+            conditions.append(EventModel.starts_at < day_bounds(date_to)[1])
+        if event_type:
+            conditions.append(EventModel.event_type == event_type)
+        if search:
+            conditions.append(EventModel.name.ilike(f"%{search}%"))
+
+        result = await self.session.execute(
+            select(EventModel).where(and_(*conditions)).order_by(EventModel.starts_at.desc()).limit(limit)
+        )
+        return list(result.scalars())
+
+    async def get_or_create_id(self, church_id: UUID, event_type: str, event_date: date,
+                               name: Optional[str] = None) -> UUID:
+        """
+        Evento del día con ese tipo y nombre (el primero si hay varios); si no hay, lo crea
+
+        Es lo que usan los registros que llegan sin event_id. Sin nombre se
+        usa el tipo, como en la migración que agrupó los registros
+        existentes. El evento nuevo empieza a las 00:00; si otra transacción
+        lo crea a la vez, se usa el suyo.
+        """
+        name = name or event_type
+        start, end = day_bounds(event_date)
+        query = (
+            select(EventModel.id)
+            .where(
+                and_(
+                    EventModel.church_id == church_id,
+                    EventModel.event_type == event_type,
+                    EventModel.name == name,
+                    EventModel.starts_at >= start,
+                    EventModel.starts_at < end
+                )
+            )
+            .order_by(EventModel.starts_at)
+            .limit(1)
+        )
+        event_id = (await self.session.execute(query)).scalar_one_or_none()
+        if event_id is not None:
+            return event_id
+
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            insert(EventModel)
+            .values(
+                id=uuid4(), church_id=church_id, event_type=event_type, name=name, starts_at=start,
+                records=0, headcount=0, created_at=now, updated_at=now
+            )
+            .on_conflict_do_nothing(constraint="uq_events_church_type_name_start")
+            .returning(EventModel.id)
+        )
+        event_id = result.scalar_one_or_none()
+        if event_id is None:
+            event_id = (await self.session.execute(query)).scalar_one()
+        return event_id
+
+    async def add_headcount(self, event_id: UUID, records: int, attended: int) -> None:
+        """
+        Suma registros nuevos a los totales del evento
+
+        Se llama en la transacción que inserta los registros: la fila del
+        evento queda bloqueada hasta el commit, así dos registros simultáneos
+        no pierden un incremento.
+        """
+        if not records:
+            return
+
+        await self.session.execute(
+            update(EventModel)
+            .where(EventModel.id == event_id)
+            .values(
+                records=EventModel.records + records,
+                headcount=EventModel.headcount + attended,
+                updated_at=datetime.utcnow()
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def get_attendees(self, event: EventModel, attended_only: bool = False) -> list:
+        """
+        Registros del evento con el nombre del miembro, por apellido y nombre
+
+        Filtra también por la fecha del evento: se lee una sola partición
+        (uq_attendance_event_member). Los eventos de meses archivados conservan sus
+        totales pero no tienen filas aquí.
+        """
+        conditions = [
+            AttendanceRecordModel.event_id == event.id,
+            AttendanceRecordModel.event_date == event.starts_at.date()
+        ]
+        if attended_only:
+            conditions.append(AttendanceRecordModel.attended.is_(True))
+
+        result = await self.session.execute(
+            select(
+                AttendanceRecordModel.member_id,
+                MemberModel.first_name,
+                MemberModel.last_name,
+                AttendanceRecordModel.attended,
+                AttendanceRecordModel.arrival_time
+            )
+            .join(MemberModel, MemberModel.id == AttendanceRecordModel.member_id)
+            .where(and_(*conditions))
+            .order_by(MemberModel.last_name, MemberModel.first_name, AttendanceRecordModel.member_id)
+        )
+        return result.all()
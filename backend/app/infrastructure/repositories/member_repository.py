@@ -1,23 +1,143 @@
 # app/infrastructure/repositories/member_repository.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import (
+    select, update, func, and_, or_, tuple_, case, literal, text, cast, union_all,
+    Boolean, Date, DateTime, Float, Integer, String, bindparam
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
 from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+import re
 
 from app.infrastructure.database.models.member import (
     MemberModel, 
     PastoralNoteModel,
-    AttendanceRecordModel
+    AttendanceRecordModel,
+    member_search_document,
+    member_search_vector,
+    member_phone_digits,
+    member_birth_month_day,
+    member_membership_month_day,
+    unaccent_lower
 )
+from app.infrastructure.database.models.member_stats import ChurchMemberStatsModel
+from app.infrastructure.database.models.church import ChurchModel
+from app.infrastructure.database.models.scheduler_state import SchedulerStateModel
 from app.domain.schemas.member import (
     MemberCreate, 
     MemberUpdate,
     PastoralNoteCreate,
     AttendanceRecordCreate,
-    ChurchMemberStats
+    ChurchMemberStats,
+    MemberListItem,
+    MemberBulkUpdate
+)
+from app.infrastructure.repositories.member_stats_tracking import (
+    STATS_FIELDS, age_bucket, apply_stats_deltas, stats_deltas
+)
+from app.infrastructure.repositories.attendance_rollup_repository import AttendanceRollupRepository
+from app.infrastructure.repositories.attendance_partition_repository import AttendancePartitionRepository
+from app.infrastructure.repositories.event_repository import EventRepository
+from app.infrastructure.archive import read_member_attendance
+from app.infrastructure.repositories.member_scoring_sql import (
+    commitment_score_expr, risk_score_expr, risk_level_expr, boundary_due_criteria
 )
+from app.infrastructure.repositories.attendance_trend_sql import attendance_trend_query
+from app.domain.services.scoring_rules import CURRENT_RULES_VERSION, ScoringRules, get_rules
+from app.domain.services.celebrations import celebration_ranges
+from app.infrastructure.cache.invalidation import mark_churches_dirty
+from app.core.pagination import encode_cursor, decode_cursor, InvalidCursorError
+
+
+# Ventana de attendance_rate: registros con event_date >= inicio. Los contadores
+# attendance_window_* de members la siguen registro a registro y
+# jobs/attendance_window la avanza una vez por día (inicio = última corrida - 90).
+# Cada iglesia tiene su fila en scheduler_state; la global marca la última
+# corrida completa y es el punto de partida de las iglesias sin fila propia
+ATTENDANCE_WINDOW_DAYS = 90
+ATTENDANCE_WINDOW_SCHEDULER = "attendance_window"
+
+
+# Columnas de uq_attendance_event_member: un registro por miembro y evento
+ATTENDANCE_EVENT_KEY = ["event_id", "member_id", "event_date"]
+
+
+def attendance_window_scheduler(church_id: UUID) -> str:
+    """Nombre de la fila de scheduler_state con la última corrida de la ventana de la iglesia"""
+    return f"{ATTENDANCE_WINDOW_SCHEDULER}:{church_id}"
+
+
+def attendance_rate(total: int, attended: int) -> float:
+    """Tasa de asistencia de la ventana (la misma fórmula que attendance_rate_expr)"""
+    return (attended / total) * 100 if total else 0.0
+
+
+def attendance_rate_expr(total, attended):
+    return case((total > 0, (cast(attended, Float) / cast(total, Float)) * 100), else_=0.0)
+
+
+# Columnas de MemberListItem: los listados no cargan filas ORM completas
+# (ARRAYs, JSON ai_notes, notes Text, ...) ni crean identidades en la sesión
+LIST_ITEM_COLUMNS = (
+    MemberModel.id,
+    MemberModel.first_name,
+    MemberModel.last_name,
+    MemberModel.email,
+    MemberModel.phone,
+    MemberModel.member_type,
+    func.coalesce(MemberModel.commitment_score, 0.0).label("commitment_score"),
+    func.coalesce(MemberModel.attendance_rate, 0.0).label("attendance_rate"),
+    MemberModel.risk_level,
+    func.coalesce(MemberModel.ministries, text("'{}'")).label("ministries"),
+)
+
+# Campos que leen calculate_commitment_score y detect_abandonment_risk
+SCORE_INPUT_COLUMNS = (
+    MemberModel.id,
+    MemberModel.church_id,
+    MemberModel.member_type,
+    MemberModel.membership_date,
+    MemberModel.attendance_rate,
+    MemberModel.last_attendance,
+    MemberModel.ministries,
+    MemberModel.spiritual_gifts,
+    MemberModel.small_group_id,
+    MemberModel.small_group_role,
+    MemberModel.commitment_score,
+    MemberModel.risk_level,
+)
+
+# SCORE_INPUT_COLUMNS más el resto de lo que lee el paquete de ai_notes
+# (member_insights.INSIGHT_INPUT_FIELDS)
+INSIGHT_INPUT_COLUMNS = SCORE_INPUT_COLUMNS + (
+    MemberModel.first_name,
+    MemberModel.birth_date,
+    MemberModel.preferred_contact_method,
+    MemberModel.skills,
+)
+
+
+def _array_edit(column, add: List[str], remove: List[str]):
+    """
+    (column || add) - remove, sin duplicados y conservando el orden
+
+    Una sola expresión por columna, evaluada por fila dentro del UPDATE.
+    """
+    name = column.key
+    return text(f"""
+        ARRAY(
+            SELECT t.v
+            FROM unnest(array_cat(coalesce({name}, '{{}}'), :{name}_add)) WITH ORDINALITY AS t(v, n)
+            WHERE t.v <> ALL(:{name}_remove)
+            GROUP BY t.v
+            ORDER BY min(t.n)
+        )
+    """).bindparams(
+        bindparam(f"{name}_add", add, type_=ARRAY(String)),
+        bindparam(f"{name}_remove", remove, type_=ARRAY(String))
+    )
 
 
 class MemberRepository:
@@ -35,14 +155,33 @@ class MemberRepository:
         await self.session.refresh(member)
         return member
     
-    async def get_by_id(self, member_id: UUID) -> Optional[MemberModel]:
+    async def get_by_id(
+        self,
+        member_id: UUID,
+        with_notes: bool = False,
+        with_attendance: bool = False
+    ) -> Optional[MemberModel]:
+        """
+        Obtener miembro por ID
+        
+        Las colecciones pastoral_notes y attendance_records sólo se cargan si
+        se piden; acceder a ellas sin cargarlas falla en una sesión async.
+        """
+        query = select(MemberModel).where(MemberModel.id == member_id)
+        
+        if with_notes:
+            query = query.options(selectinload(MemberModel.pastoral_notes))
+        
+        if with_attendance:
+            query = query.options(selectinload(MemberModel.attendance_records))
+        
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+    
+    async def get_church_id(self, member_id: UUID) -> Optional[UUID]:
+        """Iglesia del miembro, para autorizar sin cargar la fila completa"""
         result = await self.session.execute(
-            select(MemberModel)
-            .where(MemberModel.id == member_id)
-            .options(
-                selectinload(MemberModel.pastoral_notes),
-                selectinload(MemberModel.attendance_records)
-            )
+            select(MemberModel.church_id).where(MemberModel.id == member_id)
         )
         return result.scalar_one_or_none()
     
@@ -61,45 +200,176 @@ class MemberRepository:
         skip: int = 0,
         limit: int = 100
     ) -> List[MemberModel]:
-        query = select(MemberModel).where(MemberModel.church_id == church_id)
-        
-        if member_type:
-            query = query.where(MemberModel.member_type == member_type)
-        
-        if member_status:
-            query = query.where(MemberModel.member_status == member_status)
-        
-        if risk_level:
-            query = query.where(MemberModel.risk_level == risk_level)
-        
+        query = self._church_query(select(MemberModel), church_id, member_type, member_status, risk_level)
         query = query.order_by(MemberModel.last_name, MemberModel.first_name)
         query = query.offset(skip).limit(limit)
         
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    async def list_by_church(
+        self,
+        church_id: UUID,
+        member_type: Optional[str] = None,
+        member_status: str = "active",
+        risk_level: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[MemberListItem]:
+        """Igual que get_all_by_church pero proyectando sólo las columnas de MemberListItem"""
+        query = self._church_query(select(*LIST_ITEM_COLUMNS), church_id, member_type, member_status, risk_level)
+        query = query.order_by(MemberModel.last_name, MemberModel.first_name)
+        query = query.offset(skip).limit(limit)
+        
+        return await self._fetch_list_items(query)
+    
+    async def get_page_by_church(
+        self,
+        church_id: UUID,
+        member_type: Optional[str] = None,
+        member_status: str = "active",
+        risk_level: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[MemberListItem], Optional[str]]:
+        """
+        Paginación por cursor (keyset) sobre (last_name, first_name, id)
+        
+        Retorna la página (proyectada a MemberListItem) y el cursor de la
+        siguiente, o None si no hay más. Lanza InvalidCursorError si el
+        cursor no es válido.
+        """
+        query = self._church_query(select(*LIST_ITEM_COLUMNS), church_id, member_type, member_status, risk_level)
+        
+        if after:
+            last_name, first_name, last_id = decode_cursor(after, size=3)
+            try:
+                last_id = UUID(last_id)
+            except (TypeError, ValueError) as e:
+                raise InvalidCursorError(f"Cursor inválido: {after}") from e
+            
+            query = query.where(
+                tuple_(MemberModel.last_name, MemberModel.first_name, MemberModel.id)
+                > tuple_(last_name, first_name, last_id)
+            )
+        
+        query = query.order_by(MemberModel.last_name, MemberModel.first_name, MemberModel.id)
+        # Un registro extra indica si existe una página siguiente
+        query = query.limit(limit + 1)
+        
+        members = await self._fetch_list_items(query)
+        
+        next_cursor = None
+        if len(members) > limit:
+            members = members[:limit]
+            last = members[-1]
+            next_cursor = encode_cursor(last.last_name, last.first_name, last.id)
+        
+        return members, next_cursor
+    
     async def search_members(
         self,
         church_id: UUID,
         search_term: str,
         limit: int = 50
     ) -> List[MemberModel]:
-        search = f"%{search_term}%"
-        query = select(MemberModel).where(
-            and_(
-                MemberModel.church_id == church_id,
-                or_(
-                    MemberModel.first_name.ilike(search),
-                    MemberModel.last_name.ilike(search),
-                    MemberModel.email.ilike(search),
-                    MemberModel.phone.ilike(search)
-                )
-            )
-        ).limit(limit)
+        """
+        Búsqueda por nombre, email o teléfono, ordenada por relevancia
+        
+        - Insensible a acentos y mayúsculas ("perez" encuentra "Pérez")
+        - Prefijos por palabra ("mar gon" encuentra "María González")
+        - Teléfono por dígitos, ignorando espacios, guiones y "+"
+        
+        Usa los índices GIN ix_members_search_tsv, ix_members_search_trgm
+        e ix_members_phone_digits_trgm.
+        """
+        query = self._search_query(select(MemberModel), church_id, search_term, limit)
+        if query is None:
+            return []
         
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    async def search_list_items(
+        self,
+        church_id: UUID,
+        search_term: str,
+        limit: int = 50
+    ) -> List[MemberListItem]:
+        """search_members proyectando sólo las columnas de MemberListItem"""
+        query = self._search_query(select(*LIST_ITEM_COLUMNS), church_id, search_term, limit)
+        if query is None:
+            return []
+        
+        return await self._fetch_list_items(query)
+    
+    @staticmethod
+    def _church_query(
+        query,
+        church_id: UUID,
+        member_type: Optional[str] = None,
+        member_status: Optional[str] = None,
+        risk_level: Optional[str] = None
+    ):
+        """Aplica el filtro de iglesia y los filtros opcionales del listado"""
+        query = query.where(MemberModel.church_id == church_id)
+        
+        if member_type:
+            query = query.where(MemberModel.member_type == member_type)
+        
+        if member_status:
+            query = query.where(MemberModel.member_status == member_status)
+        
+        if risk_level:
+            query = query.where(MemberModel.risk_level == risk_level)
+        
+        return query
+    
+    @staticmethod
+    def _search_query(query, church_id: UUID, search_term: str, limit: int):
+        """Filtro y orden por relevancia de la búsqueda; None si no hay términos"""
+        words = re.findall(r"[^\W_]+", search_term.lower())
+        if not words:
+            return None
+        
+        needle = unaccent_lower(literal(" ".join(words)))
+        ts_query = func.to_tsquery(
+            text("'simple'::regconfig"),
+            func.f_unaccent(literal(" & ".join(f"{w}:*" for w in words)))
+        )
+        escaped = search_term.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        
+        matches = [
+            member_search_vector.op("@@")(ts_query),
+            member_search_document.like(unaccent_lower(literal(f"%{escaped.strip()}%"))),
+            needle.op("<%")(member_search_document)
+        ]
+        rank = func.ts_rank(member_search_vector, ts_query) + func.word_similarity(needle, member_search_document)
+        
+        digits = re.sub(r"[^0-9]", "", search_term)
+        if len(digits) >= 3:
+            phone_match = member_phone_digits.like(f"%{digits}%")
+            matches.append(phone_match)
+            rank = rank + case((phone_match, 1.0), else_=0.0)
+        
+        return (
+            query
+            .where(
+                and_(
+                    MemberModel.church_id == church_id,
+                    or_(*matches)
+                )
+            )
+            .order_by(rank.desc(), MemberModel.last_name, MemberModel.first_name, MemberModel.id)
+            .limit(limit)
+        )
+    
+    async def _fetch_list_items(self, query) -> List[MemberListItem]:
+        # Filas ya validadas al escribirse: se construyen sin revalidar
+        # (la validación de salida la hace el response_model del endpoint)
+        result = await self.session.execute(query)
+        return [MemberListItem.model_construct(**row._mapping) for row in result]
+    
     async def update(self, member_id: UUID, member_data: MemberUpdate) -> Optional[MemberModel]:
         member = await self.get_by_id(member_id)
         if not member:
@@ -122,85 +392,563 @@ class MemberRepository:
         await self.session.commit()
         return True
     
-    async def get_church_stats(self, church_id: UUID) -> ChurchMemberStats:
-        total_result = await self.session.execute(
-            select(func.count(MemberModel.id))
-            .where(MemberModel.church_id == church_id)
+    async def list_by_ids(self, church_id: UUID, member_ids: List[UUID]) -> List[MemberListItem]:
+        """Miembros de la iglesia por ID, proyectados; los IDs ajenos se omiten"""
+        query = select(*LIST_ITEM_COLUMNS).where(
+            and_(
+                MemberModel.church_id == church_id,
+                MemberModel.id.in_(member_ids)
+            )
         )
-        total_members = total_result.scalar() or 0
+        return await self._fetch_list_items(query)
+    
+    async def bulk_update(self, church_id: UUID, bulk_data: MemberBulkUpdate) -> List[UUID]:
+        """
+        Aplica los mismos cambios a varios miembros con un único UPDATE
+        
+        Sólo toca miembros de la iglesia indicada y retorna los IDs
+        actualizados. No hace commit: el llamador cierra la transacción y,
+        como el UPDATE no pasa por el ORM, debe aplicar al snapshot de
+        estadísticas lo que cambió (get_stats_values antes y después y
+        apply_stats_changes).
+        """
+        values = {}
+        
+        if bulk_data.member_type is not None:
+            values["member_type"] = bulk_data.member_type
+        
+        if bulk_data.ministries is not None:
+            values["ministries"] = list(dict.fromkeys(bulk_data.ministries))
+        elif bulk_data.add_ministries or bulk_data.remove_ministries:
+            values["ministries"] = _array_edit(
+                MemberModel.ministries, bulk_data.add_ministries, bulk_data.remove_ministries
+            )
+        
+        if bulk_data.tags is not None:
+            values["tags"] = list(dict.fromkeys(bulk_data.tags))
+        elif bulk_data.add_tags or bulk_data.remove_tags:
+            values["tags"] = _array_edit(
+                MemberModel.tags, bulk_data.add_tags, bulk_data.remove_tags
+            )
         
-        active_result = await self.session.execute(
-            select(func.count(MemberModel.id))
+        if not values:
+            return []
+        
+        values["updated_at"] = datetime.utcnow()
+        
+        result = await self.session.execute(
+            update(MemberModel)
             .where(
                 and_(
                     MemberModel.church_id == church_id,
-                    MemberModel.member_type == "activo",
-                    MemberModel.member_status == "active"
+                    MemberModel.id.in_(bulk_data.member_ids)
                 )
             )
+            .values(**values)
+            .returning(MemberModel.id)
+            .execution_options(synchronize_session=False)
         )
-        active_members = active_result.scalar() or 0
+        updated_ids = [row.id for row in result]
+        
+        if updated_ids:
+            mark_churches_dirty(self.session, [church_id])
         
-        visitors_result = await self.session.execute(
-            select(func.count(MemberModel.id))
+        return updated_ids
+    
+    async def get_stats_values(self, church_id: UUID, member_ids: List[UUID], lock: bool = False) -> List[dict]:
+        """
+        Campos de los miembros que aportan al snapshot de estadísticas
+
+        lock=True bloquea las filas (en orden de id) hasta el commit: leídas
+        antes de un UPDATE masivo, nadie las cambia entre esta lectura y la
+        de después.
+        """
+        if not member_ids:
+            return []
+        query = select(*(getattr(MemberModel, field) for field in STATS_FIELDS)).where(
+            and_(MemberModel.church_id == church_id, MemberModel.id.in_(member_ids))
+        )
+        if lock:
+            query = query.order_by(MemberModel.id).with_for_update()
+        result = await self.session.execute(query)
+        return [dict(row._mapping) for row in result]
+    
+    async def apply_stats_changes(self, before: List[dict], after: List[dict]) -> None:
+        """
+        Aplica al snapshot la diferencia de unos miembros antes y después de un UPDATE masivo
+        
+        Es lo que hace el listener de member_stats_tracking en cada flush,
+        sin recorrer la iglesia entera como reconcile_stats_snapshot. No hace
+        commit.
+        """
+        deltas = stats_deltas(before, after)
+        if deltas:
+            await self.session.run_sync(lambda session: apply_stats_deltas(session.connection(), deltas))
+    
+    async def existing_member_ids(self, church_id: UUID, member_ids: List[UUID]) -> set:
+        """IDs de `member_ids` que existen en la iglesia"""
+        if not member_ids:
+            return set()
+        result = await self.session.execute(
+            select(MemberModel.id).where(
+                and_(MemberModel.church_id == church_id, MemberModel.id.in_(member_ids))
+            )
+        )
+        return set(result.scalars())
+    
+    async def get_score_inputs(self, member_ids: List[UUID]) -> list:
+        """Sólo las columnas necesarias para recalcular scores (SCORE_INPUT_COLUMNS)"""
+        result = await self.session.execute(
+            select(*SCORE_INPUT_COLUMNS).where(MemberModel.id.in_(member_ids))
+        )
+        return result.all()
+    
+    async def count_by_church(self, church_id: UUID) -> int:
+        result = await self.session.execute(
+            select(func.count(MemberModel.id)).where(MemberModel.church_id == church_id)
+        )
+        return result.scalar_one()
+    
+    async def get_score_inputs_page(
+        self,
+        church_id: UUID,
+        after: Optional[UUID] = None,
+        limit: int = 500
+    ) -> list:
+        """
+        Lote de INSIGHT_INPUT_COLUMNS de la iglesia, por id
+        
+        Keyset sobre members.id: `after` es el último id del lote anterior.
+        """
+        query = select(*INSIGHT_INPUT_COLUMNS).where(MemberModel.church_id == church_id)
+        if after is not None:
+            query = query.where(MemberModel.id > after)
+        
+        result = await self.session.execute(query.order_by(MemberModel.id).limit(limit))
+        return result.all()
+    
+    async def lock_score_inputs(self, church_id: UUID, member_ids: List[UUID]) -> list:
+        """
+        Las mismas columnas que get_score_inputs_page, de esos miembros, bloqueados
+        
+        FOR UPDATE en orden de id hasta el commit: quien escribe scores a
+        partir de ellas no pisa un cambio confirmado en el medio. Los que ya
+        no existen (o cambiaron de iglesia) no vuelven.
+        """
+        if not member_ids:
+            return []
+        
+        result = await self.session.execute(
+            select(*INSIGHT_INPUT_COLUMNS)
+            .where(and_(MemberModel.church_id == church_id, MemberModel.id.in_(member_ids)))
+            .order_by(MemberModel.id)
+            .with_for_update()
+        )
+        return result.all()
+    
+    async def get_church_score_inputs(self, church_id: UUID) -> list:
+        """SCORE_INPUT_COLUMNS (+ nombre) de toda la iglesia en una consulta (evaluación en sombra)"""
+        result = await self.session.execute(
+            select(*SCORE_INPUT_COLUMNS, MemberModel.first_name, MemberModel.last_name)
+            .where(MemberModel.church_id == church_id)
+        )
+        return result.all()
+    
+    async def get_scoring_rules_version(self, church_id: UUID) -> int:
+        """Versión de reglas fijada por la iglesia (CURRENT_RULES_VERSION si no fijó ninguna)"""
+        result = await self.session.execute(
+            select(ChurchModel.scoring_rules_version).where(ChurchModel.id == church_id)
+        )
+        version = result.scalar()
+        return CURRENT_RULES_VERSION if version is None else version
+    
+    async def get_scoring_rules(self, church_id: UUID) -> ScoringRules:
+        """Reglas de scoring con las que se puntúan los miembros de la iglesia"""
+        return get_rules(await self.get_scoring_rules_version(church_id))
+    
+    async def set_scoring_rules_version(self, church_id: UUID, version: int) -> None:
+        """Fija la versión de reglas de la iglesia; no recalcula ni hace commit"""
+        get_rules(version)
+        await self.session.execute(
+            update(ChurchModel)
+            .where(ChurchModel.id == church_id)
+            .values(scoring_rules_version=version)
+            .execution_options(synchronize_session=False)
+        )
+        # Los insights y respuestas cacheadas de la iglesia dependen de la versión
+        mark_churches_dirty(self.session, [church_id])
+    
+    async def get_ministry_candidate_inputs(self, church_id: UUID) -> list:
+        """
+        Columnas que usa MinistryMatcher.rank_candidates, de los miembros activos con dones
+        
+        Sin dones no hay sugerencias (suggest_ministry_assignments), así que
+        esos miembros ni se traen.
+        """
+        result = await self.session.execute(
+            select(
+                MemberModel.id,
+                MemberModel.first_name,
+                MemberModel.last_name,
+                MemberModel.spiritual_gifts,
+                MemberModel.skills,
+                MemberModel.ministries,
+                func.coalesce(MemberModel.commitment_score, 0.0).label("commitment_score"),
+                func.coalesce(MemberModel.attendance_rate, 0.0).label("attendance_rate"),
+                MemberModel.risk_level,
+            )
             .where(
                 and_(
                     MemberModel.church_id == church_id,
-                    MemberModel.member_type == "visitante"
+                    MemberModel.member_status == "active",
+                    func.cardinality(MemberModel.spiritual_gifts) > 0
                 )
             )
         )
-        visitors = visitors_result.scalar() or 0
+        return result.all()
+    
+    async def get_attendance_rates(self, member_ids: List[UUID], since: date) -> dict:
+        """
+        Tasa de asistencia desde `since` para varios miembros en una consulta
+        
+        Misma fórmula que recalculate_attendance_rate; los miembros sin
+        registros en el período quedan en 0.
+        """
+        counts = await self.get_attendance_window_counts(member_ids, since)
+        return {member_id: attendance_rate(*counts[member_id]) for member_id in member_ids}
+    
+    async def get_attendance_window_counts(self, member_ids: List[UUID], since: date) -> dict:
+        """{member_id: (registros, asistencias)} desde `since`, recontados en una consulta"""
+        if not member_ids:
+            return {}
         
-        risk_result = await self.session.execute(
-            select(func.count(MemberModel.id))
+        result = await self.session.execute(
+            select(
+                AttendanceRecordModel.member_id,
+                func.count(AttendanceRecordModel.id),
+                func.count(AttendanceRecordModel.id).filter(AttendanceRecordModel.attended.is_(True))
+            )
             .where(
                 and_(
-                    MemberModel.church_id == church_id,
-                    MemberModel.risk_level.in_(["alto", "critico"])
+                    AttendanceRecordModel.member_id.in_(member_ids),
+                    AttendanceRecordModel.event_date >= since
+                )
+            )
+            .group_by(AttendanceRecordModel.member_id)
+        )
+        
+        counts = dict.fromkeys(member_ids, (0, 0))
+        for member_id, total, attended in result:
+            counts[member_id] = (total, attended)
+        return counts
+    
+    async def update_scores(self, scores: List[dict]) -> None:
+        """
+        Guarda scores recalculados en un solo executemany por clave primaria
+        
+        Cada elemento: {"id", "commitment_score", "risk_level"} y, si hace
+        falta, otras columnas (attendance_rate, ai_notes); todos con las
+        mismas claves. No hace commit.
+        """
+        if not scores:
+            return
+        
+        await self.session.execute(
+            update(MemberModel).execution_options(synchronize_session=False),
+            scores
+        )
+    
+    async def save_ai_notes(self, member_id: UUID, ai_notes: dict) -> None:
+        """
+        Guarda ai_notes sin pasar por el ORM ni tocar updated_at
+        
+        Es un caché derivado de otras columnas: no cuenta como edición del
+        miembro (snapshot de estadísticas, invalidación de caché). No hace commit.
+        """
+        await self.session.execute(
+            update(MemberModel)
+            .where(MemberModel.id == member_id)
+            .values(ai_notes=ai_notes, updated_at=MemberModel.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+    
+    def _rescore_statement(self, today: date, rules: ScoringRules, *criteria):
+        """UPDATE de commitment_score/risk_level con las reglas en SQL, sólo filas que cambian"""
+        commitment = commitment_score_expr(today, rules)
+        risk_level = risk_level_expr(risk_score_expr(today, commitment_score=commitment, rules=rules), rules)
+        
+        return (
+            update(MemberModel)
+            .where(
+                and_(
+                    *criteria,
+                    or_(
+                        MemberModel.commitment_score.is_distinct_from(commitment),
+                        MemberModel.risk_level.is_distinct_from(risk_level)
+                    )
                 )
             )
+            .values(commitment_score=commitment, risk_level=risk_level)
+            .execution_options(synchronize_session=False)
         )
-        members_at_risk = risk_result.scalar() or 0
+    
+    async def rescore_church(self, church_id: UUID, today: Optional[date] = None) -> int:
+        """
+        Recalcula commitment_score y risk_level de toda la iglesia en PostgreSQL
+        
+        Un solo UPDATE con las reglas de la versión fijada por la iglesia
+        compiladas a CASE (member_scoring_sql): no viaja ninguna fila a
+        Python. Sólo se reescriben las filas cuyo valor cambia. No hace
+        commit; al pasar por fuera del ORM hay que reconciliar el snapshot de
+        estadísticas.
+        """
+        rules = await self.get_scoring_rules(church_id)
+        result = await self.session.execute(
+            self._rescore_statement(today or date.today(), rules, MemberModel.church_id == church_id)
+        )
+        
+        if result.rowcount:
+            mark_churches_dirty(self.session, [church_id])
+        
+        return result.rowcount
+    
+    async def rescore_due(self, since: date, until: date) -> dict:
+        """
+        Recalcula en PostgreSQL sólo a los miembros con un umbral en (since, until]
+        
+        Si los scores eran exactos al cierre de `since`, quedan exactos al de
+        `until` tocando una fracción pequeña de filas (boundary_due_criteria).
+        Un UPDATE por versión de reglas en uso (normalmente uno solo, para
+        todas las iglesias). Retorna {church_id: filas cambiadas}; no hace
+        commit.
+        """
+        # Sólo las iglesias con versión fijada (índice parcial); el resto usa la actual
+        pinned = ChurchModel.scoring_rules_version
+        other_versions = set((await self.session.execute(
+            select(pinned).where(pinned.is_not(None)).distinct()
+        )).scalars()) - {CURRENT_RULES_VERSION}
+        
+        changed = {}
+        for version in [CURRENT_RULES_VERSION, *sorted(other_versions)]:
+            rules = get_rules(version)
+            criteria = [boundary_due_criteria(since, until, rules)]
+            if version != CURRENT_RULES_VERSION:
+                criteria.append(MemberModel.church_id.in_(select(ChurchModel.id).where(pinned == version)))
+            elif other_versions:
+                criteria.append(MemberModel.church_id.not_in(
+                    select(ChurchModel.id).where(pinned.in_(other_versions))
+                ))
+            
+            result = await self.session.execute(
+                self._rescore_statement(until, rules, *criteria).returning(MemberModel.church_id)
+            )
+            for church_id in result.scalars():
+                changed[church_id] = changed.get(church_id, 0) + 1
+        
+        mark_churches_dirty(self.session, changed)
+        return changed
+    
+    async def get_church_stats(self, church_id: UUID) -> ChurchMemberStats:
+        """
+        Estadísticas de la iglesia en una sola consulta
         
+        Los totales salen de agregados condicionales (COUNT ... FILTER) y las
+        distribuciones de GROUPING SETS sobre la misma lectura de members:
+        la fila del conjunto vacío trae los totales y cada conjunto agrupado
+        trae una distribución. GROUPING() indica a qué conjunto pertenece la fila.
+        """
         today = date.today()
         first_day_month = today.replace(day=1)
-        new_month_result = await self.session.execute(
-            select(func.count(MemberModel.id))
+        first_day_year = today.replace(month=1, day=1)
+        
+        # Sin parámetros: GROUP BY y GROUPING() deben repetir la expresión textualmente
+        age = cast(func.date_part(text("'year'"), func.age(MemberModel.birth_date)), Integer)
+        grouped = (age, MemberModel.gender, MemberModel.marital_status, MemberModel.member_type)
+        
+        needing_followup = (
+            select(func.count(func.distinct(PastoralNoteModel.member_id)))
+            .join(MemberModel, MemberModel.id == PastoralNoteModel.member_id)
             .where(
                 and_(
                     MemberModel.church_id == church_id,
-                    MemberModel.membership_date >= first_day_month
+                    PastoralNoteModel.follow_up_date <= today,
+                    PastoralNoteModel.follow_up_completed.isnot(True)
                 )
             )
+            .scalar_subquery()
         )
-        new_this_month = new_month_result.scalar() or 0
         
-        avg_result = await self.session.execute(
+        query = (
             select(
-                func.avg(MemberModel.attendance_rate),
-                func.avg(MemberModel.commitment_score)
-            ).where(MemberModel.church_id == church_id)
+                func.grouping(*grouped).label("grouping"),
+                *grouped,
+                func.count(MemberModel.id).label("total"),
+                func.count(MemberModel.id).filter(
+                    and_(MemberModel.member_type == "activo", MemberModel.member_status == "active")
+                ).label("active"),
+                func.count(MemberModel.id).filter(MemberModel.member_type == "visitante").label("visitors"),
+                func.count(MemberModel.id).filter(MemberModel.risk_level.in_(["alto", "critico"])).label("at_risk"),
+                func.count(MemberModel.id).filter(MemberModel.membership_date >= first_day_month).label("new_month"),
+                func.count(MemberModel.id).filter(MemberModel.membership_date >= first_day_year).label("new_year"),
+                func.avg(MemberModel.attendance_rate).label("avg_attendance"),
+                func.avg(MemberModel.commitment_score).label("avg_commitment"),
+                needing_followup.label("needing_followup")
+            )
+            .where(MemberModel.church_id == church_id)
+            .group_by(func.grouping_sets(tuple_(), *[tuple_(column) for column in grouped]))
         )
-        avg_attendance, avg_commitment = avg_result.first() or (0, 0)
+        
+        result = await self.session.execute(query)
+        
+        # Bits de GROUPING(): 1 = columna no agrupada en esa fila (orden inverso)
+        all_bits = (1 << len(grouped)) - 1
+        distributions = [{}, {}, {}, {}]
+        totals = None
+        
+        for row in result:
+            if row.grouping == all_bits:
+                totals = row
+                continue
+            for position, key in enumerate(row[1:1 + len(grouped)]):
+                bit = 1 << (len(grouped) - 1 - position)
+                if not row.grouping & bit:
+                    if position == 0:
+                        key = age_bucket(key)
+                    distribution = distributions[position]
+                    label = key if key is not None else "sin_dato"
+                    distribution[label] = distribution.get(label, 0) + row.total
+        
+        if totals is None or not totals.total:
+            return ChurchMemberStats(
+                total_members=0,
+                active_members=0,
+                visitors=0,
+                inactive_members=0,
+                new_this_month=0,
+                new_this_year=0,
+                average_attendance_rate=0.0,
+                average_commitment_score=0.0,
+                members_at_risk=0,
+                members_needing_followup=0,
+                age_distribution={},
+                gender_distribution={},
+                marital_status_distribution={},
+                member_type_distribution={}
+            )
+        
+        age_distribution, gender_distribution, marital_distribution, type_distribution = distributions
         
         return ChurchMemberStats(
-            total_members=total_members,
-            active_members=active_members,
-            visitors=visitors,
-            inactive_members=total_members - active_members - visitors,
-            new_this_month=new_this_month,
-            new_this_year=0,
-            average_attendance_rate=float(avg_attendance or 0),
-            average_commitment_score=float(avg_commitment or 0),
-            members_at_risk=members_at_risk,
-            members_needing_followup=0,
-            age_distribution={},
-            gender_distribution={},
-            marital_status_distribution={},
-            member_type_distribution={}
+            total_members=totals.total,
+            active_members=totals.active,
+            visitors=totals.visitors,
+            inactive_members=totals.total - totals.active - totals.visitors,
+            new_this_month=totals.new_month,
+            new_this_year=totals.new_year,
+            average_attendance_rate=float(totals.avg_attendance or 0),
+            average_commitment_score=float(totals.avg_commitment or 0),
+            members_at_risk=totals.at_risk,
+            members_needing_followup=totals.needing_followup or 0,
+            age_distribution=age_distribution,
+            gender_distribution=gender_distribution,
+            marital_status_distribution=marital_distribution,
+            member_type_distribution=type_distribution
         )
     
+    async def get_stats_snapshot(self, church_id: UUID) -> ChurchMemberStats:
+        """
+        Estadísticas desde el snapshot church_member_stats (una fila por iglesia)
+        
+        Si la iglesia todavía no tiene snapshot se crea con un recálculo
+        completo (reconcile_stats_snapshot, que confirma la transacción); dos
+        primeras lecturas simultáneas crean una sola fila.
+        """
+        snapshot = await self.session.get(ChurchMemberStatsModel, church_id)
+        if snapshot is None:
+            snapshot = await self.reconcile_stats_snapshot(church_id)
+        
+        today = date.today()
+        new_by_month = snapshot.new_by_month or {}
+        total = snapshot.total_members
+        
+        return ChurchMemberStats(
+            total_members=total,
+            active_members=snapshot.active_members,
+            visitors=snapshot.visitors,
+            inactive_members=total - snapshot.active_members - snapshot.visitors,
+            new_this_month=new_by_month.get(today.strftime("%Y-%m"), 0),
+            new_this_year=sum(
+                count for month, count in new_by_month.items()
+                if month.startswith(f"{today.year}-")
+            ),
+            average_attendance_rate=snapshot.sum_attendance_rate / total if total else 0.0,
+            average_commitment_score=snapshot.sum_commitment_score / total if total else 0.0,
+            members_at_risk=snapshot.members_at_risk,
+            members_needing_followup=snapshot.members_needing_followup,
+            age_distribution=snapshot.age_distribution or {},
+            gender_distribution=snapshot.gender_distribution or {},
+            marital_status_distribution=snapshot.marital_status_distribution or {},
+            member_type_distribution=snapshot.member_type_distribution or {},
+            snapshot_updated_at=snapshot.updated_at,
+            snapshot_reconciled_at=snapshot.reconciled_at
+        )
+    
+    async def reconcile_stats_snapshot(self, church_id: UUID) -> ChurchMemberStatsModel:
+        """
+        Recalcula por completo el snapshot de la iglesia y corrige desvíos
+        
+        Bloquea la fila del snapshot antes de recalcular para que los
+        incrementos concurrentes se apliquen sobre el valor reconciliado. Si
+        no existe se inserta vacía antes (ON CONFLICT DO NOTHING): así hay
+        siempre una fila que bloquear y dos reconciliaciones simultáneas de
+        una iglesia nueva no chocan en la clave primaria.
+        """
+        await self.session.execute(
+            insert(ChurchMemberStatsModel)
+            .values(church_id=church_id)
+            .on_conflict_do_nothing(index_elements=[ChurchMemberStatsModel.church_id])
+        )
+        result = await self.session.execute(
+            select(ChurchMemberStatsModel)
+            .where(ChurchMemberStatsModel.church_id == church_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        snapshot = result.scalar_one()
+        
+        stats = await self.get_church_stats(church_id)
+        
+        month = func.to_char(MemberModel.membership_date, text("'YYYY-MM'"))
+        months_result = await self.session.execute(
+            select(month, func.count(MemberModel.id))
+            .where(
+                and_(
+                    MemberModel.church_id == church_id,
+                    MemberModel.membership_date >= date.today().replace(month=1, day=1)
+                )
+            )
+            .group_by(month)
+        )
+        
+        now = datetime.utcnow()
+        snapshot.total_members = stats.total_members
+        snapshot.active_members = stats.active_members
+        snapshot.visitors = stats.visitors
+        snapshot.members_at_risk = stats.members_at_risk
+        snapshot.members_needing_followup = stats.members_needing_followup
+        snapshot.sum_attendance_rate = stats.average_attendance_rate * stats.total_members
+        snapshot.sum_commitment_score = stats.average_commitment_score * stats.total_members
+        snapshot.new_by_month = {key: count for key, count in months_result.all()}
+        snapshot.age_distribution = stats.age_distribution
+        snapshot.gender_distribution = stats.gender_distribution
+        snapshot.marital_status_distribution = stats.marital_status_distribution
+        snapshot.member_type_distribution = stats.member_type_distribution
+        snapshot.updated_at = now
+        snapshot.reconciled_at = now
+        
+        await self.session.commit()
+        return snapshot
+    
     async def get_members_at_risk(self, church_id: UUID) -> List[MemberModel]:
         result = await self.session.execute(
             select(MemberModel)
@@ -215,6 +963,56 @@ class MemberRepository:
         )
         return result.scalars().all()
     
+    async def list_at_risk(self, church_id: UUID) -> List[MemberListItem]:
+        """get_members_at_risk proyectando sólo las columnas de MemberListItem"""
+        return await self._fetch_list_items(
+            select(*LIST_ITEM_COLUMNS)
+            .where(
+                and_(
+                    MemberModel.church_id == church_id,
+                    MemberModel.risk_level.in_(["alto", "critico"]),
+                    MemberModel.member_status == "active"
+                )
+            )
+            .order_by(MemberModel.commitment_score.asc())
+        )
+    
+    async def get_upcoming_celebrations(self, church_id: UUID, today: date, days: int) -> list:
+        """
+        Cumpleaños y aniversarios de membresía de hoy a hoy + `days`
+        
+        Filas (id, first_name, last_name, preferred_contact_method, kind,
+        original_date) de los miembros activos; rangos de mes-día sobre
+        ix_members_church_birth_month_day / ix_members_church_membership_month_day,
+        partidos en dos si la ventana cruza el fin de año.
+        """
+        ranges = celebration_ranges(today, days)
+        
+        def celebrations(kind: str, column, month_day):
+            return (
+                select(
+                    MemberModel.id,
+                    MemberModel.first_name,
+                    MemberModel.last_name,
+                    MemberModel.preferred_contact_method,
+                    literal(kind).label("kind"),
+                    column.label("original_date")
+                )
+                .where(
+                    and_(
+                        MemberModel.church_id == church_id,
+                        or_(*(month_day.between(first, last) for first, last in ranges)),
+                        MemberModel.member_status == "active"
+                    )
+                )
+            )
+        
+        result = await self.session.execute(union_all(
+            celebrations("birthday", MemberModel.birth_date, member_birth_month_day),
+            celebrations("membership_anniversary", MemberModel.membership_date, member_membership_month_day)
+        ))
+        return result.all()
+    
     async def create_note(self, note_data: PastoralNoteCreate, pastor_id: UUID) -> PastoralNoteModel:
         note = PastoralNoteModel(
             **note_data.dict(),
@@ -247,45 +1045,506 @@ class MemberRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
-    async def record_attendance(self, attendance_data: AttendanceRecordCreate) -> AttendanceRecordModel:
-        record = AttendanceRecordModel(**attendance_data.dict())
-        self.session.add(record)
+    async def get_attendance_page(
+        self,
+        member_id: UUID,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        event_type: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: int = 50,
+        include_archived: bool = False
+    ) -> Tuple[List[AttendanceRecordModel], Optional[str]]:
+        """
+        Historial de asistencia de un miembro, del más reciente al más antiguo
+        
+        Paginación por cursor sobre (event_date, id) descendente; usa el índice
+        ix_attendance_member_date. Lanza InvalidCursorError si el cursor no es
+        válido.
+        
+        include_archived suma los meses archivados en Parquet con el mismo
+        orden y cursor; sólo se leen archivos si la página llega a meses
+        archivados.
+        """
+        before = None
+        query = select(AttendanceRecordModel).where(AttendanceRecordModel.member_id == member_id)
+        
+        if date_from:
+            query = query.where(AttendanceRecordModel.event_date >= date_from)
+        
+        if date_to:
+            query = query.where(AttendanceRecordModel.event_date <= date_to)
+        
+        if event_type:
+            query = query.where(AttendanceRecordModel.event_type == event_type)
+        
+        if after:
+            last_date, last_id = decode_cursor(after, size=2)
+            try:
+                last_date = date.fromisoformat(last_date)
+                last_id = UUID(last_id)
+            except (TypeError, ValueError) as e:
+                raise InvalidCursorError(f"Cursor inválido: {after}") from e
+            
+            before = (last_date, last_id)
+            query = query.where(
+                tuple_(AttendanceRecordModel.event_date, AttendanceRecordModel.id)
+                < tuple_(last_date, last_id)
+            )
+        
+        query = query.order_by(
+            AttendanceRecordModel.event_date.desc(),
+            AttendanceRecordModel.id.desc()
+        ).limit(limit + 1)
+        
+        result = await self.session.execute(query)
+        records = list(result.scalars().all())
+        
+        if include_archived:
+            archived_until = await AttendancePartitionRepository(self.session).get_archived_until()
+            if archived_until and (len(records) <= limit or records[limit].event_date < archived_until):
+                upper = min(filter(None, (date_to, before and before[0])), default=None)
+                archives = await AttendancePartitionRepository(self.session).get_archives(date_from, upper)
+                archived = await read_member_attendance(
+                    [archive.path for archive in archives], member_id, limit + 1,
+                    date_from=date_from, date_to=date_to, event_type=event_type, before=before
+                )
+                records = sorted(records + archived, key=lambda r: (r.event_date, r.id), reverse=True)[:limit + 1]
+        
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            last = records[-1]
+            next_cursor = encode_cursor(last.event_date.isoformat(), last.id)
+        
+        return records, next_cursor
+    
+    async def get_attendance_trends(
+        self,
+        church_id: UUID,
+        since: date,
+        today: date,
+        limit: int = 50
+    ) -> list:
+        """
+        Tendencia de asistencia de los miembros activos, mayor caída primero
+        
+        Una consulta con funciones de ventana (attendance_trend_query); sólo
+        miembros con al menos 4 registros en (since, today].
+        """
+        result = await self.session.execute(
+            attendance_trend_query(church_id, since, today).limit(limit)
+        )
+        return result.all()
+    
+    async def get_member_attendance_trend(self, church_id: UUID, member_id: UUID, since: date, today: date):
+        """Fila de attendance_trend_query de un miembro (records = 0 si no tiene registros)"""
+        result = await self.session.execute(
+            attendance_trend_query(church_id, since, today, member_id=member_id, min_records=1)
+        )
+        return result.one_or_none()
+    
+    async def get_attendance_window_start(
+        self, church_id: UUID, today: Optional[date] = None, lock: bool = False
+    ) -> date:
+        """
+        Inicio de la ventana que siguen los contadores attendance_window_* de la iglesia
+        
+        lock=True toma la fila de la iglesia en scheduler_state en modo
+        compartido hasta el commit: el avance diario de esa iglesia espera a
+        los registros en curso y ellos a él, así ningún registro se cuenta con
+        la ventana equivocada; las demás iglesias no esperan.
+        """
+        if lock:
+            last_run = await self.lock_attendance_window(church_id, today, exclusive=False)
+        else:
+            result = await self.session.execute(
+                select(SchedulerStateModel.name, SchedulerStateModel.last_run_date).where(
+                    SchedulerStateModel.name.in_((attendance_window_scheduler(church_id), ATTENDANCE_WINDOW_SCHEDULER))
+                )
+            )
+            runs = dict(result.all())
+            last_run = runs.get(attendance_window_scheduler(church_id)) or runs.get(ATTENDANCE_WINDOW_SCHEDULER)
+        return (last_run or today or date.today()) - timedelta(days=ATTENDANCE_WINDOW_DAYS)
+
+    async def get_oldest_attendance_window_start(self, today: Optional[date] = None) -> date:
+        """
+        Inicio de ventana más antiguo entre todas las iglesias
+
+        Una iglesia cuyo avance diario falló queda con una ventana más vieja
+        que la global; nada anterior a esta fecha puede salir de la tabla sin
+        dejar a sus contadores sin filas que recontar.
+        """
+        result = await self.session.execute(
+            select(func.min(SchedulerStateModel.last_run_date)).where(
+                or_(
+                    SchedulerStateModel.name == ATTENDANCE_WINDOW_SCHEDULER,
+                    SchedulerStateModel.name.startswith(f"{ATTENDANCE_WINDOW_SCHEDULER}:")
+                )
+            )
+        )
+        last_run = result.scalar_one_or_none()
+        return (last_run or today or date.today()) - timedelta(days=ATTENDANCE_WINDOW_DAYS)
+
+    async def lock_attendance_window(
+        self, church_id: UUID, today: Optional[date] = None, exclusive: bool = True
+    ) -> date:
+        """
+        Bloquea la fila de la ventana de la iglesia y retorna su última corrida
+        
+        Si la iglesia todavía no tiene fila se crea con la fecha global (o
+        today), para que haya algo que bloquear; un INSERT simultáneo espera
+        al primero. exclusive=False es el modo compartido de los registros de
+        asistencia; el avance diario la bloquea en exclusiva.
+        """
+        name = attendance_window_scheduler(church_id)
+        query = select(SchedulerStateModel.last_run_date).where(SchedulerStateModel.name == name)
+        query = query.with_for_update(read=not exclusive)
+        
+        last_run = (await self.session.execute(query)).scalar_one_or_none()
+        if last_run is not None:
+            return last_run
+        
+        default = (await self.session.execute(
+            select(SchedulerStateModel.last_run_date).where(SchedulerStateModel.name == ATTENDANCE_WINDOW_SCHEDULER)
+        )).scalar_one_or_none()
+        await self.session.execute(
+            insert(SchedulerStateModel)
+            .values(name=name, last_run_date=default or today or date.today())
+            .on_conflict_do_nothing(index_elements=[SchedulerStateModel.name])
+        )
+        return (await self.session.execute(query)).scalar_one()
+    
+    async def record_attendance(self, attendance_data: AttendanceRecordCreate) -> Optional[AttendanceRecordModel]:
+        """
+        Registra una asistencia y actualiza la tasa del miembro en O(1)
+        
+        Suma el registro a los contadores de la ventana (si cae en ella) y
+        recalcula attendance_rate a partir de ellos, sin recontar el historial;
+        commitment_score y risk_level se recalculan con rescore_members, igual
+        que en el camino masivo. La fila del miembro se bloquea para que dos
+        registros simultáneos no pierdan un incremento. También suma al
+        agregado semanal y a los totales del evento; sin event_id usa (o crea)
+        el evento del día con ese tipo y nombre.
+        
+        None (y rollback) si el miembro ya tiene registro del evento: el
+        INSERT es ON CONFLICT DO NOTHING sobre uq_attendance_event_member, así
+        un registro simultáneo del mismo miembro no se cuenta dos veces.
+        """
+        events = EventRepository(self.session)
+        if attendance_data.event_id is None:
+            attendance_data.event_id = await events.get_or_create_id(
+                attendance_data.church_id, attendance_data.event_type, attendance_data.event_date,
+                attendance_data.event_name
+            )
+        record = (await self.session.scalars(
+            insert(AttendanceRecordModel)
+            .values(**attendance_data.dict())
+            .on_conflict_do_nothing(index_elements=ATTENDANCE_EVENT_KEY)
+            .returning(AttendanceRecordModel)
+        )).one_or_none()
+        if record is None:
+            await self.session.rollback()
+            return None
         
-        member = await self.get_by_id(attendance_data.member_id)
-        if member and attendance_data.attended:
-            member.last_attendance = attendance_data.event_date
+        window_start = await self.get_attendance_window_start(attendance_data.church_id, lock=True)
+        result = await self.session.execute(
+            select(MemberModel)
+            .where(MemberModel.id == attendance_data.member_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        member = result.scalar_one_or_none()
+        if member:
+            if attendance_data.attended:
+                member.last_attendance = attendance_data.event_date
+            if attendance_data.event_date >= window_start:
+                member.attendance_window_total += 1
+                member.attendance_window_attended += int(bool(attendance_data.attended))
+            member.attendance_rate = attendance_rate(member.attendance_window_total, member.attendance_window_attended)
+            
+            # El UPDATE de scores no pasa por el ORM: su diferencia va al snapshot a mano
+            before = await self.get_stats_values(attendance_data.church_id, [member.id])
+            if await self.rescore_members(attendance_data.church_id, [member.id]):
+                after = await self.get_stats_values(attendance_data.church_id, [member.id])
+                await self.apply_stats_changes(before, after)
+                await self.session.refresh(member, ["commitment_score", "risk_level"])
+        
+        await AttendanceRollupRepository(self.session).add_records(
+            attendance_data.church_id, attendance_data.event_type, attendance_data.event_date,
+            1, int(bool(attendance_data.attended))
+        )
+        await events.add_headcount(attendance_data.event_id, 1, int(bool(attendance_data.attended)))
         
         await self.session.commit()
         await self.session.refresh(record)
         
-        await self.recalculate_attendance_rate(attendance_data.member_id)
-        
         return record
     
     async def recalculate_attendance_rate(self, member_id: UUID):
-        three_months_ago = date.today() - timedelta(days=90)
+        """Recuenta la ventana del miembro: corrige sus contadores y attendance_rate"""
+        church_id = await self.get_church_id(member_id)
+        if church_id is None:
+            return
+        
+        window_start = await self.get_attendance_window_start(church_id, lock=True)
+        await self.recount_attendance_counters([member_id], window_start)
+        await self.session.commit()
+    
+    async def recount_attendance_counters(self, member_ids: List[UUID], since: date) -> dict:
+        """
+        Reescribe contadores y attendance_rate con un recuento desde `since`
+        
+        Las filas se bloquean (en orden de id) antes de recontar: un registro
+        de asistencia simultáneo ya confirmado entra en el recuento, y uno
+        posterior espera al commit y suma sobre el valor recontado, así no se
+        pierde su +1. Retorna {member_id: (registros, asistencias)}; no hace
+        commit ni reconcilia el snapshot de estadísticas.
+        """
+        if not member_ids:
+            return {}
+        
+        await self.session.execute(
+            select(MemberModel.id)
+            .where(MemberModel.id.in_(member_ids))
+            .order_by(MemberModel.id)
+            .with_for_update()
+        )
+        counts = await self.get_attendance_window_counts(member_ids, since)
+        await self.update_scores([
+            {
+                "id": member_id,
+                "attendance_window_total": total,
+                "attendance_window_attended": attended,
+                "attendance_rate": attendance_rate(total, attended),
+            }
+            for member_id, (total, attended) in counts.items()
+        ])
+        return counts
+    
+    async def record_attendance_bulk(
+        self,
+        church_id: UUID,
+        event_type: str,
+        event_date: date,
+        statuses: Dict[UUID, bool],
+        event_name: Optional[str] = None,
+        today: Optional[date] = None,
+        event_id: Optional[UUID] = None
+    ) -> Tuple[list, int]:
+        """
+        Asistencia de varios miembros a un evento en pocas sentencias
+        
+        1. INSERT ... SELECT sobre unnest(ids, estados) de los miembros de la
+           iglesia, ON CONFLICT DO NOTHING (uq_attendance_event_member): los
+           que ya tienen registro del evento, aunque se haya confirmado en
+           paralelo, no vuelven en RETURNING ni suman a nada
+        2. UPDATE de last_attendance, contadores de la ventana y
+           attendance_rate (a partir de los contadores) de los registrados
+        3. UPDATE de commitment_score/risk_level de esos miembros
+        4. Suma al agregado semanal y a los totales del evento
+        
+        Sin event_id usa (o crea) el evento del día con ese tipo y nombre.
+        Retorna (filas (member_id, attended) insertadas, miembros con score
+        nuevo). No hace commit: el llamador cierra la transacción y, como los
+        UPDATE no pasan por el ORM, debe aplicar al snapshot de estadísticas la
+        diferencia de los miembros (get_stats_values y apply_stats_changes).
+        """
+        today = today or date.today()
+        window_start = await self.get_attendance_window_start(church_id, today, lock=True)
+        events = EventRepository(self.session)
+        if event_id is None:
+            event_id = await events.get_or_create_id(church_id, event_type, event_date, event_name)
+        member_ids = list(statuses)
+        entries = func.unnest(
+            bindparam("member_ids", member_ids, type_=ARRAY(PG_UUID(as_uuid=True))),
+            bindparam("attended", [statuses[member_id] for member_id in member_ids], type_=ARRAY(Boolean))
+        ).table_valued("member_id", "attended").render_derived()
         
         result = await self.session.execute(
+            insert(AttendanceRecordModel)
+            .from_select(
+                ["id", "member_id", "church_id", "event_id", "event_type", "event_name", "event_date", "attended", "created_at"],
+                select(
+                    func.gen_random_uuid(),
+                    MemberModel.id,
+                    MemberModel.church_id,
+                    literal(event_id, PG_UUID(as_uuid=True)),
+                    literal(event_type, String),
+                    literal(event_name, String),
+                    literal(event_date, Date),
+                    entries.c.attended,
+                    literal(datetime.utcnow(), DateTime)
+                )
+                .select_from(entries)
+                .join(MemberModel, MemberModel.id == entries.c.member_id)
+                .where(MemberModel.church_id == church_id)
+            )
+            .on_conflict_do_nothing(index_elements=ATTENDANCE_EVENT_KEY)
+            .returning(AttendanceRecordModel.member_id, AttendanceRecordModel.attended)
+        )
+        recorded = result.all()
+        if not recorded:
+            return [], 0
+        
+        recorded_ids = [row.member_id for row in recorded]
+        attended_ids = [row.member_id for row in recorded if row.attended]
+        
+        # Un registro por miembro: +1 a los contadores si el evento cae en la ventana
+        in_window = int(event_date >= window_start)
+        total = MemberModel.attendance_window_total + in_window
+        attended = MemberModel.attendance_window_attended + case(
+            (MemberModel.id.in_(attended_ids), in_window), else_=0
+        )
+        await self.session.execute(
+            update(MemberModel)
+            .where(MemberModel.id.in_(recorded_ids))
+            .values(
+                attendance_window_total=total,
+                attendance_window_attended=attended,
+                attendance_rate=attendance_rate_expr(total, attended),
+                last_attendance=case(
+                    (MemberModel.id.in_(attended_ids), func.greatest(MemberModel.last_attendance, event_date)),
+                    else_=MemberModel.last_attendance
+                ),
+                updated_at=datetime.utcnow()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        
+        rescored = await self.rescore_members(church_id, recorded_ids, today)
+        await AttendanceRollupRepository(self.session).add_records(
+            church_id, event_type, event_date, len(recorded_ids), len(attended_ids)
+        )
+        await events.add_headcount(event_id, len(recorded_ids), len(attended_ids))
+        return recorded, rescored
+    
+    async def rescore_members(self, church_id: UUID, member_ids: List[UUID], today: Optional[date] = None) -> int:
+        """
+        rescore_church limitado a algunos miembros de la iglesia
+        
+        Marca la iglesia para invalidar el cache (hubo un UPDATE fuera del
+        ORM); no hace commit ni reconcilia el snapshot de estadísticas.
+        """
+        if not member_ids:
+            return 0
+        
+        rules = await self.get_scoring_rules(church_id)
+        result = await self.session.execute(
+            self._rescore_statement(
+                today or date.today(), rules, MemberModel.church_id == church_id, MemberModel.id.in_(member_ids)
+            )
+        )
+        mark_churches_dirty(self.session, [church_id])
+        return result.rowcount
+    
+    async def expire_attendance_window(self, church_id: UUID, old_start: date, new_start: date) -> List[UUID]:
+        """
+        Descuenta de los contadores los registros que salen de la ventana
+        
+        Los registros de la iglesia con event_date en [old_start, new_start)
+        dejan de contar: un UPDATE resta su agregado por miembro y recalcula
+        attendance_rate desde los contadores. Sólo lee ese rango de fechas.
+        Retorna los miembros actualizados; no hace commit.
+        """
+        leaving = (
             select(
-                func.count(AttendanceRecordModel.id).label('total'),
-                func.sum(func.cast(AttendanceRecordModel.attended, func.INTEGER)).label('attended')
+                AttendanceRecordModel.member_id,
+                func.count(AttendanceRecordModel.id).label("total"),
+                func.count(AttendanceRecordModel.id).filter(AttendanceRecordModel.attended.is_(True)).label("attended")
             )
             .where(
                 and_(
-                    AttendanceRecordModel.member_id == member_id,
-                    AttendanceRecordModel.event_date >= three_months_ago
+                    AttendanceRecordModel.church_id == church_id,
+                    AttendanceRecordModel.event_date >= old_start,
+                    AttendanceRecordModel.event_date < new_start
                 )
             )
+            .group_by(AttendanceRecordModel.member_id)
+            .subquery()
+        )
+        total = MemberModel.attendance_window_total - leaving.c.total
+        attended = MemberModel.attendance_window_attended - leaving.c.attended
+        result = await self.session.execute(
+            update(MemberModel)
+            .where(and_(MemberModel.church_id == church_id, MemberModel.id == leaving.c.member_id))
+            .values(
+                attendance_window_total=total,
+                attendance_window_attended=attended,
+                attendance_rate=attendance_rate_expr(total, attended)
+            )
+            .returning(MemberModel.id)
+            .execution_options(synchronize_session=False)
         )
         
-        total, attended = result.first() or (0, 0)
+        changed = list(result.scalars())
+        if changed:
+            mark_churches_dirty(self.session, [church_id])
+        return changed
+    
+    async def check_attendance_counters(self, church_id: UUID, since: date) -> list:
+        """
+        Miembros cuyos contadores no coinciden con un recuento completo
         
-        if total > 0:
-            attendance_rate = (attended / total) * 100
-        else:
-            attendance_rate = 0
+        Filas (id, attendance_window_total, attendance_window_attended,
+        expected_total, expected_attended, attendance_rate) con el recuento de
+        los registros con event_date >= since (la ventana vigente).
+        """
+        recount = (
+            select(
+                AttendanceRecordModel.member_id,
+                func.count(AttendanceRecordModel.id).label("total"),
+                func.count(AttendanceRecordModel.id).filter(AttendanceRecordModel.attended.is_(True)).label("attended")
+            )
+            .where(
+                and_(
+                    AttendanceRecordModel.church_id == church_id,
+                    AttendanceRecordModel.event_date >= since
+                )
+            )
+            .group_by(AttendanceRecordModel.member_id)
+            .subquery()
+        )
+        expected_total = func.coalesce(recount.c.total, 0)
+        expected_attended = func.coalesce(recount.c.attended, 0)
+        result = await self.session.execute(
+            select(
+                MemberModel.id,
+                MemberModel.attendance_window_total,
+                MemberModel.attendance_window_attended,
+                expected_total.label("expected_total"),
+                expected_attended.label("expected_attended"),
+                MemberModel.attendance_rate
+            )
+            .outerjoin(recount, recount.c.member_id == MemberModel.id)
+            .where(
+                and_(
+                    MemberModel.church_id == church_id,
+                    or_(
+                        MemberModel.attendance_window_total != expected_total,
+                        MemberModel.attendance_window_attended != expected_attended,
+                        MemberModel.attendance_rate.is_distinct_from(attendance_rate_expr(expected_total, expected_attended))
+                    )
+                )
+            )
+        )
+        return result.all()
+    
+    async def repair_attendance_counters(
+        self, church_id: UUID, drift: list, since: date, today: Optional[date] = None
+    ) -> int:
+        """
+        Corrige las filas de check_attendance_counters con un recuento nuevo
         
-        member = await self.get_by_id(member_id)
-        if member:
-            member.attendance_rate = attendance_rate
-            await self.session.commit()
+        No escribe los valores esperados de `drift` (leídos sin bloqueo):
+        recount_attendance_counters bloquea esos miembros y recuenta, y luego
+        se re-puntúan. No hace commit; al pasar por fuera del ORM hay que
+        reconciliar el snapshot de estadísticas.
+        """
+        if not drift:
+            return 0
+        
+        member_ids = [row.id for row in drift]
+        await self.recount_attendance_counters(member_ids, since)
+        await self.rescore_members(church_id, member_ids, today)
+        return len(drift)
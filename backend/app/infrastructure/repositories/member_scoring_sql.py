@@ -0,0 +1,129 @@
+# app/infrastructure/repositories/member_scoring_sql.py
+"""
+Reglas de MemberAIService compiladas a SQL
+
+Misma lógica que calculate_commitment_score y detect_abandonment_risk (y que
+su versión NumPy, member_scoring.py), con los umbrales de un ScoringRules,
+como expresiones CASE sobre las columnas de members, para recalcular toda una iglesia con un solo UPDATE sin traer
+filas a Python. Cada escalón if/elif es un CASE con las mismas condiciones en
+el mismo orden; la fecha de referencia va como parámetro (no CURRENT_DATE)
+para que coincida con date.today() del proceso.
+
+Un NULL en last_attendance hace NULL a los días transcurridos y ninguna rama
+del CASE aplica, igual que el `if member.last_attendance` de Python.
+"""
+import operator
+from datetime import date, timedelta
+
+from sqlalchemy import Date, Float, and_, case, cast, func, literal, or_, text
+
+from app.domain.services.scoring_rules import DEFAULT_RULES, GROUP_LEADER_ROLES, RISK_LEVELS, ScoringRules
+from app.infrastructure.database.models.member import MemberModel
+
+
+def _days_since(column, today: date):
+    """:today - columna, en días (NULL si la columna es NULL)"""
+    return literal(today, Date) - column
+
+
+def _ministries_count():
+    return func.coalesce(func.cardinality(MemberModel.ministries), 0)
+
+
+def _attendance_rate():
+    return func.coalesce(MemberModel.attendance_rate, 0)
+
+
+def _ladder(value, op, tiers, else_=0):
+    """Escalón if/elif de un ScoringRules como CASE (mismo orden de tramos)"""
+    return case(*((op(value, threshold), points) for threshold, points in tiers), else_=else_)
+
+
+def commitment_score_expr(today: date, rules: ScoringRules = DEFAULT_RULES):
+    """calculate_commitment_score como expresión SQL (0-100)"""
+    attendance = _ladder(_attendance_rate(), operator.ge, rules.attendance_points)
+
+    count = _ministries_count()
+    ministry = case(
+        (count >= 2, rules.many_ministries_points),
+        (count == 1, rules.one_ministry_points),
+        (MemberModel.small_group_id.is_not(None), rules.small_group_points),
+        else_=0
+    )
+
+    days = _days_since(MemberModel.last_attendance, today)
+    recent = _ladder(days, operator.lt, rules.recent_attendance_points)
+
+    gifts = case(
+        (func.coalesce(func.cardinality(MemberModel.spiritual_gifts), 0) > 0, rules.spiritual_gifts_points),
+        else_=0
+    )
+    leader = case((MemberModel.small_group_role.in_(GROUP_LEADER_ROLES), rules.group_leader_points), else_=0)
+
+    return cast(func.least(100, attendance + ministry + recent + gifts + leader), Float)
+
+
+def risk_score_expr(today: date, commitment_score=None, rules: ScoringRules = DEFAULT_RULES):
+    """
+    Puntaje de detect_abandonment_risk (sin tope) como expresión SQL
+
+    commitment_score reemplaza a la columna guardada (p. ej. la expresión
+    recién calculada, como hacen los endpoints); la columna NULL cuenta como
+    0, igual que en member_scoring.py.
+    """
+    commitment = func.coalesce(MemberModel.commitment_score, 0) if commitment_score is None else commitment_score
+
+    days = _days_since(MemberModel.last_attendance, today)
+    absence = case(
+        *((days > threshold, points) for threshold, points in rules.absence_risk),
+        (MemberModel.last_attendance.is_(None), rules.no_attendance_risk),
+        else_=0
+    )
+
+    attendance = _ladder(_attendance_rate(), operator.lt, rules.low_attendance_risk)
+
+    no_ministry = case((_ministries_count() == 0, rules.no_ministry_risk), else_=0)
+    no_group = case((MemberModel.small_group_id.is_(None), rules.no_small_group_risk), else_=0)
+
+    low_commitment = _ladder(commitment, operator.lt, rules.low_commitment_risk)
+
+    stalled_visitor = case(
+        (
+            (MemberModel.member_type == "visitante")
+            & (_days_since(MemberModel.membership_date, today) > rules.stalled_visitor_days),
+            rules.stalled_visitor_risk
+        ),
+        else_=0
+    )
+
+    return absence + attendance + no_ministry + no_group + low_commitment + stalled_visitor
+
+
+def risk_level_expr(risk_score, rules: ScoringRules = DEFAULT_RULES):
+    return _ladder(
+        risk_score, operator.ge, zip(rules.risk_level_thresholds, RISK_LEVELS[:0:-1]), else_=RISK_LEVELS[0]
+    )
+
+
+def boundary_due_criteria(since: date, until: date, rules: ScoringRules = DEFAULT_RULES):
+    """
+    Miembros con un umbral de rules.attendance/visitor_boundary_days en (since, until]
+
+    Rangos sobre last_attendance y membership_date (indexadas): sólo esas
+    filas pueden tener un scoring distinto entre ambas fechas.
+    """
+    first = since + timedelta(days=1)
+    ranges = [
+        MemberModel.last_attendance.between(first - timedelta(days=d), until - timedelta(days=d))
+        for d in rules.attendance_boundary_days
+    ]
+    ranges.append(
+        and_(
+            # Constante como text() para que coincida con el predicado del índice parcial
+            MemberModel.member_type == text("'visitante'"),
+            MemberModel.membership_date.between(
+                first - timedelta(days=rules.visitor_boundary_days), until - timedelta(days=rules.visitor_boundary_days)
+            )
+        )
+    )
+    return or_(*ranges)
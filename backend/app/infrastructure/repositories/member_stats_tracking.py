@@ -0,0 +1,170 @@
+# app/infrastructure/repositories/member_stats_tracking.py
+"""
+Mantenimiento incremental de church_member_stats
+
+Cada flush que crea, modifica o elimina un MemberModel resta el aporte
+anterior del miembro y suma el nuevo en el snapshot de su iglesia, dentro de
+la misma transacción. Así cubre todos los caminos de escritura del ORM
+(repositorio, endpoints que ajustan scores, importación, asistencia).
+
+Las actualizaciones set-based (UPDATE masivos) no pasan por el ORM: deben
+aplicar la diferencia de los miembros tocados con
+MemberRepository.apply_stats_changes o, si tocan toda la iglesia, llamar a
+MemberRepository.reconcile_stats_snapshot al terminar.
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.infrastructure.database.models.member import MemberModel
+from app.infrastructure.database.models.member_stats import ChurchMemberStatsModel
+
+# Rangos de edad para ChurchMemberStats.age_distribution: (edad máxima, etiqueta)
+AGE_BUCKETS = [(17, "0-17"), (25, "18-25"), (35, "26-35"), (50, "36-50"), (65, "51-65")]
+
+STATS_FIELDS = (
+    "church_id", "member_type", "member_status", "risk_level", "attendance_rate",
+    "commitment_score", "membership_date", "birth_date", "gender", "marital_status"
+)
+COUNTERS = ("total_members", "active_members", "visitors", "members_at_risk")
+SUMS = ("sum_attendance_rate", "sum_commitment_score")
+DISTRIBUTIONS = (
+    "new_by_month", "age_distribution", "gender_distribution",
+    "marital_status_distribution", "member_type_distribution"
+)
+
+
+def age_bucket(age: Optional[int]) -> str:
+    if age is None:
+        return "sin_dato"
+    for max_age, label in AGE_BUCKETS:
+        if age <= max_age:
+            return label
+    return "65+"
+
+
+def _age(birth_date: Optional[date], today: date) -> Optional[int]:
+    if not birth_date:
+        return None
+    return today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+
+
+def member_contribution(values: Dict[str, Any]) -> Dict[Any, float]:
+    """
+    Aporte de un miembro al snapshot
+
+    Retorna {contador: n} y {(distribución, clave): n}. Usa las mismas reglas
+    que MemberRepository.get_church_stats.
+    """
+    membership_date = values["membership_date"]
+    if isinstance(membership_date, datetime):
+        membership_date = membership_date.date()
+
+    contribution = {
+        "total_members": 1,
+        "active_members": int(values["member_type"] == "activo" and values["member_status"] == "active"),
+        "visitors": int(values["member_type"] == "visitante"),
+        "members_at_risk": int(values["risk_level"] in ("alto", "critico")),
+        "sum_attendance_rate": values["attendance_rate"] or 0.0,
+        "sum_commitment_score": values["commitment_score"] or 0.0,
+        ("age_distribution", age_bucket(_age(values["birth_date"], date.today()))): 1,
+        ("gender_distribution", values["gender"] or "sin_dato"): 1,
+        ("marital_status_distribution", values["marital_status"] or "sin_dato"): 1,
+        ("member_type_distribution", values["member_type"] or "sin_dato"): 1,
+    }
+    if membership_date:
+        contribution[("new_by_month", membership_date.strftime("%Y-%m"))] = 1
+    return contribution
+
+
+def _values_before(member: MemberModel) -> Dict[str, Any]:
+    """Valores previos al flush; si un atributo no estaba cargado usa el actual"""
+    state = inspect(member)
+    values = {}
+    for field in STATS_FIELDS:
+        history = state.attrs[field].history
+        if history.deleted:
+            values[field] = history.deleted[0]
+        elif history.unchanged:
+            values[field] = history.unchanged[0]
+        else:
+            values[field] = getattr(member, field)
+    return values
+
+
+def _values_after(member: MemberModel) -> Dict[str, Any]:
+    return {field: getattr(member, field) for field in STATS_FIELDS}
+
+
+def _accumulate(deltas, values: Dict[str, Any], sign: int) -> None:
+    church_deltas = deltas[values["church_id"]]
+    for key, amount in member_contribution(values).items():
+        church_deltas[key] += sign * amount
+
+
+def stats_deltas(before: Iterable[Dict[str, Any]], after: Iterable[Dict[str, Any]]):
+    """Diferencia por iglesia entre el aporte de unos miembros antes y después de un cambio"""
+    deltas = defaultdict(lambda: defaultdict(float))
+    for values in before:
+        _accumulate(deltas, values, -1)
+    for values in after:
+        _accumulate(deltas, values, +1)
+    return deltas
+
+
+def apply_stats_deltas(connection, deltas) -> None:
+    """Suma las diferencias al snapshot de cada iglesia (bloqueando su fila)"""
+    table = ChurchMemberStatsModel.__table__
+
+    for church_id, church_deltas in deltas.items():
+        if church_id is None or not any(church_deltas.values()):
+            continue
+
+        snapshot = connection.execute(
+            select(table).where(table.c.church_id == church_id).with_for_update()
+        ).mappings().first()
+        if snapshot is None:
+            # Sin snapshot todavía: se crea en la primera lectura/reconciliación
+            continue
+
+        values = {counter: snapshot[counter] + int(church_deltas.get(counter, 0)) for counter in COUNTERS}
+        values.update({column: snapshot[column] + church_deltas.get(column, 0.0) for column in SUMS})
+
+        distributions = {name: dict(snapshot[name] or {}) for name in DISTRIBUTIONS}
+        for delta_key, amount in church_deltas.items():
+            if isinstance(delta_key, tuple) and amount:
+                name, key = delta_key
+                current = distributions[name]
+                current[key] = int(current.get(key, 0) + amount)
+                if current[key] <= 0:
+                    del current[key]
+        values.update(distributions)
+
+        values["updated_at"] = datetime.utcnow()
+        connection.execute(update(table).where(table.c.church_id == church_id).values(**values))
+
+
+@event.listens_for(Session, "after_flush")
+def track_member_stats(session: Session, flush_context) -> None:
+    deltas = defaultdict(lambda: defaultdict(float))
+
+    for obj in session.new:
+        if isinstance(obj, MemberModel):
+            _accumulate(deltas, _values_after(obj), +1)
+
+    for obj in session.dirty:
+        if isinstance(obj, MemberModel) and session.is_modified(obj, include_collections=False):
+            _accumulate(deltas, _values_before(obj), -1)
+            _accumulate(deltas, _values_after(obj), +1)
+
+    for obj in session.deleted:
+        if isinstance(obj, MemberModel):
+            _accumulate(deltas, _values_before(obj), -1)
+
+    if not deltas:
+        return
+
+    apply_stats_deltas(session.connection(), deltas)
@@ -3,12 +3,22 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import structlog
 
 # Import routers
 from app.api.v1.auth.endpoints import router as auth_router
 from app.api.v1.church.endpoints import router as church_router
+from app.config.settings import settings
+from app.infrastructure.jobs.stats_reconciliation import run_periodic_reconciliation
+from app.infrastructure.jobs.member_recalculation import run_job_resumer, cancel_running_jobs
+from app.infrastructure.jobs.score_refresh import run_periodic_score_refresh
+from app.infrastructure.jobs.attendance_window import run_periodic_attendance_window
+from app.infrastructure.jobs.attendance_partitions import run_periodic_attendance_partitions
+from app.infrastructure.cache import get_response_cache
+from app.domain.services.member_insights import insights_cache_metrics
+from app.infrastructure.external.openai_service import get_openai_service
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -18,8 +28,24 @@ logger = structlog.get_logger()
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Starting ChurchAI API")
+    background_tasks = []
+    if settings.STATS_RECONCILE_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_periodic_reconciliation()))
+    if settings.SCORE_REFRESH_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_periodic_score_refresh()))
+    if settings.ATTENDANCE_WINDOW_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_periodic_attendance_window()))
+    if settings.ATTENDANCE_PARTITION_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_periodic_attendance_partitions()))
+    # Retoma recálculos interrumpidos (proceso caído o reiniciado)
+    background_tasks.append(asyncio.create_task(run_job_resumer()))
     yield
     # Shutdown
+    for task in background_tasks:
+        task.cancel()
+    await cancel_running_jobs()
+    await get_response_cache().close()
+    await get_openai_service().close()
     logger.info("🛑 Shutting down ChurchAI API")
 
 # Create FastAPI app
@@ -39,6 +65,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Root endpoint
@@ -62,7 +89,10 @@ async def health_check():
         "status": "healthy",
         "service": "ChurchAI API",
         "version": "1.0.0",
-        "timestamp": "2024-01-01T00:00:00Z"
+        "timestamp": "2024-01-01T00:00:00Z",
+        "cache": get_response_cache().metrics(),
+        "ai_insights": insights_cache_metrics(),
+        "llm": get_openai_service().metrics()
     }
 
 # Include API routers
@@ -92,3 +122,17 @@ app.include_router(members.router, prefix="/api/v1", tags=["members"])
 from app.api.v1.endpoints import members
 app.include_router(members.router, prefix="/api/v1", tags=["members"])
 
+from app.api.v1.endpoints import jobs
+app.include_router(jobs.router, prefix="/api/v1", tags=["jobs"])
+
+from app.api.v1.endpoints import ministries
+app.include_router(ministries.router, prefix="/api/v1", tags=["ministries"])
+
+from app.api.v1.endpoints import scoring_rules
+app.include_router(scoring_rules.router, prefix="/api/v1", tags=["scoring-rules"])
+
+from app.api.v1.endpoints import attendance
+app.include_router(attendance.router, prefix="/api/v1", tags=["attendance"])
+
+from app.api.v1.endpoints import events
+app.include_router(events.router, prefix="/api/v1", tags=["events"])
@@ -0,0 +1,88 @@
+# benchmarks/bench_attendance_bulk.py
+"""
+Registrar la asistencia de un culto: registro por registro vs POST /attendance/bulk
+
+El camino por registro es el de POST /members/{id}/attendance (get_by_id con
+eager loading, commit, refresh y contadores de la ventana por miembro);
+el masivo es record_attendance_bulk + reconcile_stats_snapshot en una
+transacción. Cada repetición usa un tipo de evento nuevo para no chocar con
+el control de duplicados.
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_attendance_bulk [--members 2000 --checkins 300]
+"""
+import argparse
+import asyncio
+import itertools
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.schemas.member import AttendanceRecordCreate
+from app.infrastructure.database.models.member import MemberModel
+from app.infrastructure.repositories.member_repository import MemberRepository
+from benchmarks.seed import get_engine, seed_church, seed_attendance, drop_church
+from benchmarks.timing import measure, print_table
+
+
+async def main(members: int, checkins: int, weeks: int, repeat: int):
+    engine = get_engine()
+
+    async with engine.begin() as conn:
+        church_id = await seed_church(conn, members)
+        await seed_attendance(conn, church_id, weeks)
+
+    events = itertools.count()
+    try:
+        async with AsyncSession(engine) as session:
+            member_ids = list((await session.execute(
+                select(MemberModel.id).where(MemberModel.church_id == church_id).limit(checkins)
+            )).scalars())
+
+        async def per_record():
+            event_type = f"bench-{next(events)}"
+            async with AsyncSession(engine) as session:
+                repo = MemberRepository(session)
+                for member_id in member_ids:
+                    await repo.get_by_id(member_id, with_notes=True, with_attendance=True)
+                    await repo.record_attendance(AttendanceRecordCreate(
+                        member_id=member_id, church_id=church_id, event_type=event_type, event_date=date.today()
+                    ))
+
+        async def bulk():
+            event_type = f"bench-{next(events)}"
+            async with AsyncSession(engine) as session:
+                repo = MemberRepository(session)
+                await repo.record_attendance_bulk(
+                    church_id, event_type, date.today(), dict.fromkeys(member_ids, True)
+                )
+                await repo.reconcile_stats_snapshot(church_id)
+
+        rows = {
+            "por registro": await measure(per_record, repeat, warmup=1),
+            "bulk (una transacción)": await measure(bulk, repeat, warmup=1),
+        }
+        print_table(
+            f"Asistencia de un culto ({len(member_ids)} registros, iglesia de {members} miembros, "
+            f"{weeks} semanas de historial, {repeat} repeticiones)",
+            rows
+        )
+        print(f"por registro / bulk: {rows['por registro']['p50_ms'] / rows['bulk (una transacción)']['p50_ms']:.1f}x")
+    finally:
+        async with engine.begin() as conn:
+            await drop_church(conn, church_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=2_000)
+    parser.add_argument("--checkins", type=int, default=300)
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.members, args.checkins, args.weeks, args.repeat))
@@ -0,0 +1,85 @@
+# benchmarks/bench_attendance_rollups.py
+"""
+Asistencia por semana del último año: agregados semanales vs attendance_records
+
+"agregados" es AttendanceRollupRepository.get_weekly (lo que responde
+GET /attendance/weekly); "registros" es la misma serie agrupando
+attendance_records fila por fila.
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_attendance_rollups [--members 2000 --weeks 104]
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.models.member import AttendanceRecordModel
+from app.infrastructure.repositories.attendance_rollup_repository import AttendanceRollupRepository, week_start_expr
+from benchmarks.seed import get_engine, seed_church, seed_attendance, drop_church
+from benchmarks.timing import measure, print_table
+
+
+async def main(members: int, weeks: int, repeat: int):
+    engine = get_engine()
+
+    async with engine.begin() as conn:
+        church_id = await seed_church(conn, members)
+        await seed_attendance(conn, church_id, weeks)
+
+    today = date.today()
+    since = today - timedelta(weeks=52)
+    try:
+        async def rollups():
+            async with AsyncSession(engine) as session:
+                return await AttendanceRollupRepository(session).get_weekly(church_id, since, today, "culto")
+
+        async def records():
+            week = week_start_expr(AttendanceRecordModel.event_date)
+            async with AsyncSession(engine) as session:
+                result = await session.execute(
+                    select(
+                        week,
+                        func.count(AttendanceRecordModel.id),
+                        func.count(AttendanceRecordModel.id).filter(AttendanceRecordModel.attended.is_(True))
+                    )
+                    .where(
+                        and_(
+                            AttendanceRecordModel.church_id == church_id,
+                            AttendanceRecordModel.event_type == "culto",
+                            AttendanceRecordModel.event_date >= since
+                        )
+                    )
+                    .group_by(week)
+                    .order_by(week)
+                )
+                return result.all()
+
+        rows = {
+            "agregados semanales": await measure(rollups, repeat),
+            "attendance_records": await measure(records, repeat),
+        }
+        print_table(
+            f"Serie semanal de 52 semanas (iglesia de {members} miembros, {weeks} semanas de historial, "
+            f"{repeat} repeticiones)",
+            rows
+        )
+        print(f"registros / agregados: {rows['attendance_records']['p50_ms'] / rows['agregados semanales']['p50_ms']:.1f}x")
+    finally:
+        async with engine.begin() as conn:
+            await drop_church(conn, church_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=2_000)
+    parser.add_argument("--weeks", type=int, default=104)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.members, args.weeks, args.repeat))
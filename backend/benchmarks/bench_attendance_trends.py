@@ -0,0 +1,87 @@
+# benchmarks/bench_attendance_trends.py
+"""
+Latencia de GET /members/trends sobre años de asistencia semanal
+
+Compara cargar el historial y correr analyze_member_trend miembro por
+miembro en Python contra la consulta con funciones de ventana
+(get_attendance_trends), con ventanas de 26 y 104 semanas (el máximo del
+endpoint) sobre un historial de varios años.
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_attendance_trends [--members 2000 --weeks 260]
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date, timedelta
+from itertools import groupby
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.services.member_ai_service import MemberAIService
+from app.infrastructure.database.models.member import AttendanceRecordModel
+from app.infrastructure.repositories.member_repository import MemberRepository
+from benchmarks.seed import get_engine, seed_church, seed_attendance, drop_church
+from benchmarks.timing import measure, print_table
+
+
+async def python_trends(session: AsyncSession, church_id, since: date, today: date):
+    """Historial completo a Python y analyze_member_trend por miembro"""
+    result = await session.execute(
+        select(AttendanceRecordModel.member_id, AttendanceRecordModel.attended)
+        .where(
+            and_(
+                AttendanceRecordModel.church_id == church_id,
+                AttendanceRecordModel.event_date > since,
+                AttendanceRecordModel.event_date <= today
+            )
+        )
+        .order_by(AttendanceRecordModel.member_id, AttendanceRecordModel.event_date, AttendanceRecordModel.id)
+    )
+    trends = [
+        MemberAIService.analyze_member_trend(None, list(records))
+        for _, records in groupby(result.all(), key=lambda row: row.member_id)
+    ]
+    return sorted(trends, key=lambda trend: trend.get("commitment_change", 0))
+
+
+async def main(members: int, weeks: int, repeat: int):
+    engine = get_engine()
+
+    async with engine.begin() as conn:
+        church_id = await seed_church(conn, members)
+        await seed_attendance(conn, church_id, weeks)
+
+    try:
+        today = date.today()
+        rows = {}
+        async with AsyncSession(engine) as session:
+            repo = MemberRepository(session)
+            for window in (26, 104):
+                since = today - timedelta(weeks=window)
+                rows[f"python ({window} semanas)"] = await measure(
+                    lambda: python_trends(session, church_id, since, today), repeat
+                )
+                rows[f"ventanas SQL ({window} semanas)"] = await measure(
+                    lambda: repo.get_attendance_trends(church_id, since, today), repeat
+                )
+        print_table(
+            f"Tendencias de asistencia ({members} miembros, {weeks} semanas de historial, {repeat} repeticiones)",
+            rows
+        )
+    finally:
+        async with engine.begin() as conn:
+            await drop_church(conn, church_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=2_000)
+    parser.add_argument("--weeks", type=int, default=260)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.members, args.weeks, args.repeat))
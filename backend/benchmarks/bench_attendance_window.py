@@ -0,0 +1,105 @@
+# benchmarks/bench_attendance_window.py
+"""
+Registrar una asistencia: contadores de la ventana vs recuento de 90 días
+
+"contadores" es record_attendance (suma al miembro y calcula la tasa en
+O(1)); "recuento" agrega recalculate_attendance_rate, que es lo que hacía
+cada registro antes: leer todo el historial de la ventana del miembro. El
+historial sembrado es de varios eventos por semana para que el recuento
+tenga filas que leer. También mide el chequeo de consistencia de la
+iglesia contra un recuento completo.
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_attendance_window [--members 2000 --events-per-week 5]
+"""
+import argparse
+import asyncio
+import itertools
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.schemas.member import AttendanceRecordCreate
+from app.infrastructure.database.models.member import MemberModel
+from app.infrastructure.repositories.member_repository import MemberRepository
+from benchmarks.seed import get_engine, seed_church, seed_attendance, drop_church
+from benchmarks.timing import measure, print_table
+
+
+async def main(members: int, weeks: int, events_per_week: int, repeat: int):
+    engine = get_engine()
+
+    async with engine.begin() as conn:
+        church_id = await seed_church(conn, members)
+        # Eventos extra entre semana antes de sembrar 'culto' (que deja los contadores al día)
+        await conn.execute(
+            text("""
+                INSERT INTO attendance_records (id, member_id, church_id, event_type, event_date, attended, created_at)
+                SELECT gen_random_uuid(), m.id, m.church_id, 'evento-' || e, CAST(:today AS date) - (w * 7 + e), random() < 0.6, now()
+                FROM members m
+                CROSS JOIN generate_series(0, :weeks - 1) AS w
+                CROSS JOIN generate_series(1, :extra) AS e
+                WHERE m.church_id = :church_id
+            """),
+            {"church_id": church_id, "weeks": weeks, "extra": events_per_week - 1, "today": date.today()}
+        )
+        await seed_attendance(conn, church_id, weeks)
+
+    events = itertools.count()
+    try:
+        async with AsyncSession(engine) as session:
+            member_ids = list((await session.execute(
+                select(MemberModel.id).where(MemberModel.church_id == church_id).limit(repeat + 5)
+            )).scalars())
+        members_cycle = itertools.cycle(member_ids)
+
+        def checkin():
+            return AttendanceRecordCreate(
+                member_id=next(members_cycle), church_id=church_id,
+                event_type=f"bench-{next(events)}", event_date=date.today() - timedelta(days=1)
+            )
+
+        async def counters():
+            async with AsyncSession(engine) as session:
+                await MemberRepository(session).record_attendance(checkin())
+
+        async def recount():
+            async with AsyncSession(engine) as session:
+                repo = MemberRepository(session)
+                record = await repo.record_attendance(checkin())
+                await repo.recalculate_attendance_rate(record.member_id)
+
+        async def check():
+            async with AsyncSession(engine) as session:
+                repo = MemberRepository(session)
+                await repo.check_attendance_counters(church_id, await repo.get_attendance_window_start(church_id))
+
+        rows = {
+            "contadores (O(1))": await measure(counters, repeat, warmup=3),
+            "recuento de 90 días": await measure(recount, repeat, warmup=3),
+            "chequeo de la iglesia": await measure(check, 5, warmup=1),
+        }
+        print_table(
+            f"Registro de asistencia ({members} miembros, {weeks} semanas x {events_per_week} eventos, "
+            f"{repeat} repeticiones)",
+            rows
+        )
+        print(f"recuento / contadores: {rows['recuento de 90 días']['p50_ms'] / rows['contadores (O(1))']['p50_ms']:.1f}x")
+    finally:
+        async with engine.begin() as conn:
+            await drop_church(conn, church_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=2_000)
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--events-per-week", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.members, args.weeks, args.events_per_week, args.repeat))
@@ -0,0 +1,80 @@
+# benchmarks/bench_church_stats.py
+"""
+Round trips y latencia de GET /members/stats
+
+Compara las seis consultas originales de get_church_stats contra la versión
+de una sola consulta (agregados condicionales + GROUPING SETS).
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_church_stats [--members 20000]
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, func, and_, event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.models.member import MemberModel
+from app.infrastructure.repositories.member_repository import MemberRepository
+from benchmarks.seed import get_engine, seed_church, drop_church
+from benchmarks.timing import measure, print_table
+
+
+async def legacy_stats(session: AsyncSession, church_id):
+    """Las seis consultas de la implementación anterior (sin distribuciones)"""
+    in_church = MemberModel.church_id == church_id
+    count = func.count(MemberModel.id)
+    await session.execute(select(count).where(in_church))
+    await session.execute(
+        select(count).where(and_(in_church, MemberModel.member_type == "activo", MemberModel.member_status == "active"))
+    )
+    await session.execute(select(count).where(and_(in_church, MemberModel.member_type == "visitante")))
+    await session.execute(select(count).where(and_(in_church, MemberModel.risk_level.in_(["alto", "critico"]))))
+    await session.execute(
+        select(count).where(and_(in_church, MemberModel.membership_date >= date.today().replace(day=1)))
+    )
+    await session.execute(
+        select(func.avg(MemberModel.attendance_rate), func.avg(MemberModel.commitment_score)).where(in_church)
+    )
+
+
+async def main(members: int, repeat: int):
+    engine = get_engine()
+    statements = {"count": 0}
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statements(*args):
+        statements["count"] += 1
+
+    async with engine.begin() as conn:
+        church_id = await seed_church(conn, members)
+
+    try:
+        rows = {}
+        async with AsyncSession(engine) as session:
+            repo = MemberRepository(session)
+            for name, fn in (
+                ("legacy (6 consultas)", lambda: legacy_stats(session, church_id)),
+                ("single-pass", lambda: repo.get_church_stats(church_id)),
+            ):
+                statements["count"] = 0
+                await fn()
+                round_trips = statements["count"]
+                rows[name] = {"round_trips": round_trips, **await measure(fn, repeat)}
+        print_table(f"Estadísticas de iglesia ({members} miembros, {repeat} repeticiones)", rows)
+    finally:
+        async with engine.begin() as conn:
+            await drop_church(conn, church_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.members, args.repeat))
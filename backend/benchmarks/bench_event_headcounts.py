@@ -0,0 +1,89 @@
+# benchmarks/bench_event_headcounts.py
+"""
+Totales por evento del último año: fila del evento vs attendance_records
+
+"eventos" es EventRepository.get_events (lo que responde GET /events, con
+records/headcount mantenidos en cada registro); "registros" son los mismos
+totales agrupando attendance_records por tipo, nombre y fecha.
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_event_headcounts [--members 2000 --weeks 104]
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.models.member import AttendanceRecordModel
+from app.infrastructure.repositories.event_repository import EventRepository
+from benchmarks.seed import get_engine, seed_church, seed_attendance, drop_church
+from benchmarks.timing import measure, print_table
+
+
+async def main(members: int, weeks: int, repeat: int):
+    engine = get_engine()
+
+    async with engine.begin() as conn:
+        church_id = await seed_church(conn, members)
+        await seed_attendance(conn, church_id, weeks)
+
+    today = date.today()
+    since = today - timedelta(weeks=52)
+    try:
+        async def events():
+            async with AsyncSession(engine) as session:
+                return await EventRepository(session).get_events(church_id, since, today)
+
+        async def records():
+            async with AsyncSession(engine) as session:
+                result = await session.execute(
+                    select(
+                        AttendanceRecordModel.event_type,
+                        AttendanceRecordModel.event_name,
+                        AttendanceRecordModel.event_date,
+                        func.count(AttendanceRecordModel.id),
+                        func.count(AttendanceRecordModel.id).filter(AttendanceRecordModel.attended.is_(True))
+                    )
+                    .where(
+                        and_(
+                            AttendanceRecordModel.church_id == church_id,
+                            AttendanceRecordModel.event_date >= since
+                        )
+                    )
+                    .group_by(
+                        AttendanceRecordModel.event_type,
+                        AttendanceRecordModel.event_name,
+                        AttendanceRecordModel.event_date
+                    )
+                    .order_by(AttendanceRecordModel.event_date.desc())
+                )
+                return result.all()
+
+        rows = {
+            "eventos": await measure(events, repeat),
+            "attendance_records": await measure(records, repeat),
+        }
+        print_table(
+            f"Totales de 52 semanas de eventos (iglesia de {members} miembros, {weeks} semanas de historial, "
+            f"{repeat} repeticiones)",
+            rows
+        )
+        print(f"registros / eventos: {rows['attendance_records']['p50_ms'] / rows['eventos']['p50_ms']:.1f}x")
+    finally:
+        async with engine.begin() as conn:
+            await drop_church(conn, church_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=2_000)
+    parser.add_argument("--weeks", type=int, default=104)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.members, args.weeks, args.repeat))
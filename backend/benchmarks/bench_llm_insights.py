@@ -0,0 +1,108 @@
+# benchmarks/bench_llm_insights.py
+"""
+Throughput y latencia de cola de los insights con LLM, contra un servidor falso
+
+Levanta benchmarks.fake_llm_server en un hilo y genera los insights de una
+iglesia sintética con OpenAIService/LLMClient (SDK de OpenAI real, transporte
+HTTP real) en varias configuraciones: un miembro por prompt en secuencia (sobre
+una muestra), concurrencia acotada, lotes, dos generaciones concurrentes de la
+misma iglesia (coalescing), cache caliente y un timeout más corto que la cola
+lenta del servidor (respaldo a la plantilla). Sin base de datos ni red.
+
+    python -m benchmarks.bench_llm_insights [--members 400 --latency-ms 150]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.infrastructure.cache.backends import InMemoryCacheBackend
+from app.infrastructure.external.llm_client import LLMClient, OpenAIChatTransport
+from app.infrastructure.external.openai_service import OpenAIService
+from benchmarks.bench_member_scoring import synthesize_members
+from benchmarks.fake_llm_server import FakeLLMConfig, FakeLLMServer
+from benchmarks.timing import print_table
+
+MODEL = "fake-llm"
+
+
+def church_members(count: int):
+    members = synthesize_members(count)
+    for i, member in enumerate(members):
+        member.first_name = f"Miembro{i}"
+        member.risk_level = "medio"
+    return members
+
+
+def service(server: FakeLLMServer, concurrency: int, batch_size: int, timeout: float = 15.0) -> OpenAIService:
+    transport = OpenAIChatTransport("sk-fake", MODEL, base_url=server.base_url, timeout=timeout + 5)
+    return OpenAIService(LLMClient(
+        transport, InMemoryCacheBackend(), MODEL,
+        max_concurrency=concurrency, batch_size=batch_size, timeout=timeout
+    ))
+
+
+async def run(server: FakeLLMServer, llm: OpenAIService, members, callers: int = 1):
+    """Genera los insights `callers` veces en paralelo; reporta por miembro de la iglesia"""
+    before = dict(llm.llm.metrics())
+    requests = server.requests
+    start = time.perf_counter()
+    results = await asyncio.gather(*(llm.llm_member_insights(members) for _ in range(callers)))
+    elapsed = time.perf_counter() - start
+    metrics = llm.llm.metrics()
+    return {
+        "members_s": round(len(members) / elapsed, 1),
+        "wall_ms": round(elapsed * 1000),
+        "requests": server.requests - requests,
+        "p50_ms": metrics["p50_ms"],
+        "p99_ms": metrics["p99_ms"],
+        "cache_hits": metrics["cache_hits"] - before["cache_hits"],
+        "coalesced": metrics["coalesced"] - before["coalesced"],
+        "fallback": sum(text is None for texts in results for text in texts),
+    }
+
+
+async def main(members: int, config: FakeLLMConfig, concurrency: int, batch_size: int, short_timeout: float):
+    data = church_members(members)
+
+    with FakeLLMServer(config) as server:
+        rows = {}
+        sample = data[:max(1, members // 10)]
+        rows[f"secuencial, 1/prompt ({len(sample)})"] = await run(server, service(server, 1, 1), sample)
+        rows[f"concurrencia {concurrency}, 1/prompt"] = await run(server, service(server, concurrency, 1), data)
+
+        batched = service(server, concurrency, batch_size)
+        rows[f"concurrencia {concurrency}, lotes de {batch_size}"] = await run(server, batched, data)
+        rows["misma iglesia de nuevo (cache)"] = await run(server, batched, data)
+
+        rows["2 generaciones a la vez"] = await run(server, service(server, concurrency, batch_size), data, callers=2)
+        rows[f"timeout {short_timeout}s (cola lenta)"] = await run(
+            server, service(server, concurrency, batch_size, timeout=short_timeout), data
+        )
+
+    print_table(
+        f"Insights con LLM ({members} miembros, servidor {config.latency_ms:.0f}ms "
+        f"+{config.per_item_ms:.0f}ms/miembro, cola {config.tail_ratio:.0%} a +{config.tail_ms:.0f}ms)",
+        rows
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=400)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--per-item-ms", type=float, default=10.0)
+    parser.add_argument("--tail-ratio", type=float, default=0.05)
+    parser.add_argument("--tail-ms", type=float, default=2000.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--short-timeout", type=float, default=1.0)
+    args = parser.parse_args()
+    config = FakeLLMConfig(
+        latency_ms=args.latency_ms, per_item_ms=args.per_item_ms,
+        tail_ratio=args.tail_ratio, tail_ms=args.tail_ms
+    )
+    asyncio.run(main(args.members, config, args.concurrency, args.batch_size, args.short_timeout))
@@ -0,0 +1,101 @@
+# benchmarks/bench_member_list.py
+"""
+Memoria y latencia de GET /members (página de 500) y GET /members/at-risk
+
+Compara cargar filas ORM completas contra la proyección de columnas de
+MemberRepository.list_by_church / list_at_risk. Ambos caminos terminan con la
+validación del response_model, como en el endpoint. Las filas llevan ai_notes
+y notes con contenido para reflejar miembros reales.
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_member_list [--members 20000]
+"""
+import argparse
+import asyncio
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.schemas.member import MemberListItem
+from app.infrastructure.repositories.member_repository import MemberRepository
+from benchmarks.seed import get_engine, seed_church, drop_church
+from benchmarks.timing import measure, print_table
+
+PAGE_SIZE = 500
+
+
+def response_model(items):
+    """Lo que hace FastAPI con response_model=List[MemberListItem]"""
+    return [
+        MemberListItem.model_validate(item.model_dump() if isinstance(item, MemberListItem) else item)
+        for item in items
+    ]
+
+
+async def peak_memory_kb(fn) -> float:
+    tracemalloc.start()
+    await fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+async def main(members: int, repeat: int):
+    engine = get_engine()
+    async with engine.begin() as conn:
+        church_id = await seed_church(conn, members)
+        await conn.execute(
+            text("""
+                UPDATE members
+                SET notes = repeat('Nota pastoral de seguimiento. ', 40),
+                    ai_notes = json_build_object('insights', repeat('Análisis del miembro. ', 30)),
+                    tags = ARRAY['familia', 'nuevo', 'voluntario']
+                WHERE church_id = :church_id
+            """),
+            {"church_id": church_id}
+        )
+
+    try:
+        rows = {}
+        async with AsyncSession(engine) as session:
+            repo = MemberRepository(session)
+
+            async def orm_page():
+                response_model(await repo.get_all_by_church(church_id, member_status=None, limit=PAGE_SIZE))
+                session.expunge_all()
+
+            async def projected_page():
+                response_model(await repo.list_by_church(church_id, member_status=None, limit=PAGE_SIZE))
+
+            async def orm_at_risk():
+                response_model(await repo.get_members_at_risk(church_id))
+                session.expunge_all()
+
+            async def projected_at_risk():
+                response_model(await repo.list_at_risk(church_id))
+
+            for name, fn in (
+                ("ORM      /members (500)", orm_page),
+                ("projected /members (500)", projected_page),
+                ("ORM      /at-risk", orm_at_risk),
+                ("projected /at-risk", projected_at_risk),
+            ):
+                rows[name] = {"peak_kb": await peak_memory_kb(fn), **await measure(fn, repeat)}
+
+        print_table(f"Listados de miembros ({members} miembros, {repeat} repeticiones)", rows)
+    finally:
+        async with engine.begin() as conn:
+            await drop_church(conn, church_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.members, args.repeat))
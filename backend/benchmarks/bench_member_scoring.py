@@ -0,0 +1,100 @@
+# benchmarks/bench_member_scoring.py
+"""
+Recalcular el scoring de toda una iglesia: camino escalar vs vectorizado
+
+El escalar es el bucle de los endpoints (calculate_commitment_score +
+detect_abandonment_risk por miembro); el vectorizado es
+MemberAIService.score_batch sobre columnas NumPy. No necesita base de datos:
+los miembros se sintetizan en memoria con la misma forma que las filas de
+get_score_inputs.
+
+    python -m benchmarks.bench_member_scoring [--members 20000]
+"""
+import argparse
+import asyncio
+import random
+import sys
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.domain.services.member_ai_service import MemberAIService
+from app.domain.services.member_scoring import MemberScoringColumns, factor_names
+from benchmarks.timing import measure, print_table
+
+MINISTRIES = ["alabanza", "jovenes", "ninos", "multimedia", "ujieres"]
+
+
+def synthesize_members(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    today = date.today()
+    members = []
+    for _ in range(count):
+        members.append(SimpleNamespace(
+            attendance_rate=round(rng.uniform(0, 100), 1) if rng.random() > 0.05 else None,
+            last_attendance=today - timedelta(days=rng.randint(0, 120)) if rng.random() > 0.1 else None,
+            ministries=rng.sample(MINISTRIES, rng.randint(0, 3)),
+            small_group_id=uuid.uuid4() if rng.random() > 0.5 else None,
+            small_group_role=rng.choice([None, "miembro", "lider", "anfitrion"]),
+            spiritual_gifts=["servicio"] if rng.random() > 0.6 else [],
+            commitment_score=round(rng.uniform(0, 100), 1),
+            member_type=rng.choice(["activo", "visitante", "inactivo"]),
+            membership_date=today - timedelta(days=rng.randint(0, 2000)),
+        ))
+    return members
+
+
+def scalar_scores(members):
+    results = []
+    for member in members:
+        scored = SimpleNamespace(**vars(member))
+        scored.commitment_score = MemberAIService.calculate_commitment_score(scored)
+        risk = MemberAIService.detect_abandonment_risk(scored)
+        results.append((scored.commitment_score, risk["score"], risk["level"], risk["factors"]))
+    return results
+
+
+def batch_scores(members):
+    return MemberAIService.score_batch(MemberScoringColumns.from_members(members))
+
+
+def check_parity(scalar, batch):
+    levels = batch.level_names()
+    for i, (commitment, score, level, factors) in enumerate(scalar):
+        assert batch.commitment_score[i] == commitment
+        assert batch.risk_score[i] == score
+        assert levels[i] == level
+        assert factor_names(int(batch.risk_factors[i])) == factors
+
+
+async def main(members: int, repeat: int):
+    data = synthesize_members(members)
+    check_parity(scalar_scores(data), batch_scores(data))
+    columns = MemberScoringColumns.from_members(data)
+
+    async def run_scalar():
+        scalar_scores(data)
+
+    async def run_batch():
+        batch_scores(data)
+
+    async def run_batch_only():
+        MemberAIService.score_batch(columns)
+
+    rows = {
+        "escalar (por miembro)": await measure(run_scalar, repeat),
+        "vectorizado (con columnas)": await measure(run_batch, repeat),
+        "vectorizado (solo scoring)": await measure(run_batch_only, repeat),
+    }
+    print_table(f"Scoring de iglesia ({members} miembros, {repeat} repeticiones, paridad OK)", rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.members, args.repeat))
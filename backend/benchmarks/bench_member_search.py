@@ -0,0 +1,71 @@
+# benchmarks/bench_member_search.py
+"""
+Latencia de GET /members?search= con 100k miembros
+
+Compara los cuatro ILIKE '%term%' originales contra MemberRepository.search_members
+(tsvector + trigramas con unaccent). Requiere haber aplicado 003_members_search_indexes.sql.
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_member_search [--members 100000]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.models.member import MemberModel
+from app.infrastructure.repositories.member_repository import MemberRepository
+from benchmarks.seed import get_engine, seed_church, drop_church
+from benchmarks.timing import measure, print_table
+
+TERMS = ["perez", "Pérez", "mar gon", "m12345-", "1234-5678", "alvarez sosa", "juli"]
+
+
+async def legacy_search(session: AsyncSession, church_id, term: str, limit: int = 50):
+    search = f"%{term}%"
+    result = await session.execute(
+        select(MemberModel).where(
+            and_(
+                MemberModel.church_id == church_id,
+                or_(
+                    MemberModel.first_name.ilike(search),
+                    MemberModel.last_name.ilike(search),
+                    MemberModel.email.ilike(search),
+                    MemberModel.phone.ilike(search)
+                )
+            )
+        ).limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def main(members: int, repeat: int):
+    engine = get_engine()
+    async with engine.begin() as conn:
+        church_id = await seed_church(conn, members)
+
+    try:
+        rows = {}
+        async with AsyncSession(engine) as session:
+            repo = MemberRepository(session)
+            for term in TERMS:
+                rows[f"ilike     {term!r}"] = await measure(lambda: legacy_search(session, church_id, term), repeat)
+                rows[f"indexed   {term!r}"] = await measure(lambda: repo.search_members(church_id, term), repeat)
+                session.expunge_all()
+        print_table(f"Búsqueda de miembros ({members} miembros, {repeat} repeticiones)", rows)
+    finally:
+        async with engine.begin() as conn:
+            await drop_church(conn, church_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.members, args.repeat))
@@ -0,0 +1,78 @@
+# benchmarks/bench_scoring_rules.py
+"""
+Costo de la evaluación en sombra de una versión de reglas candidata
+
+Compara puntuar una iglesia con la versión fijada (columnas + score_members)
+contra puntuarla con la fijada y una candidata (columnas + shadow_evaluate +
+matriz de transiciones), que es lo que hace GET /scoring-rules/{v}/shadow
+después de leer la iglesia. Objetivo: la sombra cuesta <= 1.2x el scoring
+normal. Sin base de datos, con los miembros sintéticos de
+bench_member_scoring.
+
+    python -m benchmarks.bench_scoring_rules [--members 20000]
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.domain.services.member_scoring import (
+    MemberScoringColumns, ScoringFeatures, score_features, score_members, shadow_evaluate
+)
+from app.domain.services.scoring_rules import DEFAULT_RULES
+from benchmarks.bench_member_scoring import synthesize_members
+from benchmarks.timing import measure, print_table
+
+CANDIDATE_RULES = DEFAULT_RULES.derive(
+    version=2,
+    description="benchmark",
+    absence_risk=((45, 35), (28, 25), (18, 15), (10, 10)),
+    low_attendance_risk=((25, 25), (45, 15), (65, 10)),
+    risk_level_thresholds=(65, 45, 30),
+)
+
+
+async def main(members: int, repeat: int):
+    data = synthesize_members(members)
+    today = date.today()
+    columns = MemberScoringColumns.from_members(data)
+    features = ScoringFeatures.from_columns(columns, today)
+
+    async def run_pinned():
+        score_members(MemberScoringColumns.from_members(data), today, DEFAULT_RULES)
+
+    async def run_shadow():
+        evaluation = shadow_evaluate(MemberScoringColumns.from_members(data), DEFAULT_RULES, CANDIDATE_RULES, today)
+        evaluation.transitions()
+        evaluation.level_changed
+
+    async def run_pinned_only():
+        score_members(columns, today, DEFAULT_RULES)
+
+    async def run_shadow_only():
+        shadow_evaluate(columns, DEFAULT_RULES, CANDIDATE_RULES, today).transitions()
+
+    async def run_rules_only():
+        score_features(features, CANDIDATE_RULES)
+
+    rows = {
+        "fijada (con columnas)": await measure(run_pinned, repeat),
+        "sombra (con columnas)": await measure(run_shadow, repeat),
+        "fijada (solo scoring)": await measure(run_pinned_only, repeat),
+        "sombra (solo scoring)": await measure(run_shadow_only, repeat),
+        "una versión más (lookups)": await measure(run_rules_only, repeat),
+    }
+    ratio = rows["sombra (con columnas)"]["p50_ms"] / rows["fijada (con columnas)"]["p50_ms"]
+    print_table(f"Evaluación en sombra ({members} miembros, {repeat} repeticiones)", rows)
+    print(f"sombra / fijada (con columnas): {ratio:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.members, args.repeat))
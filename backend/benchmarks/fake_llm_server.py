@@ -0,0 +1,125 @@
+# benchmarks/fake_llm_server.py
+"""
+Servidor local compatible con /v1/chat/completions de OpenAI, para benchmarks
+
+Responde el JSON de insights que espera OpenAIService (un texto por miembro
+del prompt) después de una latencia simulada: base + por miembro del lote +
+jitter, y una fracción de respuestas lentas (cola). `capacity` limita los
+requests atendidos a la vez, como el rate limit de un proveedor real.
+
+    python -m benchmarks.fake_llm_server [--port 8100 --latency-ms 300 --tail-ratio 0.02]
+
+y LLM_BASE_URL=http://127.0.0.1:8100/v1 en la API.
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+
+@dataclass
+class FakeLLMConfig:
+    latency_ms: float = 300.0
+    per_item_ms: float = 20.0
+    jitter_ms: float = 50.0
+    tail_ratio: float = 0.02
+    tail_ms: float = 3000.0
+    capacity: int = 64
+    seed: int = 42
+
+
+def create_app(config: FakeLLMConfig) -> FastAPI:
+    app = FastAPI()
+    rng = random.Random(config.seed)
+    slots = asyncio.Semaphore(config.capacity)
+    app.state.requests = 0
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        try:
+            members = json.loads(body["messages"][-1]["content"])["members"]
+        except (KeyError, TypeError, ValueError):
+            members = []
+
+        delay = config.latency_ms + config.per_item_ms * len(members) + rng.uniform(0, config.jitter_ms)
+        if rng.random() < config.tail_ratio:
+            delay += config.tail_ms
+        async with slots:
+            app.state.requests += 1
+            await asyncio.sleep(delay / 1000)
+
+        content = json.dumps({"insights": [
+            {
+                "id": member["id"],
+                "text": f"{member.get('nombre')} mantiene compromiso {member.get('compromiso')}/100 "
+                        f"y asistencia de {member.get('asistencia_90_dias')}%."
+            }
+            for member in members
+        ]}, ensure_ascii=False)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        }
+
+    return app
+
+
+class FakeLLMServer:
+    """Servidor en un hilo propio (su propio event loop, fuera del que se mide)"""
+
+    def __init__(self, config: FakeLLMConfig, port: int = 8100):
+        self.app = create_app(config)
+        self.port = port
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host="127.0.0.1", port=port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    @property
+    def requests(self) -> int:
+        return self.app.state.requests
+
+    def __enter__(self) -> "FakeLLMServer":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--per-item-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--tail-ratio", type=float, default=0.02)
+    parser.add_argument("--tail-ms", type=float, default=3000.0)
+    parser.add_argument("--capacity", type=int, default=64)
+    args = parser.parse_args()
+    config = FakeLLMConfig(
+        latency_ms=args.latency_ms, per_item_ms=args.per_item_ms, jitter_ms=args.jitter_ms,
+        tail_ratio=args.tail_ratio, tail_ms=args.tail_ms, capacity=args.capacity
+    )
+    uvicorn.run(create_app(config), host="127.0.0.1", port=args.port)
@@ -0,0 +1,31 @@
+# benchmarks/timing.py
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+
+
+async def measure(fn: Callable[[], Awaitable], repeat: int = 20, warmup: int = 3) -> Dict[str, float]:
+    """Ejecuta `fn` varias veces y retorna p50/p95/max en milisegundos"""
+    for _ in range(warmup):
+        await fn()
+
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[max(0, int(len(samples) * 0.95) - 1)], 2),
+        "max_ms": round(samples[-1], 2),
+    }
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n{title}")
+    print("-" * 70)
+    for name, stats in rows.items():
+        values = "  ".join(f"{k}={v}" for k, v in stats.items())
+        print(f"{name:<35} {values}")
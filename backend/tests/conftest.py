@@ -1,5 +1,6 @@
 import pytest
 import asyncio
+import os
 import sys
 from pathlib import Path
 
@@ -7,7 +8,32 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
 from app.main import app
+from benchmarks import seed
+
+# PostgreSQL descartable para los tests marcados con @pytest.mark.database;
+# sin ella se saltean. La app ya quedó importada arriba con su propio
+# DATABASE_URL: los tests usan el engine de db_engine y, si el código bajo
+# prueba abre sus sesiones, le parchean AsyncSessionLocal
+QUERY_PLAN_DATABASE_URL = os.getenv("QUERY_PLAN_DATABASE_URL")
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "database: necesita un PostgreSQL descartable en QUERY_PLAN_DATABASE_URL"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if QUERY_PLAN_DATABASE_URL:
+        return
+    skip = pytest.mark.skip(reason="QUERY_PLAN_DATABASE_URL no configurada")
+    for item in items:
+        if "database" in item.keywords:
+            item.add_marker(skip)
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -23,3 +49,42 @@ async def client():
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """Engine sobre QUERY_PLAN_DATABASE_URL; sin pool, sirve en cada asyncio.run"""
+    engine = create_async_engine(QUERY_PLAN_DATABASE_URL, poolclass=NullPool)
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def seeded_church(db_engine):
+    """
+    Sembrar iglesias con benchmarks.seed: seeded_church(members, weeks=0, rate=0.7)
+    retorna el id; se borran al terminar el test
+    """
+    church_ids = []
+
+    async def _seed(members, weeks, rate):
+        async with db_engine.begin() as conn:
+            church_id = await seed.seed_church(conn, members)
+            if weeks:
+                await seed.seed_attendance(conn, church_id, weeks, rate=rate)
+        return church_id
+
+    def _seeded_church(members, weeks=0, rate=0.7):
+        church_id = asyncio.run(_seed(members, weeks, rate))
+        church_ids.append(church_id)
+        return church_id
+
+    yield _seeded_church
+
+    async def _drop():
+        async with db_engine.begin() as conn:
+            for church_id in church_ids:
+                await seed.drop_church(conn, church_id)
+
+    if church_ids:
+        asyncio.run(_drop())
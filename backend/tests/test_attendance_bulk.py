@@ -0,0 +1,95 @@
+"""
+record_attendance_bulk contra el cálculo miembro por miembro
+
+Siembra una iglesia con historial semanal, registra un culto para presentes,
+ausentes e IDs desconocidos y compara attendance_rate, last_attendance y
+scores con get_attendance_rates / score_batch sobre el mismo estado. Un
+segundo envío del mismo evento no duplica registros.
+
+Necesita un PostgreSQL descartable (el mismo de test_query_plans):
+    QUERY_PLAN_DATABASE_URL=postgresql+asyncpg://... pytest tests/test_attendance_bulk.py
+"""
+import asyncio
+import uuid
+from datetime import date, timedelta
+
+import pytest
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.services.member_ai_service import MemberAIService
+from app.domain.services.member_scoring import MemberScoringColumns
+from app.infrastructure.database.models.member import AttendanceRecordModel, MemberModel
+from app.infrastructure.repositories.member_repository import MemberRepository
+
+pytestmark = pytest.mark.database
+
+MEMBERS = 200
+
+
+async def _scenario(engine, church_id):
+    today = date.today()
+
+    async with AsyncSession(engine) as session:
+        repo = MemberRepository(session)
+        member_ids = list((await session.execute(
+            select(MemberModel.id).where(MemberModel.church_id == church_id).order_by(MemberModel.id)
+        )).scalars())
+        before = dict((await session.execute(
+            select(MemberModel.id, MemberModel.last_attendance).where(MemberModel.church_id == church_id)
+        )).all())
+
+        statuses = {member_id: i % 5 != 0 for i, member_id in enumerate(member_ids[:150])}
+        unknown = uuid.uuid4()
+        statuses[unknown] = True
+
+        recorded, _ = await repo.record_attendance_bulk(church_id, "reunion_jovenes", today, statuses, today=today)
+        await repo.reconcile_stats_snapshot(church_id)
+
+        rows = (await session.execute(
+            select(MemberModel.id, MemberModel.attendance_rate, MemberModel.last_attendance)
+            .where(MemberModel.id.in_(member_ids[:150]))
+        )).all()
+        rates = await repo.get_attendance_rates(member_ids[:150], since=today - timedelta(days=90))
+        score_inputs = await repo.get_score_inputs(member_ids[:150])
+        expected = MemberAIService.score_batch(
+            MemberScoringColumns.from_members(score_inputs), today, await repo.get_scoring_rules(church_id)
+        )
+
+        again, _ = await repo.record_attendance_bulk(church_id, "reunion_jovenes", today, statuses, today=today)
+        await session.commit()
+        count = (await session.execute(
+            select(func.count()).select_from(AttendanceRecordModel).where(
+                AttendanceRecordModel.church_id == church_id,
+                AttendanceRecordModel.event_type == "reunion_jovenes",
+                AttendanceRecordModel.event_date == today
+            )
+        )).scalar()
+
+    return statuses, unknown, recorded, rows, rates, before, score_inputs, expected, again, count
+
+
+def test_bulk_matches_per_member_path(db_engine, seeded_church):
+    """Test: Tasas, última asistencia y scores iguales al cálculo por miembro; sin duplicados"""
+    church_id = seeded_church(MEMBERS, weeks=12, rate=0.6)
+    statuses, unknown, recorded, rows, rates, before, score_inputs, expected, again, count = asyncio.run(
+        _scenario(db_engine, church_id)
+    )
+
+    assert len(recorded) == 150
+    assert unknown not in {row.member_id for row in recorded}
+    for member in rows:
+        assert member.attendance_rate == rates[member.id]
+        if statuses[member.id]:
+            assert member.last_attendance == max(filter(None, (before[member.id], date.today())))
+        else:
+            assert member.last_attendance == before[member.id]
+
+    levels = expected.level_names()
+    for i, row in enumerate(score_inputs):
+        assert row.commitment_score == expected.commitment_score[i]
+        assert row.risk_level == levels[i]
+
+    assert again == []
+    assert count == 150
@@ -0,0 +1,103 @@
+"""
+Particiones mensuales de asistencia y archivo en Parquet
+
+Siembra una iglesia, agrega registros de un mes muy antiguo (caen en la
+partición DEFAULT), crea las particiones, archiva ese mes y recorre el
+historial de un miembro página por página con y sin include_archived.
+
+Necesita un PostgreSQL descartable (el mismo de test_query_plans) y pyarrow:
+    QUERY_PLAN_DATABASE_URL=postgresql+asyncpg://... pytest tests/test_attendance_partitions.py
+"""
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.infrastructure.database.models.attendance_archive import AttendanceArchiveModel
+from app.infrastructure.database.models.member import AttendanceRecordModel, MemberModel
+from app.infrastructure.jobs import attendance_partitions
+from app.infrastructure.repositories.attendance_partition_repository import (
+    AttendancePartitionRepository, DEFAULT_PARTITION, add_months, month_start
+)
+from app.infrastructure.repositories.member_repository import MemberRepository
+
+pytestmark = pytest.mark.database
+
+MEMBERS = 20
+# Mes anterior a cualquier dato sembrado: sólo este test lo archiva
+OLD_MONTH = date(2001, 1, 1)
+
+
+async def _history(repo, member_id, include_archived):
+    """Todas las páginas de 3 registros del historial"""
+    records, cursor = await repo.get_attendance_page(member_id, limit=3, include_archived=include_archived)
+    pages = [records]
+    while cursor:
+        records, cursor = await repo.get_attendance_page(
+            member_id, after=cursor, limit=3, include_archived=include_archived
+        )
+        pages.append(records)
+    return [(record.event_date, record.id) for page in pages for record in page]
+
+
+async def _scenario(engine, church_id, monkeypatch, archive_dir):
+    today = date.today()
+    # El job abre sus propias sesiones: que usen esta base
+    monkeypatch.setattr(attendance_partitions, "AsyncSessionLocal", async_sessionmaker(engine, expire_on_commit=False))
+
+    try:
+        async with AsyncSession(engine) as session:
+            member_id = (await session.execute(
+                select(MemberModel.id).where(MemberModel.church_id == church_id).order_by(MemberModel.id).limit(1)
+            )).scalar_one()
+            session.add_all([
+                AttendanceRecordModel(
+                    member_id=member_id, church_id=church_id, event_type="culto",
+                    event_date=OLD_MONTH + timedelta(days=7 * week), attended=week % 2 == 0
+                )
+                for week in range(4)
+            ])
+            await session.commit()
+            live = await _history(MemberRepository(session), member_id, include_archived=False)
+
+        created = await attendance_partitions.ensure_attendance_partitions(today=today, months_ahead=2)
+        archived = await attendance_partitions.archive_attendance_partitions(
+            today.year - OLD_MONTH.year - 1, str(archive_dir), today=today
+        )
+
+        async with AsyncSession(engine) as session:
+            repo = AttendancePartitionRepository(session)
+            months = await repo.get_partition_months()
+            in_default = (await session.execute(text(f"SELECT count(*) FROM {DEFAULT_PARTITION}"))).scalar()
+            member_repo = MemberRepository(session)
+            without_archive = await _history(member_repo, member_id, include_archived=False)
+            with_archive = await _history(member_repo, member_id, include_archived=True)
+
+        return live, created, archived, months, in_default, without_archive, with_archive
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(delete(AttendanceArchiveModel).where(AttendanceArchiveModel.month == OLD_MONTH))
+
+
+def test_archived_month_is_read_back_in_history(db_engine, seeded_church, monkeypatch, tmp_path):
+    """Test: El mes archivado sale de la tabla y vuelve al historial con include_archived, con el mismo orden"""
+    live, created, archived, months, in_default, without_archive, with_archive = asyncio.run(
+        _scenario(db_engine, seeded_church(MEMBERS, weeks=4), monkeypatch, tmp_path)
+    )
+    current = month_start(date.today())
+
+    assert OLD_MONTH in created
+    assert archived == [(OLD_MONTH, 4)]
+    assert (tmp_path / "2001" / "attendance_records_2001_01.parquet").exists()
+    assert OLD_MONTH not in months
+    assert {add_months(current, i) for i in range(3)} <= set(months)
+    assert in_default == 0
+
+    assert with_archive == live
+    assert without_archive == [row for row in live if row[0] >= add_months(OLD_MONTH, 1)]
+    assert len(live) - len(without_archive) == 4
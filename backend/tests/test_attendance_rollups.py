@@ -0,0 +1,84 @@
+"""
+Agregados semanales de asistencia contra una reconstrucción completa
+
+Siembra una iglesia, registra asistencias por el camino individual y el
+masivo (semanas distintas, presentes y ausentes) y compara los agregados
+mantenidos en cada registro con los que deja rebuild desde
+attendance_records.
+
+Necesita un PostgreSQL descartable (el mismo de test_query_plans):
+    QUERY_PLAN_DATABASE_URL=postgresql+asyncpg://... pytest tests/test_attendance_rollups.py
+"""
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.schemas.member import AttendanceRecordCreate
+from app.infrastructure.database.models.attendance_rollup import AttendanceWeeklyRollupModel
+from app.infrastructure.database.models.member import MemberModel
+from app.infrastructure.repositories.attendance_rollup_repository import AttendanceRollupRepository, week_start
+from app.infrastructure.repositories.member_repository import MemberRepository
+
+pytestmark = pytest.mark.database
+
+MEMBERS = 40
+
+
+async def _rollups(session, church_id):
+    result = await session.execute(
+        select(
+            AttendanceWeeklyRollupModel.event_type,
+            AttendanceWeeklyRollupModel.week_start,
+            AttendanceWeeklyRollupModel.records,
+            AttendanceWeeklyRollupModel.attended
+        ).where(AttendanceWeeklyRollupModel.church_id == church_id)
+    )
+    return {(row.event_type, row.week_start): (row.records, row.attended) for row in result}
+
+
+async def _scenario(engine, church_id):
+    today = date.today()
+
+    async with AsyncSession(engine) as session:
+        repo = MemberRepository(session)
+        member_ids = list((await session.execute(
+            select(MemberModel.id).where(MemberModel.church_id == church_id).order_by(MemberModel.id)
+        )).scalars())
+        for i, member_id in enumerate(member_ids[:6]):
+            await repo.record_attendance(AttendanceRecordCreate(
+                member_id=member_id, church_id=church_id, event_type="celula",
+                event_date=today - timedelta(days=7 * (i % 2)), attended=i % 3 != 0
+            ))
+        for weeks_ago in (0, 3):
+            await repo.record_attendance_bulk(
+                church_id, "reunion_jovenes", today - timedelta(weeks=weeks_ago),
+                {member_id: i % 4 != 0 for i, member_id in enumerate(member_ids[10:30])}, today=today
+            )
+            await repo.reconcile_stats_snapshot(church_id)
+
+        maintained = await _rollups(session, church_id)
+        rollups = AttendanceRollupRepository(session)
+        weekly = await rollups.get_weekly(church_id, today - timedelta(weeks=3), today, "reunion_jovenes")
+        await rollups.rebuild(church_id)
+        await session.commit()
+        rebuilt = await _rollups(session, church_id)
+
+    return maintained, rebuilt, weekly
+
+
+def test_maintained_rollups_match_rebuild(db_engine, seeded_church):
+    """Test: Los agregados mantenidos por los registros coinciden con una reconstrucción completa"""
+    church_id = seeded_church(MEMBERS, weeks=8, rate=0.6)
+    maintained, rebuilt, weekly = asyncio.run(_scenario(db_engine, church_id))
+    this_week = week_start(date.today())
+
+    assert maintained == rebuilt
+    assert maintained[("celula", this_week)] == (3, 2)
+    assert [(row.week_start, row.records, row.attended) for row in weekly] == [
+        (this_week - timedelta(weeks=3), 20, 15),
+        (this_week, 20, 15),
+    ]
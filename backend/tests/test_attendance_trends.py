@@ -0,0 +1,112 @@
+"""
+Paridad entre attendance_trend_query y analyze_member_trend
+
+Siembra una iglesia con asistencia semanal más registros sueltos (otros
+eventos, attended NULL) y compara, miembro por miembro, las mitades, tasas
+móviles y rachas de la consulta contra el cálculo en Python sobre el mismo
+historial ordenado por (event_date, id).
+
+Necesita un PostgreSQL descartable (el mismo de test_query_plans):
+    QUERY_PLAN_DATABASE_URL=postgresql+asyncpg://... pytest tests/test_attendance_trends.py
+"""
+import asyncio
+from datetime import date, timedelta
+from itertools import groupby
+
+import pytest
+
+from sqlalchemy import and_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.services.member_ai_service import MemberAIService
+from app.infrastructure.database.models.member import AttendanceRecordModel, MemberModel
+from app.infrastructure.repositories.member_repository import MemberRepository
+
+pytestmark = pytest.mark.database
+
+MEMBERS = 300
+WEEKS = 30
+
+
+def _streaks(attended):
+    """(racha actual, asistió en la racha actual, racha de asistencia más larga)"""
+    runs = [(value, len(list(group))) for value, group in groupby(attended)]
+    longest = max((length for value, length in runs if value), default=0)
+    return runs[-1][1], runs[-1][0], longest
+
+
+def _rate(attended):
+    return sum(attended) / len(attended) * 100 if attended else None
+
+
+async def _compare(engine, church_id):
+    today = date.today()
+    since = today - timedelta(weeks=26)
+
+    async with engine.begin() as conn:
+        # Eventos extra el mismo día (desempate por id) y attended NULL
+        await conn.execute(
+            text("""
+                INSERT INTO attendance_records (id, member_id, church_id, event_type, event_date, attended, created_at)
+                SELECT gen_random_uuid(), m.id, m.church_id, 'reunion', CAST(:today AS date) - (random() * 200)::int,
+                       CASE WHEN random() < 0.1 THEN NULL ELSE random() < 0.5 END, now()
+                FROM members m CROSS JOIN generate_series(1, 5)
+                WHERE m.church_id = :church_id AND random() < 0.7
+            """),
+            {"church_id": church_id, "today": today}
+        )
+        # Un miembro sin registros en la ventana
+        without_records = (await conn.execute(
+            text("SELECT id FROM members WHERE church_id = :c ORDER BY id LIMIT 1"), {"c": church_id}
+        )).scalar()
+        await conn.execute(text("DELETE FROM attendance_records WHERE member_id = :m"), {"m": without_records})
+
+    async with AsyncSession(engine) as session:
+        repo = MemberRepository(session)
+        rows = await repo.get_attendance_trends(church_id, since, today, limit=MEMBERS)
+        history = (await session.execute(
+            select(AttendanceRecordModel.member_id, AttendanceRecordModel.event_date, AttendanceRecordModel.attended)
+            .where(
+                and_(
+                    AttendanceRecordModel.church_id == church_id,
+                    AttendanceRecordModel.event_date > since,
+                    AttendanceRecordModel.event_date <= today
+                )
+            )
+            .order_by(AttendanceRecordModel.member_id, AttendanceRecordModel.event_date, AttendanceRecordModel.id)
+        )).all()
+        active = set((await session.execute(
+            select(MemberModel.id).where(and_(MemberModel.church_id == church_id, MemberModel.member_status == "active"))
+        )).scalars())
+        empty = await repo.get_member_attendance_trend(church_id, without_records, since, today)
+
+    history = {key: list(group) for key, group in groupby(history, key=lambda r: r.member_id)}
+    return today, rows, history, active, empty
+
+
+def test_trend_query_matches_python(db_engine, seeded_church):
+    """Test: Mitades, tasas de 4/8/12 semanas y rachas coinciden con el cálculo en Python"""
+    church_id = seeded_church(MEMBERS, weeks=WEEKS, rate=0.6)
+    today, rows, history, active, empty = asyncio.run(_compare(db_engine, church_id))
+
+    assert {row.member_id for row in rows} == {
+        member_id for member_id, records in history.items() if member_id in active and len(records) >= 4
+    }
+    changes = [row.change for row in rows]
+    assert changes == sorted(changes)
+
+    for row in rows:
+        records = history[row.member_id]
+        attended = [bool(r.attended) for r in records]
+        expected = MemberAIService.analyze_member_trend(None, records)
+
+        assert row.records == len(records)
+        assert round(row.first_half_rate, 1) == expected["first_half_rate"]
+        assert round(row.second_half_rate, 1) == expected["second_half_rate"]
+        assert round(row.change, 1) == expected["commitment_change"]
+        for weeks in (4, 8, 12):
+            recent = [bool(r.attended) for r in records if r.event_date > today - timedelta(weeks=weeks)]
+            assert row._mapping[f"rate_{weeks}_weeks"] == pytest.approx(_rate(recent))
+        assert (row.current_streak, row.current_streak_attended, row.longest_attended_streak) == _streaks(attended)
+
+    assert empty.records == 0 and empty.first_half_rate is None
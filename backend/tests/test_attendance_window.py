@@ -0,0 +1,108 @@
+"""
+Contadores de la ventana de asistencia contra un recuento completo
+
+Siembra una iglesia con historial semanal, fija la última corrida de la
+ventana una semana atrás y registra asistencias por el camino individual y
+el masivo: los contadores y attendance_rate coinciden con el recuento. Al
+avanzar la ventana hasta hoy (expire_attendance_windows) siguen
+coincidiendo con el recuento de los últimos 90 días.
+
+Necesita un PostgreSQL descartable (el mismo de test_query_plans):
+    QUERY_PLAN_DATABASE_URL=postgresql+asyncpg://... pytest tests/test_attendance_window.py
+"""
+import asyncio
+from datetime import date, timedelta
+from typing import Optional
+
+import pytest
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.domain.schemas.member import AttendanceRecordCreate
+from app.infrastructure.database.models.member import MemberModel
+from app.infrastructure.database.models.scheduler_state import SchedulerStateModel
+from app.infrastructure.jobs import attendance_window
+from app.infrastructure.repositories.member_repository import MemberRepository, ATTENDANCE_WINDOW_SCHEDULER
+
+pytestmark = pytest.mark.database
+
+MEMBERS = 60
+
+
+async def _set_last_run(engine, last_run: Optional[date]) -> None:
+    async with engine.begin() as conn:
+        if last_run is None:
+            await conn.execute(
+                delete(SchedulerStateModel).where(SchedulerStateModel.name == ATTENDANCE_WINDOW_SCHEDULER)
+            )
+        else:
+            await conn.execute(
+                insert(SchedulerStateModel)
+                .values(name=ATTENDANCE_WINDOW_SCHEDULER, last_run_date=last_run)
+                .on_conflict_do_update(index_elements=[SchedulerStateModel.name], set_={"last_run_date": last_run})
+            )
+
+
+@pytest.fixture
+def window_ran_last_week(db_engine):
+    """La ventana corrió hace una semana; va antes de sembrar porque la siembra cuenta sobre ella"""
+    asyncio.run(_set_last_run(db_engine, date.today() - timedelta(days=7)))
+    yield
+    asyncio.run(_set_last_run(db_engine, None))
+
+
+async def _scenario(engine, church_id, monkeypatch):
+    today = date.today()
+    # El job abre sus propias sesiones: que usen esta base
+    monkeypatch.setattr(attendance_window, "AsyncSessionLocal", async_sessionmaker(engine, expire_on_commit=False))
+
+    async with AsyncSession(engine) as session:
+        repo = MemberRepository(session)
+        # Los contadores sembrados ya coinciden; attendance_rate no
+        window_start = await repo.get_attendance_window_start(church_id)
+        seeded = await repo.check_attendance_counters(church_id, window_start)
+        await repo.repair_attendance_counters(church_id, seeded, window_start, today)
+        await repo.reconcile_stats_snapshot(church_id)
+
+        member_ids = list((await session.execute(
+            select(MemberModel.id).where(MemberModel.church_id == church_id).order_by(MemberModel.id)
+        )).scalars())
+        for i, member_id in enumerate(member_ids[:10]):
+            await repo.record_attendance(AttendanceRecordCreate(
+                member_id=member_id, church_id=church_id, event_type="celula",
+                event_date=today - timedelta(days=95 if i % 3 == 0 else 1), attended=i % 2 == 0
+            ))
+        await repo.record_attendance_bulk(
+            church_id, "reunion_jovenes", today,
+            {member_id: i % 4 != 0 for i, member_id in enumerate(member_ids[5:40])}, today=today
+        )
+        await repo.reconcile_stats_snapshot(church_id)
+        after_checkins = await repo.check_attendance_counters(church_id, window_start)
+
+    expired = await attendance_window.expire_attendance_windows(today)
+
+    async with AsyncSession(engine) as session:
+        repo = MemberRepository(session)
+        new_start = await repo.get_attendance_window_start(church_id)
+        after_expiry = await repo.check_attendance_counters(church_id, new_start)
+
+    return seeded, after_checkins, expired, new_start, after_expiry
+
+
+def test_counters_match_full_recount(db_engine, window_ran_last_week, seeded_church, monkeypatch):
+    """Test: Contadores iguales al recuento tras registros individuales, masivos y el avance de la ventana"""
+    church_id = seeded_church(MEMBERS, weeks=20, rate=0.6)
+    seeded, after_checkins, expired, new_start, after_expiry = asyncio.run(
+        _scenario(db_engine, church_id, monkeypatch)
+    )
+
+    assert all(
+        (row.attendance_window_total, row.attendance_window_attended) == (row.expected_total, row.expected_attended)
+        for row in seeded
+    )
+    assert after_checkins == []
+    assert new_start == date.today() - timedelta(days=90)
+    assert expired > 0
+    assert after_expiry == []
@@ -0,0 +1,37 @@
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.domain.schemas.background_job import BackgroundJobResponse
+
+
+def _job(**overrides):
+    started = datetime(2026, 10, 17, 12, 0, 0)
+    job = dict(
+        id=uuid.uuid4(), church_id=uuid.uuid4(), job_type="recalculate_members", status="running",
+        total=10_000, processed=2_500, updated=2_490, failed=10, errors=[],
+        created_at=started, started_at=started, heartbeat_at=started + timedelta(seconds=5), finished_at=None
+    )
+    job.update(overrides)
+    return SimpleNamespace(**job)
+
+
+def test_job_progress_and_eta():
+    """Test: Progreso, miembros por segundo y tiempo restante de un trabajo en curso"""
+    job = _job()
+    response = BackgroundJobResponse.from_job(job, now=job.started_at + timedelta(seconds=10))
+
+    assert response.progress_percent == 25.0
+    assert response.throughput_per_second == 250.0
+    assert response.eta_seconds == 30.0
+
+
+def test_finished_job_has_no_eta():
+    """Test: Un trabajo terminado usa finished_at para el throughput y no estima tiempo restante"""
+    started = datetime(2026, 10, 17, 12, 0, 0)
+    job = _job(status="completed", processed=10_000, finished_at=started + timedelta(seconds=20))
+    response = BackgroundJobResponse.from_job(job, now=started + timedelta(hours=1))
+
+    assert response.progress_percent == 100.0
+    assert response.throughput_per_second == 500.0
+    assert response.eta_seconds is None
@@ -0,0 +1,28 @@
+from datetime import date
+
+from app.domain.services.celebrations import celebration_ranges, month_day, next_occurrence
+from app.domain.services.member_ai_service import MemberAIService
+
+
+def test_leap_day_birthday_in_common_years():
+    """Test: Un 29/2 se celebra el 28/2 en años no bisiestos y no rompe el cálculo"""
+    leap_day = date(2000, 2, 29)
+
+    assert next_occurrence(leap_day, date(2027, 2, 1)) == date(2027, 2, 28)
+    assert next_occurrence(leap_day, date(2027, 3, 1)) == date(2028, 2, 29)
+    assert next_occurrence(leap_day, date(2028, 2, 29)) == date(2028, 2, 29)
+    assert 0 <= MemberAIService._days_until_next_birthday(leap_day) <= 366
+
+
+def test_ranges_wrap_year_and_cover_leap_day():
+    """Test: La ventana que cruza el fin de año se parte y la que termina el 28/2 incluye el 29/2"""
+    assert celebration_ranges(date(2026, 12, 28), 7) == [(1228, 1231), (101, 104)]
+    assert celebration_ranges(date(2027, 2, 21), 7) == [(221, 229)]
+    assert celebration_ranges(date(2028, 2, 21), 7) == [(221, 228)]
+
+    # Toda fecha de la ventana cae en algún rango
+    today = date(2026, 12, 20)
+    ranges = celebration_ranges(today, 30)
+    for offset in range(31):
+        day = date.fromordinal(today.toordinal() + offset)
+        assert any(first <= month_day(day) <= last for first, last in ranges)
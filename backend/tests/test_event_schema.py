@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from app.domain.schemas.event import EventCreate
+
+
+def test_aware_starts_at_is_stored_as_naive_utc():
+    """Test: Un starts_at con offset se convierte a UTC sin zona (la columna es TIMESTAMP)"""
+    event = EventCreate(event_type="culto", name="Vigilia", starts_at="2026-04-04T20:00:00-03:00")
+
+    assert event.starts_at == datetime(2026, 4, 4, 23, 0)
+    assert event.starts_at.tzinfo is None
+
+
+def test_naive_starts_at_is_kept():
+    """Test: Un starts_at sin zona se guarda tal cual"""
+    event = EventCreate(event_type="culto", name="Vigilia", starts_at=datetime(2026, 4, 4, 20, 0))
+
+    assert event.starts_at == datetime(2026, 4, 4, 20, 0)
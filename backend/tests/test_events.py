@@ -0,0 +1,128 @@
+"""
+Totales de asistencia mantenidos en los eventos contra un recuento
+
+Siembra una iglesia (con sus cultos semanales), crea un evento y registra
+asistencias por el camino individual y el masivo, con event_id y sin él
+(evento del día creado al vuelo), y compara records/headcount de cada
+evento con un recuento de attendance_records. Un registro repetido, aunque
+llegue en paralelo, no se inserta ni se cuenta.
+
+Necesita un PostgreSQL descartable (el mismo de test_query_plans):
+    QUERY_PLAN_DATABASE_URL=postgresql+asyncpg://... pytest tests/test_events.py
+"""
+import asyncio
+from datetime import date, datetime, time
+
+import pytest
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.schemas.member import AttendanceRecordCreate
+from app.infrastructure.database.models.event import EventModel
+from app.infrastructure.database.models.member import AttendanceRecordModel, MemberModel
+from app.infrastructure.repositories.event_repository import EventRepository
+from app.infrastructure.repositories.member_repository import MemberRepository
+
+pytestmark = pytest.mark.database
+
+MEMBERS = 30
+
+
+async def _totals(session, church_id):
+    """{evento: ((records, headcount) mantenidos, (records, headcount) recontados)}"""
+    counted = (
+        select(
+            AttendanceRecordModel.event_id,
+            func.count().label("records"),
+            func.count().filter(AttendanceRecordModel.attended.is_(True)).label("headcount")
+        )
+        .where(AttendanceRecordModel.church_id == church_id)
+        .group_by(AttendanceRecordModel.event_id)
+        .subquery()
+    )
+    result = await session.execute(
+        select(EventModel.id, EventModel.records, EventModel.headcount, counted.c.records, counted.c.headcount)
+        .outerjoin(counted, counted.c.event_id == EventModel.id)
+        .where(EventModel.church_id == church_id)
+    )
+    return {row[0]: ((row[1], row[2]), (row[3] or 0, row[4] or 0)) for row in result}
+
+
+async def _scenario(engine, church_id):
+    today = date.today()
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        repo = MemberRepository(session)
+        events = EventRepository(session)
+        member_ids = list((await session.execute(
+            select(MemberModel.id).where(MemberModel.church_id == church_id).order_by(MemberModel.id)
+        )).scalars())
+
+        easter = await events.create(
+            church_id, "culto", "Vigilia de Pascua", datetime.combine(today, time(20, 0)), recurrence="yearly"
+        )
+        await session.commit()
+
+        for i, member_id in enumerate(member_ids[:5]):
+            await repo.record_attendance(AttendanceRecordCreate(
+                member_id=member_id, church_id=church_id, event_id=easter.id, event_type=easter.event_type,
+                event_name=easter.name, event_date=today, attended=i != 0
+            ))
+        for member_id in member_ids[5:8]:
+            await repo.record_attendance(AttendanceRecordCreate(
+                member_id=member_id, church_id=church_id, event_type="celula", event_date=today
+            ))
+
+        # Los primeros cinco ya están registrados en la vigilia: no se duplican
+        await repo.record_attendance_bulk(
+            church_id, easter.event_type, today,
+            {member_id: i % 3 != 0 for i, member_id in enumerate(member_ids[:15])},
+            event_name=easter.name, today=today, event_id=easter.id
+        )
+        await repo.reconcile_stats_snapshot(church_id)
+        await repo.record_attendance_bulk(church_id, "celula", today, dict.fromkeys(member_ids[8:12], True), today=today)
+        await repo.reconcile_stats_snapshot(church_id)
+
+        duplicate = await repo.record_attendance(AttendanceRecordCreate(
+            member_id=member_ids[0], church_id=church_id, event_id=easter.id, event_type=easter.event_type,
+            event_name=easter.name, event_date=today
+        ))
+
+        # Dos registros masivos simultáneos de los mismos miembros: uno solo inserta cada fila
+        async def concurrent_bulk():
+            async with AsyncSession(engine, expire_on_commit=False) as other:
+                recorded, _ = await MemberRepository(other).record_attendance_bulk(
+                    church_id, "celula", today, dict.fromkeys(member_ids[12:20], True), today=today
+                )
+                await other.commit()
+                return len(recorded)
+        concurrent = await asyncio.gather(concurrent_bulk(), concurrent_bulk())
+
+        totals = await _totals(session, church_id)
+        cell_events = await events.get_events(church_id, today, today, event_type="celula")
+        await session.refresh(easter)
+        attendees = await events.get_attendees(easter, attended_only=True)
+
+    return member_ids, easter, totals, cell_events, attendees, duplicate, concurrent
+
+
+def test_event_headcounts_match_recount(db_engine, seeded_church):
+    """Test: records/headcount de cada evento coinciden con sus registros, con y sin event_id"""
+    member_ids, easter, totals, cell_events, attendees, duplicate, concurrent = asyncio.run(
+        _scenario(db_engine, seeded_church(MEMBERS, weeks=3))
+    )
+
+    assert all(maintained == counted for maintained, counted in totals.values())
+    # Tres cultos sembrados, la vigilia y una sola célula para los dos caminos
+    assert len(totals) == 5
+
+    expected_present = set(member_ids[1:5]) | {member_id for i, member_id in enumerate(member_ids[5:15], 5) if i % 3 != 0}
+    assert (easter.records, easter.headcount) == (15, len(expected_present))
+    assert {row.member_id for row in attendees} == expected_present
+
+    assert len(cell_events) == 1
+    assert (cell_events[0].name, cell_events[0].records, cell_events[0].headcount) == ("celula", 15, 15)
+
+    assert duplicate is None
+    assert sorted(concurrent) == [0, 8]
@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+from app.domain.services.member_ai_service import MemberAIService
+from app.infrastructure.cache import InMemoryCacheBackend
+from app.infrastructure.external.llm_client import LLMClient
+from app.infrastructure.external.openai_service import OpenAIService
+from benchmarks.bench_llm_insights import church_members
+
+
+class FakeTransport:
+    """Responde un texto por miembro del prompt; cuenta requests y concurrencia"""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.batches = []
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, messages):
+        members = json.loads(messages[-1]["content"])["members"]
+        self.batches.append(len(members))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return json.dumps({"insights": [{"id": m["id"], "text": f"llm {m['nombre']}"} for m in members]})
+
+
+def _service(transport, **kwargs) -> OpenAIService:
+    return OpenAIService(LLMClient(transport, InMemoryCacheBackend(), "fake", **kwargs))
+
+
+def test_batches_coalescing_and_cache():
+    """Test: Lotes de batch_size, duplicados concurrentes coalescidos y segunda pasada desde cache"""
+    transport = FakeTransport()
+    service = _service(transport, max_concurrency=2, batch_size=10)
+    members = church_members(25)
+
+    async def scenario():
+        first, duplicate = await asyncio.gather(
+            service.generate_member_insights(members),
+            service.generate_member_insights(members)
+        )
+        cached = await service.generate_member_insights(members)
+        return first, duplicate, cached
+
+    first, duplicate, cached = asyncio.run(scenario())
+
+    assert transport.batches == [10, 10, 5]
+    assert transport.max_active <= 2
+    assert first == duplicate == cached == [f"llm {member.first_name}" for member in members]
+    metrics = service.metrics()
+    assert metrics["coalesced"] == 25
+    assert metrics["cache_hits"] == 25
+
+
+def test_timeout_falls_back_to_template():
+    """Test: Si el LLM no responde a tiempo se usa la plantilla y no se cachea"""
+    transport = FakeTransport(delay=0.5)
+    service = _service(transport, timeout=0.05)
+    members = church_members(3)
+
+    async def scenario():
+        texts = await service.generate_member_insights(members)
+        transport.delay = 0
+        return texts, await service.generate_member_insights(members)
+
+    texts, retried = asyncio.run(scenario())
+
+    assert texts == [MemberAIService.generate_ai_insights(member) for member in members]
+    assert retried == [f"llm {member.first_name}" for member in members]
+    assert service.metrics()["timeouts"] == 1
@@ -0,0 +1,50 @@
+import json
+import uuid
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from app.domain.services import member_insights
+from app.domain.services.member_insights import cached_insights, compute_insights, insights_cache_metrics
+
+TODAY = date(2026, 10, 17)
+
+
+def _member(**overrides):
+    member = dict(
+        id=uuid.uuid4(), first_name="Lucía", last_name="Pérez", member_type="activo",
+        membership_date=TODAY - timedelta(days=800), birth_date=date(1990, 10, 20),
+        preferred_contact_method="whatsapp", attendance_rate=75.0, last_attendance=TODAY - timedelta(days=25),
+        commitment_score=45.0, risk_level="medio", ministries=[], spiritual_gifts=["musica"],
+        skills=["diseño gráfico"], small_group_id=None, small_group_role=None, ai_notes=None
+    )
+    member.update(overrides)
+    return SimpleNamespace(**member)
+
+
+def test_stored_bundle_is_served_until_inputs_change():
+    """Test: ai_notes se sirve mientras la huella coincide; cambiar una entrada, el día o la versión recalcula"""
+    member = _member()
+    before = insights_cache_metrics()
+
+    bundle, computed = cached_insights(member, TODAY)
+    assert computed
+    # ai_notes es JSON: el paquete guardado vuelve sin tipos de Python
+    member.ai_notes = json.loads(json.dumps(bundle))
+
+    served, computed = cached_insights(member, TODAY)
+    assert not computed and served == member.ai_notes
+    assert served == compute_insights(member, TODAY)
+
+    assert cached_insights(member, TODAY + timedelta(days=1))[1]
+    assert cached_insights(_member(**{**vars(member), "ministries": ["alabanza"]}), TODAY)[1]
+
+    original = member_insights.INSIGHTS_RULES_VERSION
+    member_insights.INSIGHTS_RULES_VERSION = original + 1
+    try:
+        assert cached_insights(member, TODAY)[1]
+    finally:
+        member_insights.INSIGHTS_RULES_VERSION = original
+
+    after = insights_cache_metrics()
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 4
@@ -0,0 +1,140 @@
+import itertools
+import uuid
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.domain.services.member_ai_service import MemberAIService
+from app.domain.services.member_scoring import (
+    MemberScoringColumns, RISK_LEVELS, abandonment_risk, factor_names, next_score_change, score_members,
+    shadow_evaluate
+)
+from app.domain.services.scoring_rules import DEFAULT_RULES
+
+# Valores justo antes, en y después de cada umbral de los escalones if/elif
+DAYS_SINCE_LAST = [None, 0, 6, 7, 13, 14, 15, 20, 21, 22, 29, 30, 31, 59, 60, 61, 400]
+ATTENDANCE_RATES = [None, 0.0, 19.9, 20.0, 39.9, 40.0, 59.9, 60.0, 79.9, 80.0, 100.0]
+STORED_SCORES = [0.0, 29.9, 30.0, 49.9, 50.0, 100.0]
+DAYS_AS_MEMBER = [None, 90, 91]
+
+# Candidata con umbrales dentro de la grilla de arriba y puntos distintos
+CANDIDATE_RULES = DEFAULT_RULES.derive(
+    version=2,
+    attendance_points=((79.9, 35), (40, 30), (19.9, 15), (0, 5)),
+    recent_attendance_points=((14, 25), (30, 5)),
+    absence_risk=((59, 30), (29, 20), (20, 12), (13, 8)),
+    low_attendance_risk=((19.9, 30), (59.9, 20), (80, 5)),
+    low_commitment_risk=((49.9, 20), (50, 5)),
+    stalled_visitor_days=89,
+    risk_level_thresholds=(75, 45, 25),
+)
+
+
+def _members():
+    today = date.today()
+    for days, rate, ministries, group, gifts, role, score, member_type, membership in itertools.product(
+        DAYS_SINCE_LAST, ATTENDANCE_RATES, (0, 1, 2), (False, True), (False, True),
+        (None, "lider", "miembro"), STORED_SCORES, ("visitante", "activo"), DAYS_AS_MEMBER
+    ):
+        yield SimpleNamespace(
+            last_attendance=today - timedelta(days=days) if days is not None else None,
+            attendance_rate=rate,
+            ministries=["alabanza", "jovenes"][:ministries] if ministries else None,
+            small_group_id=uuid.uuid4() if group else None,
+            spiritual_gifts=["servicio"] if gifts else [],
+            small_group_role=role,
+            commitment_score=score,
+            member_type=member_type,
+            membership_date=today - timedelta(days=membership) if membership is not None else None,
+        )
+
+
+@pytest.mark.parametrize("rules", [DEFAULT_RULES, CANDIDATE_RULES], ids=["default", "candidate"])
+def test_batch_scoring_matches_scalar_path(rules):
+    """Test: El scoring vectorizado es idéntico al escalar en todas las combinaciones de umbrales"""
+    members = list(_members())
+    today = date.today()
+    columns = MemberScoringColumns.from_members(members)
+
+    # detect_abandonment_risk con el score guardado
+    risk_score, risk_level, risk_factors = abandonment_risk(columns, today, rules=rules)
+    for i, member in enumerate(members):
+        expected = MemberAIService.detect_abandonment_risk(member, rules)
+        assert RISK_LEVELS[risk_level[i]] == expected["level"]
+        assert risk_score[i] == expected["score"]
+        assert factor_names(int(risk_factors[i])) == expected["factors"]
+
+    # Flujo de los endpoints: score nuevo y riesgo con ese score
+    result = MemberAIService.score_batch(columns, today, rules)
+    levels = result.level_names()
+    for i, member in enumerate(members):
+        member.commitment_score = MemberAIService.calculate_commitment_score(member, rules=rules)
+        expected = MemberAIService.detect_abandonment_risk(member, rules)
+        assert result.commitment_score[i] == member.commitment_score
+        assert levels[i] == expected["level"]
+        assert result.risk_score[i] == expected["score"]
+        assert factor_names(int(result.risk_factors[i])) == expected["factors"]
+
+
+def test_batch_scoring_empty():
+    """Test: Una iglesia sin miembros da arreglos vacíos"""
+    result = MemberAIService.score_batch(MemberScoringColumns.from_members([]))
+
+    assert len(result.commitment_score) == 0
+    assert result.risk_level.dtype == np.int8
+
+
+def test_scores_change_only_on_boundary_dates():
+    """Test: Día a día, el scoring sólo cambia en la fecha que indica next_score_change"""
+    start = date.today()
+    members = [
+        member for member in _members()
+        if member.commitment_score == 0.0 and member.small_group_role != "miembro"
+    ]
+    columns = MemberScoringColumns.from_members(members)
+
+    previous = score_members(columns, start)
+    for day in range(1, 130):
+        today = start + timedelta(days=day)
+        current = score_members(columns, today)
+        changed = (
+            (current.commitment_score != previous.commitment_score)
+            | (current.risk_level != previous.risk_level)
+        )
+        for i in np.flatnonzero(changed):
+            member = members[i]
+            boundary = next_score_change(
+                member.last_attendance, member.membership_date, member.member_type, today - timedelta(days=1)
+            )
+            assert boundary == today, (member, today)
+        previous = current
+
+
+def test_shadow_evaluation_matches_separate_scoring():
+    """Test: La evaluación en sombra da lo mismo que puntuar con cada versión por separado"""
+    today = date.today()
+    columns = MemberScoringColumns.from_members(list(_members()))
+
+    evaluation = shadow_evaluate(columns, DEFAULT_RULES, CANDIDATE_RULES, today)
+    current = score_members(columns, today, DEFAULT_RULES)
+    candidate = score_members(columns, today, CANDIDATE_RULES)
+
+    assert np.array_equal(evaluation.current.risk_level, current.risk_level)
+    assert np.array_equal(evaluation.candidate.risk_level, candidate.risk_level)
+    assert np.array_equal(evaluation.candidate.commitment_score, candidate.commitment_score)
+    assert np.array_equal(evaluation.level_changed, np.flatnonzero(current.risk_level != candidate.risk_level))
+
+    transitions = evaluation.transitions()
+    assert sum(n for row in transitions.values() for n in row.values()) == len(columns)
+    moved = sum(n for level, row in transitions.items() for to, n in row.items() if to != level)
+    assert moved == len(evaluation.level_changed) > 0
+
+
+def test_rules_reject_non_monotonic_tiers():
+    """Test: Un escalón con umbrales fuera de orden no equivale al if/elif y se rechaza"""
+    with pytest.raises(ValueError):
+        DEFAULT_RULES.derive(version=3, attendance_points=((60, 30), (80, 40), (40, 20), (20, 10)))
+    with pytest.raises(ValueError):
+        DEFAULT_RULES.derive(version=3, absence_risk=((60, 35), (30, 25)))
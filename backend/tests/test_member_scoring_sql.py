@@ -0,0 +1,241 @@
+"""
+Paridad entre las reglas de MemberAIService en Python y su versión SQL
+
+Siembra una iglesia con entradas de scoring aleatorias (con mucho peso en los
+umbrales de cada escalón), recalcula con MemberRepository.rescore_church y
+compara fila por fila contra el camino escalar, con las reglas por defecto y
+con una versión fijada por la iglesia. Todo dentro de una transacción que se
+revierte.
+
+Necesita un PostgreSQL descartable (el mismo de test_query_plans):
+    QUERY_PLAN_DATABASE_URL=postgresql+asyncpg://... pytest tests/test_member_scoring_sql.py
+"""
+import asyncio
+import random
+import uuid
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.schemas.member import AttendanceRecordCreate
+from app.domain.services.member_ai_service import MemberAIService
+from app.infrastructure.database.models.member import MemberModel
+from app.infrastructure.database.models.member_stats import ChurchMemberStatsModel
+from app.infrastructure.repositories.member_repository import MemberRepository, SCORE_INPUT_COLUMNS
+from app.infrastructure.repositories.member_scoring_sql import commitment_score_expr, risk_score_expr
+from app.domain.services.scoring_rules import DEFAULT_RULES, register_rules
+
+pytestmark = pytest.mark.database
+
+MEMBERS = 3000
+
+DAYS = [0, 6, 7, 13, 14, 15, 20, 21, 22, 29, 30, 31, 59, 60, 61, 89, 90, 91]
+RATES = [0.0, 19.9, 20.0, 39.9, 40.0, 59.9, 60.0, 79.9, 80.0, 100.0]
+SCORES = [0.0, 29.9, 30.0, 49.9, 50.0, 100.0]
+
+# Versión de prueba con todos los umbrales y puntos movidos
+TUNED_RULES = register_rules(DEFAULT_RULES.derive(
+    version=9001,
+    description="tests/test_member_scoring_sql.py",
+    attendance_points=((75, 45), (50, 25), (25, 10), (10, 5)),
+    many_ministries_points=25,
+    recent_attendance_points=((10, 25), (20, 10), (45, 5)),
+    absence_risk=((90, 40), (45, 20), (20, 12), (7, 5)),
+    no_attendance_risk=30,
+    low_attendance_risk=((15, 30), (35, 20), (50, 5)),
+    low_commitment_risk=((35, 20), (55, 5)),
+    stalled_visitor_days=60,
+    risk_level_thresholds=(65, 45, 25),
+))
+
+
+def _pick(rng, boundaries, low, high, null_ratio=0.1):
+    roll = rng.random()
+    if roll < null_ratio:
+        return None
+    if roll < 0.6:
+        return rng.choice(boundaries)
+    return rng.uniform(low, high)
+
+
+def _random_inputs(rng: random.Random, member_id: uuid.UUID, today: date) -> dict:
+    days = _pick(rng, DAYS, 0, 400)
+    membership = _pick(rng, DAYS, 0, 2000)
+    return {
+        "id": member_id,
+        "attendance_rate": _pick(rng, RATES, 0, 100),
+        "last_attendance": today - timedelta(days=int(days)) if days is not None else None,
+        "membership_date": today - timedelta(days=int(membership)) if membership is not None else None,
+        "ministries": rng.choice([None, [], ["alabanza"], ["alabanza", "jovenes"], ["a", "b", "c"]]),
+        "spiritual_gifts": rng.choice([None, [], ["servicio"]]),
+        "small_group_id": uuid.uuid4() if rng.random() < 0.5 else None,
+        "small_group_role": rng.choice([None, "miembro", "lider", "anfitrion"]),
+        "commitment_score": _pick(rng, SCORES, 0, 100, null_ratio=0),
+        "member_type": rng.choice(["visitante", "activo", "inactivo"]),
+    }
+
+
+async def _randomize_members(session, church_id, rng, today):
+    member_ids = (await session.execute(
+        select(MemberModel.id).where(MemberModel.church_id == church_id)
+    )).scalars().all()
+    await session.execute(
+        update(MemberModel).execution_options(synchronize_session=False),
+        [_random_inputs(rng, member_id, today) for member_id in member_ids]
+    )
+
+
+async def _check_parity(engine, church_id, rules=DEFAULT_RULES):
+    today = date.today()
+    rng = random.Random(2026)
+
+    async with engine.connect() as conn:
+        outer = await conn.begin()
+        session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+        repo = MemberRepository(session)
+
+        await _randomize_members(session, church_id, rng, today)
+        if rules is not DEFAULT_RULES:
+            await repo.set_scoring_rules_version(church_id, rules.version)
+
+        rows = (await session.execute(
+            select(*SCORE_INPUT_COLUMNS, commitment_score_expr(today, rules), risk_score_expr(today, rules=rules))
+            .where(MemberModel.church_id == church_id)
+        )).all()
+
+        expected = {}
+        for row in rows:
+            member = SimpleNamespace(**row._mapping)
+            # Riesgo con el score guardado y con el recién calculado
+            stored_risk = MemberAIService.detect_abandonment_risk(member, rules)
+            assert min(100, row[-1]) == stored_risk["score"], row
+            member.commitment_score = MemberAIService.calculate_commitment_score(member, rules=rules)
+            assert row[-2] == member.commitment_score, row
+            expected[row.id] = (
+                member.commitment_score, MemberAIService.detect_abandonment_risk(member, rules)["level"]
+            )
+
+        await repo.rescore_church(church_id, today)
+
+        actual = {
+            row.id: (row.commitment_score, row.risk_level)
+            for row in await session.execute(
+                select(MemberModel.id, MemberModel.commitment_score, MemberModel.risk_level)
+                .where(MemberModel.church_id == church_id)
+            )
+        }
+
+        changed_again = await repo.rescore_church(church_id, today)
+
+        await session.close()
+        await outer.rollback()
+
+    return expected, actual, changed_again
+
+
+@pytest.mark.parametrize("rules", [DEFAULT_RULES, TUNED_RULES], ids=["default", "pinned"])
+def test_sql_scoring_matches_python(rules, db_engine, seeded_church):
+    """Test: El UPDATE set-based produce los mismos scores y niveles que MemberAIService"""
+    expected, actual, changed_again = asyncio.run(_check_parity(db_engine, seeded_church(MEMBERS), rules))
+
+    assert len(actual) == MEMBERS
+    mismatches = {member_id: (expected[member_id], actual[member_id])
+                  for member_id in expected if expected[member_id] != actual[member_id]}
+    assert not mismatches, list(mismatches.items())[:5]
+    # Una segunda pasada no reescribe filas
+    assert changed_again == 0
+
+
+async def _simulate_days(engine, church_id, days: int):
+    """Recálculo completo el día 0 y luego sólo rescore_due día a día"""
+    start = date.today()
+    rng = random.Random(7)
+
+    stale, touched = [], []
+    async with engine.connect() as conn:
+        outer = await conn.begin()
+        session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+        repo = MemberRepository(session)
+
+        await _randomize_members(session, church_id, rng, start)
+        await repo.rescore_church(church_id, start)
+
+        for day in range(1, days + 1):
+            today = start + timedelta(days=day)
+            changed = await repo.rescore_due(today - timedelta(days=1), today)
+            touched.append(changed.get(church_id, 0))
+            # Lo que cambiaría un recálculo completo ese día (debe ser nada)
+            stale.append(await repo.rescore_church(church_id, today))
+
+        await session.close()
+        await outer.rollback()
+
+    return stale, touched
+
+
+def test_boundary_refresh_keeps_scores_exact(db_engine, seeded_church):
+    """Test: Recalcular sólo los umbrales vencidos deja los scores igual que un recálculo completo"""
+    days = 100
+    stale, touched = asyncio.run(_simulate_days(db_engine, seeded_church(MEMBERS), days))
+
+    assert stale == [0] * days
+    assert sum(touched) > 0
+    # Una fracción chica de la iglesia por día
+    assert sum(touched) / days < MEMBERS * 0.05, touched
+
+
+async def _check_in_after_absence(engine, church_id):
+    """Un miembro con 70 días sin asistir registra una asistencia por el camino individual"""
+    today = date.today()
+    scores = select(MemberModel.commitment_score, MemberModel.risk_level)
+    snapshot = select(ChurchMemberStatsModel.members_at_risk, ChurchMemberStatsModel.sum_commitment_score)
+
+    async with engine.connect() as conn:
+        outer = await conn.begin()
+        session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+        repo = MemberRepository(session)
+
+        member_id = (await session.execute(
+            select(MemberModel.id).where(MemberModel.church_id == church_id).order_by(MemberModel.id).limit(1)
+        )).scalar_one()
+        await session.execute(
+            update(MemberModel)
+            .where(MemberModel.id == member_id)
+            .values(last_attendance=today - timedelta(days=70), member_type="activo")
+            .execution_options(synchronize_session=False)
+        )
+        await repo.rescore_church(church_id, today)
+        await repo.reconcile_stats_snapshot(church_id)
+        await session.commit()
+        absent = (await session.execute(scores.where(MemberModel.id == member_id))).one()
+
+        await repo.record_attendance(AttendanceRecordCreate(
+            member_id=member_id, church_id=church_id, event_type="culto", event_date=today, attended=True
+        ))
+        checked_in = (await session.execute(scores.where(MemberModel.id == member_id))).one()
+        # Lo que cambiaría un recálculo completo (debe ser nada) y el snapshot contra un recuento
+        stale = await repo.rescore_church(church_id, today)
+        maintained = (await session.execute(snapshot.where(ChurchMemberStatsModel.church_id == church_id))).one()
+        await repo.reconcile_stats_snapshot(church_id)
+        recounted = (await session.execute(snapshot.where(ChurchMemberStatsModel.church_id == church_id))).one()
+
+        await session.close()
+        await outer.rollback()
+
+    return absent, checked_in, stale, maintained, recounted
+
+
+def test_single_check_in_rescores_member(db_engine, seeded_church):
+    """Test: record_attendance deja commitment_score y risk_level como un recálculo completo"""
+    absent, checked_in, stale, maintained, recounted = asyncio.run(
+        _check_in_after_absence(db_engine, seeded_church(20))
+    )
+
+    assert absent != checked_in
+    assert stale == 0
+    assert maintained.members_at_risk == recounted.members_at_risk
+    assert maintained.sum_commitment_score == pytest.approx(recounted.sum_commitment_score)
@@ -0,0 +1,60 @@
+import random
+from types import SimpleNamespace
+
+from app.domain.services.member_ai_service import MemberAIService
+from app.domain.services.ministry_matching import MINISTRY_MATCHER, GIFT_TO_MINISTRY
+
+GIFTS = list(GIFT_TO_MINISTRY) + ["Musica", "FE", "otro"]
+SKILLS = ["Diseño gráfico", "contabilidad y tecnologia", "cocina", "construccion civil", "educacion", "nada"]
+MINISTRIES = ["Alabanza", "jovenes", "cocina", "eventos", "REDES_SOCIALES", "finanzas"]
+
+
+def _members(count: int, seed: int = 15):
+    rng = random.Random(seed)
+    return [
+        SimpleNamespace(
+            id=i, first_name="Nombre", last_name=f"Apellido {i}",
+            spiritual_gifts=rng.choice([None, rng.sample(GIFTS, rng.randint(0, 3))]),
+            skills=rng.choice([None, rng.sample(SKILLS, rng.randint(0, 3))]),
+            ministries=rng.choice([None, rng.sample(MINISTRIES, rng.randint(0, 3))]),
+            commitment_score=rng.uniform(0, 100), attendance_rate=rng.uniform(0, 100), risk_level="bajo"
+        )
+        for i in range(count)
+    ]
+
+
+def test_suggestions_follow_gift_and_skill_rules():
+    """Test: Dones primero (85), luego habilidades por subcadena (75), sin repetir ni incluir ministerios actuales"""
+    member = SimpleNamespace(
+        spiritual_gifts=["Musica"], skills=["Diseño gráfico y tecnologia"], ministries=["ALABANZA"]
+    )
+    suggestions = MemberAIService.suggest_ministry_assignments(member)
+
+    assert suggestions == [
+        {"ministry": "coro", "reason": "Don de Musica", "fit_score": 85},
+        {"ministry": "banda", "reason": "Don de Musica", "fit_score": 85},
+        {"ministry": "redes_sociales", "reason": "Habilidad en Diseño gráfico y tecnologia", "fit_score": 75},
+        {"ministry": "creatividad", "reason": "Habilidad en Diseño gráfico y tecnologia", "fit_score": 75},
+        {"ministry": "comunicaciones", "reason": "Habilidad en Diseño gráfico y tecnologia", "fit_score": 75},
+    ]
+    assert MemberAIService.suggest_ministry_assignments(SimpleNamespace(spiritual_gifts=[], skills=["cocina"], ministries=None)) == []
+
+
+def test_candidates_match_member_suggestions():
+    """Test: El ranking por ministerio da el mismo fit_score y razón que las sugerencias de cada miembro"""
+    members = _members(2000)
+
+    for ministry in MINISTRY_MATCHER.ministries:
+        ranked = MINISTRY_MATCHER.rank_candidates(ministry, members, limit=len(members))
+        expected = {}
+        for member in members:
+            for suggestion in MINISTRY_MATCHER.suggest(member.spiritual_gifts, member.skills, member.ministries, limit=100):
+                if suggestion["ministry"] == ministry:
+                    expected[member.id] = (suggestion["fit_score"], suggestion["reason"])
+
+        assert {c["member_id"]: (c["fit_score"], c["reason"]) for c in ranked} == expected, ministry
+        keys = [(c["fit_score"], c["commitment_score"]) for c in ranked]
+        assert keys == sorted(keys, reverse=True)
+
+    top = MINISTRY_MATCHER.rank_candidates("jovenes", members, limit=10)
+    assert top == MINISTRY_MATCHER.rank_candidates("jovenes", members, limit=len(members))[:10]
@@ -0,0 +1,23 @@
+import uuid
+
+import pytest
+
+from app.core.pagination import encode_cursor, decode_cursor, InvalidCursorError
+
+
+def test_cursor_roundtrip():
+    """Test: El cursor conserva acentos y el id del miembro"""
+    member_id = uuid.uuid4()
+    token = encode_cursor("Pérez", "José", member_id)
+
+    assert "=" not in token
+    assert decode_cursor(token, size=3) == ["Pérez", "José", str(member_id)]
+
+
+def test_cursor_invalid():
+    """Test: Cursores manipulados o de otro tamaño se rechazan"""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("no-es-un-cursor", size=3)
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(encode_cursor("Pérez", "José"), size=3)
@@ -0,0 +1,578 @@
+"""
+Regresión de planes de consulta de los repositorios
+
+Siembra datos sintéticos con volumen realista (benchmarks/seed.py), ejecuta
+cada método de MemberRepository, UserRepository, ChurchRepository y
+MemberAuditRepository capturando el SQL que emite, y corre EXPLAIN sobre
+cada sentencia con los mismos parámetros (los executemany, con el primer
+juego de parámetros). Falla si una consulta hace Seq Scan
+sobre una tabla grande, si deja de usar el índice esperado o si la
+estimación de filas supera el presupuesto.
+
+Necesita un PostgreSQL descartable:
+    QUERY_PLAN_DATABASE_URL=postgresql+asyncpg://... pytest tests/test_query_plans.py
+
+Las escrituras se hacen dentro de una transacción que se revierte.
+"""
+import asyncio
+import os
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.connection import Base
+from app.infrastructure.database.repository import ChurchRepository
+from app.infrastructure.database.repositories.user_repository import UserRepository
+from app.infrastructure.database.models.user import UserStatus
+from app.api.v1.church.schemas import ChurchRegistrationRequest
+from app.domain.schemas.member_audit import MemberAuditLogCreate
+from app.domain.services.scoring_rules import CURRENT_RULES_VERSION
+from app.infrastructure.repositories.member_repository import MemberRepository
+from app.infrastructure.repositories.member_audit_repository import MemberAuditRepository
+from app.infrastructure.repositories.attendance_rollup_repository import AttendanceRollupRepository
+from app.infrastructure.repositories.attendance_partition_repository import (
+    AttendancePartitionRepository, add_months, month_start
+)
+from app.infrastructure.repositories.event_repository import EventRepository
+from app.domain.schemas.member import (
+    MemberCreate,
+    MemberUpdate,
+    MemberBulkUpdate,
+    PastoralNoteCreate,
+    AttendanceRecordCreate
+)
+from app.infrastructure.cache import ResponseCache, InMemoryCacheBackend, set_response_cache
+from benchmarks import seed
+
+pytestmark = pytest.mark.database
+
+# Volumen: CHURCHES iglesias de MEMBERS miembros; la iglesia bajo prueba es
+# una entre muchas, como en producción
+CHURCHES = int(os.getenv("QUERY_PLAN_CHURCHES", "20"))
+MEMBERS = int(os.getenv("QUERY_PLAN_MEMBERS", "2000"))
+USERS_PER_CHURCH = 50
+FILLER_CHURCHES = int(os.getenv("QUERY_PLAN_FILLER_CHURCHES", "5000"))
+# Con particiones mensuales lo que cuenta es la fracción de la iglesia dentro de
+# cada mes: en producción es una entre muchas
+ATTENDANCE_CHURCHES = int(os.getenv("QUERY_PLAN_ATTENDANCE_CHURCHES", str(CHURCHES)))
+ATTENDANCE_WEEKS = 26
+
+# Tablas donde un Seq Scan es siempre una regresión
+LARGE_TABLES = frozenset({
+    "members", "attendance_records", "pastoral_notes", "member_audit_log", "users",
+    "churches", "addresses", "contact_info", "events"
+})
+
+
+@dataclass
+class PlanCase:
+    """Un método de repositorio y lo que se espera de sus planes"""
+    name: str
+    call: Callable[[AsyncSession, Dict[str, Any]], Awaitable[Any]]
+    # Índices que deben aparecer en algún plan del método
+    indexes: FrozenSet[str] = frozenset()
+    # Filas estimadas máximas en el nodo raíz de cada sentencia
+    max_rows: int = 1
+    # Requiere pg_trgm/unaccent (búsqueda)
+    needs_search: bool = False
+    # Recorre particiones enteras a propósito (la DEFAULT, el mes que se archiva)
+    partition_scans: bool = False
+
+
+@dataclass
+class Captured:
+    statement: str
+    parameters: Any
+    plans: List[dict] = field(default_factory=list)
+
+
+def _member_case(method, *args, **kwargs):
+    async def call(session, ctx):
+        resolved = [arg(ctx) if callable(arg) else arg for arg in args]
+        resolved_kwargs = {k: v(ctx) if callable(v) else v for k, v in kwargs.items()}
+        return await getattr(MemberRepository(session), method)(*resolved, **resolved_kwargs)
+    return call
+
+
+def _repo_case(repo_class, method, *args):
+    async def call(session, ctx):
+        resolved = [arg(ctx) if callable(arg) else arg for arg in args]
+        return await getattr(repo_class(session), method)(*resolved)
+    return call
+
+
+async def _create_member(session, ctx):
+    return await MemberRepository(session).create(
+        MemberCreate(church_id=ctx["church_id"], first_name="Plan", last_name="Prueba"),
+        created_by=ctx["user_id"]
+    )
+
+
+async def _second_page(session, ctx):
+    repo = MemberRepository(session)
+    _, cursor = await repo.get_page_by_church(ctx["church_id"], limit=50)
+    return await repo.get_page_by_church(ctx["church_id"], after=cursor, limit=50)
+
+
+async def _bulk_update(session, ctx):
+    repo = MemberRepository(session)
+    before = await repo.get_stats_values(ctx["church_id"], ctx["member_ids"], lock=True)
+    updated = await repo.bulk_update(
+        ctx["church_id"],
+        MemberBulkUpdate(member_ids=ctx["member_ids"], add_ministries=["alabanza"])
+    )
+    rows = await repo.get_score_inputs(updated)
+    await repo.apply_stats_changes(before, await repo.get_stats_values(ctx["church_id"], updated))
+    return rows
+
+
+async def _create_note(session, ctx):
+    return await MemberRepository(session).create_note(
+        PastoralNoteCreate(member_id=ctx["member_id"], note_type="seguimiento", content="Nota de prueba de planes"),
+        pastor_id=ctx["user_id"]
+    )
+
+
+async def _record_attendance(session, ctx):
+    return await MemberRepository(session).record_attendance(
+        AttendanceRecordCreate(
+            member_id=ctx["member_id"], church_id=ctx["church_id"],
+            event_type="culto", event_date=date.today()
+        )
+    )
+
+
+async def _record_attendance_bulk(session, ctx):
+    return await MemberRepository(session).record_attendance_bulk(
+        ctx["church_id"], "reunion", date.today(), dict.fromkeys(ctx["member_ids"], True)
+    )
+
+
+async def _event_attendees(session, ctx):
+    repo = EventRepository(session)
+    event = await repo.get_by_id(ctx["event_id"], ctx["church_id"])
+    return await repo.get_attendees(event)
+
+
+def _user_case(method, *args, **kwargs):
+    """Método de UserRepository sobre el usuario de prueba (buscado por email)"""
+    async def call(session, ctx):
+        repo = UserRepository(session)
+        user = await repo.find_by_email(ctx["user_email"])
+        resolved = [arg(ctx) if callable(arg) else arg for arg in args]
+        return await getattr(repo, method)(user, *resolved, **kwargs)
+    return call
+
+
+async def _create_user(session, ctx):
+    return await UserRepository(session).create_user(
+        email="plan-nuevo@example.com", password="Secreto123!", first_name="Plan", last_name="Prueba",
+        role="lider", registration_type="staff_existing_church", pending_church_id=ctx["church_id"]
+    )
+
+
+async def _save_church_registration(session, ctx):
+    request = ChurchRegistrationRequest(
+        name="Iglesia Plan",
+        denomination="Evangélica",
+        address={
+            "street": "Calle Falsa", "number": "123", "neighborhood": "Centro", "city": "Córdoba",
+            "state": "Córdoba", "postal_code": "5000", "country": "Argentina"
+        },
+        contact_info={"primary_email": "plan-iglesia@example.com", "primary_phone": "+54 351 555 0000"},
+        legal_documentation={
+            "documents": [], "legal_representative_name": "Plan Prueba", "legal_representative_id": "20-12345678-9",
+            "registration_authority": "IGJ", "registration_number": "PLAN-1", "registration_date": "2020-01-01"
+        },
+        founding_date="1990-01-01"
+    )
+    return await ChurchRepository(session).save_church_registration(
+        request, uuid4(), {"risk_score": 10, "recommendation": "approve"}, owner_user_id=ctx["pastor_id"]
+    )
+
+
+async def _update_scores(session, ctx):
+    return await MemberRepository(session).update_scores([
+        {"id": member_id, "commitment_score": 50.0, "risk_level": "medio"} for member_id in ctx["member_ids"]
+    ])
+
+
+async def _repair_attendance_counters(session, ctx):
+    drift = [SimpleNamespace(id=member_id) for member_id in ctx["member_ids"]]
+    return await MemberRepository(session).repair_attendance_counters(
+        ctx["church_id"], drift, date.today() - timedelta(days=90)
+    )
+
+
+church_id = lambda ctx: ctx["church_id"]
+member_id = lambda ctx: ctx["member_id"]
+
+CASES = [
+    # MemberRepository
+    PlanCase("member.create", _create_member, frozenset({"members_pkey"})),
+    PlanCase("member.get_by_id", _member_case("get_by_id", member_id, with_notes=True, with_attendance=True),
+             frozenset({"members_pkey", "ix_attendance_member_date"}), max_rows=60),
+    PlanCase("member.get_church_id", _member_case("get_church_id", member_id), frozenset({"members_pkey"})),
+    PlanCase("member.get_by_email", _member_case("get_by_email", lambda ctx: ctx["member_email"]),
+             frozenset({"ix_members_email"})),
+    PlanCase("member.get_all_by_church", _member_case("get_all_by_church", church_id),
+             frozenset({"ix_members_church_name_keyset"}), max_rows=100),
+    PlanCase("member.list_by_church", _member_case("list_by_church", church_id),
+             frozenset({"ix_members_church_name_keyset"}), max_rows=100),
+    PlanCase("member.get_page_by_church", _second_page,
+             frozenset({"ix_members_church_name_keyset"}), max_rows=51),
+    PlanCase("member.search_members", _member_case("search_members", church_id, "perez"),
+             frozenset({"ix_members_search_trgm"}), max_rows=100, needs_search=True),
+    PlanCase("member.search_list_items", _member_case("search_list_items", church_id, "11 1234"),
+             frozenset({"ix_members_phone_digits_trgm"}), max_rows=100, needs_search=True),
+    PlanCase("member.update", _member_case("update", member_id, MemberUpdate(notes="plan")),
+             frozenset({"members_pkey"})),
+    PlanCase("member.delete", _member_case("delete", member_id), frozenset({"members_pkey"})),
+    PlanCase("member.list_by_ids", _member_case("list_by_ids", church_id, lambda ctx: ctx["member_ids"]),
+             frozenset({"ix_members_church_id_keyset"}), max_rows=10),
+    PlanCase("member.bulk_update", _bulk_update, frozenset({"members_pkey"}), max_rows=10),
+    # members se lee por cualquiera de los índices que empiezan por church_id
+    PlanCase("member.rescore_church", _member_case("rescore_church", church_id), max_rows=MEMBERS),
+    # Un día de hace diez años: el seed no deja scores exactos y un día reciente
+    # reescribiría media tabla (el plan es el mismo)
+    PlanCase("member.rescore_due", _member_case("rescore_due", date.today() - timedelta(days=3651),
+                                                date.today() - timedelta(days=3650)),
+             frozenset({"ix_members_last_attendance", "ix_members_visitor_membership"}), max_rows=MEMBERS),
+    # La estimación de GROUPING SETS suma la de cada conjunto: holgura x2
+    PlanCase("member.get_church_stats", _member_case("get_church_stats", church_id),
+             frozenset({"ix_pastoral_notes_pending_followup"}), max_rows=2 * MEMBERS),
+    PlanCase("member.reconcile_stats_snapshot", _member_case("reconcile_stats_snapshot", church_id),
+             frozenset({"church_member_stats_pkey", "ix_pastoral_notes_pending_followup"}), max_rows=2 * MEMBERS),
+    PlanCase("member.get_members_at_risk", _member_case("get_members_at_risk", church_id),
+             frozenset({"ix_members_church_risk"}), max_rows=MEMBERS),
+    PlanCase("member.list_at_risk", _member_case("list_at_risk", church_id),
+             frozenset({"ix_members_church_risk"}), max_rows=MEMBERS),
+    # Ventana que cruza el fin de año: dos rangos de mes-día por tipo de celebración
+    PlanCase("member.get_upcoming_celebrations",
+             _member_case("get_upcoming_celebrations", church_id, date(date.today().year, 12, 28), 7),
+             frozenset({"ix_members_church_birth_month_day", "ix_members_church_membership_month_day"}),
+             max_rows=MEMBERS // 10),
+    PlanCase("member.get_score_inputs_page",
+             _member_case("get_score_inputs_page", church_id, lambda ctx: ctx["member_ids"][0], limit=100),
+             frozenset({"ix_members_church_id_keyset"}), max_rows=100),
+    # Toda la iglesia (evaluación en sombra); los casos anteriores le agregan miembros
+    PlanCase("member.get_church_score_inputs", _member_case("get_church_score_inputs", church_id),
+             max_rows=2 * MEMBERS),
+    PlanCase("member.get_scoring_rules_version", _member_case("get_scoring_rules_version", church_id),
+             frozenset({"churches_pkey"})),
+    PlanCase("member.set_scoring_rules_version",
+             _member_case("set_scoring_rules_version", church_id, CURRENT_RULES_VERSION),
+             frozenset({"churches_pkey"})),
+    # Activos con dones: cualquiera de los índices que empiezan por church_id
+    PlanCase("member.get_ministry_candidate_inputs", _member_case("get_ministry_candidate_inputs", church_id),
+             max_rows=MEMBERS),
+    PlanCase("member.save_ai_notes",
+             _member_case("save_ai_notes", member_id, {"version": 1, "insights": ["plan"]}),
+             frozenset({"members_pkey"})),
+    PlanCase("member.lock_score_inputs",
+             _member_case("lock_score_inputs", church_id, lambda ctx: ctx["member_ids"]),
+             frozenset({"ix_members_church_id_keyset"}), max_rows=10),
+    PlanCase("member.get_attendance_rates",
+             _member_case("get_attendance_rates", lambda ctx: ctx["member_ids"], date.today() - timedelta(days=90)),
+             frozenset({"ix_attendance_member_date"}), max_rows=100),
+    # Con una ventana corta la iglesia bajo prueba es una fracción de los meses que toca
+    PlanCase("member.get_attendance_trends",
+             _member_case("get_attendance_trends", church_id, date.today() - timedelta(weeks=4), date.today()),
+             frozenset({"ix_attendance_church_date"}), max_rows=50),
+    PlanCase("member.get_member_attendance_trend",
+             _member_case("get_member_attendance_trend", church_id, member_id,
+                          date.today() - timedelta(weeks=12), date.today()),
+             frozenset({"members_pkey", "ix_attendance_member_date"})),
+    PlanCase("member.create_note", _create_note, frozenset({"members_pkey"})),
+    PlanCase("member.get_member_notes", _member_case("get_member_notes", member_id),
+             frozenset({"ix_pastoral_notes_member_created"}), max_rows=20),
+    PlanCase("member.get_attendance_page",
+             _member_case("get_attendance_page", member_id, date_from=date.today() - timedelta(days=90)),
+             frozenset({"ix_attendance_member_date"}), max_rows=51),
+    PlanCase("member.record_attendance", _record_attendance,
+             frozenset({"members_pkey", "scheduler_state_pkey", "events_pkey"}), max_rows=60),
+    # unnest() se estima en 100 filas sin importar el largo del arreglo
+    PlanCase("member.record_attendance_bulk", _record_attendance_bulk,
+             frozenset({"members_pkey", "scheduler_state_pkey", "events_pkey"}), max_rows=100),
+    # executemany por clave primaria: se analiza con el primer juego de parámetros
+    PlanCase("member.update_scores", _update_scores, frozenset({"members_pkey"})),
+    PlanCase("member.existing_member_ids",
+             _member_case("existing_member_ids", church_id, lambda ctx: ctx["member_ids"]),
+             frozenset({"ix_members_church_id_keyset"}), max_rows=10),
+    PlanCase("member.recalculate_attendance_rate", _member_case("recalculate_attendance_rate", member_id),
+             frozenset({"ix_attendance_member_date", "members_pkey"})),
+    PlanCase("member.expire_attendance_window",
+             _member_case("expire_attendance_window", church_id, date.today() - timedelta(days=91), date.today() - timedelta(days=90)),
+             frozenset({"ix_attendance_church_date"}), max_rows=MEMBERS),
+    PlanCase("member.check_attendance_counters",
+             _member_case("check_attendance_counters", church_id, date.today() - timedelta(days=90)),
+             frozenset({"ix_attendance_church_date"}), max_rows=2 * MEMBERS),
+    PlanCase("member.get_attendance_window_start", _member_case("get_attendance_window_start", church_id),
+             frozenset({"scheduler_state_pkey"}), max_rows=2),
+    PlanCase("member.lock_attendance_window", _member_case("lock_attendance_window", church_id),
+             frozenset({"scheduler_state_pkey"})),
+    # El recuento es el de get_attendance_rates: GROUP BY sobre varias particiones
+    PlanCase("member.recount_attendance_counters",
+             _member_case("recount_attendance_counters", lambda ctx: ctx["member_ids"], date.today() - timedelta(days=90)),
+             frozenset({"members_pkey", "ix_attendance_member_date"}), max_rows=100),
+    PlanCase("member.rescore_members",
+             _member_case("rescore_members", church_id, lambda ctx: ctx["member_ids"]),
+             frozenset({"churches_pkey", "ix_members_church_id_keyset"}), max_rows=10),
+    PlanCase("member.repair_attendance_counters", _repair_attendance_counters,
+             frozenset({"members_pkey", "ix_attendance_member_date", "ix_members_church_id_keyset"}), max_rows=100),
+
+    # AttendanceRollupRepository
+    # Los agregados son pocas filas por iglesia (no está en LARGE_TABLES): el
+    # planificador puede preferir un Seq Scan, así que sólo se acota el volumen
+    PlanCase("attendance_rollup.get_weekly",
+             _repo_case(AttendanceRollupRepository, "get_weekly", church_id, date.today() - timedelta(weeks=52), date.today()),
+             max_rows=60),
+    PlanCase("attendance_rollup.rebuild", _repo_case(AttendanceRollupRepository, "rebuild", church_id),
+             frozenset({"churches_pkey", "attendance_weekly_rollups_pkey"})),
+
+    # AttendancePartitionRepository
+    PlanCase("attendance_partition.get_partition_months",
+             _repo_case(AttendancePartitionRepository, "get_partition_months"), max_rows=1000),
+    # La DEFAULT debería estar vacía: recorrerla entera es lo esperado
+    PlanCase("attendance_partition.get_default_months",
+             _repo_case(AttendancePartitionRepository, "get_default_months"), max_rows=1000, partition_scans=True),
+    # Un mes que todavía no existe: el movimiento desde la DEFAULT no encuentra filas
+    PlanCase("attendance_partition.create_month",
+             _repo_case(AttendancePartitionRepository, "create_month", add_months(month_start(date.today()), 24)),
+             max_rows=1000, partition_scans=True),
+    PlanCase("attendance_partition.count_rows",
+             _repo_case(AttendancePartitionRepository, "count_rows", lambda ctx: ctx["attendance_month"], True),
+             partition_scans=True),
+    # Sólo el INSERT ... ON CONFLICT (month)
+    PlanCase("attendance_partition.add_archive",
+             _repo_case(AttendancePartitionRepository, "add_archive", date(2001, 1, 1), "plan.parquet", 10)),
+    PlanCase("attendance_partition.get_archives",
+             _repo_case(AttendancePartitionRepository, "get_archives", date(2001, 1, 1), date.today()), max_rows=1000),
+    PlanCase("attendance_partition.get_archived_until", _repo_case(AttendancePartitionRepository, "get_archived_until"),
+             frozenset({"attendance_archives_pkey"})),
+    PlanCase("member.get_oldest_attendance_window_start", _member_case("get_oldest_attendance_window_start"),
+             max_rows=1000),
+
+    # EventRepository
+    PlanCase("event.get_events",
+             _repo_case(EventRepository, "get_events", church_id, date.today() - timedelta(weeks=52), date.today()),
+             frozenset({"ix_events_church_starts"}), max_rows=100),
+    # El rango del día sobre starts_at ya deja una o dos filas
+    PlanCase("event.get_or_create_id",
+             _repo_case(EventRepository, "get_or_create_id", church_id, "culto", date.today(), "Culto dominical"),
+             frozenset({"ix_events_church_starts"})),
+    # Sin evento del día: la búsqueda va por la clave única (no hay filas con
+    # ese nombre) y después el INSERT ... ON CONFLICT
+    PlanCase("event.get_or_create_id_new",
+             _repo_case(EventRepository, "get_or_create_id", church_id, "culto", date.today(), "Evento de plan"),
+             frozenset({"uq_events_church_type_name_start"})),
+    PlanCase("event.add_headcount", _repo_case(EventRepository, "add_headcount", lambda ctx: ctx["event_id"], 1, 1),
+             frozenset({"events_pkey"})),
+    PlanCase("event.get_attendees", _event_attendees,
+             frozenset({"events_pkey", "uq_attendance_event_member", "members_pkey"}), max_rows=MEMBERS),
+
+    # UserRepository
+    PlanCase("user.find_by_email", _repo_case(UserRepository, "find_by_email", lambda ctx: ctx["user_email"]),
+             frozenset({"ix_users_email"})),
+    PlanCase("user.find_by_id", _repo_case(UserRepository, "find_by_id", lambda ctx: ctx["user_id"]),
+             frozenset({"users_pkey", "ix_churches_owner_user_id"}), max_rows=5),
+    PlanCase("user.create_user", _create_user, frozenset({"users_pkey"}), max_rows=5),
+    PlanCase("user.update_user", _user_case("update_user"), frozenset({"ix_users_email", "users_pkey"}), max_rows=5),
+    PlanCase("user.update_approval_status",
+             _user_case("update_approval_status", UserStatus.ACTIVE, ai_score=90.0, can_create_church=True),
+             frozenset({"ix_users_email", "users_pkey"}), max_rows=5),
+    PlanCase("user.link_user_to_church", _user_case("link_user_to_church", church_id),
+             frozenset({"ix_users_email", "users_pkey"}), max_rows=5),
+    PlanCase("user.update_last_login", _user_case("update_last_login"), frozenset({"ix_users_email", "users_pkey"})),
+    PlanCase("user.verify_email", _repo_case(UserRepository, "verify_email", lambda ctx: ctx["verification_token"]),
+             frozenset({"ix_users_email_verification_token"})),
+    PlanCase("user.find_by_church", _repo_case(UserRepository, "find_by_church", church_id),
+             frozenset({"ix_users_church_id"}), max_rows=2 * USERS_PER_CHURCH),
+
+    # ChurchRepository
+    # Sólo INSERTs (iglesia, dirección, contacto, documentos)
+    PlanCase("church.save_church_registration", _save_church_registration),
+    PlanCase("church.find_church_by_id", _repo_case(ChurchRepository, "find_church_by_id", church_id),
+             frozenset({"churches_pkey", "ix_addresses_church_id", "ix_contact_info_church_id"}), max_rows=5),
+    PlanCase("church.find_church_by_email", _repo_case(ChurchRepository, "find_church_by_email", lambda ctx: ctx["church_email"]),
+             frozenset({"ix_contact_info_primary_email"})),
+    PlanCase("church.get_all_churches", _repo_case(ChurchRepository, "get_all_churches", 10),
+             frozenset({"ix_churches_created_at"}), max_rows=10),
+
+    # MemberAuditRepository
+    PlanCase("audit.create_log",
+             _repo_case(MemberAuditRepository, "create_log", lambda ctx: MemberAuditLogCreate(
+                 member_id=ctx["member_id"], user_id=ctx["pastor_id"], action="update",
+                 field_name="notes", old_value="antes", new_value="después"
+             ))),
+    PlanCase("audit.get_member_history", _repo_case(MemberAuditRepository, "get_member_history", member_id),
+             frozenset({"ix_member_audit_member_changed"}), max_rows=50),
+    PlanCase("audit.get_user_actions", _repo_case(MemberAuditRepository, "get_user_actions", lambda ctx: ctx["pastor_id"]),
+             frozenset({"ix_member_audit_user_changed"}), max_rows=50),
+]
+
+
+def _walk(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+
+async def _has_search_extensions(conn) -> bool:
+    result = await conn.execute(
+        text("SELECT count(*) FROM pg_extension WHERE extname IN ('pg_trgm', 'unaccent')")
+    )
+    return result.scalar() == 2
+
+
+async def _seed(engine) -> Dict[str, Any]:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    church_ids = []
+    async with engine.begin() as conn:
+        filler_tag = await seed.seed_filler_churches(conn, FILLER_CHURCHES)
+        for i in range(CHURCHES):
+            church = await seed.seed_church(conn, MEMBERS, seed=i / CHURCHES)
+            church_ids.append(church)
+            await seed.seed_church_details(conn, church, users=USERS_PER_CHURCH)
+            await seed.seed_pastoral_notes(conn, church)
+            await seed.seed_audit_log(conn, church)
+            if i < ATTENDANCE_CHURCHES:
+                await seed.seed_attendance(conn, church, ATTENDANCE_WEEKS)
+        for table in ("members", "users", "churches", "addresses", "contact_info", "pastoral_notes"):
+            await conn.execute(text(f"ANALYZE {table}"))
+
+        target = church_ids[0]
+        members = (await conn.execute(
+            text("SELECT id, email FROM members WHERE church_id = :c ORDER BY id LIMIT 5"), {"c": target}
+        )).all()
+        user = (await conn.execute(
+            text("SELECT id, email, email_verification_token FROM users WHERE church_id = :c AND role = 'lider' LIMIT 1"),
+            {"c": target}
+        )).one()
+        pastor_id = (await conn.execute(text("SELECT owner_user_id FROM churches WHERE id = :c"), {"c": target})).scalar()
+        church_email = (await conn.execute(
+            text("SELECT primary_email FROM contact_info WHERE church_id = :c"), {"c": target}
+        )).scalar()
+        search = await _has_search_extensions(conn)
+        event_id = (await conn.execute(
+            text("SELECT id FROM events WHERE church_id = :c ORDER BY starts_at DESC LIMIT 1"), {"c": target}
+        )).scalar()
+
+    # La asistencia sembrada cae en la partición DEFAULT: una partición por mes
+    async with AsyncSession(engine) as session:
+        repo = AttendancePartitionRepository(session)
+        for month in await repo.get_default_months():
+            await repo.create_month(month)
+        await session.commit()
+
+    async with engine.begin() as conn:
+        await conn.execute(text("ANALYZE attendance_records"))
+        # Particiones y sus índices se reportan con el nombre de la tabla/índice padre
+        parents = dict((await conn.execute(text("""
+            SELECT c.relname, p.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+        """))).all())
+
+    return {
+        "filler_tag": filler_tag,
+        "church_ids": church_ids,
+        "church_id": target,
+        "member_id": members[0].id,
+        "member_ids": [m.id for m in members],
+        "member_email": members[0].email,
+        "user_id": user.id,
+        "user_email": user.email,
+        "verification_token": user.email_verification_token,
+        "pastor_id": pastor_id,
+        "church_email": church_email,
+        "search": search,
+        "event_id": event_id,
+        # Mes anterior: con asistencia sembrada y su partición ya creada
+        "attendance_month": add_months(month_start(date.today()), -1),
+        "parents": parents,
+    }
+
+
+async def _drop(engine, ctx: Dict[str, Any]) -> None:
+    async with engine.begin() as conn:
+        for church in ctx["church_ids"]:
+            await seed.drop_church(conn, church)
+        await seed.drop_filler_churches(conn, ctx["filler_tag"])
+
+
+@pytest.fixture(scope="module")
+def plan_context(db_engine):
+    # conftest ya importó app.main (y su caché): los métodos cacheados usan una en memoria
+    set_response_cache(ResponseCache(InMemoryCacheBackend()))
+    ctx = asyncio.run(_seed(db_engine))
+    yield ctx
+    asyncio.run(_drop(db_engine, ctx))
+
+
+async def _capture_plans(engine, case: PlanCase, ctx: Dict[str, Any]) -> List[Captured]:
+    captured: List[Captured] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        sql = statement.lstrip().upper()
+        if not sql.startswith(("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")):
+            return
+        # Un executemany repite el mismo plan: alcanza con el primer juego de parámetros
+        captured.append(Captured(statement, parameters[0] if executemany else parameters))
+
+    async with engine.connect() as conn:
+        outer = await conn.begin()
+        session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            await case.call(session, ctx)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+        for item in captured:
+            result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {item.statement}", item.parameters)
+            item.plans = [result.scalar()[0]["Plan"]]
+
+        await session.close()
+        await outer.rollback()
+
+    return captured
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case.name for case in CASES])
+def test_query_plan(case: PlanCase, plan_context, db_engine):
+    """Test: El método usa sus índices, sin Seq Scan en tablas grandes y dentro del presupuesto de filas"""
+    if case.needs_search and not plan_context["search"]:
+        pytest.skip("pg_trgm/unaccent no disponibles")
+
+    captured = asyncio.run(_capture_plans(db_engine, case, plan_context))
+    assert captured, f"{case.name} no emitió consultas"
+
+    used_indexes = set()
+    for item in captured:
+        for plan in item.plans:
+            for node in _walk(plan):
+                relation = plan_context["parents"].get(node.get("Relation Name"), node.get("Relation Name"))
+                whole_partition = case.partition_scans and relation != node.get("Relation Name")
+                assert not (node["Node Type"] == "Seq Scan" and relation in LARGE_TABLES and not whole_partition), (
+                    f"{case.name}: Seq Scan sobre {relation}\n{item.statement}"
+                )
+                if node.get("Index Name"):
+                    used_indexes.add(plan_context["parents"].get(node["Index Name"], node["Index Name"]))
+
+            assert plan["Plan Rows"] <= case.max_rows, (
+                f"{case.name}: estima {plan['Plan Rows']} filas (presupuesto {case.max_rows})\n{item.statement}"
+            )
+
+    missing = case.indexes - used_indexes
+    assert not missing, f"{case.name}: no usa {sorted(missing)} (usa {sorted(used_indexes)})"
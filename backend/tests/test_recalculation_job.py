@@ -0,0 +1,110 @@
+"""
+Lease del trabajo de recálculo: claim, advance, list_resumable y toma por otro proceso
+
+Dos "procesos" (dos estados del mismo job) sobre una iglesia sembrada: el
+segundo no puede tomar el trabajo mientras el latido del primero está
+vigente; cuando vence, lo retoma desde el último cursor confirmado. El lote
+que el primero procesa después se descarta (advance falla) y su finish
+tampoco pisa el trabajo; el segundo lo termina.
+
+Necesita un PostgreSQL descartable (el mismo de test_query_plans):
+    QUERY_PLAN_DATABASE_URL=postgresql+asyncpg://... pytest tests/test_recalculation_job.py
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.infrastructure.database.models.background_job import BackgroundJobModel
+from app.infrastructure.jobs import member_recalculation
+from app.infrastructure.repositories.background_job_repository import BackgroundJobRepository
+
+pytestmark = pytest.mark.database
+
+MEMBERS = 30
+CHUNK_SIZE = 10
+
+
+async def _resumable(engine):
+    async with AsyncSession(engine) as session:
+        return await BackgroundJobRepository(session).list_resumable(
+            member_recalculation.JOB_TYPE, member_recalculation._stale_before()
+        )
+
+
+async def _job(engine, job_id):
+    async with AsyncSession(engine) as session:
+        job = await BackgroundJobRepository(session).get_by_id(job_id)
+        return job.status, job.cursor, job.processed, job.attempts
+
+
+async def _scenario(engine, church_id, monkeypatch):
+    # El job abre sus propias sesiones: que usen esta base
+    monkeypatch.setattr(member_recalculation, "AsyncSessionLocal", async_sessionmaker(engine, expire_on_commit=False))
+
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            job = await BackgroundJobRepository(session).create(
+                church_id, member_recalculation.JOB_TYPE, chunk_size=CHUNK_SIZE
+            )
+            await session.commit()
+        steps = {"pending": await _resumable(engine)}
+
+        first = await member_recalculation._claim(job.id)
+        steps["second_claim_while_alive"] = await member_recalculation._claim(job.id)
+        steps["first_chunk"] = await member_recalculation._process_chunk(job.id, first)
+        steps["alive"] = await _resumable(engine)
+
+        # El primer proceso deja de latir: el trabajo se puede retomar
+        async with AsyncSession(engine) as session:
+            await session.execute(
+                update(BackgroundJobModel)
+                .where(BackgroundJobModel.id == job.id)
+                .values(heartbeat_at=datetime.utcnow() - timedelta(hours=1))
+            )
+            await session.commit()
+        steps["stale"] = await _resumable(engine)
+
+        second = await member_recalculation._claim(job.id)
+        steps["second_from"] = second.cursor
+        steps["second_chunk"] = await member_recalculation._process_chunk(job.id, second)
+        steps["second_cursor"] = second.cursor
+
+        # El primero sigue con su cursor viejo: su lote y su finish se descartan
+        steps["late_chunk"] = await member_recalculation._process_chunk(job.id, first)
+        steps["late_finish"] = await member_recalculation._finish(job.id, first, "failed")
+        steps["after_takeover"] = await _job(engine, job.id)
+
+        while await member_recalculation._process_chunk(job.id, second):
+            pass
+        steps["finish"] = await member_recalculation._finish(job.id, second, "completed")
+        steps["done"] = await _job(engine, job.id)
+
+        return first, second, steps
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(delete(BackgroundJobModel).where(BackgroundJobModel.church_id == church_id))
+
+
+def test_takeover_discards_the_stale_worker(db_engine, seeded_church, monkeypatch):
+    """Test: Un proceso sin latido pierde el trabajo; su lote y su finish posteriores no se aplican"""
+    first, second, steps = asyncio.run(_scenario(db_engine, seeded_church(MEMBERS), monkeypatch))
+
+    assert len(steps["pending"]) == 1
+    assert first is not None
+    assert steps["second_claim_while_alive"] is None
+    assert steps["first_chunk"] == CHUNK_SIZE
+    assert steps["alive"] == []
+    assert steps["stale"] == steps["pending"]
+
+    assert steps["second_from"] == first.cursor
+    assert steps["second_chunk"] == CHUNK_SIZE
+    assert steps["late_chunk"] is None
+    assert steps["late_finish"] is False
+    assert steps["after_takeover"] == ("running", steps["second_cursor"], 2 * CHUNK_SIZE, 2)
+
+    assert steps["finish"] is True
+    assert steps["done"] == ("completed", second.cursor, MEMBERS, 2)
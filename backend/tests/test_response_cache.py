@@ -0,0 +1,51 @@
+import asyncio
+import uuid
+
+from app.infrastructure.cache import ResponseCache, InMemoryCacheBackend
+
+
+def test_cache_hit_miss_and_invalidation():
+    """Test: El segundo acceso es hit y la invalidación fuerza un recálculo"""
+    cache = ResponseCache(InMemoryCacheBackend())
+    church_id = uuid.uuid4()
+    calls = []
+
+    async def loader(session):
+        calls.append(1)
+        return {"total_members": len(calls)}
+
+    async def scenario():
+        first = await cache.get_or_load(church_id, "stats", loader)
+        second = await cache.get_or_load(church_id, "stats", loader)
+        await cache.invalidate(church_id)
+        third = await cache.get_or_load(church_id, "stats", loader)
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+
+    assert first == second == {"total_members": 1}
+    assert third == {"total_members": 2}
+    assert cache.metrics()["stats"]["hits"] == 1
+    assert cache.metrics()["stats"]["misses"] == 2
+
+
+def test_cache_single_flight():
+    """Test: Misses concurrentes de la misma clave recalculan una sola vez"""
+    cache = ResponseCache(InMemoryCacheBackend())
+    church_id = uuid.uuid4()
+    calls = []
+
+    async def loader(session):
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return [{"id": str(church_id)}]
+
+    async def scenario():
+        return await asyncio.gather(*[
+            cache.get_or_load(church_id, "at-risk", loader) for _ in range(10)
+        ])
+
+    results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)